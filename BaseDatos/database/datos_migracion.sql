@@ -0,0 +1,29 @@
+-- ============================================================================
+-- Migración de datos existentes
+-- ============================================================================
+-- Se aplica después de funciones.sql (usa sus funciones) y antes de
+-- tiggers.sql (los triggers de mantenimiento contarían dos veces lo que se
+-- rellena aquí). schema.sql solo crea estructura.
+
+-- SÍNTOMAS: categoría, serie diaria y episodios de los registros anteriores
+UPDATE sintomas SET sin_categoria = fn_sintoma_categoria(sin_tipo);
+
+INSERT INTO sintomas_nino_dia (nin_id, snd_fecha, snd_categorias, snd_grado_max, snd_eventos)
+SELECT nin_id, sin_fecha, BIT_OR(sin_categoria), MAX(sin_grado), COUNT(*)
+FROM sintomas
+GROUP BY nin_id, sin_fecha;
+
+INSERT INTO sintomas_episodios (nin_id, sep_categoria, sep_inicio, sep_fin, sep_dias, sep_grado_max)
+SELECT nin_id, sin_categoria, MIN(sin_fecha), MAX(sin_fecha), COUNT(*), MAX(grado)
+FROM (
+  SELECT nin_id, sin_categoria, sin_fecha, grado,
+         SUM(nuevo) OVER (PARTITION BY nin_id, sin_categoria ORDER BY sin_fecha) AS episodio
+  FROM (
+    SELECT nin_id, sin_categoria, sin_fecha, MAX(sin_grado) AS grado,
+           COALESCE(DATEDIFF(sin_fecha, LAG(sin_fecha) OVER (PARTITION BY nin_id, sin_categoria ORDER BY sin_fecha)) > 2,
+                    1) AS nuevo
+    FROM sintomas
+    GROUP BY nin_id, sin_categoria, sin_fecha
+  ) d
+) e
+GROUP BY nin_id, sin_categoria, episodio;
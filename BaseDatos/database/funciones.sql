@@ -89,3 +89,24 @@ BEGIN
   );
 END;
 
+
+create
+    definer = root@`%` function fn_sintoma_categoria(p_tipo varchar(120)) returns tinyint unsigned deterministic
+BEGIN
+  -- Bit de la categoría del síntoma (texto libre); se guarda en sintomas.sin_categoria.
+  -- 1 DIARREA, 2 VOMITO, 4 FIEBRE, 8 RESPIRATORIO, 16 APETITO, 128 OTRO
+  IF p_tipo LIKE '%diarr%' OR p_tipo LIKE '%deposic%liquid%' THEN
+    RETURN 1;
+  ELSEIF p_tipo LIKE '%vomit%' THEN
+    RETURN 2;
+  ELSEIF p_tipo LIKE '%fiebre%' OR p_tipo LIKE '%febril%' OR p_tipo LIKE '%temperatura%' THEN
+    RETURN 4;
+  ELSEIF p_tipo REGEXP '(^|[^[:alpha:]])tos([^[:alpha:]]|$)'
+      OR p_tipo LIKE '%respir%' OR p_tipo LIKE '%resfr%' OR p_tipo LIKE '%gripe%'
+      OR p_tipo LIKE '%bronq%' OR p_tipo LIKE '%neumon%' THEN
+    RETURN 8;
+  ELSEIF p_tipo LIKE '%apetito%' OR p_tipo LIKE '%anorex%' THEN
+    RETURN 16;
+  END IF;
+  RETURN 128;
+END;
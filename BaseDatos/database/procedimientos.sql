@@ -306,15 +306,17 @@ BEGIN
 
   -- Insertar o actualizar evaluación nutricional (campos corregidos según tabla real)
   INSERT INTO evaluaciones_nutricionales(
-    nin_id, ant_id, en_edad_meses, en_z_score_imc,
+    nin_id, ant_id, en_edad_meses, en_imc, en_z_score_imc, en_percentil_imc,
     en_clasificacion, en_nivel_riesgo
   ) VALUES (
-    p_nin_id, v_ant_id, v_edad_meses, v_zscore,
+    p_nin_id, v_ant_id, v_edad_meses, v_imc, v_zscore, v_percentil,
     v_clasificacion, v_nivel_riesgo
   )
   ON DUPLICATE KEY UPDATE
     en_edad_meses = v_edad_meses,
+    en_imc = v_imc,
     en_z_score_imc = v_zscore,
+    en_percentil_imc = v_percentil,
     en_clasificacion = v_clasificacion,
     en_nivel_riesgo = v_nivel_riesgo;
 
@@ -993,3 +995,1006 @@ BEGIN
   SELECT v_usr_id AS usr_id, 'OK' AS msg;
 END;
 
+create
+    definer = root@`%` procedure sp_tokens_revocar(IN p_jti varchar(64), IN p_usuario varchar(150),
+                                                   IN p_expira_en datetime)
+BEGIN
+  INSERT INTO tokens_revocados (tr_jti, tr_usuario, tr_expira_en)
+  VALUES (p_jti, p_usuario, p_expira_en)
+  ON DUPLICATE KEY UPDATE tr_expira_en = GREATEST(tr_expira_en, VALUES(tr_expira_en));
+
+  SELECT p_jti AS jti, 'OK' AS msg;
+END;
+
+create
+    definer = root@`%` procedure sp_tokens_esta_revocado(IN p_jti varchar(64))
+BEGIN
+  SELECT EXISTS(
+    SELECT 1
+    FROM tokens_revocados
+    WHERE tr_jti = p_jti
+      AND tr_expira_en > UTC_TIMESTAMP()
+  ) AS esta_revocado;
+END;
+
+create
+    definer = root@`%` procedure sp_tokens_revocados_desde(IN p_desde datetime)
+BEGIN
+  -- Delta de revocaciones vigentes; con p_desde NULL devuelve el conjunto completo
+  SELECT tr_jti, tr_expira_en, creado_en
+  FROM tokens_revocados
+  WHERE tr_expira_en > UTC_TIMESTAMP()
+    AND (p_desde IS NULL OR creado_en >= p_desde)
+  ORDER BY creado_en;
+END;
+
+create
+    definer = root@`%` procedure sp_tokens_purgar_expirados()
+BEGIN
+  DELETE FROM tokens_revocados
+  WHERE tr_expira_en <= UTC_TIMESTAMP();
+
+  SELECT ROW_COUNT() AS eliminados;
+END;
+
+create
+    definer = root@`%` procedure sp_usuarios_actualizar_contrasena(IN p_usr_id bigint unsigned,
+                                                                   IN p_contrasena_hash varchar(255))
+BEGIN
+  UPDATE usuarios
+  SET usr_contrasena = p_contrasena_hash
+  WHERE usr_id = p_usr_id;
+
+  SELECT p_usr_id AS usr_id, ROW_COUNT() AS filas_afectadas;
+END;
+
+create
+    definer = root@`%` procedure sp_version_tutor_incrementar(IN p_usr_id bigint unsigned)
+BEGIN
+  IF p_usr_id IS NOT NULL THEN
+    INSERT INTO versiones_tutor (usr_id, vt_version)
+    VALUES (p_usr_id, 1)
+    ON DUPLICATE KEY UPDATE vt_version = vt_version + 1;
+  END IF;
+END;
+
+create
+    definer = root@`%` procedure sp_version_entidad_incrementar(IN p_ent_id int unsigned)
+BEGIN
+  -- Tutores y propietarios de los niños de la entidad (GET /children muestra sus datos)
+  INSERT INTO versiones_tutor (usr_id, vt_version)
+  SELECT usr_id, 1
+  FROM (
+    SELECT usr_id_tutor AS usr_id FROM ninos WHERE ent_id = p_ent_id AND usr_id_tutor IS NOT NULL
+    UNION
+    SELECT usr_id_propietario FROM ninos WHERE ent_id = p_ent_id AND usr_id_propietario IS NOT NULL
+  ) afectados
+  ON DUPLICATE KEY UPDATE vt_version = vt_version + 1;
+END;
+
+create
+    definer = root@`%` procedure sp_version_alergia_incrementar(IN p_ta_id smallint unsigned)
+BEGIN
+  -- Tutores y propietarios de los niños con la alergia (GET /children muestra su nombre y categoría)
+  INSERT INTO versiones_tutor (usr_id, vt_version)
+  SELECT usr_id, 1
+  FROM (
+    SELECT n.usr_id_tutor AS usr_id
+    FROM ninos_alergias na
+    JOIN ninos n ON n.nin_id = na.nin_id
+    WHERE na.ta_id = p_ta_id AND n.usr_id_tutor IS NOT NULL
+    UNION
+    SELECT n.usr_id_propietario
+    FROM ninos_alergias na
+    JOIN ninos n ON n.nin_id = na.nin_id
+    WHERE na.ta_id = p_ta_id AND n.usr_id_propietario IS NOT NULL
+  ) afectados
+  ON DUPLICATE KEY UPDATE vt_version = vt_version + 1;
+END;
+
+create
+    definer = root@`%` procedure sp_version_tutor_obtener(IN p_usr_id bigint unsigned)
+BEGIN
+  SELECT COALESCE(
+    (SELECT vt_version FROM versiones_tutor WHERE usr_id = p_usr_id),
+    0
+  ) AS version;
+END;
+
+create
+    definer = root@`%` procedure sp_export_mediciones(IN p_usr_id_tutor bigint unsigned, IN p_ent_id int unsigned)
+BEGIN
+  -- Una fila por antropometría; filtra por tutor/propietario o por entidad
+  SELECT
+    n.nin_id,
+    n.ent_id,
+    n.nin_sexo,
+    n.nin_fecha_nac,
+    a.ant_id,
+    a.ant_fecha,
+    a.ant_peso_kg,
+    a.ant_talla_cm,
+    TIMESTAMPDIFF(MONTH, n.nin_fecha_nac, a.ant_fecha) AS edad_meses,
+    ROUND(a.ant_peso_kg / POW(a.ant_talla_cm / 100, 2), 2) AS imc,
+    a.ant_z_imc,
+    a.ant_z_peso_edad,
+    a.ant_z_talla_edad,
+    ev.en_z_score_imc,
+    ev.en_percentil_imc,
+    ev.en_clasificacion,
+    ev.en_nivel_riesgo,
+    (
+      SELECT GROUP_CONCAT(ta.ta_codigo ORDER BY ta.ta_codigo SEPARATOR ';')
+      FROM ninos_alergias na
+      JOIN tipos_alergias ta ON ta.ta_id = na.ta_id
+      WHERE na.nin_id = n.nin_id AND na.na_activo = 1
+    ) AS alergias
+  FROM ninos n
+  JOIN antropometrias a ON a.nin_id = n.nin_id
+  LEFT JOIN evaluaciones_nutricionales ev ON ev.ant_id = a.ant_id
+  WHERE (p_usr_id_tutor IS NULL OR n.usr_id_tutor = p_usr_id_tutor OR n.usr_id_propietario = p_usr_id_tutor)
+    AND (p_ent_id IS NULL OR n.ent_id = p_ent_id)
+    AND (p_usr_id_tutor IS NOT NULL OR p_ent_id IS NOT NULL)
+  ORDER BY n.nin_id, a.ant_fecha;
+END;
+
+create
+    definer = root@`%` procedure sp_nutricionista_en_entidad(IN p_usr_id bigint unsigned, IN p_ent_id int unsigned)
+BEGIN
+  SELECT EXISTS(
+    SELECT 1 FROM nutricionistas WHERE usr_id = p_usr_id AND ent_id = p_ent_id
+  ) AS pertenece;
+END;
+
+create
+    definer = root@`%` procedure sp_evaluacion_obtener_ultima(IN p_nin_id bigint unsigned)
+BEGIN
+  -- Evaluación ya calculada de la última antropometría (vacío si aún no existe)
+  SELECT
+    en.en_id,
+    en.nin_id,
+    en.ant_id,
+    en.en_edad_meses,
+    en.en_imc AS imc_calculado,
+    en.en_z_score_imc,
+    en.en_percentil_imc AS percentil_calculado,
+    en.en_clasificacion,
+    en.en_nivel_riesgo,
+    NULL AS oms_usado,
+    en.creado_en AS evaluado_en
+  FROM evaluaciones_nutricionales en
+  JOIN (
+    SELECT ant_id
+    FROM antropometrias
+    WHERE nin_id = p_nin_id
+    ORDER BY ant_fecha DESC, creado_en DESC
+    LIMIT 1
+  ) ult ON ult.ant_id = en.ant_id
+  WHERE en.en_imc IS NOT NULL;
+END;
+
+create
+    definer = root@`%` procedure sp_trabajos_encolar(IN p_tipo varchar(60), IN p_payload json,
+                                                     IN p_clave varchar(120), IN p_max_intentos smallint unsigned,
+                                                     IN p_retraso_seg int unsigned)
+BEGIN
+  -- La clave única solo existe mientras el trabajo está pendiente: encolar dos
+  -- veces la misma clave actualiza el payload en lugar de duplicar el trabajo.
+  INSERT INTO trabajos (tra_tipo, tra_payload, tra_clave_unica, tra_max_intentos, tra_disponible_en)
+  VALUES (p_tipo, p_payload, p_clave, COALESCE(p_max_intentos, 5),
+          UTC_TIMESTAMP() + INTERVAL COALESCE(p_retraso_seg, 0) SECOND)
+  ON DUPLICATE KEY UPDATE
+    tra_id = LAST_INSERT_ID(tra_id),
+    tra_payload = VALUES(tra_payload),
+    tra_disponible_en = LEAST(tra_disponible_en, VALUES(tra_disponible_en));
+
+  SELECT LAST_INSERT_ID() AS tra_id;
+END;
+
+create
+    definer = root@`%` procedure sp_trabajos_reservar(IN p_worker varchar(100), IN p_tipos varchar(500),
+                                                      IN p_limite int unsigned)
+BEGIN
+  -- Reserva hasta p_limite trabajos vencidos. FOR UPDATE SKIP LOCKED evita que
+  -- dos workers tomen el mismo trabajo sin bloquearse entre sí. El llamador
+  -- debe hacer COMMIT para liberar los locks.
+  DECLARE v_id BIGINT UNSIGNED;
+  DECLARE v_fin INT DEFAULT 0;
+  DECLARE cur CURSOR FOR
+    SELECT tra_id
+    FROM trabajos
+    WHERE tra_estado = 'PENDIENTE'
+      AND tra_disponible_en <= UTC_TIMESTAMP()
+      AND (p_tipos IS NULL OR FIND_IN_SET(tra_tipo, p_tipos) > 0)
+    ORDER BY tra_disponible_en, tra_id
+    LIMIT p_limite
+    FOR UPDATE SKIP LOCKED;
+  DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_fin = 1;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_trabajos_reservados;
+  CREATE TEMPORARY TABLE tmp_trabajos_reservados (tra_id BIGINT UNSIGNED PRIMARY KEY) ENGINE=MEMORY;
+
+  OPEN cur;
+  leer: LOOP
+    FETCH cur INTO v_id;
+    IF v_fin = 1 THEN
+      LEAVE leer;
+    END IF;
+    INSERT INTO tmp_trabajos_reservados (tra_id) VALUES (v_id);
+  END LOOP;
+  CLOSE cur;
+
+  UPDATE trabajos t
+  JOIN tmp_trabajos_reservados r ON r.tra_id = t.tra_id
+  SET t.tra_estado = 'EN_PROCESO',
+      t.tra_intentos = t.tra_intentos + 1,
+      t.tra_bloqueado_por = p_worker,
+      t.tra_bloqueado_en = UTC_TIMESTAMP(),
+      t.tra_clave_unica = NULL;
+
+  SELECT t.tra_id, t.tra_tipo, t.tra_payload, t.tra_intentos, t.tra_max_intentos
+  FROM trabajos t
+  JOIN tmp_trabajos_reservados r ON r.tra_id = t.tra_id
+  ORDER BY t.tra_id;
+
+  DROP TEMPORARY TABLE tmp_trabajos_reservados;
+END;
+
+create
+    definer = root@`%` procedure sp_trabajos_completar(IN p_tra_id bigint unsigned)
+BEGIN
+  UPDATE trabajos
+  SET tra_estado = 'COMPLETADO', tra_error = NULL, tra_bloqueado_por = NULL, tra_bloqueado_en = NULL
+  WHERE tra_id = p_tra_id;
+
+  SELECT p_tra_id AS tra_id, ROW_COUNT() AS filas_afectadas;
+END;
+
+create
+    definer = root@`%` procedure sp_trabajos_fallar(IN p_tra_id bigint unsigned, IN p_error text,
+                                                    IN p_reintentar_en_seg int unsigned)
+BEGIN
+  -- Reprograma con el backoff indicado o marca FALLADO si agotó sus intentos
+  UPDATE trabajos
+  SET tra_estado = IF(tra_intentos >= tra_max_intentos, 'FALLADO', 'PENDIENTE'),
+      tra_disponible_en = UTC_TIMESTAMP() + INTERVAL p_reintentar_en_seg SECOND,
+      tra_error = LEFT(p_error, 2000),
+      tra_bloqueado_por = NULL,
+      tra_bloqueado_en = NULL
+  WHERE tra_id = p_tra_id;
+
+  SELECT tra_id, tra_estado, tra_intentos FROM trabajos WHERE tra_id = p_tra_id;
+END;
+
+create
+    definer = root@`%` procedure sp_trabajos_recuperar_expirados(IN p_timeout_seg int unsigned)
+BEGIN
+  -- Trabajos EN_PROCESO de un worker que murió vuelven a la cola
+  UPDATE trabajos
+  SET tra_estado = IF(tra_intentos >= tra_max_intentos, 'FALLADO', 'PENDIENTE'),
+      tra_error = 'Reservado sin completar (timeout)',
+      tra_bloqueado_por = NULL,
+      tra_bloqueado_en = NULL
+  WHERE tra_estado = 'EN_PROCESO'
+    AND tra_bloqueado_en < UTC_TIMESTAMP() - INTERVAL p_timeout_seg SECOND;
+
+  SELECT ROW_COUNT() AS recuperados;
+END;
+
+create
+    definer = root@`%` procedure sp_puntajes_riesgo_insertar(IN p_nin_id bigint unsigned, IN p_version varchar(32),
+                                                             IN p_riesgo decimal(6, 4), IN p_caracteristicas json)
+BEGIN
+  INSERT INTO puntajes_riesgo (nin_id, pri_fecha_hora, pri_version, pri_riesgo, pri_caracteristicas)
+  VALUES (p_nin_id, NOW(), p_version, p_riesgo, p_caracteristicas);
+
+  SELECT LAST_INSERT_ID() AS pri_id;
+END;
+
+create
+    definer = root@`%` procedure sp_notificaciones_crear(IN p_usr_id bigint unsigned, IN p_tipo varchar(60),
+                                                         IN p_payload json, IN p_clave varchar(120),
+                                                         IN p_ventana_seg int unsigned)
+BEGIN
+  -- Con p_clave repetida para el mismo usuario no se inserta y not_id es NULL
+  INSERT IGNORE INTO notificaciones (usr_id, not_tipo, not_payload, not_clave, not_disponible_en)
+  VALUES (p_usr_id, p_tipo, p_payload, p_clave, UTC_TIMESTAMP() + INTERVAL p_ventana_seg SECOND);
+
+  SELECT IF(ROW_COUNT() > 0, LAST_INSERT_ID(), NULL) AS not_id;
+END;
+
+create
+    definer = root@`%` procedure sp_notificaciones_obtener(IN p_not_id bigint unsigned)
+BEGIN
+  SELECT n.not_id, n.usr_id, n.not_tipo, n.not_payload, n.not_estado, n.not_enviado_en, n.creado_en,
+         u.usr_correo
+  FROM notificaciones n
+  JOIN usuarios u ON u.usr_id = n.usr_id
+  WHERE n.not_id = p_not_id;
+END;
+
+create
+    definer = root@`%` procedure sp_notificaciones_marcar(IN p_not_id bigint unsigned, IN p_estado varchar(20))
+BEGIN
+  UPDATE notificaciones
+  SET not_estado = p_estado,
+      not_enviado_en = IF(p_estado = 'ENVIADO', NOW(), not_enviado_en)
+  WHERE not_id = p_not_id;
+
+  SELECT p_not_id AS not_id, ROW_COUNT() AS filas_afectadas;
+END;
+
+create
+    definer = root@`%` procedure sp_riesgo_ejecucion_iniciar(IN p_version varchar(32), IN p_incremental tinyint(1))
+BEGIN
+  -- La marca de agua es el inicio de la última corrida completada de la misma versión:
+  -- lo que cambió durante esa corrida vuelve a puntuarse en la siguiente
+  DECLARE v_desde DATETIME DEFAULT NULL;
+
+  IF p_incremental THEN
+    SELECT MAX(rej_iniciado_en) INTO v_desde
+    FROM puntajes_riesgo_ejecuciones
+    WHERE rej_version = p_version AND rej_estado = 'COMPLETADO';
+  END IF;
+
+  INSERT INTO puntajes_riesgo_ejecuciones (rej_version, rej_modo, rej_desde, rej_iniciado_en)
+  VALUES (p_version, IF(v_desde IS NULL, 'COMPLETO', 'INCREMENTAL'), v_desde, NOW());
+
+  SELECT rej_id, rej_version, rej_modo, rej_desde, rej_iniciado_en
+  FROM puntajes_riesgo_ejecuciones
+  WHERE rej_id = LAST_INSERT_ID();
+END;
+
+create
+    definer = root@`%` procedure sp_riesgo_ejecucion_finalizar(IN p_rej_id bigint unsigned, IN p_estado varchar(20),
+                                                               IN p_puntuados int unsigned, IN p_error text)
+BEGIN
+  UPDATE puntajes_riesgo_ejecuciones
+  SET rej_estado = p_estado,
+      rej_puntuados = p_puntuados,
+      rej_error = p_error,
+      rej_finalizado_en = NOW()
+  WHERE rej_id = p_rej_id;
+
+  SELECT p_rej_id AS rej_id, ROW_COUNT() AS filas_afectadas;
+END;
+
+create
+    definer = root@`%` procedure sp_riesgo_caracteristicas(IN p_desde datetime)
+BEGIN
+  -- Últimas características por niño (una fila por niño). Cada agregado se
+  -- calcula con un único GROUP BY sobre su tabla; con p_desde solo se devuelven
+  -- los niños con alguna entrada creada o modificada desde esa fecha, o con un
+  -- síntoma/adherencia que salió desde entonces de su ventana de 14/30 días
+  -- (sintomas_14d, diarrea_14d y adherencia_30d cambian aunque nadie escriba).
+  SELECT
+    n.nin_id,
+    n.nin_sexo,
+    n.nin_fecha_nac,
+    a.ant_id,
+    a.ant_fecha,
+    TIMESTAMPDIFF(MONTH, n.nin_fecha_nac, a.ant_fecha) AS edad_meses,
+    ROUND(a.ant_peso_kg / POW(a.ant_talla_cm / 100, 2), 2) AS imc,
+    a.ant_z_imc,
+    a.ant_z_peso_edad,
+    a.ant_z_talla_edad,
+    ev.en_z_score_imc,
+    ev.en_clasificacion,
+    ev.en_nivel_riesgo,
+    COALESCE(al.alergias, 0) AS alergias,
+    COALESCE(al.alergias_severas, 0) AS alergias_severas,
+    COALESCE(si.sintomas_14d, 0) AS sintomas_14d,
+    COALESCE(si.diarrea_14d, 0) AS diarrea_14d,
+    ad.adherencia_30d,
+    COALESCE(ad.registros_30d, 0) AS registros_30d
+  FROM ninos n
+  LEFT JOIN (
+    -- Una sola medición por niño: la más reciente y, si hay dos el mismo día, la última registrada
+    SELECT nin_id, ant_id, cambio_en
+    FROM (
+      SELECT nin_id, ant_id,
+             MAX(actualizado_en) OVER (PARTITION BY nin_id) AS cambio_en,
+             ROW_NUMBER() OVER (PARTITION BY nin_id ORDER BY ant_fecha DESC, ant_id DESC) AS orden
+      FROM antropometrias
+    ) m
+    WHERE orden = 1
+  ) ua ON ua.nin_id = n.nin_id
+  LEFT JOIN antropometrias a ON a.ant_id = ua.ant_id
+  LEFT JOIN evaluaciones_nutricionales ev ON ev.ant_id = a.ant_id
+  LEFT JOIN (
+    SELECT nin_id,
+           SUM(na_activo) AS alergias,
+           SUM(na_activo AND na_severidad = 'SEVERA') AS alergias_severas,
+           MAX(actualizado_en) AS cambio_en
+    FROM ninos_alergias
+    GROUP BY nin_id
+  ) al ON al.nin_id = n.nin_id
+  LEFT JOIN (
+    SELECT nin_id,
+           SUM(sin_fecha >= CURDATE() - INTERVAL 14 DAY) AS sintomas_14d,
+           MAX(sin_fecha >= CURDATE() - INTERVAL 14 DAY AND sin_categoria = 1) AS diarrea_14d,
+           MAX(creado_en) AS cambio_en,
+           MAX(sin_fecha < CURDATE() - INTERVAL 14 DAY
+               AND sin_fecha >= DATE(p_desde) - INTERVAL 14 DAY) AS salio_de_ventana
+    FROM sintomas
+    GROUP BY nin_id
+  ) si ON si.nin_id = n.nin_id
+  LEFT JOIN (
+    SELECT nin_id,
+           AVG(IF(adh_registrado_en >= NOW() - INTERVAL 30 DAY,
+                  CASE adh_estado WHEN 'OK' THEN 1 WHEN 'PARCIAL' THEN 0.5 ELSE 0 END,
+                  NULL)) AS adherencia_30d,
+           SUM(adh_registrado_en >= NOW() - INTERVAL 30 DAY) AS registros_30d,
+           MAX(adh_registrado_en) AS cambio_en,
+           MAX(adh_registrado_en < NOW() - INTERVAL 30 DAY
+               AND adh_registrado_en >= p_desde - INTERVAL 30 DAY) AS salio_de_ventana
+    FROM adherencias
+    GROUP BY nin_id
+  ) ad ON ad.nin_id = n.nin_id
+  WHERE p_desde IS NULL
+     OR GREATEST(
+          n.actualizado_en,
+          COALESCE(ua.cambio_en, n.actualizado_en),
+          COALESCE(ev.creado_en, n.actualizado_en),
+          COALESCE(al.cambio_en, n.actualizado_en),
+          COALESCE(si.cambio_en, n.actualizado_en),
+          COALESCE(ad.cambio_en, n.actualizado_en)
+        ) >= p_desde
+     OR si.salio_de_ventana
+     OR ad.salio_de_ventana
+  ORDER BY n.nin_id;
+END;
+
+create
+    definer = root@`%` procedure sp_menu_catalogo_nutrientes()
+BEGIN
+  -- Matriz alimento x nutriente (por 100 g/ml) de los alimentos activos
+  SELECT an.ali_id, nu.nutri_codigo, an.an_cantidad_100
+  FROM alimentos_nutrientes an
+  JOIN alimentos a ON a.ali_id = an.ali_id AND a.ali_activo = 1
+  JOIN nutrientes nu ON nu.nutri_id = an.nutri_id
+  ORDER BY an.ali_id;
+END;
+
+create
+    definer = root@`%` procedure sp_menu_catalogo_recetas()
+BEGIN
+  -- Ingredientes (una porción) de las recetas activas; descarta recetas con ingredientes inactivos
+  SELECT r.rec_id, r.rec_nombre, r.rec_mascara_alergenos, ri.ali_id, ri.ri_cantidad, ri.ri_unidad
+  FROM recetas r
+  JOIN recetas_ingredientes ri ON ri.rec_id = r.rec_id
+  WHERE r.rec_activo = 1
+    AND NOT EXISTS (
+      SELECT 1
+      FROM recetas_ingredientes ri2
+      JOIN alimentos a ON a.ali_id = ri2.ali_id
+      WHERE ri2.rec_id = r.rec_id AND a.ali_activo = 0
+    )
+  ORDER BY r.rec_id;
+END;
+
+create
+    definer = root@`%` procedure sp_menu_catalogo_disponibilidad(IN p_periodo varchar(2))
+BEGIN
+  SELECT ali_id, ent_id, dis_region, dis_disponible, dis_precio_promedio
+  FROM disponibilidad_alimentos
+  WHERE dis_periodo = p_periodo;
+END;
+
+create
+    definer = root@`%` procedure sp_menu_ninos(IN p_ent_id int unsigned, IN p_nin_id bigint unsigned,
+                                               IN p_inicio date)
+BEGIN
+  -- Niños a planificar con su región, la máscara de bits de sus alergias activas
+  -- y el menú generado (no archivado) que ya tengan para la semana de p_inicio
+  SELECT
+    n.nin_id,
+    n.nin_fecha_nac,
+    n.nin_sexo,
+    n.ent_id,
+    e.ent_departamento AS region,
+    n.nin_mascara_alergias,
+    (SELECT MAX(m.men_id)
+     FROM menus m
+     WHERE m.nin_id = n.nin_id AND m.men_inicio = p_inicio
+       AND m.men_generado_por = 'IA' AND m.men_estado <> 'ARCHIVADO') AS men_id_semana
+  FROM ninos n
+  LEFT JOIN entidades e ON e.ent_id = n.ent_id
+  WHERE (p_ent_id IS NULL OR n.ent_id = p_ent_id)
+    AND (p_nin_id IS NULL OR n.nin_id = p_nin_id)
+  ORDER BY n.nin_id;
+END;
+
+create
+    definer = root@`%` procedure sp_menus_crear(IN p_nin_id bigint unsigned, IN p_generado_por varchar(20),
+                                                IN p_inicio date, IN p_fin date, IN p_kcal_total int)
+BEGIN
+  INSERT INTO menus (nin_id, men_generado_por, men_inicio, men_fin, men_kcal_total)
+  VALUES (p_nin_id, p_generado_por, p_inicio, p_fin, p_kcal_total);
+
+  SELECT LAST_INSERT_ID() AS men_id;
+END;
+
+create
+    definer = root@`%` procedure sp_alergenos_recalcular_nino(IN p_nin_id bigint unsigned)
+BEGIN
+  DECLARE v_mascara BIGINT UNSIGNED;
+
+  SELECT COALESCE(BIT_OR(1 << ta.ta_bit), 0) INTO v_mascara
+  FROM ninos_alergias na
+  JOIN tipos_alergias ta ON ta.ta_id = na.ta_id
+  WHERE na.nin_id = p_nin_id AND na.na_activo = 1 AND ta.ta_bit IS NOT NULL;
+
+  UPDATE ninos
+  SET nin_mascara_alergias = v_mascara
+  WHERE nin_id = p_nin_id AND nin_mascara_alergias <> v_mascara;
+END;
+
+create
+    definer = root@`%` procedure sp_alergenos_recalcular_receta(IN p_rec_id int unsigned)
+BEGIN
+  DECLARE v_mascara BIGINT UNSIGNED;
+
+  SELECT COALESCE(BIT_OR(a.ali_mascara_alergenos), 0) INTO v_mascara
+  FROM recetas_ingredientes ri
+  JOIN alimentos a ON a.ali_id = ri.ali_id
+  WHERE ri.rec_id = p_rec_id;
+
+  UPDATE recetas
+  SET rec_mascara_alergenos = v_mascara
+  WHERE rec_id = p_rec_id AND rec_mascara_alergenos <> v_mascara;
+END;
+
+create
+    definer = root@`%` procedure sp_alergenos_recalcular_alimento(IN p_ali_id int unsigned)
+BEGIN
+  -- Recalcula el alimento y propaga a las recetas que lo usan
+  DECLARE v_mascara BIGINT UNSIGNED;
+
+  SELECT COALESCE(BIT_OR(1 << ta.ta_bit), 0) INTO v_mascara
+  FROM alimentos_alergias aa
+  JOIN tipos_alergias ta ON ta.ta_id = aa.ta_id
+  WHERE aa.ali_id = p_ali_id AND ta.ta_bit IS NOT NULL;
+
+  UPDATE alimentos
+  SET ali_mascara_alergenos = v_mascara
+  WHERE ali_id = p_ali_id AND ali_mascara_alergenos <> v_mascara;
+
+  UPDATE recetas r
+  JOIN (
+    SELECT ri.rec_id, BIT_OR(a.ali_mascara_alergenos) AS mascara
+    FROM recetas_ingredientes ri
+    JOIN alimentos a ON a.ali_id = ri.ali_id
+    WHERE ri.rec_id IN (SELECT rec_id FROM recetas_ingredientes WHERE ali_id = p_ali_id)
+    GROUP BY ri.rec_id
+  ) x ON x.rec_id = r.rec_id
+  SET r.rec_mascara_alergenos = x.mascara
+  WHERE r.rec_mascara_alergenos <> x.mascara;
+END;
+
+create
+    definer = root@`%` procedure sp_alergenos_reconstruir()
+BEGIN
+  -- Reconstrucción completa (carga inicial o tras cambiar bits): alimentos -> recetas -> niños
+  UPDATE alimentos a
+  LEFT JOIN (
+    SELECT aa.ali_id, BIT_OR(1 << ta.ta_bit) AS mascara
+    FROM alimentos_alergias aa
+    JOIN tipos_alergias ta ON ta.ta_id = aa.ta_id
+    WHERE ta.ta_bit IS NOT NULL
+    GROUP BY aa.ali_id
+  ) x ON x.ali_id = a.ali_id
+  SET a.ali_mascara_alergenos = COALESCE(x.mascara, 0)
+  WHERE a.ali_mascara_alergenos <> COALESCE(x.mascara, 0);
+
+  UPDATE recetas r
+  LEFT JOIN (
+    SELECT ri.rec_id, BIT_OR(a.ali_mascara_alergenos) AS mascara
+    FROM recetas_ingredientes ri
+    JOIN alimentos a ON a.ali_id = ri.ali_id
+    GROUP BY ri.rec_id
+  ) x ON x.rec_id = r.rec_id
+  SET r.rec_mascara_alergenos = COALESCE(x.mascara, 0)
+  WHERE r.rec_mascara_alergenos <> COALESCE(x.mascara, 0);
+
+  UPDATE ninos n
+  LEFT JOIN (
+    SELECT na.nin_id, BIT_OR(1 << ta.ta_bit) AS mascara
+    FROM ninos_alergias na
+    JOIN tipos_alergias ta ON ta.ta_id = na.ta_id
+    WHERE na.na_activo = 1 AND ta.ta_bit IS NOT NULL
+    GROUP BY na.nin_id
+  ) x ON x.nin_id = n.nin_id
+  SET n.nin_mascara_alergias = COALESCE(x.mascara, 0)
+  WHERE n.nin_mascara_alergias <> COALESCE(x.mascara, 0);
+END;
+
+create
+    definer = root@`%` procedure sp_alergenos_bits()
+BEGIN
+  SELECT ta_id, ta_codigo, ta_categoria, ta_bit
+  FROM tipos_alergias
+  WHERE ta_bit IS NOT NULL
+  ORDER BY ta_bit;
+END;
+
+create
+    definer = root@`%` procedure sp_alergenos_indice(IN p_desde datetime)
+BEGIN
+  -- Máscaras de niños, alimentos y recetas modificados desde p_desde (NULL = todos);
+  -- `activo` = 0 indica que la fila debe salir del índice
+  SELECT 'NINO' AS tipo, nin_id AS id, ent_id, nin_mascara_alergias AS mascara, 1 AS activo, actualizado_en
+  FROM ninos
+  WHERE p_desde IS NULL OR actualizado_en >= p_desde
+  UNION ALL
+  SELECT 'ALIMENTO', ali_id, NULL, ali_mascara_alergenos, ali_activo, actualizado_en
+  FROM alimentos
+  WHERE p_desde IS NULL OR actualizado_en >= p_desde
+  UNION ALL
+  SELECT 'RECETA', rec_id, NULL, rec_mascara_alergenos, rec_activo, actualizado_en
+  FROM recetas
+  WHERE p_desde IS NULL OR actualizado_en >= p_desde;
+END;
+
+create
+    definer = root@`%` procedure sp_version_catalogo_incrementar(IN p_catalogo varchar(40))
+BEGIN
+  INSERT INTO versiones_catalogo (vc_catalogo, vc_version)
+  VALUES (p_catalogo, 1)
+  ON DUPLICATE KEY UPDATE vc_version = vc_version + 1;
+END;
+
+create
+    definer = root@`%` procedure sp_version_catalogo_obtener(IN p_catalogo varchar(40))
+BEGIN
+  SELECT COALESCE(
+    (SELECT vc_version FROM versiones_catalogo WHERE vc_catalogo = p_catalogo),
+    0
+  ) AS version;
+END;
+
+create
+    definer = root@`%` procedure sp_alimentos_catalogo()
+BEGIN
+  -- Alimentos activos del catálogo de búsqueda
+  SELECT ali_id, ali_nombre, ali_grupo, ali_unidad
+  FROM alimentos
+  WHERE ali_activo = 1
+  ORDER BY ali_id;
+END;
+
+create
+    definer = root@`%` procedure sp_alimentos_catalogo_nutrientes()
+BEGIN
+  SELECT nutri_codigo, nutri_nombre, nutri_unidad
+  FROM nutrientes
+  ORDER BY nutri_id;
+END;
+
+create
+    definer = root@`%` procedure sp_alimentos_catalogo_disponibilidad()
+BEGIN
+  -- Registros nacionales y regionales de todos los trimestres (los de entidad no aplican)
+  SELECT ali_id, dis_periodo, dis_region, dis_disponible, dis_precio_promedio
+  FROM disponibilidad_alimentos
+  WHERE ent_id IS NULL;
+END;
+
+create
+    definer = root@`%` procedure sp_adherencia_resumen_aplicar(IN p_nin_id bigint unsigned, IN p_men_id bigint unsigned,
+                                                               IN p_fecha date, IN p_estado varchar(10), IN p_signo int)
+BEGIN
+  -- Suma (p_signo = 1) o resta (-1) un evento en los resúmenes por niño/día y por menú
+  DECLARE v_ok INT DEFAULT IF(p_estado = 'OK', p_signo, 0);
+  DECLARE v_parcial INT DEFAULT IF(p_estado = 'PARCIAL', p_signo, 0);
+  DECLARE v_no INT DEFAULT IF(p_estado = 'NO', p_signo, 0);
+
+  INSERT INTO adherencias_nino_dia (nin_id, adn_fecha, adn_ok, adn_parcial, adn_no)
+  VALUES (p_nin_id, p_fecha, v_ok, v_parcial, v_no)
+  ON DUPLICATE KEY UPDATE
+    adn_ok = adn_ok + v_ok, adn_parcial = adn_parcial + v_parcial, adn_no = adn_no + v_no;
+
+  IF p_men_id IS NOT NULL THEN
+    INSERT INTO adherencias_menu (men_id, adm_ok, adm_parcial, adm_no)
+    VALUES (p_men_id, v_ok, v_parcial, v_no)
+    ON DUPLICATE KEY UPDATE
+      adm_ok = adm_ok + v_ok, adm_parcial = adm_parcial + v_parcial, adm_no = adm_no + v_no;
+  END IF;
+END;
+
+create
+    definer = root@`%` procedure sp_adherencia_resumen_nino(IN p_nin_id bigint unsigned, IN p_desde date)
+BEGIN
+  SELECT
+    COALESCE(SUM(adn_ok), 0) AS ok,
+    COALESCE(SUM(adn_parcial), 0) AS parcial,
+    COALESCE(SUM(adn_no), 0) AS no_cumple,
+    COUNT(*) AS dias
+  FROM adherencias_nino_dia
+  WHERE nin_id = p_nin_id AND adn_fecha >= p_desde;
+END;
+
+create
+    definer = root@`%` procedure sp_adherencia_resumen_menu(IN p_men_id bigint unsigned)
+BEGIN
+  SELECT
+    m.men_id,
+    m.nin_id,
+    COALESCE(a.adm_ok, 0) AS ok,
+    COALESCE(a.adm_parcial, 0) AS parcial,
+    COALESCE(a.adm_no, 0) AS no_cumple
+  FROM menus m
+  LEFT JOIN adherencias_menu a ON a.men_id = m.men_id
+  WHERE m.men_id = p_men_id;
+END;
+
+create
+    definer = root@`%` procedure sp_adherencia_menus_obtener(IN p_men_ids json, IN p_mei_ids json)
+BEGIN
+  -- Niño dueño de cada menú y de cada ítem (y su menú) citados en un lote de
+  -- adherencia; p_men_ids / p_mei_ids = [id, ...]. Los inexistentes no aparecen.
+  SELECT 'MENU' AS tipo, m.men_id AS id, m.men_id, m.nin_id
+  FROM JSON_TABLE(p_men_ids, '$[*]' COLUMNS (id BIGINT UNSIGNED PATH '$')) j
+  JOIN menus m ON m.men_id = j.id
+  UNION ALL
+  SELECT 'ITEM', i.mei_id, i.men_id, m.nin_id
+  FROM JSON_TABLE(p_mei_ids, '$[*]' COLUMNS (id BIGINT UNSIGNED PATH '$')) j
+  JOIN menus_items i ON i.mei_id = j.id
+  JOIN menus m ON m.men_id = i.men_id;
+END;
+
+create
+    definer = root@`%` procedure sp_auditoria_listar(IN p_entidad varchar(80), IN p_entidad_id varchar(64),
+                                                     IN p_desde datetime, IN p_hasta datetime,
+                                                     IN p_cursor_fecha datetime, IN p_cursor_id bigint unsigned,
+                                                     IN p_limite int)
+BEGIN
+  -- Historial de una entidad (idx_eau_entidad), del más reciente al más antiguo.
+  -- Paginación por cursor (eau_fecha_hora, eau_id) del último registro recibido.
+  SELECT eau_id, usr_id, eau_entidad, eau_entidad_id, eau_accion, eau_ip, eau_metadata, eau_fecha_hora
+  FROM eventos_auditoria
+  WHERE eau_entidad = p_entidad
+    AND eau_entidad_id = p_entidad_id
+    AND (p_desde IS NULL OR eau_fecha_hora >= p_desde)
+    AND (p_hasta IS NULL OR eau_fecha_hora < p_hasta)
+    AND (p_cursor_fecha IS NULL
+         OR eau_fecha_hora < p_cursor_fecha
+         OR (eau_fecha_hora = p_cursor_fecha AND eau_id < p_cursor_id))
+  ORDER BY eau_fecha_hora DESC, eau_id DESC
+  LIMIT p_limite;
+END;
+
+create
+    definer = root@`%` procedure sp_sintomas_recalcular(IN p_nin_id bigint unsigned, IN p_fecha date,
+                                                        IN p_categoria tinyint unsigned)
+BEGIN
+  -- Lo llaman los triggers de sintomas: rehace la fila del día y los episodios
+  -- de la categoría para el niño (pocas filas por índice; la máscara y el grado
+  -- máximo no se pueden restar al eliminar)
+  DELETE FROM sintomas_nino_dia WHERE nin_id = p_nin_id AND snd_fecha = p_fecha;
+  INSERT INTO sintomas_nino_dia (nin_id, snd_fecha, snd_categorias, snd_grado_max, snd_eventos)
+  SELECT nin_id, sin_fecha, BIT_OR(sin_categoria), MAX(sin_grado), COUNT(*)
+  FROM sintomas
+  WHERE nin_id = p_nin_id AND sin_fecha = p_fecha
+  GROUP BY nin_id, sin_fecha;
+
+  DELETE FROM sintomas_episodios WHERE nin_id = p_nin_id AND sep_categoria = p_categoria;
+  INSERT INTO sintomas_episodios (nin_id, sep_categoria, sep_inicio, sep_fin, sep_dias, sep_grado_max)
+  SELECT p_nin_id, p_categoria, MIN(sin_fecha), MAX(sin_fecha), COUNT(*), MAX(grado)
+  FROM (
+    SELECT sin_fecha, grado, SUM(nuevo) OVER (ORDER BY sin_fecha) AS episodio
+    FROM (
+      SELECT sin_fecha, MAX(sin_grado) AS grado,
+             COALESCE(DATEDIFF(sin_fecha, LAG(sin_fecha) OVER (ORDER BY sin_fecha)) > 2, 1) AS nuevo
+      FROM sintomas
+      WHERE nin_id = p_nin_id AND sin_categoria = p_categoria
+      GROUP BY sin_fecha
+    ) d
+  ) e
+  GROUP BY episodio;
+END;
+
+create
+    definer = root@`%` procedure sp_sintomas_registrar(IN p_nin_id bigint unsigned, IN p_fecha date,
+                                                       IN p_tipo varchar(120), IN p_grado tinyint unsigned,
+                                                       IN p_notas text)
+BEGIN
+  INSERT INTO sintomas (nin_id, sin_fecha, sin_tipo, sin_grado, sin_notas)
+  VALUES (p_nin_id, p_fecha, p_tipo, p_grado, p_notas);
+
+  SELECT sin_id, nin_id, sin_fecha, sin_tipo, sin_categoria, sin_grado, sin_notas, creado_en
+  FROM sintomas
+  WHERE sin_id = LAST_INSERT_ID();
+END;
+
+create
+    definer = root@`%` procedure sp_sintomas_listar(IN p_nin_id bigint unsigned, IN p_desde date)
+BEGIN
+  SELECT sin_id, nin_id, sin_fecha, sin_tipo, sin_categoria, sin_grado, sin_notas, creado_en
+  FROM sintomas
+  WHERE nin_id = p_nin_id AND (p_desde IS NULL OR sin_fecha >= p_desde)
+  ORDER BY sin_fecha DESC, sin_id DESC;
+END;
+
+create
+    definer = root@`%` procedure sp_sintomas_eliminar(IN p_nin_id bigint unsigned, IN p_sin_id bigint unsigned)
+BEGIN
+  DELETE FROM sintomas WHERE sin_id = p_sin_id AND nin_id = p_nin_id;
+  SELECT ROW_COUNT() AS filas_afectadas;
+END;
+
+create
+    definer = root@`%` procedure sp_sintomas_resumen_nino(IN p_nin_id bigint unsigned, IN p_desde date)
+BEGIN
+  -- Episodios por categoría que siguen activos en la ventana (terminan en p_desde o después)
+  SELECT sep_categoria AS categoria,
+         COUNT(*) AS episodios,
+         SUM(sep_dias) AS dias,
+         MAX(sep_grado_max) AS grado_max,
+         MAX(sep_fin) AS ultima_fecha
+  FROM sintomas_episodios
+  WHERE nin_id = p_nin_id AND sep_fin >= p_desde
+  GROUP BY sep_categoria
+  ORDER BY sep_categoria;
+END;
+
+create
+    definer = root@`%` procedure sp_sintomas_serie(IN p_desde date)
+BEGIN
+  -- Serie diaria de toda la población, ordenada para los joins por fecha en NumPy
+  SELECT nin_id, snd_fecha, snd_categorias, snd_grado_max, snd_eventos
+  FROM sintomas_nino_dia
+  WHERE p_desde IS NULL OR snd_fecha >= p_desde
+  ORDER BY nin_id, snd_fecha;
+END;
+
+create
+    definer = root@`%` procedure sp_adherencia_serie(IN p_desde date)
+BEGIN
+  SELECT nin_id, adn_fecha, adn_ok, adn_parcial, adn_no
+  FROM adherencias_nino_dia
+  WHERE p_desde IS NULL OR adn_fecha >= p_desde
+  ORDER BY nin_id, adn_fecha;
+END;
+
+create
+    definer = root@`%` procedure sp_antropometria_serie(IN p_desde date)
+BEGIN
+  SELECT nin_id, ant_fecha, ant_peso_kg, ant_talla_cm, ant_z_imc, ant_z_peso_edad, ant_z_talla_edad
+  FROM antropometrias
+  WHERE p_desde IS NULL OR ant_fecha >= p_desde
+  ORDER BY nin_id, ant_fecha;
+END;
+
+create
+    definer = root@`%` procedure sp_notificaciones_reclamar(IN p_worker varchar(100), IN p_max_grupos int unsigned)
+BEGIN
+  -- Reserva las notificaciones PENDIENTE de hasta p_max_grupos grupos (usuario,
+  -- tipo) cuya ventana ya venció (rango sobre idx_not_pendientes). Las filas del
+  -- grupo que llegaron después viajan en el mismo digest. FOR UPDATE SKIP LOCKED
+  -- como en sp_trabajos_reservar; el llamador debe hacer COMMIT.
+  DECLARE v_id BIGINT UNSIGNED;
+  DECLARE v_fin INT DEFAULT 0;
+  DECLARE cur CURSOR FOR
+    SELECT n.not_id
+    FROM tmp_notificaciones_grupos g
+    JOIN notificaciones n ON n.usr_id = g.usr_id AND n.not_tipo = g.not_tipo
+    WHERE n.not_estado = 'PENDIENTE'
+    FOR UPDATE SKIP LOCKED;
+  DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_fin = 1;
+
+  DROP TEMPORARY TABLE IF EXISTS tmp_notificaciones_grupos;
+  CREATE TEMPORARY TABLE tmp_notificaciones_grupos (
+    usr_id BIGINT UNSIGNED NOT NULL,
+    not_tipo VARCHAR(60) NOT NULL,
+    PRIMARY KEY (usr_id, not_tipo)
+  ) ENGINE=MEMORY;
+  DROP TEMPORARY TABLE IF EXISTS tmp_notificaciones_reservadas;
+  CREATE TEMPORARY TABLE tmp_notificaciones_reservadas (not_id BIGINT UNSIGNED PRIMARY KEY) ENGINE=MEMORY;
+
+  INSERT INTO tmp_notificaciones_grupos (usr_id, not_tipo)
+  SELECT usr_id, not_tipo
+  FROM notificaciones
+  WHERE not_estado = 'PENDIENTE' AND not_disponible_en <= UTC_TIMESTAMP()
+  GROUP BY usr_id, not_tipo
+  ORDER BY MIN(not_disponible_en)
+  LIMIT p_max_grupos;
+
+  OPEN cur;
+  leer: LOOP
+    FETCH cur INTO v_id;
+    IF v_fin = 1 THEN
+      LEAVE leer;
+    END IF;
+    INSERT INTO tmp_notificaciones_reservadas (not_id) VALUES (v_id);
+  END LOOP;
+  CLOSE cur;
+
+  UPDATE notificaciones n
+  JOIN tmp_notificaciones_reservadas r ON r.not_id = n.not_id
+  SET n.not_estado = 'ENVIANDO',
+      n.not_intentos = n.not_intentos + 1,
+      n.not_bloqueado_por = p_worker,
+      n.not_bloqueado_en = UTC_TIMESTAMP();
+
+  SELECT n.not_id, n.usr_id, u.usr_correo, u.usr_nombre, n.not_tipo, n.not_payload, n.not_intentos, n.creado_en
+  FROM notificaciones n
+  JOIN tmp_notificaciones_reservadas r ON r.not_id = n.not_id
+  JOIN usuarios u ON u.usr_id = n.usr_id
+  ORDER BY n.usr_id, n.not_tipo, n.not_id;
+
+  DROP TEMPORARY TABLE tmp_notificaciones_reservadas;
+  DROP TEMPORARY TABLE tmp_notificaciones_grupos;
+END;
+
+create
+    definer = root@`%` procedure sp_notificaciones_finalizar(IN p_worker varchar(100), IN p_resultados json,
+                                                             IN p_max_intentos smallint unsigned,
+                                                             IN p_backoff_base int unsigned,
+                                                             IN p_backoff_max int unsigned)
+BEGIN
+  -- Resultado de un ciclo de envío en un solo UPDATE:
+  -- p_resultados = [{"id": not_id, "ok": 1|0, "error": "..."}]. Las fallidas se
+  -- reprograman con backoff exponencial o quedan FALLADO al agotar los intentos.
+  -- Solo se tocan las filas que p_worker sigue teniendo reservadas: si la reserva
+  -- expiró y otro proceso la tomó, ese proceso registra su propio resultado.
+  UPDATE notificaciones n
+  JOIN JSON_TABLE(
+    p_resultados, '$[*]' COLUMNS (
+      not_id BIGINT UNSIGNED PATH '$.id',
+      ok     TINYINT PATH '$.ok',
+      error  VARCHAR(500) PATH '$.error'
+    )
+  ) r ON r.not_id = n.not_id
+  SET n.not_estado = CASE
+        WHEN r.ok THEN 'ENVIADO'
+        WHEN n.not_intentos >= p_max_intentos THEN 'FALLADO'
+        ELSE 'PENDIENTE'
+      END,
+      n.not_enviado_en = IF(r.ok, UTC_TIMESTAMP(), n.not_enviado_en),
+      n.not_disponible_en = IF(r.ok, n.not_disponible_en,
+                               UTC_TIMESTAMP() + INTERVAL LEAST(p_backoff_base * POW(2, n.not_intentos - 1),
+                                                                p_backoff_max) SECOND),
+      n.not_error = IF(r.ok, NULL, r.error),
+      n.not_bloqueado_por = NULL,
+      n.not_bloqueado_en = NULL
+  WHERE n.not_estado = 'ENVIANDO'
+    AND n.not_bloqueado_por = p_worker;
+
+  SELECT ROW_COUNT() AS filas_afectadas;
+END;
+
+create
+    definer = root@`%` procedure sp_notificaciones_recuperar_expiradas(IN p_timeout_seg int unsigned)
+BEGIN
+  -- Notificaciones ENVIANDO de un proceso que murió vuelven a la cola
+  UPDATE notificaciones
+  SET not_estado = 'PENDIENTE',
+      not_error = 'Reservada sin finalizar (timeout)',
+      not_bloqueado_por = NULL,
+      not_bloqueado_en = NULL
+  WHERE not_estado = 'ENVIANDO'
+    AND not_bloqueado_en < UTC_TIMESTAMP() - INTERVAL p_timeout_seg SECOND;
+
+  SELECT ROW_COUNT() AS recuperadas;
+END;
+
+create
+    definer = root@`%` procedure sp_ninos_mediciones_vencidas(IN p_dias int unsigned)
+BEGIN
+  -- Tutor y propietario de cada niño sin medición en los últimos p_dias días
+  SELECT d.usr_id, n.nin_id, n.nin_nombres, ua.ultima_fecha
+  FROM ninos n
+  LEFT JOIN (
+    SELECT nin_id, MAX(ant_fecha) AS ultima_fecha
+    FROM antropometrias
+    GROUP BY nin_id
+  ) ua ON ua.nin_id = n.nin_id
+  JOIN (
+    SELECT nin_id, usr_id_tutor AS usr_id FROM ninos
+    UNION
+    SELECT nin_id, usr_id_propietario FROM ninos WHERE usr_id_propietario IS NOT NULL
+  ) d ON d.nin_id = n.nin_id
+  WHERE ua.ultima_fecha IS NULL OR ua.ultima_fecha < CURDATE() - INTERVAL p_dias DAY
+  ORDER BY d.usr_id, n.nin_id;
+END;
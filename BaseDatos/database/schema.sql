@@ -523,5 +523,263 @@ ALTER TABLE evaluaciones_nutricionales
   ADD COLUMN en_imc DECIMAL(5,2) NULL COMMENT 'IMC calculado' AFTER en_edad_meses,
   ADD COLUMN en_percentil_imc DECIMAL(5,2) NULL COMMENT 'Percentil calculado' AFTER en_z_score_imc;
 
+-- ============================================================================
+-- TOKENS REVOCADOS (LOGOUT)
+-- ============================================================================
+CREATE TABLE tokens_revocados (
+  tr_jti        VARCHAR(64)  PRIMARY KEY,
+  tr_usuario    VARCHAR(150) NOT NULL,
+  tr_expira_en  DATETIME     NOT NULL COMMENT 'exp del token (UTC)',
+  creado_en     DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  KEY idx_tr_creado (creado_en),
+  KEY idx_tr_expira (tr_expira_en)
+) ENGINE=InnoDB;
+
+-- ============================================================================
+-- VERSIÓN DE DATOS POR TUTOR (ETag de /children)
+-- ============================================================================
+CREATE TABLE versiones_tutor (
+  usr_id         BIGINT UNSIGNED PRIMARY KEY,
+  vt_version     BIGINT UNSIGNED NOT NULL DEFAULT 1,
+  actualizado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_vt_usuario FOREIGN KEY (usr_id) REFERENCES usuarios(usr_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- ============================================================================
+-- COLA DE TRABAJOS EN SEGUNDO PLANO
+-- ============================================================================
+CREATE TABLE trabajos (
+  tra_id            BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+  tra_tipo          VARCHAR(60)  NOT NULL,
+  tra_payload       JSON         NOT NULL,
+  tra_estado        ENUM('PENDIENTE','EN_PROCESO','COMPLETADO','FALLADO') NOT NULL DEFAULT 'PENDIENTE',
+  tra_clave_unica   VARCHAR(120) NULL COMMENT 'Deduplicación mientras está PENDIENTE',
+  tra_intentos      SMALLINT UNSIGNED NOT NULL DEFAULT 0,
+  tra_max_intentos  SMALLINT UNSIGNED NOT NULL DEFAULT 5,
+  tra_disponible_en DATETIME     NOT NULL COMMENT 'UTC; backoff entre reintentos',
+  tra_bloqueado_por VARCHAR(100) NULL,
+  tra_bloqueado_en  DATETIME     NULL COMMENT 'UTC',
+  tra_error         TEXT         NULL,
+  creado_en         DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  actualizado_en    DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  UNIQUE KEY uk_tra_clave (tra_clave_unica),
+  KEY idx_tra_cola (tra_estado, tra_disponible_en),
+  KEY idx_tra_bloqueo (tra_estado, tra_bloqueado_en)
+) ENGINE=InnoDB;
+
+-- ============================================================================
+-- PUNTAJES DE RIESGO POR LOTE (ejecuciones y versión del modelo)
+-- ============================================================================
+CREATE TABLE puntajes_riesgo_ejecuciones (
+  rej_id            BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+  rej_version       VARCHAR(32)  NOT NULL COMMENT 'Versión del modelo (pri_version)',
+  rej_modo          ENUM('COMPLETO','INCREMENTAL') NOT NULL,
+  rej_estado        ENUM('EN_PROCESO','COMPLETADO','FALLADO') NOT NULL DEFAULT 'EN_PROCESO',
+  rej_desde         DATETIME     NULL COMMENT 'Marca de agua: cambios desde el inicio de la última corrida completada',
+  rej_iniciado_en   DATETIME     NOT NULL,
+  rej_finalizado_en DATETIME     NULL,
+  rej_puntuados     INT UNSIGNED NOT NULL DEFAULT 0,
+  rej_error         TEXT         NULL,
+  KEY idx_rej_version (rej_version, rej_estado, rej_iniciado_en)
+) ENGINE=InnoDB;
+
+ALTER TABLE puntajes_riesgo
+  ADD COLUMN rej_id BIGINT UNSIGNED NULL AFTER pri_caracteristicas,
+  ADD KEY idx_pri_nino_version (nin_id, pri_version, pri_fecha_hora),
+  ADD CONSTRAINT fk_pri_ejecucion FOREIGN KEY (rej_id) REFERENCES puntajes_riesgo_ejecuciones(rej_id) ON DELETE SET NULL;
+
+-- Para detectar bajas/cambios de severidad en el modo incremental
+ALTER TABLE ninos_alergias
+  ADD COLUMN actualizado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER creado_en;
+
+-- ============================================================================
+-- ALÉRGENOS POR ALIMENTO Y NUTRIENTES BASE (generador de menús)
+-- ============================================================================
+CREATE TABLE alimentos_alergias (
+  ali_id      INT UNSIGNED NOT NULL,
+  ta_id       SMALLINT UNSIGNED NOT NULL,
+  creado_en   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (ali_id, ta_id),
+  KEY idx_aa_tipo (ta_id),
+  CONSTRAINT fk_aa_alimento FOREIGN KEY (ali_id) REFERENCES alimentos(ali_id) ON DELETE CASCADE,
+  CONSTRAINT fk_aa_tipo FOREIGN KEY (ta_id) REFERENCES tipos_alergias(ta_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE INDEX idx_dis_periodo ON disponibilidad_alimentos (dis_periodo, ali_id);
+
+-- Seeds de nutrientes (idempotentes); an_cantidad_100 se expresa por 100 g/ml
+INSERT INTO nutrientes (nutri_codigo, nutri_nombre, nutri_unidad) VALUES
+('ENERGIA_KCAL', 'Energía', 'kcal'),
+('PROTEINA_G', 'Proteínas', 'g'),
+('GRASA_G', 'Grasas totales', 'g'),
+('CARBOHIDRATOS_G', 'Carbohidratos', 'g'),
+('HIERRO_MG', 'Hierro', 'mg'),
+('CALCIO_MG', 'Calcio', 'mg'),
+('ZINC_MG', 'Zinc', 'mg'),
+('VITAMINA_A_UG', 'Vitamina A (ER)', 'µg')
+ON DUPLICATE KEY UPDATE nutri_nombre = VALUES(nutri_nombre), nutri_unidad = VALUES(nutri_unidad);
+
+-- ============================================================================
+-- ÍNDICE DE ALÉRGENOS (máscaras de bits)
+-- ============================================================================
+-- Cada tipo de alergia tiene una posición de bit estable (0-63; no se reutiliza).
+-- Niños, alimentos y recetas guardan el OR de los bits de sus alergias/alérgenos;
+-- los triggers de ninos_alergias, alimentos_alergias y recetas_ingredientes los
+-- mantienen al día.
+ALTER TABLE tipos_alergias
+  ADD COLUMN ta_bit TINYINT UNSIGNED NULL AFTER ta_categoria,
+  ADD UNIQUE KEY uk_ta_bit (ta_bit);
+
+UPDATE tipos_alergias t
+JOIN (
+  SELECT ta_id, ROW_NUMBER() OVER (ORDER BY ta_id) - 1 AS bit
+  FROM tipos_alergias
+) b ON b.ta_id = t.ta_id
+SET t.ta_bit = b.bit
+WHERE t.ta_bit IS NULL AND b.bit < 64;
+
+ALTER TABLE ninos
+  ADD COLUMN nin_mascara_alergias BIGINT UNSIGNED NOT NULL DEFAULT 0;
+
+ALTER TABLE alimentos
+  ADD COLUMN ali_mascara_alergenos BIGINT UNSIGNED NOT NULL DEFAULT 0;
+
+ALTER TABLE recetas
+  ADD COLUMN rec_mascara_alergenos BIGINT UNSIGNED NOT NULL DEFAULT 0;
 
+CREATE INDEX idx_ninos_actualizado ON ninos (actualizado_en);
+CREATE INDEX idx_alimentos_actualizado ON alimentos (actualizado_en);
+CREATE INDEX idx_recetas_actualizado ON recetas (actualizado_en);
 
+-- ============================================================================
+-- VERSIÓN DE CATÁLOGOS (recarga de cachés en memoria)
+-- ============================================================================
+-- Los triggers de alimentos, nutrientes, alimentos_nutrientes y
+-- disponibilidad_alimentos incrementan la versión de 'ALIMENTOS'; la API la
+-- consulta periódicamente y recarga su catálogo columnar solo si cambió.
+CREATE TABLE versiones_catalogo (
+  vc_catalogo    VARCHAR(40) PRIMARY KEY,
+  vc_version     BIGINT UNSIGNED NOT NULL DEFAULT 1,
+  actualizado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB;
+
+INSERT INTO versiones_catalogo (vc_catalogo) VALUES ('ALIMENTOS')
+ON DUPLICATE KEY UPDATE vc_catalogo = vc_catalogo;
+
+-- ============================================================================
+-- INGESTA DE ADHERENCIA (write-behind) Y RESÚMENES INCREMENTALES
+-- ============================================================================
+-- adh_evento_id lo genera el cliente (o la API); permite reenviar un lote o
+-- reproducir el log local tras una caída con INSERT IGNORE sin duplicar.
+-- adh_registrado_en va en hora local del servidor, como su DEFAULT, los
+-- triggers (DATE(adh_registrado_en)) y sp_riesgo_caracteristicas (NOW()).
+ALTER TABLE adherencias
+  ADD COLUMN adh_evento_id VARCHAR(64) NULL AFTER adh_id,
+  ADD UNIQUE KEY uk_adh_evento (adh_evento_id),
+  ADD KEY idx_adh_nino_fecha (nin_id, adh_registrado_en);
+
+-- Conteos por niño y día, y por menú, mantenidos por los triggers de adherencias.
+-- Las tasas de adherencia se leen de aquí sin recorrer la tabla de eventos.
+CREATE TABLE adherencias_nino_dia (
+  nin_id        BIGINT UNSIGNED NOT NULL,
+  adn_fecha     DATE NOT NULL,
+  adn_ok        INT NOT NULL DEFAULT 0,
+  adn_parcial   INT NOT NULL DEFAULT 0,
+  adn_no        INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (nin_id, adn_fecha),
+  CONSTRAINT fk_adn_nino FOREIGN KEY (nin_id) REFERENCES ninos(nin_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE adherencias_menu (
+  men_id        BIGINT UNSIGNED PRIMARY KEY,
+  adm_ok        INT NOT NULL DEFAULT 0,
+  adm_parcial   INT NOT NULL DEFAULT 0,
+  adm_no        INT NOT NULL DEFAULT 0,
+  actualizado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT fk_adm_menu FOREIGN KEY (men_id) REFERENCES menus(men_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Resúmenes de los eventos ya existentes
+INSERT INTO adherencias_nino_dia (nin_id, adn_fecha, adn_ok, adn_parcial, adn_no)
+SELECT nin_id, DATE(adh_registrado_en),
+       SUM(adh_estado = 'OK'), SUM(adh_estado = 'PARCIAL'), SUM(adh_estado = 'NO')
+FROM adherencias
+GROUP BY nin_id, DATE(adh_registrado_en)
+ON DUPLICATE KEY UPDATE adn_ok = VALUES(adn_ok), adn_parcial = VALUES(adn_parcial), adn_no = VALUES(adn_no);
+
+INSERT INTO adherencias_menu (men_id, adm_ok, adm_parcial, adm_no)
+SELECT men_id, SUM(adh_estado = 'OK'), SUM(adh_estado = 'PARCIAL'), SUM(adh_estado = 'NO')
+FROM adherencias
+WHERE men_id IS NOT NULL
+GROUP BY men_id
+ON DUPLICATE KEY UPDATE adm_ok = VALUES(adm_ok), adm_parcial = VALUES(adm_parcial), adm_no = VALUES(adm_no);
+
+-- ============================================================================
+-- AUDITORÍA: consulta por entidad
+-- ============================================================================
+-- La API escribe eventos_auditoria en lotes desde una cola en memoria;
+-- eau_fecha_hora es el momento (hora local del servidor) en que se capturó el evento, no el del INSERT.
+CREATE INDEX idx_eau_entidad ON eventos_auditoria (eau_entidad, eau_entidad_id, eau_fecha_hora);
+
+-- ============================================================================
+-- SÍNTOMAS: serie diaria y episodios
+-- ============================================================================
+-- sin_categoria es el bit de fn_sintoma_categoria (lo asignan los triggers).
+-- sintomas_nino_dia guarda la serie compacta (una fila por niño y día con la
+-- máscara de categorías) y sintomas_episodios los episodios por categoría: un
+-- episodio termina tras 2 días seguidos sin el síntoma. Ambas las mantienen
+-- los triggers de sintomas, así que "episodios de diarrea en las últimas 2
+-- semanas" es una lectura por índice.
+ALTER TABLE sintomas
+  ADD COLUMN sin_categoria TINYINT UNSIGNED NOT NULL DEFAULT 128 AFTER sin_tipo,
+  ADD INDEX idx_sintomas_nino_fecha (nin_id, sin_fecha),
+  ADD INDEX idx_sintomas_nino_categoria (nin_id, sin_categoria, sin_fecha);
+
+CREATE TABLE sintomas_nino_dia (
+  nin_id         BIGINT UNSIGNED NOT NULL,
+  snd_fecha      DATE NOT NULL,
+  snd_categorias TINYINT UNSIGNED NOT NULL,
+  snd_grado_max  TINYINT UNSIGNED NULL,
+  snd_eventos    SMALLINT UNSIGNED NOT NULL,
+  PRIMARY KEY (nin_id, snd_fecha),
+  KEY idx_snd_fecha (snd_fecha),
+  CONSTRAINT fk_snd_nino FOREIGN KEY (nin_id) REFERENCES ninos(nin_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE sintomas_episodios (
+  sep_id         BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+  nin_id         BIGINT UNSIGNED NOT NULL,
+  sep_categoria  TINYINT UNSIGNED NOT NULL,
+  sep_inicio     DATE NOT NULL,
+  sep_fin        DATE NOT NULL,
+  sep_dias       SMALLINT UNSIGNED NOT NULL,
+  sep_grado_max  TINYINT UNSIGNED NULL,
+  KEY idx_sep_nino (nin_id, sep_categoria, sep_fin),
+  KEY idx_sep_categoria_fin (sep_categoria, sep_fin),
+  CONSTRAINT fk_sep_nino FOREIGN KEY (nin_id) REFERENCES ninos(nin_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- ============================================================================
+-- NOTIFICACIONES: agrupación en digests y envío por lotes
+-- ============================================================================
+-- Cada evento sigue siendo una fila, pero se entrega agrupado: el motor reserva
+-- por (usuario, tipo) cuando la primera fila pendiente cumple su ventana
+-- (not_disponible_en, UTC) y envía un solo digest con todas las del grupo.
+-- not_clave evita repetir el mismo aviso (p. ej. la misma medición vencida).
+ALTER TABLE notificaciones
+  MODIFY not_estado ENUM('PENDIENTE','ENVIANDO','ENVIADO','FALLADO') NOT NULL DEFAULT 'PENDIENTE',
+  ADD COLUMN not_clave         VARCHAR(120) NULL AFTER not_payload,
+  ADD COLUMN not_disponible_en DATETIME NULL COMMENT 'UTC; fin de la ventana de agrupación o backoff' AFTER not_estado,
+  ADD COLUMN not_intentos      SMALLINT UNSIGNED NOT NULL DEFAULT 0 AFTER not_disponible_en,
+  ADD COLUMN not_bloqueado_por VARCHAR(100) NULL AFTER not_intentos,
+  ADD COLUMN not_bloqueado_en  DATETIME NULL COMMENT 'UTC' AFTER not_bloqueado_por,
+  ADD COLUMN not_error         VARCHAR(500) NULL AFTER not_bloqueado_en;
+
+UPDATE notificaciones SET not_disponible_en = UTC_TIMESTAMP() WHERE not_disponible_en IS NULL;
+
+ALTER TABLE notificaciones
+  MODIFY not_disponible_en DATETIME NOT NULL COMMENT 'UTC; fin de la ventana de agrupación o backoff',
+  ADD UNIQUE KEY uk_not_usuario_clave (usr_id, not_clave),
+  ADD INDEX idx_not_pendientes (not_estado, not_disponible_en),
+  ADD INDEX idx_not_grupo (usr_id, not_tipo, not_estado),
+  ADD INDEX idx_not_bloqueo (not_estado, not_bloqueado_en);
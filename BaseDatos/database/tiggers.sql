@@ -0,0 +1,527 @@
+-- ============================================================================
+-- VERSIÓN DE DATOS POR TUTOR
+-- Cualquier escritura en ninos, antropometrias, ninos_alergias o
+-- evaluaciones_nutricionales (también las del worker `evaluacion.recalcular`)
+-- incrementa versiones_tutor del tutor (y del propietario) afectado. También los
+-- cambios en los datos de la entidad y del tipo de alergia que muestra
+-- GET /children y en usuarios.usr_activo (sp_ninos_obtener_por_tutor filtra por
+-- él). La API la usa como ETag de GET /children para responder 304 sin ejecutar
+-- los procedimientos: cada tabla que lee esa respuesta debe tener su trigger aquí.
+-- ============================================================================
+
+create
+    definer = root@`%` trigger trg_ninos_ai_version
+    after insert
+    on ninos
+    for each row
+BEGIN
+  CALL sp_version_tutor_incrementar(NEW.usr_id_tutor);
+  CALL sp_version_tutor_incrementar(NEW.usr_id_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_au_version
+    after update
+    on ninos
+    for each row
+BEGIN
+  CALL sp_version_tutor_incrementar(NEW.usr_id_tutor);
+  CALL sp_version_tutor_incrementar(NEW.usr_id_propietario);
+  IF NOT (OLD.usr_id_tutor <=> NEW.usr_id_tutor) THEN
+    CALL sp_version_tutor_incrementar(OLD.usr_id_tutor);
+  END IF;
+  IF NOT (OLD.usr_id_propietario <=> NEW.usr_id_propietario) THEN
+    CALL sp_version_tutor_incrementar(OLD.usr_id_propietario);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_ad_version
+    after delete
+    on ninos
+    for each row
+BEGIN
+  -- Cubre también el ON DELETE CASCADE de antropometrias/ninos_alergias,
+  -- que no dispara sus propios triggers.
+  CALL sp_version_tutor_incrementar(OLD.usr_id_tutor);
+  CALL sp_version_tutor_incrementar(OLD.usr_id_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_antropometrias_ai_version
+    after insert
+    on antropometrias
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = NEW.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_antropometrias_au_version
+    after update
+    on antropometrias
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = NEW.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_antropometrias_ad_version
+    after delete
+    on antropometrias
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = OLD.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_alergias_ai_version
+    after insert
+    on ninos_alergias
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = NEW.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_alergias_au_version
+    after update
+    on ninos_alergias
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = NEW.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_alergias_ad_version
+    after delete
+    on ninos_alergias
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = OLD.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_evaluaciones_nutricionales_ai_version
+    after insert
+    on evaluaciones_nutricionales
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = NEW.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_evaluaciones_nutricionales_au_version
+    after update
+    on evaluaciones_nutricionales
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = NEW.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_evaluaciones_nutricionales_ad_version
+    after delete
+    on evaluaciones_nutricionales
+    for each row
+BEGIN
+  DECLARE v_tutor BIGINT UNSIGNED;
+  DECLARE v_propietario BIGINT UNSIGNED;
+  SELECT usr_id_tutor, usr_id_propietario INTO v_tutor, v_propietario
+  FROM ninos WHERE nin_id = OLD.nin_id;
+  CALL sp_version_tutor_incrementar(v_tutor);
+  CALL sp_version_tutor_incrementar(v_propietario);
+END;
+
+create
+    definer = root@`%` trigger trg_tipos_alergias_au_version
+    after update
+    on tipos_alergias
+    for each row
+BEGIN
+  -- Sin trigger de borrado: fk_na_tipo (RESTRICT) impide borrar un tipo en uso
+  IF NOT (OLD.ta_codigo <=> NEW.ta_codigo AND OLD.ta_nombre <=> NEW.ta_nombre
+          AND OLD.ta_categoria <=> NEW.ta_categoria) THEN
+    CALL sp_version_alergia_incrementar(NEW.ta_id);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_entidades_au_version
+    after update
+    on entidades
+    for each row
+BEGIN
+  IF NOT (OLD.ent_nombre <=> NEW.ent_nombre AND OLD.ent_codigo <=> NEW.ent_codigo
+          AND OLD.ent_direccion <=> NEW.ent_direccion AND OLD.ent_departamento <=> NEW.ent_departamento
+          AND OLD.ent_provincia <=> NEW.ent_provincia AND OLD.ent_distrito <=> NEW.ent_distrito) THEN
+    CALL sp_version_entidad_incrementar(NEW.ent_id);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_entidades_bd_version
+    before delete
+    on entidades
+    for each row
+BEGIN
+  -- Antes del borrado: el ON DELETE SET NULL de ninos.ent_id no dispara triggers
+  -- y después ya no se sabría qué niños eran de la entidad.
+  CALL sp_version_entidad_incrementar(OLD.ent_id);
+END;
+
+create
+    definer = root@`%` trigger trg_usuarios_au_version
+    after update
+    on usuarios
+    for each row
+BEGIN
+  IF NOT (OLD.usr_activo <=> NEW.usr_activo) THEN
+    CALL sp_version_tutor_incrementar(NEW.usr_id);
+  END IF;
+END;
+
+-- ============================================================================
+-- Índice de alérgenos: bit estable por tipo y máscaras de niños, alimentos y
+-- recetas recalculadas en cada cambio.
+-- ============================================================================
+create
+    definer = root@`%` trigger trg_tipos_alergias_bi_bit
+    before insert
+    on tipos_alergias
+    for each row
+BEGIN
+  DECLARE v_bit SMALLINT UNSIGNED;
+  IF NEW.ta_bit IS NULL THEN
+    SELECT COALESCE(MAX(ta_bit) + 1, 0) INTO v_bit FROM tipos_alergias;
+    -- Más de 64 tipos: el nuevo tipo queda fuera del índice de máscaras
+    SET NEW.ta_bit = IF(v_bit < 64, v_bit, NULL);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_alergias_ai_mascara
+    after insert
+    on ninos_alergias
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_nino(NEW.nin_id);
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_alergias_au_mascara
+    after update
+    on ninos_alergias
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_nino(NEW.nin_id);
+  IF OLD.nin_id <> NEW.nin_id THEN
+    CALL sp_alergenos_recalcular_nino(OLD.nin_id);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_ninos_alergias_ad_mascara
+    after delete
+    on ninos_alergias
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_nino(OLD.nin_id);
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_alergias_ai_mascara
+    after insert
+    on alimentos_alergias
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_alimento(NEW.ali_id);
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_alergias_ad_mascara
+    after delete
+    on alimentos_alergias
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_alimento(OLD.ali_id);
+END;
+
+create
+    definer = root@`%` trigger trg_recetas_ingredientes_ai_mascara
+    after insert
+    on recetas_ingredientes
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_receta(NEW.rec_id);
+END;
+
+create
+    definer = root@`%` trigger trg_recetas_ingredientes_au_mascara
+    after update
+    on recetas_ingredientes
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_receta(NEW.rec_id);
+  IF OLD.rec_id <> NEW.rec_id THEN
+    CALL sp_alergenos_recalcular_receta(OLD.rec_id);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_recetas_ingredientes_ad_mascara
+    after delete
+    on recetas_ingredientes
+    for each row
+BEGIN
+  CALL sp_alergenos_recalcular_receta(OLD.rec_id);
+END;
+
+-- ============================================================================
+-- VERSIÓN DEL CATÁLOGO DE ALIMENTOS
+-- Cualquier escritura en alimentos, nutrientes, alimentos_nutrientes o
+-- disponibilidad_alimentos incrementa versiones_catalogo('ALIMENTOS'); la API
+-- recarga su catálogo columnar en memoria cuando la versión cambia.
+-- ============================================================================
+
+create
+    definer = root@`%` trigger trg_alimentos_ai_version
+    after insert
+    on alimentos
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_au_version
+    after update
+    on alimentos
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_ad_version
+    after delete
+    on alimentos
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_nutrientes_ai_version
+    after insert
+    on nutrientes
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_nutrientes_au_version
+    after update
+    on nutrientes
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_nutrientes_ad_version
+    after delete
+    on nutrientes
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_nutrientes_ai_version
+    after insert
+    on alimentos_nutrientes
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_nutrientes_au_version
+    after update
+    on alimentos_nutrientes
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_alimentos_nutrientes_ad_version
+    after delete
+    on alimentos_nutrientes
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_disponibilidad_alimentos_ai_version
+    after insert
+    on disponibilidad_alimentos
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_disponibilidad_alimentos_au_version
+    after update
+    on disponibilidad_alimentos
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+create
+    definer = root@`%` trigger trg_disponibilidad_alimentos_ad_version
+    after delete
+    on disponibilidad_alimentos
+    for each row
+BEGIN
+  CALL sp_version_catalogo_incrementar('ALIMENTOS');
+END;
+
+-- ============================================================================
+-- RESÚMENES DE ADHERENCIA
+-- Cada evento insertado, corregido o eliminado en adherencias actualiza los
+-- conteos de adherencias_nino_dia y adherencias_menu. Con INSERT IGNORE los
+-- eventos duplicados no disparan el trigger y no se cuentan dos veces.
+-- ============================================================================
+
+create
+    definer = root@`%` trigger trg_adherencias_ai_resumen
+    after insert
+    on adherencias
+    for each row
+BEGIN
+  CALL sp_adherencia_resumen_aplicar(NEW.nin_id, NEW.men_id, DATE(NEW.adh_registrado_en), NEW.adh_estado, 1);
+END;
+
+create
+    definer = root@`%` trigger trg_adherencias_au_resumen
+    after update
+    on adherencias
+    for each row
+BEGIN
+  IF NOT (OLD.nin_id <=> NEW.nin_id AND OLD.men_id <=> NEW.men_id
+          AND OLD.adh_registrado_en <=> NEW.adh_registrado_en AND OLD.adh_estado <=> NEW.adh_estado) THEN
+    CALL sp_adherencia_resumen_aplicar(OLD.nin_id, OLD.men_id, DATE(OLD.adh_registrado_en), OLD.adh_estado, -1);
+    CALL sp_adherencia_resumen_aplicar(NEW.nin_id, NEW.men_id, DATE(NEW.adh_registrado_en), NEW.adh_estado, 1);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_adherencias_ad_resumen
+    after delete
+    on adherencias
+    for each row
+BEGIN
+  CALL sp_adherencia_resumen_aplicar(OLD.nin_id, OLD.men_id, DATE(OLD.adh_registrado_en), OLD.adh_estado, -1);
+END;
+
+-- ============================================================================
+-- SERIE DE SÍNTOMAS
+-- Cada síntoma se clasifica al escribirse (sin_categoria) y cada alta, cambio
+-- o baja rehace la fila del día en sintomas_nino_dia y los episodios de su
+-- categoría en sintomas_episodios.
+-- ============================================================================
+
+create
+    definer = root@`%` trigger trg_sintomas_bi_categoria
+    before insert
+    on sintomas
+    for each row
+BEGIN
+  SET NEW.sin_categoria = fn_sintoma_categoria(NEW.sin_tipo);
+END;
+
+create
+    definer = root@`%` trigger trg_sintomas_bu_categoria
+    before update
+    on sintomas
+    for each row
+BEGIN
+  SET NEW.sin_categoria = fn_sintoma_categoria(NEW.sin_tipo);
+END;
+
+create
+    definer = root@`%` trigger trg_sintomas_ai_serie
+    after insert
+    on sintomas
+    for each row
+BEGIN
+  CALL sp_sintomas_recalcular(NEW.nin_id, NEW.sin_fecha, NEW.sin_categoria);
+END;
+
+create
+    definer = root@`%` trigger trg_sintomas_au_serie
+    after update
+    on sintomas
+    for each row
+BEGIN
+  IF NOT (OLD.nin_id <=> NEW.nin_id AND OLD.sin_fecha <=> NEW.sin_fecha
+          AND OLD.sin_categoria <=> NEW.sin_categoria AND OLD.sin_grado <=> NEW.sin_grado) THEN
+    CALL sp_sintomas_recalcular(OLD.nin_id, OLD.sin_fecha, OLD.sin_categoria);
+    CALL sp_sintomas_recalcular(NEW.nin_id, NEW.sin_fecha, NEW.sin_categoria);
+  END IF;
+END;
+
+create
+    definer = root@`%` trigger trg_sintomas_ad_serie
+    after delete
+    on sintomas
+    for each row
+BEGIN
+  CALL sp_sintomas_recalcular(OLD.nin_id, OLD.sin_fecha, OLD.sin_categoria);
+END;
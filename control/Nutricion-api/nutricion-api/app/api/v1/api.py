@@ -2,6 +2,12 @@ from fastapi import APIRouter
 from .endpoints import auth, usuarios, ninos
 from .endpoints import ml as ml_endpoints
 from .endpoints import entidades as entidades_endpoints
+from .endpoints import export as export_endpoints
+from .endpoints import menus as menus_endpoints
+from .endpoints import alimentos as alimentos_endpoints
+from .endpoints import adherencias as adherencias_endpoints
+from .endpoints import auditoria as auditoria_endpoints
+from .endpoints import sintomas as sintomas_endpoints
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.infrastructure.db.session import get_db
@@ -38,3 +44,9 @@ def create_allergy_type(payload: dict, db: Session = Depends(get_db)):
 api_router.include_router(alergias_router, prefix="/alergias", tags=["alergias"])
 api_router.include_router(entidades_endpoints.router, prefix="/entidades", tags=["entidades"])
 api_router.include_router(ml_endpoints.router, prefix="/ml", tags=["ml"])
+api_router.include_router(export_endpoints.router, prefix="/export", tags=["export"])
+api_router.include_router(menus_endpoints.router, prefix="/menus", tags=["menus"])
+api_router.include_router(alimentos_endpoints.router, prefix="/alimentos", tags=["alimentos"])
+api_router.include_router(adherencias_endpoints.router, prefix="/adherencias", tags=["adherencias"])
+api_router.include_router(auditoria_endpoints.router, prefix="/auditoria", tags=["auditoria"])
+api_router.include_router(sintomas_endpoints.router, prefix="/sintomas", tags=["sintomas"])
@@ -0,0 +1,149 @@
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List, Union
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.application.adherencias_ingesta import IngestaSaturada, get_adherencia_ingestor, tasa_adherencia
+from app.application.services.auth_service import get_current_user
+from app.core.config import settings
+from app.infrastructure.db.session import get_db
+from app.infrastructure.repositories.adherencias_repo import AdherenciasRepository
+from app.infrastructure.repositories.ninos_repo import NinosRepository
+from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
+from app.schemas.adherencias import (
+    AdherenciaEvento, AdherenciaMenuResumenResponse, AdherenciaNinoResumenResponse,
+    AdherenciasAceptadasResponse,
+)
+from app.schemas.auth import UserResponse
+
+router = APIRouter()
+
+SEGUIMIENTO_ROLES = {"ADMIN", "SUPERADMIN", "NUTRI", "NUTRICIONISTA"}
+MAX_EVENTOS_POR_LOTE = 1000
+
+
+def _verificar_acceso(db: Session, current_user: UserResponse, nin_ids) -> None:
+    repo = NinosRepository(db)
+    role = None
+    for nin_id in nin_ids:
+        nino = repo.get_nino_by_id(nin_id)
+        if not nino:
+            raise HTTPException(status_code=404, detail=f"Niño {nin_id} no encontrado")
+        if current_user.usr_id in (nino.get("usr_id_tutor"), nino.get("usr_id_propietario")):
+            continue
+        if role is None:
+            role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+        if role not in SEGUIMIENTO_ROLES:
+            raise HTTPException(status_code=403, detail="No tienes permiso para registrar adherencia de este niño")
+
+
+def _verificar_menus(db: Session, eventos: List[AdherenciaEvento]) -> None:
+    """El menú y el ítem de cada evento deben existir y ser del mismo niño (y el ítem, de ese menú)."""
+    men_ids = {e.men_id for e in eventos if e.men_id is not None}
+    mei_ids = {e.mei_id for e in eventos if e.mei_id is not None}
+    if not men_ids and not mei_ids:
+        return
+    menus, items = AdherenciasRepository(db).propietarios_menus(men_ids, mei_ids)
+    for e in eventos:
+        if e.men_id is not None:
+            if e.men_id not in menus:
+                raise HTTPException(status_code=404, detail=f"Menú {e.men_id} no encontrado")
+            if menus[e.men_id] != e.nin_id:
+                raise HTTPException(status_code=422, detail=f"El menú {e.men_id} no es del niño {e.nin_id}")
+        if e.mei_id is not None:
+            if e.mei_id not in items:
+                raise HTTPException(status_code=404, detail=f"Ítem de menú {e.mei_id} no encontrado")
+            men_id, nin_id = items[e.mei_id]
+            if nin_id != e.nin_id or (e.men_id is not None and men_id != e.men_id):
+                raise HTTPException(
+                    status_code=422, detail=f"El ítem {e.mei_id} no es del menú {e.men_id} del niño {e.nin_id}"
+                )
+
+
+def _hora_local(valor: datetime) -> datetime:
+    """Hora local del servidor sin zona, como CURRENT_TIMESTAMP/NOW() y `date.today()` del resumen."""
+    return valor.astimezone().replace(tzinfo=None) if valor.tzinfo else valor
+
+
+@router.post("/", response_model=AdherenciasAceptadasResponse, status_code=status.HTTP_202_ACCEPTED)
+def registrar_adherencias(
+    eventos: Union[List[AdherenciaEvento], AdherenciaEvento] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Registrar uno o varios eventos de adherencia (OK/PARCIAL/NO por comida).
+
+    Se confirman en cuanto quedan en el log local; la escritura en MySQL se
+    hace por lotes en segundo plano, por lo que los resúmenes pueden tardar
+    unos cientos de milisegundos en reflejarlos. Reenviar el mismo `evento_id`
+    no duplica el registro.
+    """
+    if not isinstance(eventos, list):
+        eventos = [eventos]
+    if not eventos:
+        raise HTTPException(status_code=422, detail="Se requiere al menos un evento")
+    if len(eventos) > MAX_EVENTOS_POR_LOTE:
+        raise HTTPException(status_code=413, detail=f"Máximo {MAX_EVENTOS_POR_LOTE} eventos por lote")
+    _verificar_acceso(db, current_user, {e.nin_id for e in eventos})
+    _verificar_menus(db, eventos)
+
+    ahora = datetime.now()
+    filas = [
+        {
+            "evento_id": e.evento_id or str(uuid.uuid4()),
+            "nin_id": e.nin_id,
+            "men_id": e.men_id,
+            "mei_id": e.mei_id,
+            "registrado_en": _hora_local(e.registrado_en) if e.registrado_en else ahora,
+            "estado": e.estado.value,
+            "notas": e.notas,
+        }
+        for e in eventos
+    ]
+    try:
+        get_adherencia_ingestor().registrar(filas)
+    except IngestaSaturada as e:
+        # MySQL no alcanza a vaciar el buffer: el cliente reintenta con el mismo evento_id
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(settings.ADHERENCE_RETRY_AFTER_SECONDS)}
+        )
+    return AdherenciasAceptadasResponse(aceptados=len(filas), evento_ids=[f["evento_id"] for f in filas])
+
+
+@router.get("/ninos/{nin_id}/resumen", response_model=AdherenciaNinoResumenResponse)
+def resumen_adherencia_nino(
+    nin_id: int,
+    dias: int = Query(7, ge=1, le=365, description="Ventana móvil en días (incluye hoy)"),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Tasa de adherencia del niño en los últimos `dias` días (desde adherencias_nino_dia)."""
+    _verificar_acceso(db, current_user, [nin_id])
+    desde = date.today() - timedelta(days=dias - 1)
+    r = AdherenciasRepository(db).resumen_nino(nin_id, desde)
+    return AdherenciaNinoResumenResponse(
+        nin_id=nin_id, desde=desde, dias_con_registro=r["dias"],
+        ok=r["ok"], parcial=r["parcial"], no=r["no"], total=r["ok"] + r["parcial"] + r["no"],
+        tasa=tasa_adherencia(r["ok"], r["parcial"], r["no"]),
+    )
+
+
+@router.get("/menus/{men_id}/resumen", response_model=AdherenciaMenuResumenResponse)
+def resumen_adherencia_menu(
+    men_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Tasa de adherencia acumulada de un menú (desde adherencias_menu)."""
+    r = AdherenciasRepository(db).resumen_menu(men_id)
+    if r is None:
+        raise HTTPException(status_code=404, detail="Menú no encontrado")
+    _verificar_acceso(db, current_user, [r["nin_id"]])
+    return AdherenciaMenuResumenResponse(
+        men_id=men_id, nin_id=r["nin_id"],
+        ok=r["ok"], parcial=r["parcial"], no=r["no"], total=r["ok"] + r["parcial"] + r["no"],
+        tasa=tasa_adherencia(r["ok"], r["parcial"], r["no"]),
+    )
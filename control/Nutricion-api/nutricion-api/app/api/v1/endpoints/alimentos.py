@@ -0,0 +1,64 @@
+import re
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.application.alimentos_catalogo import PERIODOS, obtener_catalogo_alimentos
+from app.application.menus_service import periodo_de
+from app.application.services.auth_service import get_current_user
+from app.core.serialization import trusted_response
+from app.infrastructure.db.session import get_db
+from app.schemas.alimentos import AlimentosBusquedaResponse
+from app.schemas.auth import UserResponse
+
+router = APIRouter()
+
+_RANGO = re.compile(r"^\s*([A-Za-z0-9_]+)\s*(>=|<=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+@router.get("/search", response_model=AlimentosBusquedaResponse)
+def search_alimentos(
+    rango: List[str] = Query([], description="Predicados por 100 g/ml, ej. HIERRO_MG>5 o ENERGIA_KCAL<=200"),
+    periodo: Optional[str] = Query(None, description="Trimestre Q1-Q4 (por defecto el actual)"),
+    region: Optional[str] = Query(None, description="Región de disponibilidad; sin registros usa la nacional"),
+    grupo: Optional[str] = None,
+    precio_max: Optional[float] = Query(None, ge=0, description="S/ por kg o litro"),
+    solo_disponibles: bool = True,
+    ordenar_por: Optional[str] = Query(None, description="Código de nutriente o PRECIO"),
+    por_precio: bool = Query(False, description="Ordenar por cantidad del nutriente por S/ 1"),
+    descendente: Optional[bool] = None,
+    limite: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Buscar alimentos por rangos de nutrientes, disponibilidad y precio en un
+    trimestre y región. Se resuelve sobre el catálogo columnar en memoria.
+    """
+    periodo = (periodo or periodo_de(date.today())).upper()
+    if periodo not in PERIODOS:
+        raise HTTPException(status_code=422, detail="periodo debe ser Q1, Q2, Q3 o Q4")
+    rangos = []
+    for texto in rango:
+        m = _RANGO.match(texto)
+        if not m:
+            raise HTTPException(status_code=422, detail=f"Rango inválido: {texto}")
+        rangos.append((m.group(1).upper(), m.group(2), float(m.group(3))))
+
+    catalogo = obtener_catalogo_alimentos(db)
+    try:
+        total, items = catalogo.buscar(
+            periodo, region=region, rangos=rangos, precio_max=precio_max, grupo=grupo,
+            solo_disponibles=solo_disponibles,
+            ordenar_por=ordenar_por.upper() if ordenar_por else None,
+            por_precio=por_precio, descendente=descendente, limite=limite,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # Las filas del catálogo ya traen los tipos del modelo
+    return trusted_response(
+        {"version": catalogo.version, "periodo": periodo, "region": region, "total": total, "items": items},
+        AlimentosBusquedaResponse,
+    )
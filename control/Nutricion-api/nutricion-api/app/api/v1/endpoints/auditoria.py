@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.application.services.auth_service import get_current_user
+from app.infrastructure.db.session import get_db
+from app.infrastructure.repositories.auditoria_repo import AuditoriaRepository
+from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
+from app.schemas.auditoria import EventoAuditoriaItem, EventosAuditoriaResponse
+from app.schemas.auth import UserResponse
+
+router = APIRouter()
+
+ADMIN_ROLES = {"ADMIN", "SUPERADMIN"}
+
+
+def _hora_local(valor: Optional[datetime]) -> Optional[datetime]:
+    """Un filtro con zona pasa a hora local del servidor sin zona, como eau_fecha_hora."""
+    return valor.astimezone().replace(tzinfo=None) if valor is not None and valor.tzinfo else valor
+
+
+def _parse_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None, None
+    try:
+        fecha, eau_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(fecha), int(eau_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+@router.get("/", response_model=EventosAuditoriaResponse)
+def listar_eventos(
+    entidad: str = Query(..., max_length=80, description="eau_entidad, p. ej. ninos"),
+    entidad_id: str = Query(..., max_length=64),
+    desde: Optional[datetime] = Query(None, description="Inclusive; sin zona, hora local del servidor"),
+    hasta: Optional[datetime] = Query(None, description="Exclusive; sin zona, hora local del servidor"),
+    cursor: Optional[str] = Query(None, description="`siguiente_cursor` de la página anterior"),
+    limite: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Historial de auditoría de una entidad, del evento más reciente al más antiguo.
+
+    Los eventos se escriben por lotes en segundo plano, así que los de los
+    últimos cientos de milisegundos pueden no aparecer todavía.
+    """
+    role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+    if role not in ADMIN_ROLES:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden consultar la auditoría")
+
+    cursor_fecha, cursor_id = _parse_cursor(cursor)
+    filas = AuditoriaRepository(db).listar(
+        entidad, entidad_id, desde=_hora_local(desde), hasta=_hora_local(hasta),
+        cursor_fecha=cursor_fecha, cursor_id=cursor_id, limite=limite,
+    )
+    siguiente = None
+    if len(filas) == limite:
+        ultima = filas[-1]
+        siguiente = f"{ultima['fecha_hora'].isoformat()}|{ultima['eau_id']}"
+    return EventosAuditoriaResponse(items=[EventoAuditoriaItem(**f) for f in filas], siguiente_cursor=siguiente)
@@ -24,12 +24,12 @@ def login(user_login: UserLogin, db: Session = Depends(get_db)):
     return login_user(db, user_login)
 
 @router.post("/logout")
-def logout(authorization: str = Header(None)):
+def logout(authorization: str = Header(None), db: Session = Depends(get_db)):
     if not authorization or not authorization.lower().startswith("bearer "):
         raise HTTPException(status_code=400, detail="Authorization header faltante o inválido")
     token = authorization.split(" ", 1)[1].strip()
-    logout_user(token)
-    return {"detail": "logout ok (token descartado en cliente)"}
+    logout_user(db, token)
+    return {"detail": "logout ok (token revocado)"}
 
 
 @router.post("/google", response_model=Token)
@@ -0,0 +1,78 @@
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.application.services import export_service
+from app.application.services.auth_service import get_current_user
+from app.infrastructure.db.session import SessionLocal, get_db
+from app.infrastructure.repositories.export_repo import ExportRepository
+from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
+from app.schemas.auth import UserResponse
+
+router = APIRouter()
+
+ExportFormat = Literal["csv", "ndjson", "parquet"]
+ADMIN_ROLES = {"ADMIN", "SUPERADMIN"}
+ENTIDAD_ROLES = ADMIN_ROLES | {"NUTRI", "NUTRICIONISTA"}
+
+
+def _stream(formato: str, filename: str, usr_id_tutor: Optional[int], ent_id: Optional[int], chunk_size: int):
+    if formato == "parquet" and not export_service.parquet_available():
+        raise HTTPException(status_code=501, detail="Exportación Parquet no disponible (pyarrow no instalado)")
+
+    def body():
+        # Sesión propia: el cursor debe vivir mientras dure el streaming
+        db = SessionLocal()
+        try:
+            batches = ExportRepository(db).iter_mediciones(usr_id_tutor, ent_id, chunk_size)
+            yield from export_service.WRITERS[formato](batches)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=export_service.MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_service.EXTENSIONS[formato]}"'},
+    )
+
+
+@router.get("/tutores/{usr_id}")
+def export_tutor(
+    usr_id: int,
+    formato: ExportFormat = Query("csv", alias="format"),
+    chunk_size: int = Query(1000, ge=100, le=50000),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Exportar las antropometrías, evaluaciones y alergias de todos los niños
+    de un tutor (o propietario). Solo el propio usuario o un administrador.
+    """
+    if usr_id != current_user.usr_id:
+        role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+        if role not in ADMIN_ROLES:
+            raise HTTPException(status_code=403, detail="No tienes permiso para exportar datos de este tutor")
+    return _stream(formato, f"tutor_{usr_id}_{date.today():%Y%m%d}", usr_id, None, chunk_size)
+
+
+@router.get("/entidades/{ent_id}")
+def export_entidad(
+    ent_id: int,
+    formato: ExportFormat = Query("csv", alias="format"),
+    chunk_size: int = Query(1000, ge=100, le=50000),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Exportar los datos de todos los niños de una entidad. Permitido a
+    administradores y a nutricionistas registrados en la entidad.
+    """
+    role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+    if role not in ENTIDAD_ROLES:
+        raise HTTPException(status_code=403, detail="No tienes permiso para exportar datos de entidades")
+    if role not in ADMIN_ROLES and not ExportRepository(db).nutricionista_en_entidad(current_user.usr_id, ent_id):
+        raise HTTPException(status_code=403, detail="No perteneces a esta entidad")
+    return _stream(formato, f"entidad_{ent_id}_{date.today():%Y%m%d}", None, ent_id, chunk_size)
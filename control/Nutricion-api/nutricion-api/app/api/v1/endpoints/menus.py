@@ -0,0 +1,139 @@
+from datetime import date, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.application import menus_service
+from app.application.alergenos_index import get_allergen_index
+from app.application.services.auth_service import get_current_user
+from app.core.config import settings
+from app.infrastructure.db.session import get_db
+from app.infrastructure.repositories.export_repo import ExportRepository
+from app.infrastructure.repositories.ninos_repo import NinosRepository
+from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
+from app.schemas.auth import UserResponse
+from app.schemas.menus import (
+    GenerarMenuRequest, GenerarMenusLoteRequest, GenerarMenusLoteResponse, MenuGeneradoResponse,
+    NinosAlergicosResponse, RecetasSegurasResponse,
+)
+from app.workers.registry import enqueue
+from app.workers.worker import get_job_worker
+
+router = APIRouter()
+
+ADMIN_ROLES = {"ADMIN", "SUPERADMIN"}
+PLANIFICADOR_ROLES = ADMIN_ROLES | {"NUTRI", "NUTRICIONISTA"}
+
+
+@router.post("/ninos/{nin_id}/generar", response_model=MenuGeneradoResponse, status_code=status.HTTP_201_CREATED)
+def generar_menu_nino(
+    nin_id: int,
+    payload: GenerarMenuRequest,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Generar el menú semanal de un niño según su edad, alergias, la
+    disponibilidad de su región en el trimestre y el presupuesto diario.
+    """
+    nino = NinosRepository(db).get_nino_by_id(nin_id)
+    if not nino:
+        raise HTTPException(status_code=404, detail="Niño no encontrado")
+    if current_user.usr_id not in (nino.get("usr_id_tutor"), nino.get("usr_id_propietario")):
+        role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+        if role not in PLANIFICADOR_ROLES:
+            raise HTTPException(status_code=403, detail="No tienes permiso para planificar menús de este niño")
+
+    resultado = menus_service.generar_menus(
+        db, nin_id=nin_id, inicio=payload.inicio,
+        presupuesto_dia_pen=payload.presupuesto_dia_pen, guardar=payload.guardar,
+    )
+    if not resultado.planes:
+        motivo = resultado.omitidos[0]["motivo"] if resultado.omitidos else "No se pudo generar el menú"
+        raise HTTPException(status_code=422, detail=motivo)
+
+    plan = resultado.planes[0]
+    return MenuGeneradoResponse(
+        men_id=plan.men_id,
+        nin_id=plan.nin_id,
+        inicio=plan.inicio,
+        fin=plan.fin,
+        presupuesto_dia_pen=plan.presupuesto_dia_pen,
+        kcal_total=plan.kcal_total,
+        costo_total_pen=plan.costo_total_pen,
+        cobertura=plan.cobertura,
+        cumple_objetivos=plan.cumple_objetivos,
+        dentro_presupuesto=plan.dentro_presupuesto,
+        advertencias=plan.advertencias,
+        items=[{**item, "fecha": plan.inicio + timedelta(days=item["dia_idx"])} for item in plan.items],
+    )
+
+
+@router.post("/generar-lote", response_model=GenerarMenusLoteResponse, status_code=status.HTTP_202_ACCEPTED)
+def generar_menus_lote(
+    payload: GenerarMenusLoteRequest,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Encolar la generación de menús para una entidad (o todos los niños). Solo administradores."""
+    role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+    if role not in ADMIN_ROLES:
+        raise HTTPException(status_code=403, detail="Solo un administrador puede generar menús por lote")
+
+    # La semana se fija al encolar: un reintento al día siguiente debe planificar la misma
+    inicio = payload.inicio or date.today() + timedelta(days=1)
+    tra_id = enqueue(db, "menus.generar_lote", {
+        "ent_id": payload.ent_id,
+        "inicio": inicio.isoformat(),
+        "presupuesto_dia_pen": payload.presupuesto_dia_pen,
+    }, clave=f"menus:lote:{payload.ent_id or 'todos'}")
+    if settings.JOBS_INPROCESS:
+        get_job_worker().notify()
+    return GenerarMenusLoteResponse(tra_id=tra_id)
+
+
+@router.get("/ninos/{nin_id}/recetas-seguras", response_model=RecetasSegurasResponse)
+def recetas_seguras_nino(
+    nin_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Recetas activas sin ninguno de los alérgenos del niño (índice de máscaras en memoria)."""
+    nino = NinosRepository(db).get_nino_by_id(nin_id)
+    if not nino:
+        raise HTTPException(status_code=404, detail="Niño no encontrado")
+    if current_user.usr_id not in (nino.get("usr_id_tutor"), nino.get("usr_id_propietario")):
+        role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+        if role not in PLANIFICADOR_ROLES:
+            raise HTTPException(status_code=403, detail="No tienes permiso para consultar este niño")
+
+    indice = get_allergen_index(db)
+    mascara = indice.mascara_nino(nin_id) or 0
+    return RecetasSegurasResponse(
+        nin_id=nin_id,
+        alergias=indice.codigos(mascara),
+        rec_ids=indice.recetas_seguras(mascara).tolist(),
+    )
+
+
+@router.get("/entidades/{ent_id}/ninos-alergicos", response_model=NinosAlergicosResponse)
+def ninos_alergicos_entidad(
+    ent_id: int,
+    codigos: List[str] = Query(..., description="Códigos de tipos_alergias (ej. LECHE, MANI)"),
+    todas: bool = Query(False, description="Exigir todas las alergias en lugar de alguna"),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Niños de la entidad alérgicos a los códigos indicados. Administradores y nutricionistas de la entidad."""
+    role = UsuariosRepository(db).get_role_code_by_id(current_user.rol_id)
+    if role not in PLANIFICADOR_ROLES:
+        raise HTTPException(status_code=403, detail="No tienes permiso para consultar niños de entidades")
+    if role not in ADMIN_ROLES and not ExportRepository(db).nutricionista_en_entidad(current_user.usr_id, ent_id):
+        raise HTTPException(status_code=403, detail="No perteneces a esta entidad")
+
+    try:
+        nin_ids = get_allergen_index(db).ninos_alergicos(codigos, ent_id=ent_id, todas=todas)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return NinosAlergicosResponse(ent_id=ent_id, codigos=codigos, todas=todas, nin_ids=nin_ids.tolist())
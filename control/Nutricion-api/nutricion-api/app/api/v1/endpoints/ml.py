@@ -1,58 +1,79 @@
 from __future__ import annotations
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 
-# Try to import assist from ml-recomendator; add path fallback if needed
-try:
-    from src.llm.assist import summarize_with_llm, format_recommender_prompt
-except Exception:  # pragma: no cover
-    import sys
-    from pathlib import Path
-    here = Path(__file__).resolve()
-    # Search upwards for modelo/ml-recomendator
-    root = here
-    for _ in range(10):
-        candidate = root / "modelo" / "ml-recomendator"
-        if (candidate / "src").exists():
-            sys.path.append(str(candidate))
-            break
-        root = root.parent
-    # retry import
-    from src.llm.assist import summarize_with_llm, format_recommender_prompt  # type: ignore
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.infrastructure.external import ml_bridge
 
 
 router = APIRouter()
 
+ML_SUMMARIES = REGISTRY.counter("ml_summaries_total", "Resúmenes de /ml/summary por resultado", ("resultado",))
+
 
 class SummaryRequest(BaseModel):
     features: Dict[str, Any]
     scores: Dict[str, float]
     prefer_llm: bool = True
+    # Espera máxima al LLM; por defecto ML_SUMMARY_BUDGET_MS, como mucho ML_SUMMARY_MAX_BUDGET_MS
+    budget_ms: Optional[int] = Field(default=None, ge=0, le=settings.ML_SUMMARY_MAX_BUDGET_MS)
 
 
 class SummaryResponse(BaseModel):
     text: str
     used_llm: bool
+    summary_id: Optional[str] = None  # con status "pending": el texto del LLM llega por GET o SSE
+    status: str = "done"
+
+
+def _resumidor():
+    if not ml_bridge.disponible():
+        raise HTTPException(status_code=503, detail="El módulo de ML no está instalado en el servidor")
+    try:
+        return ml_bridge.resumidor()
+    except ml_bridge.MLNoDisponible as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.post("/summary", response_model=SummaryResponse)
 def summarize(req: SummaryRequest) -> SummaryResponse:
-    # First try LLM if preferred
-    used_llm = False
-    text: Optional[str] = None
-    if req.prefer_llm:
-        try:
-            text = summarize_with_llm(req.features, req.scores)
-            used_llm = text is not None
-        except Exception as e:
-            # Fall back silently to offline
-            text = None
-            used_llm = False
-    if not text:
-        try:
-            text = format_recommender_prompt(req.features, req.scores)
-        except Exception as e:  # Should not happen; guard anyway
-            raise HTTPException(status_code=500, detail=f"No se pudo generar resumen: {e}")
-    return SummaryResponse(text=text, used_llm=used_llm)
+    """
+    Resumen del caso: el del LLM si responde dentro del presupuesto; si no, el
+    offline con `summary_id` y status "pending" mientras el LLM termina en segundo plano.
+    """
+    resumidor = _resumidor()
+    try:
+        registro = resumidor.summarize(req.features, req.scores, req.prefer_llm, req.budget_ms)
+    except Exception as e:  # Should not happen; guard anyway
+        raise HTTPException(status_code=500, detail=f"No se pudo generar resumen: {e}")
+    if registro["status"] == "pending":
+        ML_SUMMARIES.inc(("pendiente",))
+    else:
+        ML_SUMMARIES.inc(("llm" if registro["used_llm"] else "offline",))
+    return SummaryResponse(**{k: registro[k] for k in ("text", "used_llm", "summary_id", "status")})
+
+
+@router.get("/summary/{summary_id}", response_model=SummaryResponse)
+def get_summary(summary_id: str) -> SummaryResponse:
+    registro = _resumidor().get(summary_id)
+    if registro is None:
+        raise HTTPException(status_code=404, detail="Resumen no encontrado o expirado")
+    return SummaryResponse(
+        text=registro["text"], used_llm=registro["used_llm"], summary_id=summary_id, status=registro["status"]
+    )
+
 
+@router.get("/summary/{summary_id}/stream")
+def stream_summary(summary_id: str) -> StreamingResponse:
+    """SSE: evento `summary` con el texto actual, otro `summary` cuando termina el LLM y `end`."""
+    resumidor = _resumidor()
+    if resumidor.get(summary_id) is None:
+        raise HTTPException(status_code=404, detail="Resumen no encontrado o expirado")
+    return StreamingResponse(
+        resumidor.events(summary_id, timeout=settings.ML_SUMMARY_STREAM_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from app.core.config import settings
+from app.core.http_cache import etag_matches, make_etag
+from app.core.serialization import trusted_response
 from app.infrastructure.db.session import get_db
 from app.schemas.ninos import (
     NinoCreate, NinoUpdate, NinoResponse,
@@ -10,6 +13,7 @@ from app.schemas.ninos import (
     AlergiaCreate, AlergiaResponse,
     AssignTutorRequest
 )
+from app.application.alergenos_index import ALLERGEN_INDEX
 from app.application.services import ninos_service
 from app.application.services.auth_service import get_current_user
 from app.schemas.auth import UserResponse
@@ -17,6 +21,8 @@ from typing import List
 from app.infrastructure.repositories.ninos_repo import NinosRepository
 from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
 from app.schemas.ninos import NinoCreate
+from app.workers.registry import enqueue
+from app.workers.worker import get_job_worker
 
 router = APIRouter()
 
@@ -126,15 +132,33 @@ def create_child_profile(
 
 @router.get("/", response_model=List[NinoWithAnthropometry])
 def get_my_children(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     Obtener todos los niños del tutor actual con sus datos antropométricos
     y estado nutricional calculado.
+
+    Responde con ETag fuerte derivado de la versión de datos del tutor
+    (incrementada por triggers en ninos, antropometrias, ninos_alergias,
+    evaluaciones_nutricionales, tipos_alergias, entidades y usuarios.usr_activo)
+    y de la fecha, porque la edad y el estado se calculan al día. Si coincide
+    con `If-None-Match` se devuelve 304 sin ejecutar los procedimientos.
     """
     repo = NinosRepository(db)
-    return repo.get_ninos_completos_by_tutor(current_user.usr_id)
+    version = repo.get_data_version(current_user.usr_id)
+    etag = make_etag("children", settings.VERSION, current_user.usr_id, version, date.today().isoformat())
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    # Los mappers del repositorio ya entregan los tipos del modelo
+    return trusted_response(
+        repo.get_ninos_completos_by_tutor(current_user.usr_id),
+        NinoWithAnthropometry,
+        headers=cache_headers,
+    )
 
 @router.get("/{nin_id}", response_model=NinoWithAnthropometry)
 def get_child_by_id(
@@ -150,7 +174,7 @@ def get_child_by_id(
     child = repo.get_perfil_completo_con_datos(nin_id)
     if not child:
         raise HTTPException(status_code=404, detail="Niño no encontrado")
-    return child
+    return trusted_response(child, NinoWithAnthropometry)
 
 @router.put("/{nin_id}", response_model=NinoResponse)
 def update_child(
@@ -218,6 +242,12 @@ def add_anthropometry_data(
     antropometria_dict = repo.agregar_antropometria(nin_id, antropo_data.model_dump())
     if not antropometria_dict:
         raise HTTPException(status_code=400, detail="No se pudo agregar la medición antropométrica")
+
+    # Evaluación, puntaje de riesgo y alertas se calculan en segundo plano
+    enqueue(db, "evaluacion.recalcular", {"nin_id": nin_id, "ant_id": antropometria_dict["ant_id"]},
+            clave=f"evaluacion:{nin_id}")
+    if settings.JOBS_INPROCESS:
+        get_job_worker().notify()
     
     return AnthropometryResponse(**antropometria_dict)
 
@@ -349,6 +379,7 @@ def add_child_allergy(
     result_list = repo.agregar_alergia(nin_id, alergia.ta_codigo, alergia.severidad or "LEVE")
     if not result_list:
         raise HTTPException(status_code=400, detail="No se pudo agregar la alergia")
+    ALLERGEN_INDEX.invalidar()
     # Retornar el último registro correspondiente al tipo agregado
     last = result_list[-1]
     return AlergiaResponse(**last)
@@ -382,11 +413,7 @@ def delete_child_allergy(
         raise HTTPException(status_code=404, detail="Niño no encontrado")
     
     # Eliminar relación específica
-    affected = db.execute(text("DELETE FROM ninos_alergias WHERE na_id = :na_id AND nin_id = :nin_id"), {
-        "na_id": alergia_id,
-        "nin_id": nin_id
-    })
-    db.commit()
-    if affected.rowcount == 0:
+    if not repo.eliminar_alergia(nin_id, alergia_id):
         raise HTTPException(status_code=404, detail="Alergia no encontrada para este niño")
+    ALLERGEN_INDEX.invalidar()
     return {"message": "Alergia eliminada"}
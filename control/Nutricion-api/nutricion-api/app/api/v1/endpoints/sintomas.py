@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.application.sintomas_series import (
+    caracteristicas_poblacion, cargar_series, correlaciones, nombre_categoria,
+)
+from app.application.services.auth_service import get_current_user
+from app.infrastructure.db.session import get_db
+from app.infrastructure.repositories.ninos_repo import NinosRepository
+from app.infrastructure.repositories.sintomas_repo import SintomasRepository
+from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
+from app.schemas.auth import UserResponse
+from app.schemas.sintomas import (
+    SintomaCategoriaResumen, SintomaCreate, SintomaResponse, SintomasCorrelacionResponse, SintomasResumenResponse,
+)
+
+router = APIRouter()
+
+SEGUIMIENTO_ROLES = {"ADMIN", "SUPERADMIN", "NUTRI", "NUTRICIONISTA"}
+CORRELACION_X = ("sintomas_dias", "diarrea_episodios", "fiebre_episodios")
+CORRELACION_Y = ("adherencia", "delta_z_imc", "ganancia_peso_g_dia")
+
+
+def _es_seguimiento(db: Session, current_user: UserResponse) -> bool:
+    return UsuariosRepository(db).get_role_code_by_id(current_user.rol_id) in SEGUIMIENTO_ROLES
+
+
+def _verificar_acceso(db: Session, current_user: UserResponse, nin_id: int) -> None:
+    nino = NinosRepository(db).get_nino_by_id(nin_id)
+    if not nino:
+        raise HTTPException(status_code=404, detail="Niño no encontrado")
+    if current_user.usr_id in (nino.get("usr_id_tutor"), nino.get("usr_id_propietario")):
+        return
+    if not _es_seguimiento(db, current_user):
+        raise HTTPException(status_code=403, detail="No tienes permiso para ver los síntomas de este niño")
+
+
+def _sintoma_response(fila) -> SintomaResponse:
+    return SintomaResponse(**{**fila, "categoria": nombre_categoria(fila["categoria"])})
+
+
+@router.post("/", response_model=SintomaResponse, status_code=status.HTTP_201_CREATED)
+def registrar_sintoma(
+    payload: SintomaCreate,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Registrar un síntoma; la serie diaria y los episodios se actualizan en la misma escritura."""
+    _verificar_acceso(db, current_user, payload.nin_id)
+    fecha = payload.fecha or date.today()
+    if fecha > date.today():
+        raise HTTPException(status_code=422, detail="La fecha no puede ser futura")
+    fila = SintomasRepository(db).registrar(payload.nin_id, fecha, payload.tipo.strip(), payload.grado, payload.notas)
+    return _sintoma_response(fila)
+
+
+@router.get("/ninos/{nin_id}", response_model=List[SintomaResponse])
+def listar_sintomas(
+    nin_id: int,
+    dias: int = Query(90, ge=1, le=3650),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    _verificar_acceso(db, current_user, nin_id)
+    desde = date.today() - timedelta(days=dias - 1)
+    return [_sintoma_response(f) for f in SintomasRepository(db).listar(nin_id, desde)]
+
+
+@router.delete("/ninos/{nin_id}/{sin_id}")
+def eliminar_sintoma(
+    nin_id: int,
+    sin_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    _verificar_acceso(db, current_user, nin_id)
+    if not SintomasRepository(db).eliminar(nin_id, sin_id):
+        raise HTTPException(status_code=404, detail="Síntoma no encontrado para este niño")
+    return {"message": "Síntoma eliminado"}
+
+
+@router.get("/ninos/{nin_id}/resumen", response_model=SintomasResumenResponse)
+def resumen_sintomas(
+    nin_id: int,
+    dias: int = Query(14, ge=1, le=365, description="Ventana en días (incluye hoy)"),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Episodios por categoría con algún día en la ventana (desde sintomas_episodios)."""
+    _verificar_acceso(db, current_user, nin_id)
+    desde = date.today() - timedelta(days=dias - 1)
+    filas = SintomasRepository(db).resumen_nino(nin_id, desde)
+    return SintomasResumenResponse(
+        nin_id=nin_id,
+        desde=desde,
+        categorias=[SintomaCategoriaResumen(**{**f, "categoria": nombre_categoria(f["categoria"])}) for f in filas],
+    )
+
+
+@router.get("/correlacion", response_model=SintomasCorrelacionResponse)
+def correlacion_sintomas(
+    ventana_sintomas: int = Query(14, ge=1, le=90),
+    ventana_adherencia: int = Query(30, ge=1, le=180),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Correlación, sobre toda la población y a la fecha de hoy, entre la carga de
+    síntomas reciente y la adherencia y el crecimiento (cambio de z IMC y
+    ganancia de peso entre las dos últimas mediciones separadas ~90 días).
+    """
+    if not _es_seguimiento(db, current_user):
+        raise HTTPException(status_code=403, detail="Solo personal de seguimiento puede consultar la población")
+    hoy = date.today()
+    series = cargar_series(db, hoy)
+    nin_ids = series.nin_ids()
+    caracteristicas = caracteristicas_poblacion(
+        series, nin_ids, hoy, ventana_sintomas=ventana_sintomas, ventana_adherencia=ventana_adherencia,
+    )
+    return SintomasCorrelacionResponse(
+        fecha=hoy,
+        ventana_sintomas=ventana_sintomas,
+        ventana_adherencia=ventana_adherencia,
+        ninos=len(nin_ids),
+        correlaciones=correlaciones(caracteristicas, CORRELACION_X, CORRELACION_Y),
+    )
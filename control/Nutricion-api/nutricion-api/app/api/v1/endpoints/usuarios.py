@@ -9,8 +9,8 @@ from app.schemas.usuarios import (
 )
 from app.schemas.auth import Token
 from app.application.services.usuarios_service import UsuariosService
-from app.infrastructure.security.password_service import PasswordService
-from app.infrastructure.security.jwt_service import JWTService
+from app.infrastructure.security.password_service import get_password_service
+from app.infrastructure.security.jwt_service import get_jwt_service
 from pydantic import BaseModel
 from app.application.services.auth_service import get_current_user
 from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
@@ -31,8 +31,8 @@ def get_usuarios_service(db: Session = Depends(get_db)) -> UsuariosService:
     """Dependencia para obtener el servicio de usuarios con inyección de dependencias."""
     return UsuariosService(
         repository=UsuariosRepository(db),
-        password_service=PasswordService(),
-        jwt_service=JWTService()
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service()
     )
 
 
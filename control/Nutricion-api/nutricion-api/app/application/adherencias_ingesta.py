@@ -0,0 +1,311 @@
+"""
+Ingesta de adherencia con write-behind.
+
+Los clientes móviles envían un evento por comida y niño. La API responde en
+cuanto el lote queda en el log local de solo anexado (con fsync), lo acumula en
+memoria y un hilo lo vuelca a `adherencias` con INSERT multi-fila cada
+ADHERENCE_FLUSH_MS o al juntar ADHERENCE_FLUSH_ROWS eventos.
+
+El log se escribe en segmentos `adherencias-<pid>-<n>.log` (NDJSON); cada vuelco
+sella el segmento activo y lo borra cuando sus filas ya están confirmadas en
+MySQL. Al iniciar, los segmentos que ningún proceso tiene bloqueados (restos de
+una caída) se reinsertan con INSERT IGNORE: el `adh_evento_id` evita duplicar lo
+que alcanzó a confirmarse. Los triggers de `adherencias` mantienen los resúmenes
+por niño/día y por menú, así que las tasas nunca recorren la tabla de eventos.
+Si MySQL no responde, los eventos sin confirmar crecen hasta
+ADHERENCE_MAX_BUFFERED; a partir de ahí la API rechaza los lotes con 503.
+"""
+import glob
+import itertools
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.core.serialization import dumps
+from app.infrastructure.repositories.adherencias_repo import AdherenciasRepository
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PESO_PARCIAL = 0.5
+
+EVENTS_ACCEPTED = REGISTRY.counter("adherence_events_total", "Eventos de adherencia aceptados")
+ROWS_INSERTED = REGISTRY.counter(
+    "adherence_rows_inserted_total", "Filas nuevas en adherencias por origen", ("origen",)
+)
+FLUSH_SECONDS = REGISTRY.histogram("adherence_flush_seconds", "Duración de cada vuelco a MySQL")
+BUFFERED = REGISTRY.gauge("adherence_buffered_events", "Eventos aceptados aún no confirmados en MySQL")
+
+
+class IngestaSaturada(RuntimeError):
+    """El buffer llegó a `max_buffered` eventos sin confirmar (MySQL caído o lento)."""
+
+
+def tasa_adherencia(ok: int, parcial: int, no: int) -> Optional[float]:
+    """Proporción de comidas cumplidas (PARCIAL cuenta la mitad); None sin eventos."""
+    total = ok + parcial + no
+    return round((ok + PESO_PARCIAL * parcial) / total, 4) if total else None
+
+
+def _fila(evento: Dict[str, Any]) -> Dict[str, Any]:
+    registrado = evento["registrado_en"]
+    if isinstance(registrado, str):
+        registrado = datetime.fromisoformat(registrado)
+    return {
+        "evento_id": evento["evento_id"],
+        "nin_id": evento["nin_id"],
+        "men_id": evento.get("men_id"),
+        "mei_id": evento.get("mei_id"),
+        "registrado_en": registrado,
+        "estado": evento["estado"],
+        "notas": evento.get("notas"),
+    }
+
+
+class _Segmento:
+    """Archivo del log; bloqueado (flock) mientras el proceso lo tenga abierto."""
+
+    def __init__(self, path: str, nuevo: bool = False):
+        self.path = path
+        if nuevo:
+            # Se crea con otro nombre y solo aparece como `.log` ya bloqueado:
+            # `recuperar()` de otro proceso no puede tomarlo por huérfano
+            tmp = f"{path}.tmp"
+            self.file = open(tmp, "xb")
+            self._bloquear()
+            os.rename(tmp, path)
+        else:
+            self.file = open(path, "rb")
+            self._bloquear()
+            # Si otro proceso lo borró mientras se esperaba el bloqueo, ya no hay nada que recuperar
+            try:
+                vigente = os.fstat(self.file.fileno()).st_ino == os.stat(path).st_ino
+            except FileNotFoundError:
+                vigente = False
+            if not vigente:
+                self.file.close()
+                raise FileNotFoundError(path)
+
+    def _bloquear(self) -> None:
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.file.close()
+            raise
+
+    def escribir(self, data: bytes, fsync: bool) -> None:
+        self.file.write(data)
+        self.file.flush()
+        if fsync:
+            os.fsync(self.file.fileno())
+
+    def eliminar(self) -> None:
+        # Se borra antes de cerrar para no liberar el bloqueo con el archivo aún presente
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.file.close()
+
+
+class AdherenciaIngestor:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        log_dir: Optional[str] = None,
+        fsync: bool = True,
+        flush_ms: int = 250,
+        flush_rows: int = 500,
+        max_buffered: int = 50000,
+    ):
+        self.session_factory = session_factory
+        self.log_dir = log_dir
+        self.fsync = fsync
+        self.flush_interval = flush_ms / 1000.0
+        self.flush_rows = max(1, flush_rows)
+        self.max_buffered = max_buffered
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._sin_confirmar = 0  # buffer + lotes sellados aún no confirmados
+        self._segmento: Optional[_Segmento] = None
+        self._propios: set = set()
+        self._seq = itertools.count()
+        # Lotes sellados pendientes de confirmar en MySQL, en orden de llegada
+        self._pendientes: List[Tuple[Optional[_Segmento], List[Dict[str, Any]]]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._recuperado = log_dir is None
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+
+    # --- escritura ---------------------------------------------------------------
+
+    def registrar(self, eventos: Sequence[Dict[str, Any]]) -> int:
+        """
+        Aceptar eventos ya validados: quedan en el log (si hay) y en el buffer.
+
+        Args:
+            eventos: Dicts con evento_id, nin_id, men_id, mei_id, registrado_en, estado, notas
+
+        Returns:
+            Eventos en el buffer tras agregarlos
+
+        Raises:
+            IngestaSaturada: si con el lote se superaría `max_buffered` eventos sin confirmar
+        """
+        if not eventos:
+            return len(self._buffer)
+        data = b"".join(dumps(e) + b"\n" for e in eventos)
+        with self._lock:
+            if self._sin_confirmar + len(eventos) > self.max_buffered:
+                raise IngestaSaturada(
+                    f"Hay {self._sin_confirmar} eventos de adherencia sin confirmar; reintente más tarde"
+                )
+            if self.log_dir:
+                if self._segmento is None:
+                    self._segmento = self._nuevo_segmento()
+                self._segmento.escribir(data, self.fsync)
+            self._buffer.extend(eventos)
+            self._sin_confirmar += len(eventos)
+            pendientes = len(self._buffer)
+        EVENTS_ACCEPTED.inc(amount=len(eventos))
+        BUFFERED.inc(amount=len(eventos))
+        if pendientes >= self.flush_rows:
+            self._wake.set()
+        return pendientes
+
+    def _nuevo_segmento(self) -> _Segmento:
+        path = os.path.join(self.log_dir, f"adherencias-{os.getpid()}-{int(time.time() * 1000)}-{next(self._seq)}.log")
+        self._propios.add(path)
+        return _Segmento(path, nuevo=True)
+
+    # --- vuelco --------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Sellar el buffer y confirmar en MySQL todos los lotes pendientes; devuelve filas nuevas."""
+        with self._flush_lock:
+            with self._lock:
+                if self._buffer:
+                    self._pendientes.append((self._segmento, self._buffer))
+                    self._buffer = []
+                    self._segmento = None
+            insertadas = 0
+            while self._pendientes:
+                segmento, eventos = self._pendientes[0]
+                start = time.perf_counter()
+                insertadas += self._insertar(eventos, "buffer")
+                FLUSH_SECONDS.observe(time.perf_counter() - start)
+                self._pendientes.pop(0)
+                with self._lock:
+                    self._sin_confirmar -= len(eventos)
+                BUFFERED.dec(amount=len(eventos))
+                if segmento is not None:
+                    self._propios.discard(segmento.path)
+                    segmento.eliminar()
+            return insertadas
+
+    def _insertar(self, eventos: Sequence[Dict[str, Any]], origen: str) -> int:
+        insertadas = 0
+        with self.session_factory() as db:
+            repo = AdherenciasRepository(db)
+            for i in range(0, len(eventos), self.flush_rows):
+                insertadas += repo.insertar_lote([_fila(e) for e in eventos[i:i + self.flush_rows]], commit=False)
+            db.commit()
+        ROWS_INSERTED.inc((origen,), insertadas)
+        return insertadas
+
+    def recuperar(self) -> int:
+        """Reinsertar los segmentos huérfanos del log (de una caída) y borrarlos."""
+        insertadas = 0
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "adherencias-*.log"))):
+            if path in self._propios:
+                continue
+            try:
+                segmento = _Segmento(path)
+            except (BlockingIOError, FileNotFoundError):
+                continue  # lo tiene abierto un proceso vivo, o ya se recuperó
+            eventos = []
+            for linea in segmento.file:
+                try:
+                    eventos.append(orjson.loads(linea))
+                except orjson.JSONDecodeError:
+                    # Última línea truncada por la caída: nunca se confirmó al cliente
+                    logger.warning("Línea inválida descartada en %s", path)
+            try:
+                insertadas += self._insertar(eventos, "recuperacion")
+            except Exception:
+                segmento.file.close()  # liberar el bloqueo para reintentar
+                raise
+            segmento.eliminar()
+            logger.info("Log de adherencia %s recuperado: %s eventos, %s nuevos", path, len(eventos), insertadas)
+        self._recuperado = True
+        return insertadas
+
+    # --- ciclo de vida ---------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                if not self._recuperado:
+                    self.recuperar()
+                self.flush()
+            except Exception:
+                # Los lotes quedan pendientes (y en el log) hasta el siguiente intento
+                logger.exception("Error volcando eventos de adherencia")
+
+    def start(self) -> None:
+        """Iniciar el hilo de vuelco (idempotente)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="adherence-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Detener el hilo y hacer un último vuelco; lo que falle queda en el log."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("No se pudo volcar la adherencia pendiente al detener")
+
+    def __len__(self) -> int:
+        return self._sin_confirmar
+
+
+@lru_cache(maxsize=1)
+def get_adherencia_ingestor() -> AdherenciaIngestor:
+    from app.infrastructure.db.session import SessionLocal
+
+    return AdherenciaIngestor(
+        SessionLocal,
+        log_dir=settings.ADHERENCE_LOG_DIR,
+        fsync=settings.ADHERENCE_LOG_FSYNC,
+        flush_ms=settings.ADHERENCE_FLUSH_MS,
+        flush_rows=settings.ADHERENCE_FLUSH_ROWS,
+        max_buffered=settings.ADHERENCE_MAX_BUFFERED,
+    )
@@ -0,0 +1,252 @@
+"""
+Índice de alérgenos en memoria.
+
+Cada código de tipos_alergias tiene una posición de bit estable (`ta_bit`) y
+niños, alimentos y recetas guardan en la base el OR de sus bits. El índice
+mantiene esas máscaras en arreglos NumPy (`uint64`) ordenados por id, de modo
+que "recetas seguras para este niño" o "niños de la entidad alérgicos a X" son
+un AND bit a bit vectorizado sobre toda la tabla.
+
+La base recalcula las máscaras con triggers; el índice se refresca de forma
+incremental leyendo solo las filas con `actualizado_en` posterior a la última
+lectura, y se reconstruye completo cada ALLERGEN_INDEX_FULL_REFRESH_SECONDS
+(bajas de niños y transacciones largas que confirmen con una marca anterior).
+Si entre dos lecturas cambió la posición de bit de un código ya indexado (por
+ejemplo tras sp_alergenos_reconstruir), las máscaras guardadas quedan en la
+disposición anterior: el refresco incremental detecta ese salto y recarga todo.
+Con REFDATA_SHARED la lectura completa la hace un solo worker por ventana y los
+demás mapean sus arreglos (app.infrastructure.refdata); los cambios
+incrementales se aplican en cada proceso sobre esa base.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure import refdata
+from app.infrastructure.repositories.alergenos_repo import AlergenosRepository
+
+logger = logging.getLogger(__name__)
+
+SIN_ENTIDAD = -1
+
+
+@dataclass(frozen=True)
+class Mascaras:
+    """Máscaras de una tabla, ordenadas por id."""
+    ids: np.ndarray       # int64
+    mascaras: np.ndarray  # uint64
+    ent_ids: np.ndarray   # int64 (SIN_ENTIDAD si no aplica)
+
+    @classmethod
+    def vacia(cls) -> "Mascaras":
+        return cls(np.empty(0, np.int64), np.empty(0, np.uint64), np.empty(0, np.int64))
+
+    def aplicar(self, ids: np.ndarray, mascaras: np.ndarray, ent_ids: np.ndarray, activos: np.ndarray) -> "Mascaras":
+        """Nueva versión con las filas de `ids` reemplazadas (o quitadas si no están activas)."""
+        if not len(ids):
+            return self
+        quedan = ~np.isin(self.ids, ids)
+        nuevos_ids = np.concatenate([self.ids[quedan], ids[activos]])
+        orden = np.argsort(nuevos_ids, kind="stable")
+        return Mascaras(
+            nuevos_ids[orden],
+            np.concatenate([self.mascaras[quedan], mascaras[activos]])[orden],
+            np.concatenate([self.ent_ids[quedan], ent_ids[activos]])[orden],
+        )
+
+    def obtener(self, id_: int) -> Optional[int]:
+        i = int(np.searchsorted(self.ids, id_))
+        if i < len(self.ids) and self.ids[i] == id_:
+            return int(self.mascaras[i])
+        return None
+
+
+@dataclass(frozen=True)
+class _Estado:
+    bits: Dict[str, int]
+    ninos: Mascaras
+    alimentos: Mascaras
+    recetas: Mascaras
+    desde: Optional[datetime]
+
+
+_TABLAS = {"NINO": "ninos", "ALIMENTO": "alimentos", "RECETA": "recetas"}
+
+
+class AllergenIndex:
+    def __init__(self):
+        vacia = Mascaras.vacia()
+        self._estado = _Estado({}, vacia, vacia, vacia, None)
+        self._lock = threading.Lock()
+        self._refrescado_en = 0.0
+        self._completo_en = 0.0
+
+    # --- carga -----------------------------------------------------------------
+
+    def refrescar(self, db: Session, completo: bool = False) -> int:
+        """
+        Aplicar los cambios desde la última lectura (o recargar todo).
+
+        Args:
+            db: Sesión de base de datos
+            completo: Descartar el estado actual y leer todas las filas
+
+        Returns:
+            Cantidad de filas leídas
+        """
+        with self._lock:
+            repo = AlergenosRepository(db)
+            bits = None
+            if not completo:
+                bits = repo.obtener_bits()
+                if not self._bits_vigentes(bits):
+                    logger.info("Cambiaron los bits de tipos_alergias; se recarga el índice completo")
+                    completo = True
+            if completo and settings.REFDATA_SHARED:
+                return self._adjuntar(repo)
+            bits = bits or repo.obtener_bits()
+            filas = repo.obtener_mascaras(None if completo else self._estado.desde)
+            self._aplicar(bits, filas, completo)
+            return len(filas)
+
+    def cargar(self, bits: List[Dict[str, Any]], filas: List[Dict[str, Any]], completo: bool = False) -> None:
+        """Aplicar filas ya leídas (formato de AlergenosRepository); útil sin base de datos."""
+        with self._lock:
+            self._aplicar(bits, filas, completo)
+
+    def _bits_vigentes(self, bits: List[Dict[str, Any]]) -> bool:
+        """True si todos los códigos indexados conservan su bit en `bits` (los nuevos no importan)."""
+        nuevos = _bits(bits)
+        return all(nuevos.get(codigo) == bit for codigo, bit in self._estado.bits.items())
+
+    def _aplicar(self, bits: List[Dict[str, Any]], filas: List[Dict[str, Any]], completo: bool) -> None:
+        estado = self._estado
+        tablas = {}
+        for tipo, nombre in _TABLAS.items():
+            base = Mascaras.vacia() if completo else getattr(estado, nombre)
+            sel = [f for f in filas if f["tipo"] == tipo]
+            tablas[nombre] = base.aplicar(
+                np.array([f["id"] for f in sel], dtype=np.int64),
+                np.array([f["mascara"] for f in sel], dtype=np.uint64),
+                np.array([SIN_ENTIDAD if f["ent_id"] is None else f["ent_id"] for f in sel], dtype=np.int64),
+                np.array([f["activo"] for f in sel], dtype=bool),
+            )
+        desde = max((f["actualizado_en"] for f in filas), default=None) or (None if completo else estado.desde)
+        # Los lectores toman la referencia a `_estado` sin lock: se reemplaza entera
+        self._estado = _Estado(
+            _bits(bits),
+            tablas["ninos"], tablas["alimentos"], tablas["recetas"], desde,
+        )
+        ahora = time.monotonic()
+        self._refrescado_en = ahora
+        if completo:
+            self._completo_en = ahora
+
+    def _adjuntar(self, repo: AlergenosRepository) -> int:
+        """Lectura completa compartida: mapear el snapshot de la ventana y ponerse al día."""
+        def construir() -> refdata.Columnas:
+            indice = AllergenIndex()
+            indice.cargar(repo.obtener_bits(), repo.obtener_mascaras(), completo=True)
+            return a_columnas(indice._estado)
+
+        version = refdata.marca_tiempo(settings.ALLERGEN_INDEX_FULL_REFRESH_SECONDS)
+        snapshot = refdata.obtener("alergenos", version, construir)
+        self._estado = desde_snapshot(snapshot)
+        self._completo_en = time.monotonic()
+        bits = repo.obtener_bits()
+        if not self._bits_vigentes(bits):
+            # El snapshot de la ventana es anterior al cambio de bits: lectura propia
+            filas = repo.obtener_mascaras()
+            self._aplicar(bits, filas, completo=True)
+            return len(filas)
+        filas = repo.obtener_mascaras(self._estado.desde)
+        self._aplicar(bits, filas, completo=False)
+        return len(filas)
+
+    def asegurar(self, db: Session) -> "AllergenIndex":
+        """Refrescar si venció el intervalo incremental (o el completo)."""
+        ahora = time.monotonic()
+        if not self._completo_en or ahora - self._completo_en >= settings.ALLERGEN_INDEX_FULL_REFRESH_SECONDS:
+            self.refrescar(db, completo=True)
+        elif ahora - self._refrescado_en >= settings.ALLERGEN_INDEX_REFRESH_SECONDS:
+            self.refrescar(db)
+        return self
+
+    def invalidar(self) -> None:
+        """Forzar un refresco incremental en la próxima consulta (tras una escritura local)."""
+        self._refrescado_en = 0.0
+
+    # --- consultas ---------------------------------------------------------------
+
+    def mascara(self, codigos: Iterable[str]) -> int:
+        """OR de los bits de los códigos (ValueError si alguno no está indexado)."""
+        bits = self._estado.bits
+        mascara = 0
+        for codigo in codigos:
+            if codigo not in bits:
+                raise ValueError(f"Tipo de alergia no indexado: {codigo}")
+            mascara |= 1 << bits[codigo]
+        return mascara
+
+    def codigos(self, mascara: int) -> List[str]:
+        return [codigo for codigo, bit in self._estado.bits.items() if mascara >> bit & 1]
+
+    def mascara_nino(self, nin_id: int) -> Optional[int]:
+        return self._estado.ninos.obtener(nin_id)
+
+    def recetas_seguras(self, mascara: int) -> np.ndarray:
+        """ids de las recetas sin ninguno de los alérgenos de `mascara`."""
+        recetas = self._estado.recetas
+        return recetas.ids[(recetas.mascaras & np.uint64(mascara)) == 0]
+
+    def alimentos_seguros(self, mascara: int) -> np.ndarray:
+        alimentos = self._estado.alimentos
+        return alimentos.ids[(alimentos.mascaras & np.uint64(mascara)) == 0]
+
+    def ninos_alergicos(self, codigos: Iterable[str], ent_id: Optional[int] = None, todas: bool = False) -> np.ndarray:
+        """
+        ids de los niños alérgicos a alguno de los códigos (o a todos con `todas`),
+        opcionalmente solo de una entidad.
+        """
+        m = np.uint64(self.mascara(codigos))
+        ninos = self._estado.ninos
+        comunes = ninos.mascaras & m
+        sel = comunes == m if todas else comunes != 0
+        if ent_id is not None:
+            sel &= ninos.ent_ids == ent_id
+        return ninos.ids[sel]
+
+
+def _bits(filas: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {fila["ta_codigo"]: fila["ta_bit"] for fila in filas if fila["ta_bit"] is not None}
+
+
+def a_columnas(estado: _Estado) -> refdata.Columnas:
+    arrays = {}
+    for nombre in _TABLAS.values():
+        tabla = getattr(estado, nombre)
+        arrays[f"{nombre}_ids"] = tabla.ids
+        arrays[f"{nombre}_mascaras"] = tabla.mascaras
+        arrays[f"{nombre}_ent_ids"] = tabla.ent_ids
+    return arrays, {"bits": estado.bits, "desde": estado.desde.isoformat() if estado.desde else None}
+
+
+def desde_snapshot(snapshot: refdata.Snapshot) -> _Estado:
+    a = snapshot.arrays
+    tablas = {n: Mascaras(a[f"{n}_ids"], a[f"{n}_mascaras"], a[f"{n}_ent_ids"]) for n in _TABLAS.values()}
+    desde = snapshot.meta["desde"]
+    return _Estado(snapshot.meta["bits"], desde=datetime.fromisoformat(desde) if desde else None, **tablas)
+
+
+ALLERGEN_INDEX = AllergenIndex()
+
+
+def get_allergen_index(db: Session) -> AllergenIndex:
+    return ALLERGEN_INDEX.asegurar(db)
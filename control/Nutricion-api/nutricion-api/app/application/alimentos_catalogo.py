@@ -0,0 +1,349 @@
+"""
+Catálogo columnar de alimentos para búsquedas por nutrientes.
+
+Consultas del tipo "alimentos disponibles en Q2 en la sierra con hierro > 5 mg
+por 100 g y precio < S/ 3" se resuelven en memoria, sin joins en MySQL:
+
+- matriz densa alimentos x nutrientes (por 100 g/ml, NaN si no hay dato),
+  en orden de columnas para que cada predicado recorra un arreglo contiguo,
+- disponibilidad y precio por alimento para cada (trimestre, región), armados
+  a demanda a partir de los registros nacionales y regionales y cacheados.
+
+Cada búsqueda es una conjunción de máscaras booleanas más un top-k con
+`argpartition`. El catálogo se comparte en el proceso y se recarga cuando
+cambia versiones_catalogo('ALIMENTOS'), que se consulta como máximo cada
+FOOD_CATALOG_CHECK_SECONDS. Con REFDATA_SHARED las columnas se arman una vez
+por versión y nodo y cada worker las mapea (app.infrastructure.refdata).
+"""
+import logging
+import operator
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure import refdata
+from app.infrastructure.repositories.alimentos_repo import AlimentosRepository
+
+logger = logging.getLogger(__name__)
+
+PERIODOS = ("Q1", "Q2", "Q3", "Q4")
+OPERADORES = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+ORDEN_PRECIO = "PRECIO"
+
+Rango = Tuple[str, str, float]  # (nutri_codigo, operador, valor)
+
+
+@dataclass
+class Disponibilidad:
+    """Disponibilidad y precio (S/ por kg o litro, NaN sin dato) de cada alimento."""
+    disponible: np.ndarray  # (F,) bool
+    precio: np.ndarray      # (F,) float
+
+
+def resolver_disponibilidad(
+    n_ali: int, ali: np.ndarray, nivel: np.ndarray, disponible: np.ndarray, precio: np.ndarray
+) -> Disponibilidad:
+    """
+    Disponibilidad y precio por alimento a partir de registros con prioridad.
+
+    Args:
+        n_ali: Cantidad de alimentos
+        ali: (M,) índice del alimento de cada registro
+        nivel: (M,) prioridad del registro (mayor prevalece; < 0 = no aplica al contexto)
+        disponible: (M,) 1/0 de cada registro
+        precio: (M,) S/ por kg o litro, NaN sin dato
+
+    Returns:
+        Disponibilidad donde, por alimento, decide el nivel más alto con registros:
+        disponible si alguno de ese nivel lo está. El precio es el promedio de los
+        registros con precio del nivel más alto que tenga alguno. Un alimento sin
+        registros se considera disponible y sin precio (NaN).
+    """
+    disponible_ali = np.ones(n_ali, dtype=bool)
+    precio_ali = np.full(n_ali, np.nan)
+    for lvl in np.unique(nivel[nivel >= 0]):  # ascendente: cada nivel pisa a los anteriores
+        sel = nivel == lvl
+        a = ali[sel]
+        con_registro = np.bincount(a, minlength=n_ali) > 0
+        disponible_ali[con_registro] = np.bincount(a, weights=disponible[sel], minlength=n_ali)[con_registro] > 0
+        con_precio = ~np.isnan(precio[sel])
+        suma = np.bincount(a[con_precio], weights=precio[sel][con_precio], minlength=n_ali)
+        cuenta = np.bincount(a[con_precio], minlength=n_ali)
+        precio_ali[cuenta > 0] = suma[cuenta > 0] / cuenta[cuenta > 0]
+    return Disponibilidad(disponible_ali, precio_ali)
+
+
+@dataclass
+class CatalogoAlimentos:
+    version: int
+    ali_ids: np.ndarray            # (F,)
+    nombres: List[str]
+    unidades: List[str]
+    grupos: List[Optional[str]]
+    grupo_idx: np.ndarray          # (F,) índice en `grupo_codigos`, -1 sin grupo
+    grupo_codigos: Dict[str, int]  # grupo en minúsculas -> índice
+    nutrientes: Tuple[str, ...]
+    unidades_nutriente: Dict[str, str]
+    matriz: np.ndarray             # (F, N) orden Fortran
+    # Registros de disponibilidad en columnas: alimento, trimestre, región, disponible, precio
+    dis_ali: np.ndarray
+    dis_periodo: np.ndarray
+    dis_region: np.ndarray         # índice en `regiones`, 0 = nacional
+    dis_disponible: np.ndarray
+    dis_precio: np.ndarray
+    regiones: Dict[str, int]       # región en minúsculas -> índice (>= 1)
+    cargado_en: float = field(default_factory=time.monotonic)
+    _contextos: Dict[Tuple[str, int], Disponibilidad] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self._col = {c: j for j, c in enumerate(self.nutrientes)}
+
+    def columna(self, codigo: str) -> np.ndarray:
+        j = self._col.get(codigo)
+        if j is None:
+            raise ValueError(f"Nutriente desconocido: {codigo}")
+        return self.matriz[:, j]
+
+    def disponibilidad(self, periodo: str, region: Optional[str]) -> Disponibilidad:
+        """
+        Por alimento, los registros de la región prevalecen sobre los nacionales
+        (reglas en `resolver_disponibilidad`, las mismas del generador de menús).
+        """
+        if periodo not in PERIODOS:
+            raise ValueError(f"Periodo inválido: {periodo}")
+        reg = self.regiones.get((region or "").strip().casefold(), 0)
+        key = (periodo, reg)
+        with self._lock:
+            ctx = self._contextos.get(key)
+        if ctx is not None:
+            return ctx
+
+        sel = self.dis_periodo == PERIODOS.index(periodo)
+        region_fila = self.dis_region[sel]
+        # 0 nacional, 1 la región pedida, -1 otra región (con reg = 0 solo cuentan las nacionales)
+        nivel = np.where(region_fila == 0, 0, np.where(region_fila == reg, 1, -1))
+        ctx = resolver_disponibilidad(
+            len(self.ali_ids), self.dis_ali[sel], nivel, self.dis_disponible[sel], self.dis_precio[sel]
+        )
+        with self._lock:
+            self._contextos[key] = ctx
+        return ctx
+
+    def buscar(
+        self,
+        periodo: str,
+        region: Optional[str] = None,
+        rangos: Sequence[Rango] = (),
+        precio_max: Optional[float] = None,
+        grupo: Optional[str] = None,
+        solo_disponibles: bool = True,
+        ordenar_por: Optional[str] = None,
+        por_precio: bool = False,
+        descendente: Optional[bool] = None,
+        limite: int = 50,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Filtrar y ordenar el catálogo.
+
+        Args:
+            periodo: Trimestre Q1-Q4 de disponibilidad y precio
+            region: Región de disponibilidad (sin registros propios usa la nacional)
+            rangos: Predicados (nutri_codigo, operador, valor) sobre la cantidad por 100 g/ml;
+                un alimento sin dato del nutriente no los cumple
+            precio_max: Precio máximo en S/ por kg o litro (excluye alimentos sin precio)
+            grupo: Grupo de alimentos (sin distinguir mayúsculas)
+            solo_disponibles: Excluir los alimentos no disponibles en el trimestre/región
+            ordenar_por: Código de nutriente o "PRECIO"; None = por ali_id
+            por_precio: Ordenar por densidad del nutriente por sol (cantidad por S/ 1)
+            descendente: Sentido del orden; por defecto descendente salvo para el precio
+            limite: Cantidad máxima de resultados
+
+        Returns:
+            (total de alimentos que cumplen, filas del top `limite`)
+        """
+        ctx = self.disponibilidad(periodo, region)
+        mascara = ctx.disponible.copy() if solo_disponibles else np.ones(len(self.ali_ids), dtype=bool)
+        if grupo is not None:
+            mascara &= self.grupo_idx == self.grupo_codigos.get(grupo.strip().casefold(), -2)
+        for codigo, op, valor in rangos:
+            if op not in OPERADORES:
+                raise ValueError(f"Operador inválido: {op}")
+            mascara &= OPERADORES[op](self.columna(codigo), valor)
+        if precio_max is not None:
+            mascara &= ctx.precio <= precio_max
+
+        idx = np.flatnonzero(mascara)
+        total = len(idx)
+        clave = None
+        if ordenar_por == ORDEN_PRECIO:
+            clave = ctx.precio[idx]
+            descendente = False if descendente is None else descendente
+        elif ordenar_por is not None:
+            clave = self.columna(ordenar_por)[idx]
+            if por_precio:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    clave = clave * 10.0 / ctx.precio[idx]  # por 100 g -> por kg, / S/ por kg
+            descendente = True if descendente is None else descendente
+
+        if clave is None:
+            elegidos = idx[:limite]
+        else:
+            # Los NaN (sin dato o sin precio) van al final en cualquier sentido
+            orden = np.where(np.isnan(clave), np.inf, -clave if descendente else clave)
+            if limite < total:
+                # Con empates en el corte, argpartition elige cualquiera: se toman todos los
+                # <= al k-ésimo valor y el orden estable desempata por posición en el catálogo
+                corte = orden[np.argpartition(orden, limite - 1)[limite - 1]]
+                top = np.flatnonzero(orden <= corte)
+                top = top[np.argsort(orden[top], kind="stable")][:limite]
+            else:
+                top = np.argsort(orden, kind="stable")
+            elegidos = idx[top]
+            clave = clave[top]
+
+        # Conversión a tipos de Python en bloque (tolist) para no iterar escalares NumPy
+        con_densidad = por_precio and ordenar_por not in (None, ORDEN_PRECIO)
+        densidades = np.where(np.isfinite(clave), clave, np.nan).tolist() if con_densidad else None
+        precios = ctx.precio[elegidos].round(2).tolist()
+        disponibles = ctx.disponible[elegidos].tolist()
+        filas = []
+        for pos, (i, valores) in enumerate(zip(elegidos.tolist(), self.matriz[elegidos].tolist())):
+            filas.append({
+                "ali_id": int(self.ali_ids[i]),
+                "nombre": self.nombres[i],
+                "grupo": self.grupos[i],
+                "unidad": self.unidades[i],
+                "disponible": disponibles[pos],
+                "precio_kg": precios[pos] if precios[pos] == precios[pos] else None,
+                "nutrientes": {c: v for c, v in zip(self.nutrientes, valores) if v == v},
+                "densidad_precio": densidades[pos] if con_densidad and densidades[pos] == densidades[pos] else None,
+            })
+        return total, filas
+
+
+def construir_catalogo_alimentos(
+    version: int,
+    alimentos: Sequence[Dict[str, Any]],
+    nutrientes: Sequence[Dict[str, Any]],
+    matriz: Sequence[Dict[str, Any]],
+    disponibilidad: Sequence[Dict[str, Any]],
+) -> CatalogoAlimentos:
+    """
+    Armar las columnas del catálogo a partir de las filas del repositorio.
+
+    Args:
+        version: Versión del catálogo con la que se leyeron las filas
+        alimentos: Filas (ali_id, nombre, grupo, unidad) de los alimentos activos
+        nutrientes: Filas (codigo, nombre, unidad)
+        matriz: Filas (ali_id, nutri_codigo, cantidad_100)
+        disponibilidad: Filas (ali_id, periodo, region, disponible, precio)
+
+    Returns:
+        CatalogoAlimentos listo para consultar
+    """
+    ali_ids = np.array([a["ali_id"] for a in alimentos], dtype=np.int64)
+    ali_index = {int(a): i for i, a in enumerate(ali_ids)}
+    codigos = tuple(n["codigo"] for n in nutrientes)
+    col = {c: j for j, c in enumerate(codigos)}
+
+    valores = np.full((len(ali_ids), len(codigos)), np.nan, order="F")
+    filas_n = [f for f in matriz if f["ali_id"] in ali_index and f["nutri_codigo"] in col]
+    if filas_n:
+        valores[
+            [ali_index[f["ali_id"]] for f in filas_n],
+            [col[f["nutri_codigo"]] for f in filas_n],
+        ] = [f["cantidad_100"] for f in filas_n]
+
+    grupo_codigos: Dict[str, int] = {}
+    grupo_idx = np.array([
+        grupo_codigos.setdefault(a["grupo"].strip().casefold(), len(grupo_codigos)) if a["grupo"] else -1
+        for a in alimentos
+    ], dtype=np.int32)
+
+    regiones: Dict[str, int] = {}
+    filas_d = [f for f in disponibilidad if f["ali_id"] in ali_index and f["periodo"] in PERIODOS]
+    dis_region = np.array([
+        regiones.setdefault(f["region"].strip().casefold(), len(regiones) + 1) if f["region"] else 0
+        for f in filas_d
+    ], dtype=np.int32)
+
+    return CatalogoAlimentos(
+        version=version,
+        ali_ids=ali_ids,
+        nombres=[a["nombre"] for a in alimentos],
+        unidades=[a["unidad"] for a in alimentos],
+        grupos=[a["grupo"] for a in alimentos],
+        grupo_idx=grupo_idx,
+        grupo_codigos=grupo_codigos,
+        nutrientes=codigos,
+        unidades_nutriente={n["codigo"]: n["unidad"] for n in nutrientes},
+        matriz=valores,
+        dis_ali=np.array([ali_index[f["ali_id"]] for f in filas_d], dtype=np.int64),
+        dis_periodo=np.array([PERIODOS.index(f["periodo"]) for f in filas_d], dtype=np.int8),
+        dis_region=dis_region,
+        dis_disponible=np.array([f["disponible"] for f in filas_d], dtype=float),
+        dis_precio=np.array([np.nan if f["precio"] is None else f["precio"] for f in filas_d], dtype=float),
+        regiones=regiones,
+    )
+
+
+_ARREGLOS = ("ali_ids", "grupo_idx", "matriz", "dis_ali", "dis_periodo", "dis_region", "dis_disponible", "dis_precio")
+_META = ("nombres", "unidades", "grupos", "grupo_codigos", "nutrientes", "unidades_nutriente", "regiones")
+
+
+def a_columnas(catalogo: CatalogoAlimentos) -> refdata.Columnas:
+    """Arreglos y metadatos del catálogo para publicarlo como snapshot compartido."""
+    return ({c: getattr(catalogo, c) for c in _ARREGLOS}, {c: getattr(catalogo, c) for c in _META})
+
+
+def desde_snapshot(snapshot: refdata.Snapshot) -> CatalogoAlimentos:
+    """Catálogo sobre los arreglos mapeados de un snapshot (solo lectura, sin copias)."""
+    meta = dict(snapshot.meta, nutrientes=tuple(snapshot.meta["nutrientes"]))
+    return CatalogoAlimentos(version=snapshot.version, **snapshot.arrays, **meta)
+
+
+def _cargar(repo: AlimentosRepository, version: int) -> CatalogoAlimentos:
+    return construir_catalogo_alimentos(
+        version,
+        repo.obtener_alimentos(),
+        repo.obtener_nutrientes(),
+        repo.obtener_matriz_nutrientes(),
+        repo.obtener_disponibilidad(),
+    )
+
+
+_catalogo: Optional[CatalogoAlimentos] = None
+_verificado_en = 0.0
+_catalogo_lock = threading.Lock()
+
+
+def obtener_catalogo_alimentos(db: Session, forzar: bool = False) -> CatalogoAlimentos:
+    """
+    Catálogo compartido del proceso. Cada FOOD_CATALOG_CHECK_SECONDS consulta la
+    versión en la base y solo recarga si cambió. La versión se lee antes que los
+    datos: un cambio concurrente provoca, a lo sumo, una recarga extra.
+    """
+    global _catalogo, _verificado_en
+    with _catalogo_lock:
+        ahora = time.monotonic()
+        if _catalogo is not None and not forzar and ahora - _verificado_en < settings.FOOD_CATALOG_CHECK_SECONDS:
+            return _catalogo
+        repo = AlimentosRepository(db)
+        version = repo.obtener_version()
+        _verificado_en = ahora
+        if _catalogo is None or forzar or version != _catalogo.version:
+            if settings.REFDATA_SHARED and not forzar:
+                _catalogo = desde_snapshot(
+                    refdata.obtener("alimentos", version, lambda: a_columnas(_cargar(repo, version)))
+                )
+            else:
+                _catalogo = _cargar(repo, version)
+            logger.info("Catálogo de alimentos v%s cargado: %s alimentos, %s nutrientes",
+                        version, len(_catalogo.ali_ids), len(_catalogo.nutrientes))
+        return _catalogo
@@ -0,0 +1,54 @@
+"""
+Precarga de los datos de referencia compartidos (REFDATA_SHARED):
+catálogo de alimentos, catálogo de menús e índice de alérgenos.
+
+La llama el proceso maestro de gunicorn antes de crear los workers
+(gunicorn.conf.py); también sirve como paso previo al despliegue:
+    python -m app.application.datos_referencia
+"""
+import logging
+import time
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from app.application.alergenos_index import ALLERGEN_INDEX
+from app.application.alimentos_catalogo import obtener_catalogo_alimentos
+from app.application.menus_service import obtener_catalogo
+
+logger = logging.getLogger(__name__)
+
+
+def precargar(db: Session) -> Dict[str, float]:
+    """Publicar (o adjuntar, si ya están vigentes) los snapshots; devuelve segundos por catálogo."""
+    tiempos = {}
+    for nombre, cargar in (
+        ("alimentos", lambda: obtener_catalogo_alimentos(db)),
+        ("menus", lambda: obtener_catalogo(db)),
+        ("alergenos", lambda: ALLERGEN_INDEX.refrescar(db, completo=True)),
+    ):
+        start = time.perf_counter()
+        try:
+            cargar()
+        except Exception:
+            # Un catálogo que falla se arma en el primer uso de cada worker
+            logger.exception("No se pudo precargar %s", nombre)
+            continue
+        tiempos[nombre] = time.perf_counter() - start
+    return tiempos
+
+
+def main():
+    from app.infrastructure.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    db = SessionLocal()
+    try:
+        for nombre, segundos in precargar(db).items():
+            print(f"{nombre}: {segundos * 1000:.0f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
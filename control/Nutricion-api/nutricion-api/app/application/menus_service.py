@@ -0,0 +1,507 @@
+"""
+Generador de menús semanales (men_generado_por = 'IA').
+
+El catálogo se carga una vez en matrices NumPy densas y se comparte entre
+solicitudes hasta que vence su TTL:
+
+- alimentos x nutrientes (por 100 g/ml),
+- recetas x alimentos (gramos por porción) y, a partir de ambas, el vector de
+  nutrientes de cada receta,
+- la máscara de alérgenos de cada receta (`rec_mascara_alergenos`, un bit por
+  tipos_alergias, ver alergenos_index).
+
+Para cada niño se filtran las recetas candidatas (sin sus alérgenos,
+con todos los ingredientes disponibles en su entidad/región en el trimestre y
+dentro del presupuesto diario) y un algoritmo voraz elige, comida por comida,
+la receta que más cubre el déficit de nutrientes del día sin desviarse de la
+energía objetivo, penalizando repeticiones y costo. La poda de presupuesto
+reserva el costo mínimo de las comidas restantes del día. Los niños con las
+mismas entradas (banda de edad, contexto de disponibilidad, alergias y
+presupuesto) comparten el plan, lo que permite planificar miles de niños por lote.
+
+Con REFDATA_SHARED las matrices se arman una vez por ventana de TTL y nodo, y
+cada worker las mapea (app.infrastructure.refdata).
+"""
+import logging
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.application.alimentos_catalogo import resolver_disponibilidad
+from app.core.config import settings
+from app.domain.policies import nutricion_rules as reglas
+from app.infrastructure import refdata
+from app.infrastructure.repositories.menus_repo import MenusRepository
+
+logger = logging.getLogger(__name__)
+
+DIAS_SEMANA = 7
+GRAMOS_POR_UNIDAD = {"g": 1.0, "gr": 1.0, "ml": 1.0, "mg": 0.001, "kg": 1000.0, "l": 1000.0, "lt": 1000.0}
+
+# Pesos del puntaje voraz
+PESO_ENERGIA = 3.0
+PESO_REPETICION = 0.3
+PESO_COSTO = 0.5
+# Desvío de energía admitido en las comidas intermedias, relativo a la meta acumulada
+TOLERANCIA_ENERGIA_PARCIAL = 0.25
+
+
+def periodo_de(fecha: date) -> str:
+    """Trimestre (Q1-Q4) de disponibilidad_alimentos para una fecha."""
+    return f"Q{(fecha.month - 1) // 3 + 1}"
+
+
+def edad_en_meses(fecha_nac: date, fecha: date) -> int:
+    meses = (fecha.year - fecha_nac.year) * 12 + fecha.month - fecha_nac.month
+    return meses - 1 if fecha.day < fecha_nac.day else meses
+
+
+# --- catálogo --------------------------------------------------------------------
+
+
+@dataclass
+class Contexto:
+    """Recetas disponibles y su costo (S/ por porción) para un trimestre y una entidad/región."""
+    disponible: np.ndarray  # (R,) bool
+    costo: np.ndarray       # (R,) float
+
+
+@dataclass
+class CatalogoMenus:
+    nutrientes: Tuple[str, ...]
+    ali_ids: np.ndarray            # (F,)
+    rec_ids: np.ndarray            # (R,)
+    rec_nombres: List[str]
+    gramos: np.ndarray             # (R, F) gramos de cada alimento por porción
+    nutrientes_receta: np.ndarray  # (R, N)
+    mascaras: np.ndarray           # (R,) uint64 alérgenos de cada receta
+    cargado_en: float = field(default_factory=time.monotonic)
+    _disponibilidad: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict, repr=False)
+    _contextos: Dict[Tuple, Contexto] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self._ali_index = {int(a): i for i, a in enumerate(self.ali_ids)}
+
+    @property
+    def idx_energia(self) -> int:
+        return self.nutrientes.index(reglas.ENERGIA)
+
+    def conflicto_alergenos(self, mascara: int) -> np.ndarray:
+        """(R,) True para las recetas con algún alérgeno de la máscara del niño."""
+        return (self.mascaras & np.uint64(mascara)) != 0
+
+    def contexto(self, repo: MenusRepository, periodo: str, ent_id: Optional[int], region: Optional[str]) -> Contexto:
+        key = (periodo, ent_id, (region or "").casefold())
+        with self._lock:
+            ctx = self._contextos.get(key)
+        if ctx is not None:
+            return ctx
+        filas = self._disponibilidad.get(periodo)
+        if filas is None:
+            filas = repo.obtener_disponibilidad(periodo)
+        ctx = self._calcular_contexto(filas, ent_id, key[2])
+        with self._lock:
+            self._disponibilidad[periodo] = filas
+            self._contextos[key] = ctx
+        return ctx
+
+    def _calcular_contexto(self, filas: Sequence[Dict[str, Any]], ent_id: Optional[int], region: str) -> Contexto:
+        """
+        Prioridad por alimento: registro de la entidad > de la región > nacional,
+        resuelta con `alimentos_catalogo.resolver_disponibilidad` (la misma regla
+        de la búsqueda de alimentos). Un alimento sin registros se considera
+        disponible; sin precio se usa la mediana de sus precios del trimestre (o 0)
+        para que el costo de la receta siga siendo comparable.
+        """
+        ali, nivel, disponible, precio = [], [], [], []
+        precios: Dict[int, List[float]] = {}
+        for fila in filas:
+            i = self._ali_index.get(fila["ali_id"])
+            if i is None:
+                continue
+            if fila["precio"] is not None:
+                precios.setdefault(i, []).append(fila["precio"])
+            if fila["ent_id"] is not None:
+                lvl = 2 if fila["ent_id"] == ent_id else -1
+            elif fila["region"]:
+                lvl = 1 if region and fila["region"].casefold() == region else -1
+            else:
+                lvl = 0
+            ali.append(i)
+            nivel.append(lvl)
+            disponible.append(fila["disponible"])
+            precio.append(np.nan if fila["precio"] is None else fila["precio"])
+
+        resuelto = resolver_disponibilidad(
+            len(self.ali_ids),
+            np.array(ali, dtype=np.int64),
+            np.array(nivel, dtype=np.int8),
+            np.array(disponible, dtype=float),
+            np.array(precio, dtype=float),
+        )
+        disponible = resuelto.disponible
+        precio = resuelto.precio
+        for i in np.flatnonzero(np.isnan(precio)):
+            known = precios.get(int(i))
+            precio[i] = statistics.median(known) if known else 0.0
+
+        usa = self.gramos > 0
+        receta_disponible = ~usa[:, ~disponible].any(axis=1)
+        costo = self.gramos @ precio / 1000.0  # precio por kg/l
+        return Contexto(receta_disponible, costo)
+
+
+def construir_catalogo(
+    matriz: Sequence[Dict[str, Any]],
+    ingredientes: Sequence[Dict[str, Any]],
+) -> CatalogoMenus:
+    """
+    Armar las matrices del catálogo a partir de las filas de los procedimientos.
+
+    Args:
+        matriz: Filas (ali_id, nutri_codigo, cantidad_100)
+        ingredientes: Filas (rec_id, rec_nombre, ali_id, cantidad, unidad, mascara)
+
+    Returns:
+        CatalogoMenus con el vector de nutrientes de cada receta precalculado
+    """
+    codigos = reglas.NUTRIENTES_MENU
+    col = {c: j for j, c in enumerate(codigos)}
+    ali_ids = np.array(sorted({f["ali_id"] for f in matriz} | {f["ali_id"] for f in ingredientes}), dtype=np.int64)
+    ali_index = {int(a): i for i, a in enumerate(ali_ids)}
+
+    por_100 = np.zeros((len(ali_ids), len(codigos)))
+    filas_n = [f for f in matriz if f["nutri_codigo"] in col]
+    if filas_n:
+        por_100[
+            [ali_index[f["ali_id"]] for f in filas_n],
+            [col[f["nutri_codigo"]] for f in filas_n],
+        ] = [f["cantidad_100"] for f in filas_n]
+
+    nombres: Dict[int, str] = {}
+    mascaras: Dict[int, int] = {}
+    for f in ingredientes:
+        nombres.setdefault(f["rec_id"], f["rec_nombre"])
+        mascaras.setdefault(f["rec_id"], f.get("mascara", 0))
+    rec_ids = np.array(sorted(nombres), dtype=np.int64)
+    rec_index = {int(r): i for i, r in enumerate(rec_ids)}
+
+    gramos = np.zeros((len(rec_ids), len(ali_ids)))
+    for f in ingredientes:
+        factor = GRAMOS_POR_UNIDAD.get((f["unidad"] or "").strip().lower())
+        if factor is None:
+            logger.warning("Unidad '%s' desconocida en la receta %s; se asume gramos", f["unidad"], f["rec_id"])
+            factor = 1.0
+        gramos[rec_index[f["rec_id"]], ali_index[f["ali_id"]]] += f["cantidad"] * factor
+
+    return CatalogoMenus(
+        nutrientes=codigos,
+        ali_ids=ali_ids,
+        rec_ids=rec_ids,
+        rec_nombres=[nombres[int(r)] for r in rec_ids],
+        gramos=gramos,
+        nutrientes_receta=gramos @ por_100 / 100.0,
+        mascaras=np.array([mascaras[int(r)] for r in rec_ids], dtype=np.uint64),
+    )
+
+
+def a_columnas(catalogo: CatalogoMenus) -> refdata.Columnas:
+    """Matrices y nombres del catálogo para publicarlo como snapshot compartido."""
+    arrays = {c: getattr(catalogo, c) for c in ("ali_ids", "rec_ids", "gramos", "nutrientes_receta", "mascaras")}
+    return arrays, {"nutrientes": list(catalogo.nutrientes), "rec_nombres": catalogo.rec_nombres}
+
+
+def desde_snapshot(snapshot: refdata.Snapshot) -> CatalogoMenus:
+    """Catálogo sobre las matrices mapeadas de un snapshot (solo lectura, sin copias)."""
+    return CatalogoMenus(
+        nutrientes=tuple(snapshot.meta["nutrientes"]),
+        rec_nombres=snapshot.meta["rec_nombres"],
+        **snapshot.arrays,
+    )
+
+
+_catalogo: Optional[CatalogoMenus] = None
+_catalogo_lock = threading.Lock()
+
+
+def obtener_catalogo(db: Session, forzar: bool = False) -> CatalogoMenus:
+    """Catálogo compartido del proceso; se recarga al vencer MENU_CATALOG_TTL_SECONDS."""
+    global _catalogo
+    with _catalogo_lock:
+        vigente = _catalogo is not None and time.monotonic() - _catalogo.cargado_en < settings.MENU_CATALOG_TTL_SECONDS
+        if vigente and not forzar:
+            return _catalogo
+        repo = MenusRepository(db)
+
+        def cargar() -> CatalogoMenus:
+            return construir_catalogo(repo.obtener_matriz_nutrientes(), repo.obtener_ingredientes_recetas())
+
+        if settings.REFDATA_SHARED and not forzar:
+            version = refdata.marca_tiempo(settings.MENU_CATALOG_TTL_SECONDS)
+            _catalogo = desde_snapshot(refdata.obtener("menus", version, lambda: a_columnas(cargar())))
+        else:
+            _catalogo = cargar()
+        logger.info("Catálogo de menús cargado: %s alimentos, %s recetas",
+                    len(_catalogo.ali_ids), len(_catalogo.rec_ids))
+        return _catalogo
+
+
+# --- resolución --------------------------------------------------------------------
+
+
+def resolver_semana(
+    nutrientes_receta: np.ndarray,
+    objetivo: np.ndarray,
+    idx_energia: int,
+    candidatas: np.ndarray,
+    costo: np.ndarray,
+    presupuesto_dia: float,
+) -> Optional[np.ndarray]:
+    """
+    Elegir una receta por comida para los 7 días.
+
+    Args:
+        nutrientes_receta: (R, N) nutrientes por porción
+        objetivo: (N,) objetivos diarios
+        idx_energia: Columna de energía
+        candidatas: (R,) recetas permitidas para el niño
+        costo: (R,) costo por porción
+        presupuesto_dia: Presupuesto diario en soles
+
+    Returns:
+        Matriz (7, comidas) de índices de receta, o None si no hay candidatas
+    """
+    if not candidatas.any():
+        return None
+    comidas = reglas.REPARTO_COMIDAS
+    n_comidas = len(comidas)
+    fraccion_acumulada = np.cumsum([frac for _, frac in comidas])
+    peso = np.ones_like(objetivo)
+    peso[idx_energia] = 0.0
+    peso = peso / objetivo
+    costo_min = float(costo[candidatas].min())
+    escala_costo = max(presupuesto_dia, 1e-6)
+
+    usos = np.zeros(len(candidatas), dtype=np.int32)
+    plan = np.empty((DIAS_SEMANA, n_comidas), dtype=np.int64)
+    for d in range(DIAS_SEMANA):
+        acumulado = np.zeros_like(objetivo)
+        gastado = 0.0
+        hoy = np.zeros(len(candidatas), dtype=bool)
+        for s in range(n_comidas):
+            # Lo que debería llevarse cubierto al terminar esta comida
+            meta = objetivo * fraccion_acumulada[s]
+            desvio = np.abs(acumulado[idx_energia] + nutrientes_receta[:, idx_energia] - meta[idx_energia])
+            ultima = s == n_comidas - 1
+            en_rango = desvio <= (reglas.TOLERANCIA_ENERGIA * objetivo[idx_energia] if ultima
+                                  else TOLERANCIA_ENERGIA_PARCIAL * meta[idx_energia])
+
+            reserva = costo_min * (n_comidas - s - 1)
+            base = candidatas & (costo + gastado + reserva <= presupuesto_dia + 1e-9)
+            variada = base & ~hoy & (usos < reglas.MAX_REPETICIONES_SEMANA)
+            # Se relajan energía, variedad y presupuesto (en ese orden) solo si no queda otra opción
+            for permitido in (variada & en_rango, variada, base & ~hoy, base, candidatas):
+                if permitido.any():
+                    break
+
+            deficit = np.clip(meta - acumulado, 0.0, None)
+            aporte = np.minimum(nutrientes_receta, deficit) @ peso
+            puntaje = (
+                aporte
+                - PESO_ENERGIA * desvio / objetivo[idx_energia]
+                - PESO_REPETICION * usos
+                - PESO_COSTO * costo / escala_costo
+            )
+            k = int(np.argmax(np.where(permitido, puntaje, -np.inf)))
+            plan[d, s] = k
+            acumulado += nutrientes_receta[k]
+            gastado += costo[k]
+            hoy[k] = True
+            usos[k] += 1
+    return plan
+
+
+@dataclass
+class PlanSemanal:
+    nin_id: int
+    inicio: date
+    fin: date
+    presupuesto_dia_pen: float
+    items: List[Dict[str, Any]]
+    kcal_total: int
+    costo_total_pen: float
+    cobertura: Dict[str, float]
+    cumple_objetivos: bool
+    dentro_presupuesto: bool
+    advertencias: List[str] = field(default_factory=list)
+    men_id: Optional[int] = None
+
+
+@dataclass
+class _Resultado:
+    """Plan resuelto para un grupo de niños con las mismas entradas."""
+    items: List[Dict[str, Any]]
+    kcal_total: int
+    costo_total_pen: float
+    cobertura: Dict[str, float]
+    cumple_objetivos: bool
+    dentro_presupuesto: bool
+    advertencias: List[str]
+
+
+def _evaluar(
+    catalogo: CatalogoMenus, plan: np.ndarray, objetivo: np.ndarray, costo: np.ndarray, presupuesto_dia: float
+) -> _Resultado:
+    e = catalogo.idx_energia
+    nutr = catalogo.nutrientes_receta
+    comidas = [c for c, _ in reglas.REPARTO_COMIDAS]
+    totales = nutr[plan].sum(axis=1)  # (7, N)
+    costo_dia = costo[plan].sum(axis=1)
+    cobertura = totales.mean(axis=0) / objetivo
+
+    energia_ok = np.all(np.abs(totales[:, e] / objetivo[e] - 1.0) <= reglas.TOLERANCIA_ENERGIA)
+    resto = np.delete(cobertura, e)
+    advertencias = [
+        f"{codigo} cubre {cobertura[j]:.0%} del objetivo diario"
+        for j, codigo in enumerate(catalogo.nutrientes)
+        if j != e and cobertura[j] < reglas.COBERTURA_MINIMA
+    ]
+    if not energia_ok:
+        advertencias.append("La energía diaria se desvía más de "
+                            f"{reglas.TOLERANCIA_ENERGIA:.0%} del objetivo en algún día")
+    dentro_presupuesto = bool(np.all(costo_dia <= presupuesto_dia + 1e-9))
+    if not dentro_presupuesto:
+        advertencias.append(f"El costo supera S/ {presupuesto_dia:.2f} en {int((costo_dia > presupuesto_dia).sum())} día(s)")
+
+    items = [
+        {
+            "dia_idx": d,
+            "comida": comidas[s],
+            "rec_id": int(catalogo.rec_ids[k]),
+            "rec_nombre": catalogo.rec_nombres[k],
+            "kcal": int(round(nutr[k, e])),
+            "costo_pen": round(float(costo[k]), 2),
+        }
+        for d in range(plan.shape[0])
+        for s, k in enumerate(plan[d])
+    ]
+    return _Resultado(
+        items=items,
+        kcal_total=int(round(totales[:, e].sum())),
+        costo_total_pen=round(float(costo_dia.sum()), 2),
+        cobertura={c: round(float(cobertura[j]), 3) for j, c in enumerate(catalogo.nutrientes)},
+        cumple_objetivos=bool(energia_ok and np.all(resto >= reglas.COBERTURA_MINIMA)),
+        dentro_presupuesto=dentro_presupuesto,
+        advertencias=advertencias,
+    )
+
+
+@dataclass
+class ResultadoGeneracion:
+    planes: List[PlanSemanal]
+    omitidos: List[Dict[str, Any]]
+    grupos: int
+    segundos: float
+
+
+def generar_menus(
+    db: Session,
+    ent_id: Optional[int] = None,
+    nin_id: Optional[int] = None,
+    inicio: Optional[date] = None,
+    presupuesto_dia_pen: Optional[float] = None,
+    guardar: bool = True,
+    commit_cada: int = 200,
+    omitir_con_menu: bool = False,
+) -> ResultadoGeneracion:
+    """
+    Generar menús semanales para un niño, los de una entidad o todos.
+
+    Args:
+        db: Sesión de base de datos
+        ent_id: Filtrar por entidad
+        nin_id: Generar solo para este niño
+        inicio: Primer día del menú (por defecto mañana)
+        presupuesto_dia_pen: Presupuesto diario por niño en soles
+        guardar: Registrar los menús (BORRADOR) y sus ítems
+        commit_cada: Menús por transacción al guardar
+        omitir_con_menu: Omitir a los niños que ya tienen un menú generado para esa semana
+            (reintentos de un lote que alcanzó a confirmar parte de sus menús)
+
+    Returns:
+        ResultadoGeneracion con los planes, los niños omitidos y su motivo
+    """
+    start = time.perf_counter()
+    inicio = inicio or date.today() + timedelta(days=1)
+    fin = inicio + timedelta(days=DIAS_SEMANA - 1)
+    presupuesto = float(presupuesto_dia_pen or settings.MENU_DEFAULT_BUDGET_PER_DAY_PEN)
+    periodo = periodo_de(inicio)
+
+    catalogo = obtener_catalogo(db)
+    repo = MenusRepository(db)
+    con_energia = catalogo.nutrientes_receta[:, catalogo.idx_energia] > 0
+    grupos: Dict[Tuple, Optional[_Resultado]] = {}
+    planes: List[PlanSemanal] = []
+    omitidos: List[Dict[str, Any]] = []
+    pendientes = 0
+
+    for nino in repo.obtener_ninos(ent_id=ent_id, nin_id=nin_id, inicio=inicio):
+        if omitir_con_menu and nino["men_id_semana"]:
+            motivo = f"Ya tiene el menú {nino['men_id_semana']} para esa semana"
+            omitidos.append({"nin_id": nino["nin_id"], "motivo": motivo})
+            continue
+        banda = reglas.banda_edad(edad_en_meses(nino["nin_fecha_nac"], inicio))
+        if banda is None:
+            omitidos.append({"nin_id": nino["nin_id"], "motivo": "Edad fuera del rango de planificación (6 meses a 18 años)"})
+            continue
+
+        key = (banda, nino["ent_id"], (nino["region"] or "").casefold(), nino["mascara_alergias"])
+        if key not in grupos:
+            ctx = catalogo.contexto(repo, periodo, nino["ent_id"], nino["region"])
+            objetivos = reglas.OBJETIVOS_POR_EDAD[banda][2]
+            objetivo = np.array([objetivos[c] for c in catalogo.nutrientes], dtype=float)
+            candidatas = con_energia & ctx.disponible & ~catalogo.conflicto_alergenos(nino["mascara_alergias"])
+            # Poda: una receta que no deja presupuesto para las demás comidas no puede entrar
+            if candidatas.any():
+                minimo = float(ctx.costo[candidatas].min())
+                candidatas &= ctx.costo + minimo * (len(reglas.REPARTO_COMIDAS) - 1) <= presupuesto + 1e-9
+                if not candidatas.any():
+                    candidatas = con_energia & ctx.disponible & ~catalogo.conflicto_alergenos(nino["mascara_alergias"])
+            plan = resolver_semana(catalogo.nutrientes_receta, objetivo, catalogo.idx_energia,
+                                   candidatas, ctx.costo, presupuesto)
+            grupos[key] = None if plan is None else _evaluar(catalogo, plan, objetivo, ctx.costo, presupuesto)
+
+        resultado = grupos[key]
+        if resultado is None:
+            omitidos.append({"nin_id": nino["nin_id"], "motivo": "Sin recetas disponibles y compatibles con sus alergias"})
+            continue
+
+        plan_nino = PlanSemanal(
+            nin_id=nino["nin_id"], inicio=inicio, fin=fin, presupuesto_dia_pen=presupuesto,
+            items=resultado.items, kcal_total=resultado.kcal_total, costo_total_pen=resultado.costo_total_pen,
+            cobertura=resultado.cobertura, cumple_objetivos=resultado.cumple_objetivos,
+            dentro_presupuesto=resultado.dentro_presupuesto, advertencias=list(resultado.advertencias),
+        )
+        if guardar:
+            plan_nino.men_id = repo.crear_menu(
+                plan_nino.nin_id, inicio, fin, plan_nino.kcal_total, plan_nino.items, commit=False
+            )
+            pendientes += 1
+            if pendientes >= commit_cada:
+                db.commit()
+                pendientes = 0
+        planes.append(plan_nino)
+
+    if guardar and pendientes:
+        db.commit()
+    segundos = time.perf_counter() - start
+    logger.info("Menús generados: %s (omitidos %s, %s grupos) en %.2fs",
+                len(planes), len(omitidos), len(grupos), segundos)
+    return ResultadoGeneracion(planes, omitidos, len(grupos), segundos)
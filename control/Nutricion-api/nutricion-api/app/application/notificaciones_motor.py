@@ -0,0 +1,269 @@
+"""
+Motor de notificaciones: agrupación por usuario y tipo, y envío por lotes.
+
+Los productores (`notificar`, `notificar_mediciones_vencidas`, las alertas de
+evaluación) solo insertan filas PENDIENTE con una ventana de agrupación
+(NOTIFICATIONS_COALESCE_SECONDS). El motor sondea `idx_not_pendientes` y, cuando
+vence la primera fila de un grupo (usuario, tipo), reserva todas las del grupo
+y las entrega como un solo digest: un tutor con 40 niños recibe un mensaje con
+40 líneas, no 40 mensajes.
+
+Cada ciclo: reservar (FOR UPDATE SKIP LOCKED, varios procesos pueden compartir
+la cola) -> entregar los digests en un pool de hilos por los canales
+configurados -> registrar todos los resultados en un solo UPDATE. Las fallidas
+se reprograman con backoff exponencial hasta NOTIFICATIONS_MAX_ATTEMPTS. La
+entrega es al menos una vez: si un canal falla, el reintento vuelve a usar
+todos los canales.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.infrastructure.external.notificaciones_canales import Canal, Digest, crear_canales
+from app.infrastructure.repositories.notificaciones_repo import NotificacionesRepository
+
+logger = logging.getLogger(__name__)
+
+DIGESTS = REGISTRY.counter(
+    "notification_digests_total", "Digests de notificaciones por tipo y resultado", ("tipo", "resultado")
+)
+NOTIFICATIONS_DELIVERED = REGISTRY.counter(
+    "notifications_delivered_total", "Notificaciones entregadas dentro de un digest", ("tipo",)
+)
+CYCLE_SECONDS = REGISTRY.histogram("notification_cycle_seconds", "Duración de un ciclo de reserva y envío")
+
+
+# --- formato --------------------------------------------------------------------
+
+
+def _linea_alerta(p: Dict[str, Any]) -> str:
+    return (f"{p.get('nin_nombres') or 'Niño ' + str(p.get('nin_id'))}: {p.get('clasificacion')} "
+            f"(riesgo {p.get('nivel_riesgo')}, z IMC {p.get('z_score_imc')})")
+
+
+def _linea_medicion(p: Dict[str, Any]) -> str:
+    nombre = p.get("nin_nombres") or f"Niño {p.get('nin_id')}"
+    ultima = p.get("ultima_fecha")
+    return f"{nombre}: sin medición desde {ultima}" if ultima else f"{nombre}: sin mediciones registradas"
+
+
+# tipo -> (asunto en singular, asunto en plural, línea por notificación)
+FORMATOS: Dict[str, Tuple[str, str, Callable[[Dict[str, Any]], str]]] = {
+    "ALERTA_NUTRICIONAL": ("Alerta nutricional", "alertas nutricionales", _linea_alerta),
+    "MEDICION_VENCIDA": ("Medición pendiente", "mediciones pendientes", _linea_medicion),
+}
+
+
+def _linea_generica(p: Dict[str, Any]) -> str:
+    return ", ".join(f"{k}: {v}" for k, v in p.items())
+
+
+def agrupar(filas: Iterable[Dict[str, Any]]) -> List[Digest]:
+    """Armar un digest por (usuario, tipo) a partir de filas ordenadas como las devuelve `reclamar`."""
+    digests = []
+    for (usr_id, tipo), grupo in groupby(filas, key=lambda f: (f["usr_id"], f["not_tipo"])):
+        grupo = list(grupo)
+        singular, plural, linea = FORMATOS.get(tipo, (tipo, tipo, _linea_generica))
+        payloads = [f["not_payload"] or {} for f in grupo]
+        lineas = [linea(p) for p in payloads]
+        asunto = f"{singular}: {lineas[0]}" if len(grupo) == 1 else f"{len(grupo)} {plural}"
+        digests.append(Digest(
+            usr_id=usr_id,
+            correo=grupo[0]["usr_correo"],
+            nombre=grupo[0].get("usr_nombre") or "",
+            tipo=tipo,
+            asunto=asunto,
+            lineas=lineas,
+            not_ids=[f["not_id"] for f in grupo],
+            payloads=payloads,
+        ))
+    return digests
+
+
+# --- productores ------------------------------------------------------------------
+
+
+def notificar(
+    db: Session,
+    usr_ids: Iterable[Optional[int]],
+    tipo: str,
+    payload: Dict[str, Any],
+    clave: Optional[str] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Registrar la misma notificación para varios usuarios (un INSERT multi-fila).
+
+    Args:
+        db: Sesión de base de datos
+        usr_ids: Destinatarios (se ignoran None y repetidos)
+        tipo: Tipo de notificación (clave de agrupación junto al usuario)
+        payload: Datos del evento
+        clave: Evita repetir el aviso al mismo usuario
+        commit: Confirmar la transacción (False para escribir junto a otra operación)
+
+    Returns:
+        Notificaciones nuevas
+    """
+    filas = [{"usr_id": u, "tipo": tipo, "payload": payload, "clave": clave} for u in set(usr_ids) if u is not None]
+    return NotificacionesRepository(db).crear_lote(filas, settings.NOTIFICATIONS_COALESCE_SECONDS, commit=commit)
+
+
+def notificar_mediciones_vencidas(db: Session, dias: Optional[int] = None, lote: int = 1000) -> int:
+    """Avisar a tutores y propietarios de los niños sin medición en `dias` días (una vez por última medición)."""
+    dias = dias or settings.NOTIFICATIONS_OVERDUE_DAYS
+    repo = NotificacionesRepository(db)
+    filas = [
+        {
+            "usr_id": v["usr_id"],
+            "tipo": "MEDICION_VENCIDA",
+            "payload": {"nin_id": v["nin_id"], "nin_nombres": v["nin_nombres"], "ultima_fecha": v["ultima_fecha"]},
+            "clave": f"medicion_vencida:{v['nin_id']}:{v['ultima_fecha'] or 'nunca'}",
+        }
+        for v in repo.mediciones_vencidas(dias)
+    ]
+    nuevas = 0
+    for i in range(0, len(filas), lote):
+        nuevas += repo.crear_lote(filas[i:i + lote], settings.NOTIFICATIONS_COALESCE_SECONDS)
+    return nuevas
+
+
+# --- motor --------------------------------------------------------------------------
+
+
+class NotificationEngine:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        canales: Sequence[Canal],
+        workers: int = 4,
+        poll_interval: float = 2.0,
+        max_grupos: int = 200,
+        max_intentos: int = 8,
+        backoff_base: int = 30,
+        backoff_max: int = 3600,
+        lock_timeout: int = 300,
+        name: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.canales = list(canales)
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.max_grupos = max_grupos
+        self.max_intentos = max_intentos
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lock_timeout = lock_timeout
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_recovery = 0.0
+
+    def _entregar(self, digest: Digest) -> Tuple[bool, Optional[str]]:
+        for c in self.canales:
+            try:
+                c.enviar(digest)
+            except Exception as exc:
+                logger.warning("Canal %s falló para el digest %s de %s: %s", c.nombre, digest.tipo, digest.usr_id, exc)
+                return False, f"{c.nombre}: {exc}"[:500]
+        return True, None
+
+    def poll_once(self) -> int:
+        """Reservar los grupos vencidos, entregarlos y registrar el resultado. Devuelve los digests procesados."""
+        start = time.perf_counter()
+        db = self.session_factory()
+        try:
+            repo = NotificacionesRepository(db)
+            now = time.monotonic()
+            if now - self._last_recovery > self.lock_timeout / 2:
+                self._last_recovery = now
+                recuperadas = repo.recuperar_expiradas(self.lock_timeout)
+                if recuperadas:
+                    logger.warning("%s notificaciones recuperadas tras timeout de reserva", recuperadas)
+
+            digests = agrupar(repo.reclamar(self.name, self.max_grupos))
+            if not digests:
+                return 0
+            if self._executor is not None:
+                resultados = list(self._executor.map(self._entregar, digests))
+            else:
+                resultados = [self._entregar(d) for d in digests]
+
+            filas = []
+            for digest, (ok, error) in zip(digests, resultados):
+                filas.extend({"id": not_id, "ok": int(ok), "error": error} for not_id in digest.not_ids)
+                DIGESTS.inc((digest.tipo, "ok" if ok else "error"))
+                if ok:
+                    NOTIFICATIONS_DELIVERED.inc((digest.tipo,), len(digest.not_ids))
+            repo.finalizar(self.name, filas, self.max_intentos, self.backoff_base, self.backoff_max)
+            return len(digests)
+        finally:
+            db.close()
+            CYCLE_SECONDS.observe(time.perf_counter() - start)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                procesados = self.poll_once()
+            except Exception:
+                logger.exception("Error en el ciclo de notificaciones")
+                procesados = 0
+            # Con un lote completo probablemente quedan más grupos vencidos
+            if procesados < self.max_grupos:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def start(self) -> None:
+        """Iniciar el sondeo y el pool de envío (idempotente)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="notificacion")
+        self._thread = threading.Thread(target=self._loop, name="notification-poller", daemon=True)
+        self._thread.start()
+        logger.info("NotificationEngine %s iniciado (canales=%s, hilos=%s)",
+                    self.name, [c.nombre for c in self.canales], self.workers)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Terminar el ciclo en curso; lo no finalizado vuelve a la cola por timeout de reserva."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=True)
+        self._thread = None
+        self._executor = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+
+@lru_cache(maxsize=None)
+def get_notification_engine() -> NotificationEngine:
+    from app.infrastructure.db.session import SessionLocal
+
+    return NotificationEngine(
+        SessionLocal,
+        crear_canales(),
+        workers=settings.NOTIFICATIONS_WORKERS,
+        poll_interval=settings.NOTIFICATIONS_POLL_SECONDS,
+        max_grupos=settings.NOTIFICATIONS_BATCH_GROUPS,
+        max_intentos=settings.NOTIFICATIONS_MAX_ATTEMPTS,
+        backoff_base=settings.NOTIFICATIONS_BACKOFF_SECONDS,
+        backoff_max=settings.NOTIFICATIONS_BACKOFF_MAX_SECONDS,
+        lock_timeout=settings.NOTIFICATIONS_LOCK_TIMEOUT_SECONDS,
+    )
@@ -1,8 +1,231 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
 from sqlalchemy.orm import Session
+from app.application.sintomas_series import Series, caracteristicas_poblacion, cargar_series
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.infrastructure.external.ia_client import ModelBundle, load_rf_bundle
+from app.infrastructure.repositories.riesgo_repo import RiesgoRepository
 from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
 from fastapi import HTTPException
 
+logger = logging.getLogger(__name__)
+
 def insert_rol(db: Session, rol_codigo: str, rol_nombre: str):
     repo = UsuariosRepository(db)
     result = repo.insert_rol(rol_codigo, rol_nombre)
     return result
+
+
+RIESGO_VERSION_BAZ = "baz-v1"
+
+
+def puntaje_riesgo_baz(z_score_imc: Optional[float]) -> float:
+    """
+    Puntaje de riesgo (0-1) a partir del z-score IMC/edad.
+
+    Args:
+        z_score_imc: Z-score IMC para la edad (OMS)
+
+    Returns:
+        Logística sobre |z|: 0.5 en |z| = 2 (límite de desnutrición/sobrepeso),
+        ~0.88 en |z| = 3 y ~0.02 en z = 0
+    """
+    if z_score_imc is None:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-2.0 * (abs(float(z_score_imc)) - 2.0)))
+
+
+# --- Puntaje por lote --------------------------------------------------------
+
+# Columnas del random forest (configs/rf.yaml de ml-recomendator) que se pueden
+# derivar de la base; el resto queda como faltante y lo imputa el preprocesamiento.
+RF_COLUMNAS = {
+    "age_months": "edad_meses",
+    "BMI": "imc",
+    "sex": "nin_sexo",
+    "diarrhea_last_2w": "diarrea_14d",
+}
+
+# Características alineadas en el tiempo (sintomas_series) que sp_riesgo_caracteristicas
+# no calcula; se agregan a cada fila y quedan en pri_caracteristicas con el puntaje
+SERIES_COLUMNAS = (
+    "diarrea_episodios",
+    "fiebre_episodios",
+    "delta_z_imc",
+    "ganancia_peso_g_dia",
+    "dias_desde_medicion",
+)
+
+RIESGO_SCORED = REGISTRY.counter(
+    "risk_scores_written_total", "Puntajes de riesgo guardados por versión de modelo", ("version",)
+)
+RIESGO_LOTE_DURACION = REGISTRY.histogram(
+    "risk_batch_seconds", "Duración de corridas de puntaje por lote", ("modo",)
+)
+
+
+def _z_score(fila: Dict[str, Any]) -> Optional[float]:
+    z = fila.get("en_z_score_imc")
+    return z if z is not None else fila.get("ant_z_imc")
+
+
+def rf_frame(filas: Sequence[Dict[str, Any]], features: Sequence[str]):
+    """DataFrame columnar con las columnas del modelo; las no derivables quedan en NaN."""
+    import pandas as pd
+
+    nan = float("nan")
+    columnas = {}
+    for feature in features:
+        fuente = RF_COLUMNAS.get(feature)
+        if fuente is None:
+            columnas[feature] = [nan] * len(filas)
+        else:
+            columnas[feature] = [nan if fila[fuente] is None else fila[fuente] for fila in filas]
+    return pd.DataFrame(columnas, columns=list(features))
+
+
+def agregar_caracteristicas_series(filas: Sequence[Dict[str, Any]], series: Series, fecha: date) -> None:
+    """
+    Completar las filas de un lote con SERIES_COLUMNAS a la fecha `fecha`.
+
+    Args:
+        filas: Filas de `iter_caracteristicas` (se modifican)
+        series: Series de la población leídas una vez por corrida
+        fecha: Fecha de referencia de la corrida
+
+    NaN (sin datos) queda como None, igual que las columnas de SQL.
+    """
+    if not filas:
+        return
+    columnas = caracteristicas_poblacion(series, [fila["nin_id"] for fila in filas], fecha)
+    for nombre in SERIES_COLUMNAS:
+        for fila, valor in zip(filas, columnas[nombre].tolist()):
+            fila[nombre] = None if valor != valor else valor
+
+
+class BazRiskModel:
+    """Puntaje por z-score IMC/edad; se usa cuando no hay un modelo entrenado disponible."""
+
+    version = RIESGO_VERSION_BAZ
+
+    def score(self, filas: Sequence[Dict[str, Any]]) -> List[float]:
+        return [puntaje_riesgo_baz(_z_score(fila)) for fila in filas]
+
+
+class RandomForestRiskModel:
+    """
+    Random forest de ml-recomendator aplicado a un lote completo: una sola
+    transformación y un solo `predict_proba` por lote. El riesgo es la
+    probabilidad de no estar en la clase 0 (estado normal).
+    """
+
+    def __init__(self, bundle: ModelBundle):
+        self.bundle = bundle
+        self.version = bundle.version
+        self._normal = list(bundle.model.classes_).index(0)
+
+    def score(self, filas: Sequence[Dict[str, Any]]) -> List[float]:
+        if not filas:
+            return []
+        X = self.bundle.preprocess.transform(rf_frame(filas, self.bundle.features))
+        proba = self.bundle.model.predict_proba(X)
+        return (1.0 - proba[:, self._normal]).tolist()
+
+
+@lru_cache(maxsize=None)
+def get_risk_model():
+    """Random forest si hay artefactos y dependencias; si no, el puntaje BAZ."""
+    bundle = load_rf_bundle()
+    if bundle is not None:
+        try:
+            return RandomForestRiskModel(bundle)
+        except Exception:
+            logger.exception("Modelo %s no utilizable; se usa %s", bundle.version, RIESGO_VERSION_BAZ)
+    return BazRiskModel()
+
+
+@dataclass
+class ResultadoLote:
+    rej_id: int
+    version: str
+    modo: str
+    puntuados: int
+    segundos: float
+
+
+class RiskScoringEngine:
+    """
+    Puntaje de riesgo de toda la población.
+
+    Las características se leen en streaming desde una sesión dedicada (la
+    conexión queda ocupada por el cursor) y cada lote se puntúa y se inserta
+    desde la sesión de escritura. Cada corrida queda registrada en
+    puntajes_riesgo_ejecuciones; en modo incremental solo se puntúan los niños
+    con entradas nuevas o modificadas desde el inicio de la última corrida
+    completada con la misma versión de modelo, o cuyas ventanas de síntomas (14
+    días) o adherencia (30 días) perdieron un evento desde entonces. Un cambio
+    de modelo (otra versión) provoca una corrida completa.
+
+    Al inicio se leen las series de síntomas, adherencia y antropometría de la
+    población (`cargar_series`) y cada lote se completa con SERIES_COLUMNAS.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        session_factory: Callable[[], Session],
+        model=None,
+        batch_size: Optional[int] = None,
+    ):
+        self.db = db
+        self.session_factory = session_factory
+        self.model = model or get_risk_model()
+        self.batch_size = batch_size or settings.RISK_BATCH_SIZE
+
+    def run(self, incremental: bool = True) -> ResultadoLote:
+        """
+        Ejecutar una corrida.
+
+        Args:
+            incremental: Puntuar solo los niños con cambios desde la última corrida
+
+        Returns:
+            ResultadoLote con la corrida registrada y la cantidad de niños puntuados
+        """
+        repo = RiesgoRepository(self.db)
+        ejecucion = repo.iniciar_ejecucion(self.model.version, incremental)
+        rej_id = ejecucion["rej_id"]
+        start = time.perf_counter()
+        puntuados = 0
+
+        reader = self.session_factory()
+        try:
+            hoy = date.today()
+            series = cargar_series(reader, hoy)
+            for filas in RiesgoRepository(reader).iter_caracteristicas(ejecucion["rej_desde"], self.batch_size):
+                agregar_caracteristicas_series(filas, series, hoy)
+                riesgos = self.model.score(filas)
+                puntuados += repo.insertar_puntajes_lote(
+                    rej_id, self.model.version, ejecucion["rej_iniciado_en"], filas, riesgos
+                )
+        except Exception as exc:
+            self.db.rollback()
+            repo.finalizar_ejecucion(rej_id, "FALLADO", puntuados, str(exc))
+            raise
+        finally:
+            reader.close()
+
+        repo.finalizar_ejecucion(rej_id, "COMPLETADO", puntuados)
+        segundos = time.perf_counter() - start
+        RIESGO_SCORED.inc((self.model.version,), puntuados)
+        RIESGO_LOTE_DURACION.observe(segundos, (ejecucion["rej_modo"],))
+        logger.info("Corrida de riesgo %s (%s, %s): %s niños en %.1fs",
+                    rej_id, self.model.version, ejecucion["rej_modo"], puntuados, segundos)
+        return ResultadoLote(rej_id, self.model.version, ejecucion["rej_modo"], puntuados, segundos)
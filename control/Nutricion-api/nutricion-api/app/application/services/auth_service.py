@@ -3,8 +3,10 @@ Servicio de autenticación refactorizado.
 Usa servicios de infraestructura en lugar de implementaciones directas.
 Sigue los principios de Clean Architecture.
 """
+import logging
 import re
 import secrets
+from datetime import datetime
 from typing import Optional, Tuple
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -12,13 +14,19 @@ from fastapi import Depends, Header, HTTPException
 
 from app.domain.interfaces.usuarios_repository import IUsuariosRepository
 from app.infrastructure.repositories.usuarios_repo import UsuariosRepository
-from app.infrastructure.security.password_service import PasswordService
-from app.infrastructure.security.jwt_service import JWTService
+from app.infrastructure.security.password_service import PasswordService, get_password_service
+from app.infrastructure.security.jwt_service import JWTService, get_jwt_service
 from app.infrastructure.security.google_oauth_client import GoogleOAuthClient
+from app.infrastructure.security.revocation import RevocationSet, get_revocation_set
+from app.infrastructure.repositories.tokens_repo import TokensRepository
+from app.infrastructure.db.audit import set_audit_user
+from app.infrastructure.db.replicas import fijar_usuario
 from app.infrastructure.db.session import get_db
 from app.schemas.auth import Token, UserLogin, UserResponse
 from app.schemas.usuarios import UserRegister
 
+logger = logging.getLogger(__name__)
+
 
 class AuthService:
     """
@@ -30,12 +38,14 @@ class AuthService:
         repository: IUsuariosRepository,
         password_service: PasswordService,
         jwt_service: JWTService,
-        google_client: Optional[GoogleOAuthClient] = None
+        google_client: Optional[GoogleOAuthClient] = None,
+        revocation_set: Optional[RevocationSet] = None
     ):
         self.repository = repository
         self.password_service = password_service
         self.jwt_service = jwt_service
         self.google_client = google_client or GoogleOAuthClient()
+        self.revocation_set = revocation_set
     
     def authenticate_user(self, user_login: UserLogin) -> UserResponse:
         """
@@ -55,12 +65,20 @@ class AuthService:
             raise HTTPException(status_code=400, detail="Usuario no encontrado")
         
         # Verificar contraseña usando el servicio de passwords
-        if not self.password_service.verify_password(user_login.contrasena, user.password_hash):
+        valid, new_hash = self.password_service.verify_and_update(user_login.contrasena, user.password_hash)
+        if not valid:
             raise HTTPException(status_code=400, detail="Contraseña incorrecta")
         
         if not user.usr_activo:
             raise HTTPException(status_code=401, detail="Usuario inactivo")
         
+        if new_hash:
+            # Parámetros de hashing cambiaron: rehash transparente
+            try:
+                self.repository.update_password_hash(user.usr_id, new_hash)
+            except SQLAlchemyError:
+                logger.warning("No se pudo actualizar el hash de usr_id=%s", user.usr_id, exc_info=True)
+        
         return user
     
     def login_user(self, user_login: UserLogin) -> Token:
@@ -96,7 +114,14 @@ class AuthService:
             HTTPException: Si el token es inválido o el usuario no existe
         """
         # Verificar token usando el servicio de JWT
-        username = self.jwt_service.verify_token(token)
+        claims = self.jwt_service.verify_claims(token)
+        username = claims.get("sub")
+        if username is None:
+            raise HTTPException(status_code=401, detail="Token inválido")
+
+        jti = claims.get("jti")
+        if jti and self.revocation_set is not None and self.revocation_set.is_revoked(jti):
+            raise HTTPException(status_code=401, detail="Token revocado")
         
         user = self.repository.get_user_by_username(username)
         if not user:
@@ -351,8 +376,8 @@ def login_user(db: Session, user_login: UserLogin) -> Token:
     """Función legacy - usar AuthService.login_user()"""
     auth_service = AuthService(
         repository=UsuariosRepository(db),
-        password_service=PasswordService(),
-        jwt_service=JWTService()
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service()
     )
     return auth_service.login_user(user_login)
 
@@ -376,24 +401,44 @@ def get_current_user(
     # Usar AuthService
     auth_service = AuthService(
         repository=UsuariosRepository(db),
-        password_service=PasswordService(),
-        jwt_service=JWTService()
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service(),
+        revocation_set=get_revocation_set()
     )
     
-    return auth_service.get_current_user_from_token(token)
+    user = auth_service.get_current_user_from_token(token)
+    set_audit_user(user.usr_id)
+    fijar_usuario(db, user.usr_id)
+    return user
+
 
+def logout_user(db: Session, token: str) -> bool:
+    """
+    Revocar el token: se persiste en `tokens_revocados` y se registra en el
+    conjunto en memoria para que deje de aceptarse de inmediato.
+
+    Returns:
+        True si el token se revocó, False si no era un token válido con `jti`
+    """
+    jwt_service = get_jwt_service()
+    claims = jwt_service.decode_token(token)
+    jti = claims.get("jti")
+    exp = claims.get("exp")
+    if not jti or exp is None:
+        return False
 
-def logout_user(_token: str):
-    """Logout (placeholder para futura implementación con blacklist)"""
-    return
+    TokensRepository().revoke(db, jti, claims.get("sub", ""), datetime.utcfromtimestamp(exp))
+    get_revocation_set().add(jti, float(exp))
+    jwt_service.claims_cache.discard(token)
+    return True
 
 
 def login_google_user(db: Session, id_token_value: str) -> Token:
     """Función legacy - usar AuthService.login_with_google()"""
     auth_service = AuthService(
         repository=UsuariosRepository(db),
-        password_service=PasswordService(),
-        jwt_service=JWTService(),
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service(),
         google_client=GoogleOAuthClient()
     )
     return auth_service.login_with_google(id_token_value)
@@ -403,8 +448,8 @@ def build_google_authorize_url(redirect_to: str) -> str:
     """Función legacy - usar AuthService.build_google_auth_url()"""
     auth_service = AuthService(
         repository=UsuariosRepository(Session()),  # Session dummy
-        password_service=PasswordService(),
-        jwt_service=JWTService(),
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service(),
         google_client=GoogleOAuthClient()
     )
     return auth_service.build_google_auth_url(redirect_to)
@@ -414,8 +459,8 @@ def resolve_google_redirect_from_state(state_token: str) -> str:
     """Función legacy"""
     auth_service = AuthService(
         repository=UsuariosRepository(Session()),  # Session dummy
-        password_service=PasswordService(),
-        jwt_service=JWTService(),
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service(),
         google_client=GoogleOAuthClient()
     )
     return auth_service.resolve_google_redirect_from_state(state_token)
@@ -425,8 +470,8 @@ def complete_google_oauth(db: Session, code: str) -> Tuple[Token, Optional[str]]
     """Función legacy"""
     auth_service = AuthService(
         repository=UsuariosRepository(db),
-        password_service=PasswordService(),
-        jwt_service=JWTService(),
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service(),
         google_client=GoogleOAuthClient()
     )
     return auth_service.complete_google_oauth(code)
@@ -441,8 +486,8 @@ def build_google_oauth_redirect(
     """Función legacy"""
     auth_service = AuthService(
         repository=UsuariosRepository(Session()),  # Session dummy
-        password_service=PasswordService(),
-        jwt_service=JWTService(),
+        password_service=get_password_service(),
+        jwt_service=get_jwt_service(),
         google_client=GoogleOAuthClient()
     )
     return auth_service.build_google_redirect_url(url, token, error, avatar_url)
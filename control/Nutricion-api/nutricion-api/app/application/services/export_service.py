@@ -0,0 +1,131 @@
+"""
+Servicio de exportación de mediciones.
+Convierte los lotes de ExportRepository en chunks CSV, NDJSON o Parquet para
+StreamingResponse. Las columnas siguen el formato de `data/raw/surveys` del
+recomendador, de modo que el archivo sirve directamente como entrada de
+`label_dataset`.
+"""
+import csv
+import io
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from app.core.serialization import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependencia opcional, solo para format=parquet
+    pa = None
+    pq = None
+
+# (columna exportada, clave del repositorio, tipo arrow)
+EXPORT_COLUMNS = (
+    ("child_id", "nin_id", "int64"),
+    ("sex", "nin_sexo", "string"),
+    ("birth_date", "nin_fecha_nac", "date32"),
+    ("age_months", "edad_meses", "int32"),
+    ("weight_kg", "ant_peso_kg", "float64"),
+    ("height_cm", "ant_talla_cm", "float64"),
+    ("bmi", "imc", "float64"),
+    ("measurement_date", "ant_fecha", "date32"),
+    ("allergies", "alergias", "string"),
+    ("ent_id", "ent_id", "int64"),
+    ("ant_id", "ant_id", "int64"),
+    ("z_bmi_age", "ant_z_imc", "float64"),
+    ("z_weight_age", "ant_z_peso_edad", "float64"),
+    ("z_height_age", "ant_z_talla_edad", "float64"),
+    ("evaluation_z_bmi", "en_z_score_imc", "float64"),
+    ("evaluation_percentile", "en_percentil_imc", "float64"),
+    ("evaluation_class", "en_clasificacion", "string"),
+    ("risk_level", "en_nivel_riesgo", "string"),
+)
+COLUMN_NAMES = [name for name, _, _ in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "parquet": "parquet"}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def to_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Renombrar una fila del repositorio a las columnas de exportación."""
+    return {name: row.get(key) for name, key, _ in EXPORT_COLUMNS}
+
+
+def csv_chunks(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(COLUMN_NAMES)
+    for batch in batches:
+        for row in batch:
+            writer.writerow(["" if v is None else v for v in to_record(row).values()])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(dumps(to_record(row)) + b"\n" for row in batch)
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Destino de escritura para ParquetWriter que acumula bytes hasta que se
+    drenan, llevando la posición absoluta (necesaria para el footer).
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def parquet_chunks(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Un row group por lote; cada row group se envía apenas se escribe."""
+    if pa is None:
+        raise RuntimeError("pyarrow no está instalado")
+    schema = pa.schema([(name, getattr(pa, arrow_type)()) for name, _, arrow_type in EXPORT_COLUMNS])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="snappy")
+    try:
+        for batch in batches:
+            columns = {name: [row.get(key) for row in batch] for name, key, _ in EXPORT_COLUMNS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+WRITERS: Dict[str, Callable[[Iterable[List[Dict[str, Any]]]], Iterator[bytes]]] = {
+    "csv": csv_chunks,
+    "ndjson": ndjson_chunks,
+    "parquet": parquet_chunks,
+}
@@ -0,0 +1,278 @@
+"""
+Series de síntomas, adherencia y antropometría para el pipeline de riesgo/ML.
+
+Cada serie se lee de una vez para toda la población (una consulta por tabla,
+ordenada por niño y fecha) y queda en columnas NumPy con una clave entera
+niño/día. Las características se calculan para todos los pares (niño, fecha de
+referencia) a la vez, con `searchsorted` sobre esa clave:
+
+- as-of: la última fila del mismo niño con fecha <= referencia (antropometría)
+- ventanas: sumas sobre (referencia - n días, referencia] con sumas acumuladas
+- episodios: días con el síntoma separados por más de 2 días sin él (la misma
+  regla que mantienen los triggers en `sintomas_episodios`)
+
+Como cada característica usa solo filas con fecha <= referencia, sirve tanto
+para puntuar hoy como para armar datos de entrenamiento en fechas pasadas sin
+filtrar información futura. RiskScoringEngine agrega a cada fila las que SQL no
+calcula (episodios, velocidad de crecimiento; ver `riesgo_service.SERIES_COLUMNAS`)
+y quedan guardadas con el puntaje en pri_caracteristicas; GET /sintomas/correlacion
+usa el resto.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.application.adherencias_ingesta import PESO_PARCIAL
+from app.infrastructure.repositories.sintomas_repo import SintomasRepository
+
+CATEGORIAS = {
+    "DIARREA": 1,
+    "VOMITO": 2,
+    "FIEBRE": 4,
+    "RESPIRATORIO": 8,
+    "APETITO": 16,
+    "OTRO": 128,
+}
+SEPARACION_EPISODIO_DIAS = 2
+
+# Clave niño/día: nin_id en los bits altos, días desde 1970 en los 20 bajos
+_DIAS_BITS = 20
+
+
+def nombre_categoria(bit: int) -> str:
+    for nombre, valor in CATEGORIAS.items():
+        if valor == bit:
+            return nombre
+    return "OTRO"
+
+
+_ORDINAL_1970 = date(1970, 1, 1).toordinal()
+
+
+def a_dias(fechas) -> np.ndarray:
+    """Fechas (date, datetime64 o ISO) como días desde 1970 (int64)."""
+    if isinstance(fechas, list) and fechas and isinstance(fechas[0], date):
+        # Las filas de MySQL llegan como date: toordinal es ~15x más rápido que datetime64
+        return np.fromiter(map(date.toordinal, fechas), np.int64, len(fechas)) - _ORDINAL_1970
+    return np.asarray(fechas, dtype="datetime64[D]").astype(np.int64)
+
+
+def _clave(nin_ids: np.ndarray, dias: np.ndarray) -> np.ndarray:
+    return (nin_ids << _DIAS_BITS) + np.maximum(dias, 0)
+
+
+@dataclass(frozen=True)
+class Serie:
+    """Filas de una tabla por niño y fecha, ordenadas por (nin_id, día)."""
+
+    nin_ids: np.ndarray
+    dias: np.ndarray
+    columnas: Dict[str, np.ndarray]
+    claves: np.ndarray
+
+    @classmethod
+    def desde_columnas(cls, nin_ids, fechas, **columnas) -> "Serie":
+        n = np.asarray(nin_ids, dtype=np.int64)
+        d = a_dias(fechas)
+        claves = _clave(n, d)
+        valores = {k: np.asarray(v, dtype=np.float64) for k, v in columnas.items()}
+        if len(claves) > 1 and not (claves[1:] >= claves[:-1]).all():
+            orden = np.argsort(claves, kind="stable")
+            n, d, claves = n[orden], d[orden], claves[orden]
+            valores = {k: v[orden] for k, v in valores.items()}
+        return cls(n, d, valores, claves)
+
+    def __len__(self) -> int:
+        return len(self.claves)
+
+    def filtrar(self, mascara: np.ndarray) -> "Serie":
+        return Serie(self.nin_ids[mascara], self.dias[mascara],
+                     {k: v[mascara] for k, v in self.columnas.items()}, self.claves[mascara])
+
+    def _limites(self, nin_ids: np.ndarray, dias: np.ndarray, ventana: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Posiciones [lo, hi) de las filas del niño con día en (día - ventana, día]."""
+        hi = np.searchsorted(self.claves, _clave(nin_ids, dias), side="right")
+        lo = np.searchsorted(self.claves, _clave(nin_ids, dias - ventana), side="right")
+        return lo, hi
+
+    def asof(self, nin_ids: np.ndarray, dias: np.ndarray, tolerancia: Optional[int] = None) -> np.ndarray:
+        """Índice de la última fila del mismo niño con día <= referencia; -1 si no hay."""
+        pos = np.searchsorted(self.claves, _clave(nin_ids, dias), side="right") - 1
+        valido = pos >= 0
+        pos_ok = np.where(valido, pos, 0)
+        if len(self):
+            valido &= self.nin_ids[pos_ok] == nin_ids
+            if tolerancia is not None:
+                valido &= dias - self.dias[pos_ok] <= tolerancia
+        else:
+            valido[:] = False
+        return np.where(valido, pos, -1)
+
+    def dia(self, indices: np.ndarray) -> np.ndarray:
+        """Día de las filas en `indices` (de `asof`); 0 donde el índice es -1."""
+        if not len(self):
+            return np.zeros(len(indices), dtype=np.int64)
+        return np.where(indices >= 0, self.dias[np.maximum(indices, 0)], 0)
+
+    def tomar(self, columna: str, indices: np.ndarray) -> np.ndarray:
+        """Valores de `columna` en `indices` (de `asof`); NaN donde el índice es -1."""
+        valores = self.columnas[columna]
+        if not len(valores):
+            return np.full(len(indices), np.nan)
+        return np.where(indices >= 0, valores[np.maximum(indices, 0)], np.nan)
+
+    def suma_ventana(self, columna: Optional[str], nin_ids: np.ndarray, dias: np.ndarray, ventana: int) -> np.ndarray:
+        """Suma de `columna` (o cantidad de filas si es None) en la ventana de cada referencia."""
+        lo, hi = self._limites(nin_ids, dias, ventana)
+        if columna is None:
+            return (hi - lo).astype(np.float64)
+        acumulada = np.concatenate(([0.0], np.cumsum(np.nan_to_num(self.columnas[columna]))))
+        return acumulada[hi] - acumulada[lo]
+
+    def episodios_ventana(self, bit: int, nin_ids: np.ndarray, dias: np.ndarray, ventana: int) -> np.ndarray:
+        """Episodios de la categoría `bit` con al menos un día en la ventana de cada referencia."""
+        sub = self.filtrar((self.columnas["categorias"].astype(np.int64) & bit) != 0)
+        if not len(sub):
+            return np.zeros(len(nin_ids), dtype=np.int64)
+        nuevo = np.ones(len(sub), dtype=bool)
+        nuevo[1:] = (sub.nin_ids[1:] != sub.nin_ids[:-1]) | (np.diff(sub.dias) > SEPARACION_EPISODIO_DIAS)
+        episodio = np.cumsum(nuevo)
+        lo, hi = sub._limites(nin_ids, dias, ventana)
+        hay = hi > lo
+        # Las filas [lo, hi) son del mismo niño y sus episodios son consecutivos
+        return np.where(hay, episodio[np.maximum(hi - 1, 0)] - episodio[np.minimum(lo, len(sub) - 1)] + 1, 0)
+
+
+@dataclass(frozen=True)
+class Series:
+    sintomas: Serie
+    adherencia: Serie
+    antropometria: Serie
+
+    def nin_ids(self) -> np.ndarray:
+        return np.unique(np.concatenate((self.sintomas.nin_ids, self.adherencia.nin_ids, self.antropometria.nin_ids)))
+
+
+def construir_series(sintomas: Dict[str, list], adherencia: Dict[str, list], antropometria: Dict[str, list]) -> Series:
+    """Series a partir de las columnas de SintomasRepository.serie_*."""
+    return Series(
+        sintomas=Serie.desde_columnas(
+            sintomas["nin_id"], sintomas["fecha"],
+            categorias=sintomas["categorias"], grado_max=sintomas["grado_max"], eventos=sintomas["eventos"],
+        ),
+        adherencia=Serie.desde_columnas(
+            adherencia["nin_id"], adherencia["fecha"],
+            ok=adherencia["ok"], parcial=adherencia["parcial"], no=adherencia["no"],
+        ),
+        antropometria=Serie.desde_columnas(
+            antropometria["nin_id"], antropometria["fecha"],
+            peso_kg=antropometria["peso_kg"], talla_cm=antropometria["talla_cm"], z_imc=antropometria["z_imc"],
+            z_peso_edad=antropometria["z_peso_edad"], z_talla_edad=antropometria["z_talla_edad"],
+        ),
+    )
+
+
+def cargar_series(db: Session, hasta: date, historia_dias: int = 400) -> Series:
+    """
+    Leer las tres series de toda la población (tres consultas).
+
+    Args:
+        db: Sesión de base de datos
+        hasta: Fecha de referencia más reciente que se va a consultar
+        historia_dias: Días hacia atrás que se leen; debe cubrir la ventana más larga
+            y la antigüedad admitida de la última medición
+    """
+    repo = SintomasRepository(db)
+    desde = hasta - timedelta(days=historia_dias)
+    return construir_series(repo.serie_sintomas(desde), repo.serie_adherencia(desde), repo.serie_antropometria(desde))
+
+
+def caracteristicas_poblacion(
+    series: Series,
+    nin_ids: Sequence[int],
+    fechas: Iterable,
+    ventana_sintomas: int = 14,
+    ventana_adherencia: int = 30,
+    ventana_crecimiento: int = 90,
+    antiguedad_medicion: int = 365,
+) -> Dict[str, np.ndarray]:
+    """
+    Características de síntomas, adherencia y crecimiento por (niño, fecha).
+
+    Args:
+        series: Series de la población (`cargar_series` / `construir_series`)
+        nin_ids: Niño de cada referencia
+        fechas: Fecha de cada referencia (o una sola fecha para todas)
+        ventana_sintomas: Días de la ventana de síntomas (14: diarrhea_last_2w del modelo)
+        ventana_adherencia: Días de la ventana de adherencia
+        ventana_crecimiento: Separación entre mediciones para la velocidad de crecimiento
+        antiguedad_medicion: Días máximos desde la última medición para usarla
+
+    Returns:
+        Columnas NumPy alineadas con `nin_ids`; NaN donde no hay datos
+    """
+    n = np.asarray(nin_ids, dtype=np.int64)
+    d = a_dias(fechas)
+    if d.ndim == 0:
+        d = np.full(len(n), d, dtype=np.int64)
+    s, a, m = series.sintomas, series.adherencia, series.antropometria
+    diarrea = CATEGORIAS["DIARREA"]
+    dias_diarrea = s.filtrar((s.columnas["categorias"].astype(np.int64) & diarrea) != 0)
+
+    ok = a.suma_ventana("ok", n, d, ventana_adherencia)
+    parcial = a.suma_ventana("parcial", n, d, ventana_adherencia)
+    registros = ok + parcial + a.suma_ventana("no", n, d, ventana_adherencia)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        adherencia = np.where(registros > 0, (ok + PESO_PARCIAL * parcial) / registros, np.nan)
+
+    actual = m.asof(n, d, tolerancia=antiguedad_medicion)
+    previa = m.asof(n, d - ventana_crecimiento, tolerancia=antiguedad_medicion)
+    previa = np.where((previa >= 0) & (previa != actual), previa, -1)
+    dias_actual = m.dia(actual)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ganancia = (m.tomar("peso_kg", actual) - m.tomar("peso_kg", previa)) * 1000.0 / (dias_actual - m.dia(previa))
+
+    return {
+        "nin_id": n,
+        "sintomas_dias": s.suma_ventana(None, n, d, ventana_sintomas),
+        "sintomas_eventos": s.suma_ventana("eventos", n, d, ventana_sintomas),
+        "diarrea_dias": dias_diarrea.suma_ventana(None, n, d, ventana_sintomas),
+        "diarrea_episodios": s.episodios_ventana(diarrea, n, d, ventana_sintomas),
+        "fiebre_episodios": s.episodios_ventana(CATEGORIAS["FIEBRE"], n, d, ventana_sintomas),
+        "adherencia": adherencia,
+        "adherencia_registros": registros,
+        "z_imc": m.tomar("z_imc", actual),
+        "z_talla_edad": m.tomar("z_talla_edad", actual),
+        "peso_kg": m.tomar("peso_kg", actual),
+        "dias_desde_medicion": np.where(actual >= 0, d - dias_actual, np.nan),
+        "delta_z_imc": m.tomar("z_imc", actual) - m.tomar("z_imc", previa),
+        "ganancia_peso_g_dia": ganancia,
+    }
+
+
+def correlaciones(
+    caracteristicas: Dict[str, np.ndarray], x: Sequence[str], y: Sequence[str]
+) -> List[Dict[str, object]]:
+    """
+    Correlación de Pearson entre cada par (x, y) sobre las filas con ambos valores.
+
+    Returns:
+        Una entrada por par con `n` y `r` (None si hay menos de 3 filas o varianza cero)
+    """
+    resultado = []
+    for cx in x:
+        vx = np.asarray(caracteristicas[cx], dtype=np.float64)
+        for cy in y:
+            vy = np.asarray(caracteristicas[cy], dtype=np.float64)
+            validos = ~(np.isnan(vx) | np.isnan(vy))
+            cantidad = int(validos.sum())
+            r = None
+            if cantidad >= 3:
+                xs, ys = vx[validos], vy[validos]
+                if xs.std() > 0 and ys.std() > 0:
+                    r = round(float(np.corrcoef(xs, ys)[0, 1]), 4)
+            resultado.append({"x": cx, "y": cy, "n": cantidad, "r": r})
+    return resultado
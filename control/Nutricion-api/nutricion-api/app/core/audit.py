@@ -0,0 +1,107 @@
+"""
+Middleware de auditoría.
+
+Abre un `AuditContext` por request para que los repositorios registren
+eventos sin escribir en la base. Si la respuesta termina con éxito (< 400) los
+envía a la cola de `AuditWriter`; un request de escritura (POST/PUT/PATCH/DELETE)
+que no registró ninguno produce un evento genérico con la plantilla de la ruta.
+Con errores no se audita nada: la operación no se completó.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.infrastructure.db.audit import AuditContext, _contexto, get_audit_writer, nuevo_evento
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+ACCIONES = {"POST": "CREAR", "PUT": "ACTUALIZAR", "PATCH": "ACTUALIZAR", "DELETE": "ELIMINAR"}
+# Primer parámetro de la ruta -> eau_entidad, para consultar el historial por id
+PARAM_ENTIDAD = {
+    "nin_id": "ninos",
+    "usr_id": "usuarios",
+    "men_id": "menus",
+    "ent_id": "entidades",
+    "tra_id": "trabajos",
+    "not_id": "notificaciones",
+}
+
+
+def resolve_route(scope) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Plantilla y parámetros de la ruta que atendió el request."""
+    from starlette.routing import Match
+
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None), child_scope.get("path_params", {})
+    return None, {}
+
+
+def evento_de_ruta(method: str, template: str, params: Dict[str, Any], status: int) -> Dict[str, Any]:
+    relativa = template[len(settings.API_V1_STR):] if template.startswith(settings.API_V1_STR) else template
+    if params:
+        nombre, valor = next(iter(params.items()))
+        entidad = PARAM_ENTIDAD.get(nombre, nombre)
+    else:
+        entidad, valor = relativa.strip("/").split("/", 1)[0] or "api", None
+    return nuevo_evento(
+        entidad, valor, ACCIONES.get(method, method),
+        {"ruta": relativa, "metodo": method, "status": status, "params": params or None},
+    )
+
+
+class AuditMiddleware:
+    """Middleware ASGI puro (como MetricsMiddleware)."""
+
+    def __init__(self, app, writer_factory=get_audit_writer, excluded_paths: Optional[str] = None):
+        self.app = app
+        self.writer_factory = writer_factory
+        excluded = settings.AUDIT_EXCLUDED_PATHS if excluded_paths is None else excluded_paths
+        self.excluded = tuple(p.strip() for p in excluded.split(",") if p.strip())
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not settings.AUDIT_ENABLED
+            or scope["type"] != "http"
+            or (self.excluded and scope.get("path", "").startswith(self.excluded))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        ctx = AuditContext(ip=client[0] if client else None)
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        token = _contexto.set(ctx)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _contexto.reset(token)
+
+        status = status_holder[0]
+        if status >= 400:
+            return
+        eventos = ctx.eventos
+        method = scope.get("method", "")
+        if not eventos and method in MUTATING_METHODS:
+            template, params = resolve_route(scope)
+            if template is not None:
+                eventos = [evento_de_ruta(method, template, params, status)]
+        if not eventos:
+            return
+
+        writer = self.writer_factory()
+        for evento in eventos:
+            if evento["usr_id"] is None:
+                evento["usr_id"] = ctx.usr_id
+            evento["ip"] = evento["ip"] or ctx.ip
+            # Con la cola llena, la política de desborde (que puede esperar) corre fuera del event loop
+            if not writer.offer(evento):
+                await run_in_threadpool(writer.submit, evento)
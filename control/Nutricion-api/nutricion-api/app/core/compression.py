@@ -0,0 +1,202 @@
+"""
+Compresión de respuestas (brotli si está instalado, si no gzip).
+
+Middleware ASGI puro: negocia `Accept-Encoding`, respeta un tamaño mínimo,
+comprime también respuestas en streaming (con flush por chunk) y ajusta
+`Vary`, `Content-Length` y el ETag fuerte de la representación comprimida.
+"""
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+from .http_cache import ENCODING_SUFFIXES
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+# SSE necesita entregar cada evento tal cual llega
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def _parse_accept_encoding(value: str) -> dict:
+    accepted = {}
+    for item in value.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, raw = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Elegir la codificación a usar según `Accept-Encoding`.
+
+    Returns:
+        "br", "gzip" o None si el cliente no acepta ninguna
+    """
+    if not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = (("br", "gzip") if brotli_available else ("gzip",))
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _is_compressible(content_type: Optional[bytes]) -> bool:
+    if not content_type:
+        return False
+    ctype = content_type.decode("latin-1").lower()
+    if ctype.startswith(EXCLUDED_TYPES):
+        return False
+    return ctype.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Comprime respuestas de tipos textuales cuando el cliente lo acepta y el
+    cuerpo supera `minimum_size`. El ETag fuerte recibe el sufijo de la
+    codificación (p. ej. `"abc-gzip"`), ya que la representación es otra.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[dict] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None and not passthrough:
+                headers = list(start_message.get("headers", []))
+                status = start_message["status"]
+                compressible = _is_compressible(_header(headers, b"content-type"))
+                if compressible:
+                    headers = _add_vary(headers)
+                if (
+                    not compressible
+                    or status < 200 or status in (204, 304)
+                    or _header(headers, b"content-encoding") is not None
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send({**start_message, "headers": headers})
+                else:
+                    compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                    headers = _rewrite_headers(headers, encoding)
+                    if not more_body:
+                        body = compressor.compress(body, final=True)
+                        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                        await send({**start_message, "headers": headers})
+                        await send({"type": "http.response.body", "body": body, "more_body": False})
+                        return
+                    await send({**start_message, "headers": headers})
+
+            if passthrough:
+                await send(message)
+                return
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    for i, (key, value) in enumerate(headers):
+        if key.lower() == b"vary":
+            if b"accept-encoding" not in value.lower() and value.strip() != b"*":
+                headers[i] = (key, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+def _rewrite_headers(headers: List[Tuple[bytes, bytes]], encoding: str) -> List[Tuple[bytes, bytes]]:
+    out = []
+    for key, value in headers:
+        lower = key.lower()
+        if lower == b"content-length":
+            continue
+        if lower == b"etag" and not value.startswith(b"W/") and value.endswith(b'"'):
+            tag = value[:-1].decode("latin-1")
+            if not tag.endswith(ENCODING_SUFFIXES):
+                value = f'{tag}-{encoding}"'.encode("latin-1")
+        out.append((key, value))
+    out.append((b"content-encoding", encoding.encode("latin-1")))
+    return out
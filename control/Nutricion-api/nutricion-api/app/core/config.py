@@ -7,14 +7,99 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: str = ""  # URLs de réplicas separadas por coma; vacío = todo al primario
+    REPLICA_READ_PROCEDURES: str = ""  # procedimientos de solo lectura extra (además de los del dashboard)
+    REPLICA_MAX_LAG_SECONDS: float = 2.0
+    REPLICA_LAG_CHECK_SECONDS: float = 1.0
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_BACKEND: str = "jose"  # "jose" o "pyjwt"
+    JWT_CLAIMS_CACHE_SIZE: int = 4096
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    TOKEN_REVOCATION_PURGE_SECONDS: float = 300.0
+    PASSWORD_HASH_SCHEME: str = "pbkdf2_sha256"
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_SALT_SIZE: int = 16
+    PASSWORD_HASH_WORKERS: int = 2  # 0 = hashing en el mismo proceso
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     GOOGLE_REDIRECT_URI: Optional[str] = None
     GOOGLE_POST_LOGIN_REDIRECT: Optional[str] = "http://localhost:5173"
     GOOGLE_ALLOWED_REDIRECTS: Optional[str] = None
+    DEBUG_HEADERS: bool = False
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_TOKEN: Optional[str] = None  # header X-Profile para perfilar un request puntual
+    PROFILING_OUTPUT_DIR: str = "profiles"
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_CONCURRENT: int = 1
+    METRICS_TOKEN: Optional[str] = None  # Bearer para GET /metrics; sin token el endpoint no se expone
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+    GOOGLE_TOKEN_URL: str = "https://oauth2.googleapis.com/token"
+    GOOGLE_USERINFO_URL: str = "https://www.googleapis.com/oauth2/v2/userinfo"
+    GOOGLE_HTTP_POOL_SIZE: int = 10
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    JOBS_INPROCESS: bool = True  # False si se ejecuta `python -m app.workers` aparte
+    JOBS_CONCURRENCY: int = 4
+    JOBS_POLL_SECONDS: float = 1.0
+    JOBS_LOCK_TIMEOUT_SECONDS: int = 300
+    NOTIFICATIONS_WEBHOOK_URL: Optional[str] = None
+    NOTIFICATIONS_WEBHOOK_TIMEOUT: float = 5.0
+    NOTIFICATIONS_INPROCESS: bool = True  # False si se ejecuta `python -m app.workers.notificaciones` aparte
+    NOTIFICATIONS_CHANNELS: str = ""  # webhook,smtp,archivo,log; vacío = webhook si hay URL, si no log
+    NOTIFICATIONS_COALESCE_SECONDS: int = 600  # ventana de agrupación por usuario y tipo
+    NOTIFICATIONS_WORKERS: int = 4
+    NOTIFICATIONS_POLL_SECONDS: float = 2.0
+    NOTIFICATIONS_BATCH_GROUPS: int = 200
+    NOTIFICATIONS_MAX_ATTEMPTS: int = 8
+    NOTIFICATIONS_BACKOFF_SECONDS: int = 30
+    NOTIFICATIONS_BACKOFF_MAX_SECONDS: int = 3600
+    NOTIFICATIONS_LOCK_TIMEOUT_SECONDS: int = 300
+    NOTIFICATIONS_FILE_DIR: str = "notificaciones_out"
+    NOTIFICATIONS_OVERDUE_DAYS: int = 60  # días sin medición para avisar
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 587
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_FROM: str = "no-reply@appsaludable.pe"
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT: float = 10.0
+    RISK_MODEL_DIR: Optional[str] = None  # por defecto models/ del checkout de ml-recomendator (ver find_models_dir)
+    RISK_BATCH_SIZE: int = 5000
+    MENU_CATALOG_TTL_SECONDS: int = 600
+    MENU_DEFAULT_BUDGET_PER_DAY_PEN: float = 8.0  # budget_per_day_pen por niño
+    ALLERGEN_INDEX_REFRESH_SECONDS: float = 30.0
+    ALLERGEN_INDEX_FULL_REFRESH_SECONDS: float = 3600.0
+    FOOD_CATALOG_CHECK_SECONDS: float = 5.0  # consulta de versiones_catalogo('ALIMENTOS')
+    # Catálogos de alimentos/menús e índice de alérgenos publicados una vez por nodo y mapeados por cada worker
+    REFDATA_SHARED: bool = True
+    REFDATA_DIR: Optional[str] = None  # por defecto /dev/shm/appsaludable-refdata
+    ML_RECOMENDATOR_DIR: Optional[str] = None  # sin el paquete instalado; por defecto modelo/ml-recomendator del repo
+    # /ml/summary: espera al LLM como máximo ML_SUMMARY_BUDGET_MS; lo demás termina en segundo plano
+    ML_SUMMARY_BUDGET_MS: int = 800
+    ML_SUMMARY_MAX_BUDGET_MS: int = 5000  # tope del budget_ms que puede pedir el cliente
+    ML_SUMMARY_WORKERS: int = 4
+    ML_SUMMARY_MAX_PENDING: int = 64  # llamadas al LLM en curso; más allá se responde solo el resumen offline
+    ML_SUMMARY_TTL_SECONDS: float = 600.0
+    ML_SUMMARY_DIR: Optional[str] = None  # por defecto <REFDATA_DIR>/ml-resumenes (compartido por los workers)
+    ML_SUMMARY_STREAM_SECONDS: float = 35.0  # duración máxima del SSE (LLM_TIMEOUT + margen)
+    ADHERENCE_LOG_DIR: Optional[str] = "adherencias_log"  # None = solo memoria, sin recuperación
+    ADHERENCE_LOG_FSYNC: bool = True
+    ADHERENCE_FLUSH_MS: int = 250
+    ADHERENCE_FLUSH_ROWS: int = 500
+    ADHERENCE_MAX_BUFFERED: int = 50000  # eventos sin confirmar en MySQL; por encima, 503
+    ADHERENCE_RETRY_AFTER_SECONDS: int = 5
+    AUDIT_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_MS: int = 200
+    AUDIT_OVERFLOW_POLICY: str = "drop_oldest"  # block | drop_oldest | drop_newest
+    AUDIT_BLOCK_TIMEOUT_MS: int = 100
+    AUDIT_EXCLUDED_PATHS: str = "/api/v1/adherencias"  # prefijos separados por coma
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,50 @@
+"""
+Utilidades para GET condicionales (ETag / If-None-Match).
+"""
+import hashlib
+from typing import Iterable, Optional
+
+# Sufijos que CompressionMiddleware agrega al ETag de la representación comprimida
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Construir un ETag fuerte a partir de las partes que determinan el contenido.
+
+    Args:
+        parts: Valores que identifican la versión de la representación
+
+    Returns:
+        ETag entre comillas, p. ej. '"3f1a..."'
+    """
+    raw = "|".join(str(p) for p in parts).encode("utf-8")
+    return '"' + hashlib.sha1(raw).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def _split_tags(header: str) -> Iterable[str]:
+    return (t for t in header.split(",") if t.strip())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Comparación débil de If-None-Match (RFC 9110 §13.1.2), ignorando el
+    sufijo de codificación que agrega la compresión.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(tag) == target for tag in _split_tags(if_none_match))
@@ -0,0 +1,256 @@
+"""
+Perfilado opcional por request.
+
+Un profiler de muestreo captura las pilas de los hilos que atienden el request
+(solo mientras ejecutan código de ese request) y escribe un archivo `.folded`
+(compatible con flamegraph.pl / speedscope) junto con un `.sql.json` con los
+tiempos SQL atribuidos a cada método de repositorio. Se activa con
+`PROFILING_ENABLED` (muestreando una fracción del tráfico) o por request con el
+header `X-Profile: <PROFILING_TOKEN>`.
+"""
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from types import FrameType
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_REPOSITORY_MODULE_PREFIX = "app.infrastructure.repositories"
+_START_KEY = "_profiling_query_start"
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """
+    Muestras de pila y tiempos SQL de un request.
+
+    Cada hilo se asocia a un frame ancla del request: el del middleware en el
+    hilo del event loop, y el frame de la app más externo en los hilos del
+    threadpool. Solo se cuentan las pilas que contienen su ancla, así no se
+    mezclan otros requests que corren en el mismo hilo.
+    """
+
+    def __init__(self, method: str, path: str, anchor: FrameType):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self._loop_thread = threading.get_ident()
+        self.anchors: Dict[int, FrameType] = {self._loop_thread: anchor}
+        self.stacks: Counter = Counter()
+        self.sql: Dict[str, Dict[str, float]] = defaultdict(lambda: {"calls": 0, "total_ms": 0.0})
+        self._lock = threading.Lock()
+
+    def register_current_thread(self) -> None:
+        # Los endpoints síncronos corren en el threadpool: se registran al primer hook
+        tid = threading.get_ident()
+        frame = sys._getframe(1)
+        with self._lock:
+            anchor = self.anchors.get(tid)
+        outermost = None
+        while frame is not None:
+            if frame is anchor:
+                return
+            if frame.f_code.co_filename.startswith(_APP_DIR):
+                outermost = frame
+            frame = frame.f_back
+        if outermost is not None:
+            with self._lock:
+                self.anchors[tid] = outermost
+
+    def record_sql(self, owner: str, procedure: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self.sql[f"{owner} -> {procedure}"]
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed * 1000
+
+    def sample(self, frames) -> None:
+        with self._lock:
+            anchors = list(self.anchors.items())
+        for tid, anchor in anchors:
+            frame = frames.get(tid)
+            stack = []
+            owned = False
+            while frame is not None:
+                owned = owned or frame is anchor
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if owned:
+                self.stacks[";".join(reversed(stack))] += 1
+            elif tid != self._loop_thread:
+                # La llamada del request terminó: el hilo del pool ya atiende otra cosa
+                with self._lock:
+                    if self.anchors.get(tid) is anchor:
+                        del self.anchors[tid]
+
+    def close(self) -> None:
+        with self._lock:
+            self.anchors.clear()
+
+    def write(self, output_dir: str, duration: float) -> str:
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        safe_path = self.path.strip("/").replace("/", "_") or "root"
+        base = os.path.join(output_dir, f"{stamp}-{self.method}-{safe_path}-{self.id}")
+
+        with open(f"{base}.folded", "w", encoding="utf-8") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+        with open(f"{base}.sql.json", "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "id": self.id,
+                    "method": self.method,
+                    "path": self.path,
+                    "duration_ms": round(duration * 1000, 3),
+                    "samples": sum(self.stacks.values()),
+                    "sql": {
+                        k: {"calls": v["calls"], "total_ms": round(v["total_ms"], 3)}
+                        for k, v in sorted(self.sql.items(), key=lambda kv: -kv[1]["total_ms"])
+                    },
+                },
+                fh,
+                ensure_ascii=False,
+                indent=2,
+            )
+        return base
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, profile: RequestProfile, interval: float):
+        super().__init__(name=f"profiler-{profile.id}", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            frames.pop(own, None)
+            self.profile.sample(frames)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(1.0)
+
+
+def _repository_owner() -> str:
+    """Método de repositorio más cercano en la pila (p.ej. NinosRepository.obtener_nino)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        owner = frame.f_locals.get("self")
+        if owner is not None and type(owner).__module__.startswith(_REPOSITORY_MODULE_PREFIX):
+            return f"{type(owner).__name__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<sin repositorio>"
+
+
+def install_sql_profiling(engine: Engine) -> None:
+    """Atribuir el tiempo de cada sentencia al método de repositorio que la emitió."""
+    from app.infrastructure.db.instrumentation import procedure_name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is None:
+            return
+        profile.register_current_thread()
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is None:
+            return
+        starts = conn.info.get(_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        profile.record_sql(_repository_owner(), procedure_name(statement), elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        conn = context.connection
+        if conn is not None and _current_profile.get() is not None:
+            starts = conn.info.get(_START_KEY)
+            if starts:
+                starts.pop()
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila requests seleccionados.
+
+    El número de requests perfilados en paralelo está acotado por
+    `PROFILING_MAX_CONCURRENT`; si no hay cupo, el request se atiende sin perfilar.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.enabled = settings.PROFILING_ENABLED
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.token = (settings.PROFILING_TOKEN or "").encode() or None
+        self.output_dir = settings.PROFILING_OUTPUT_DIR
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000.0
+        self._slots = threading.BoundedSemaphore(max(1, settings.PROFILING_MAX_CONCURRENT))
+
+    def _requested(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.enabled and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._slots.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope.get("method", ""), scope.get("path", ""), sys._getframe())
+        token = _current_profile.set(profile)
+        sampler = _Sampler(profile, self.interval)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            profile.close()
+            _current_profile.reset(token)
+            self._slots.release()
+            try:
+                path = profile.write(self.output_dir, time.perf_counter() - start)
+                logger.info("Perfil de %s %s guardado en %s", profile.method, profile.path, path)
+            except OSError:
+                logger.exception("No se pudo guardar el perfil %s", profile.id)
@@ -0,0 +1,129 @@
+"""
+Serialización JSON con orjson.
+
+- `ORJSONResponse`: clase de respuesta por defecto de la app. orjson serializa
+  date/datetime/UUID de forma nativa; Decimal, Enum y modelos Pydantic se
+  resuelven en `_default`.
+- `trusted_response`: para datos que ya vienen con los tipos del modelo desde
+  los repositorios, proyecta los dicts a los campos del `response_model` y los
+  serializa directamente, sin la validación + serialización de FastAPI.
+"""
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="python")
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializar a JSON (bytes) con las mismas reglas que `ORJSONResponse`."""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# --- proyección a response_model ----------------------------------------------
+
+Projector = Callable[[Any], Any]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _projector_for_annotation(annotation: Any) -> Projector:
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _projector_for_annotation(args[0]) if len(args) == 1 else _identity
+    if origin in (list, tuple, set, frozenset):
+        args = get_args(annotation)
+        inner = _projector_for_annotation(args[0]) if args else _identity
+        if inner is _identity:
+            return _identity
+        return lambda items: None if items is None else [inner(item) for item in items]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return model_projector(annotation)
+    return _identity
+
+
+@lru_cache(maxsize=None)
+def model_projector(model: Type[BaseModel]) -> Projector:
+    """
+    Construir (una vez por modelo) una función que reduce un dict a los campos
+    declarados por `model`, recursivamente, completando los valores por defecto.
+    No valida tipos: solo para datos de confianza con los tipos ya correctos.
+    """
+    plan: Tuple[Tuple[str, Projector, bool, Any], ...] = tuple(
+        (
+            name,
+            _projector_for_annotation(field.annotation),
+            field.is_required(),
+            None if field.is_required() else field.get_default(call_default_factory=True),
+        )
+        for name, field in model.model_fields.items()
+    )
+
+    def project(data: Any) -> Optional[Dict[str, Any]]:
+        if data is None:
+            return None
+        if isinstance(data, BaseModel):
+            data = data.model_dump(mode="python")
+        out = {}
+        for name, sub, required, default in plan:
+            if name in data:
+                value = data[name]
+                out[name] = value if sub is _identity or value is None else sub(value)
+            elif not required:
+                out[name] = default
+        return out
+
+    return project
+
+
+def trusted_response(
+    content: Any,
+    model: Type[BaseModel],
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    """
+    Responder datos de confianza sin re-validarlos contra el `response_model`.
+
+    Args:
+        content: Dict o lista de dicts con los tipos del modelo (date, datetime, float...)
+        model: Modelo Pydantic que define los campos expuestos
+        status_code: Código HTTP
+        headers: Cabeceras adicionales (p. ej. ETag)
+
+    Returns:
+        ORJSONResponse con el contenido proyectado a los campos del modelo
+    """
+    project = model_projector(model)
+    if isinstance(content, list):
+        body = [project(item) for item in content]
+    else:
+        body = project(content)
+    return ORJSONResponse(content=body, status_code=status_code, headers=dict(headers or {}))
@@ -63,3 +63,8 @@ class INinosRepository(ABC):
     def asignar_tutor(self, nin_id: int, usr_id: int) -> Optional[Any]:
         """Asignar tutor a un niño"""
         pass
+    
+    @abstractmethod
+    def get_data_version(self, usr_id: int) -> int:
+        """Versión de los datos de niños de un tutor (para ETag)"""
+        pass
@@ -64,3 +64,8 @@ class IUsuariosRepository(ABC):
     def insert_rol(self, rol_codigo: str, rol_nombre: str) -> Any:
         """Insertar un nuevo rol"""
         pass
+    
+    @abstractmethod
+    def update_password_hash(self, usr_id: int, password_hash: str) -> None:
+        """Reemplazar el hash de contraseña (rehash al cambiar parámetros)"""
+        pass
@@ -0,0 +1,81 @@
+"""
+Objetivos nutricionales diarios por edad y reparto por comida.
+
+Valores de referencia (ingesta recomendada, IOM/FAO-OMS) para alimentación
+complementaria y edad escolar. La energía es un objetivo con tolerancia; el
+resto de nutrientes son mínimos diarios.
+"""
+from typing import Dict, List, Optional, Tuple
+
+ENERGIA = "ENERGIA_KCAL"
+
+# Nutrientes que el generador de menús contabiliza (códigos de `nutrientes`)
+NUTRIENTES_MENU: Tuple[str, ...] = (
+    ENERGIA,
+    "PROTEINA_G",
+    "GRASA_G",
+    "CARBOHIDRATOS_G",
+    "HIERRO_MG",
+    "CALCIO_MG",
+    "ZINC_MG",
+    "VITAMINA_A_UG",
+)
+
+# (edad mínima en meses, edad máxima exclusiva, objetivos diarios)
+OBJETIVOS_POR_EDAD: List[Tuple[int, int, Dict[str, float]]] = [
+    (6, 12, {
+        ENERGIA: 700, "PROTEINA_G": 11, "GRASA_G": 30, "CARBOHIDRATOS_G": 95,
+        "HIERRO_MG": 11, "CALCIO_MG": 260, "ZINC_MG": 3, "VITAMINA_A_UG": 500,
+    }),
+    (12, 36, {
+        ENERGIA: 1000, "PROTEINA_G": 13, "GRASA_G": 35, "CARBOHIDRATOS_G": 130,
+        "HIERRO_MG": 7, "CALCIO_MG": 700, "ZINC_MG": 3, "VITAMINA_A_UG": 300,
+    }),
+    (36, 96, {
+        ENERGIA: 1400, "PROTEINA_G": 19, "GRASA_G": 40, "CARBOHIDRATOS_G": 130,
+        "HIERRO_MG": 10, "CALCIO_MG": 1000, "ZINC_MG": 5, "VITAMINA_A_UG": 400,
+    }),
+    (96, 168, {
+        ENERGIA: 2000, "PROTEINA_G": 34, "GRASA_G": 55, "CARBOHIDRATOS_G": 130,
+        "HIERRO_MG": 8, "CALCIO_MG": 1300, "ZINC_MG": 8, "VITAMINA_A_UG": 600,
+    }),
+    (168, 228, {
+        ENERGIA: 2400, "PROTEINA_G": 52, "GRASA_G": 65, "CARBOHIDRATOS_G": 130,
+        "HIERRO_MG": 13, "CALCIO_MG": 1300, "ZINC_MG": 10, "VITAMINA_A_UG": 800,
+    }),
+]
+
+# Fracción de la energía diaria por comida, en el orden en que se planifican
+REPARTO_COMIDAS: Tuple[Tuple[str, float], ...] = (
+    ("DESAYUNO", 0.25),
+    ("ALMUERZO", 0.35),
+    ("REFACCION", 0.15),
+    ("CENA", 0.25),
+)
+
+TOLERANCIA_ENERGIA = 0.10  # ±10% del objetivo diario
+COBERTURA_MINIMA = 0.90    # un nutriente se considera cubierto al 90%
+MAX_REPETICIONES_SEMANA = 2
+
+
+def banda_edad(edad_meses: int) -> Optional[int]:
+    """Índice de la banda de OBJETIVOS_POR_EDAD; None si no aplica (menor de 6 meses o adulto)."""
+    for i, (desde, hasta, _) in enumerate(OBJETIVOS_POR_EDAD):
+        if desde <= edad_meses < hasta:
+            return i
+    return None
+
+
+def objetivos_diarios(edad_meses: int) -> Optional[Dict[str, float]]:
+    """
+    Objetivos diarios para la edad.
+
+    Args:
+        edad_meses: Edad del niño en meses
+
+    Returns:
+        Diccionario código de nutriente -> cantidad diaria, o None si la edad
+        está fuera de rango (antes de los 6 meses corresponde lactancia exclusiva)
+    """
+    banda = banda_edad(edad_meses)
+    return None if banda is None else OBJETIVOS_POR_EDAD[banda][2]
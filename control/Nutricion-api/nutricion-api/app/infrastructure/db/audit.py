@@ -0,0 +1,308 @@
+"""
+Auditoría asíncrona por lotes en `eventos_auditoria`.
+
+Los eventos se capturan sin tocar la base en el request:
+
+- `audited(...)`: decorador para métodos de repositorio (como `invalidates`);
+  registra el evento si el método termina sin error y devuelve algo.
+- `audit_event(...)`: registro explícito.
+- `AuditMiddleware` (app.core.audit): abre un `AuditContext` por request, y al
+  terminar con éxito envía los eventos acumulados (o uno genérico por ruta si
+  un request de escritura no registró ninguno).
+
+`AuditWriter` los recibe en una cola acotada y un hilo los escribe en INSERT
+multi-fila sobre una conexión propia, fuera del pool de los requests. Cuando
+la cola se llena aplica AUDIT_OVERFLOW_POLICY: `block` (espera hasta
+AUDIT_BLOCK_TIMEOUT_MS y luego descarta el nuevo), `drop_oldest` o `drop_newest`.
+"""
+import inspect
+import logging
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+AUDIT_EVENTS = REGISTRY.counter("audit_events_written_total", "Eventos de auditoría escritos")
+AUDIT_DROPPED = REGISTRY.counter("audit_events_dropped_total", "Eventos de auditoría descartados", ("motivo",))
+AUDIT_BATCH = REGISTRY.histogram("audit_batch_seconds", "Duración de cada INSERT por lote de auditoría")
+AUDIT_QUEUE = REGISTRY.gauge("audit_queue_size", "Eventos de auditoría en cola")
+
+# executemany sobre un INSERT ... VALUES simple: PyMySQL lo envía como INSERT multi-fila
+_INSERT_EVENTOS = text(
+    "INSERT INTO eventos_auditoria "
+    "(usr_id, eau_entidad, eau_entidad_id, eau_accion, eau_ip, eau_metadata, eau_fecha_hora) "
+    "VALUES (:usr_id, :entidad, :entidad_id, :accion, :ip, :metadata, :fecha_hora)"
+)
+
+
+# --- contexto del request ---------------------------------------------------------
+
+
+@dataclass
+class AuditContext:
+    ip: Optional[str] = None
+    usr_id: Optional[int] = None
+    eventos: List[Dict[str, Any]] = field(default_factory=list)
+
+
+# Los endpoints síncronos corren en el threadpool con una copia del contexto:
+# el objeto es el mismo, así que lo que agregan lo ve el middleware
+_contexto: ContextVar[Optional[AuditContext]] = ContextVar("audit_context", default=None)
+
+
+def contexto_actual() -> Optional[AuditContext]:
+    return _contexto.get()
+
+
+def set_audit_user(usr_id: Optional[int]) -> None:
+    """Asociar el usuario autenticado al contexto del request (lo llama get_current_user)."""
+    ctx = _contexto.get()
+    if ctx is not None:
+        ctx.usr_id = usr_id
+
+
+def nuevo_evento(
+    entidad: str,
+    entidad_id: Any,
+    accion: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    usr_id: Optional[int] = None,
+    ip: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "usr_id": usr_id,
+        "entidad": entidad[:80],
+        "entidad_id": str(entidad_id if entidad_id is not None else "-")[:64],
+        "accion": accion[:40],
+        "ip": ip,
+        "metadata": dumps(metadata).decode() if metadata else None,
+        # Hora local del servidor sin zona, como el DEFAULT CURRENT_TIMESTAMP de la columna
+        "fecha_hora": datetime.now(),
+    }
+
+
+def audit_event(
+    entidad: str,
+    entidad_id: Any,
+    accion: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    usr_id: Optional[int] = None,
+) -> None:
+    """
+    Registrar un evento. Dentro de un request se difiere hasta que la respuesta
+    termine con éxito (el middleware completa usuario e IP); fuera de un request
+    (workers, scripts) va directo a la cola.
+    """
+    evento = nuevo_evento(entidad, entidad_id, accion, metadata, usr_id)
+    ctx = _contexto.get()
+    if ctx is not None:
+        ctx.eventos.append(evento)
+    elif settings.AUDIT_ENABLED:
+        get_audit_writer().submit(evento)
+
+
+def audited(
+    entidad: str,
+    accion: str,
+    id_de: Union[str, Callable[[Any], Any]],
+    campos: Sequence[str] = (),
+):
+    """
+    Decorador para métodos de escritura de repositorios.
+
+    Args:
+        entidad: Valor de eau_entidad
+        accion: Valor de eau_accion
+        id_de: Nombre del argumento con el id de la entidad, o función que lo
+            obtiene del resultado (p. ej. para creaciones)
+        campos: Argumentos que se copian a eau_metadata
+    """
+    def decorator(fn):
+        firma = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            result = fn(self, *args, **kwargs)
+            if result is None or result is False:
+                return result
+            valores = firma.bind(self, *args, **kwargs).arguments
+            entidad_id = id_de(result) if callable(id_de) else valores.get(id_de)
+            metadata = {c: valores.get(c) for c in campos} or None
+            audit_event(entidad, entidad_id, accion, metadata)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# --- escritor ----------------------------------------------------------------------
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine],
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_ms: int = 200,
+        overflow: str = "drop_oldest",
+        block_timeout_ms: int = 100,
+        retries: int = 3,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de desborde inválida: {overflow}")
+        self.engine_factory = engine_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_ms / 1000.0
+        self.overflow = overflow
+        self.block_timeout = block_timeout_ms / 1000.0
+        self.retries = retries
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._engine: Optional[Engine] = None
+        self._conn: Optional[Connection] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # --- encolado -------------------------------------------------------------------
+
+    def offer(self, evento: Dict[str, Any]) -> bool:
+        """Encolar sin esperar ni descartar; False si la cola está llena."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(evento)
+            return True
+        except queue.Full:
+            return False
+
+    def submit(self, evento: Dict[str, Any]) -> bool:
+        """Encolar aplicando la política de desborde (puede esperar con `block`)."""
+        if self.offer(evento):
+            return True
+        if self.overflow == "block":
+            try:
+                self._queue.put(evento, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                pass
+        elif self.overflow == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                AUDIT_DROPPED.inc(("desborde_antiguo",))
+            except queue.Empty:
+                pass
+            if self.offer(evento):
+                return True
+        AUDIT_DROPPED.inc(("desborde",))
+        return False
+
+    # --- escritura ------------------------------------------------------------------
+
+    def _siguiente_lote(self) -> List[Dict[str, Any]]:
+        try:
+            lote = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        limite = time.monotonic() + self.flush_interval
+        while len(lote) < self.batch_size:
+            restante = limite - time.monotonic()
+            try:
+                lote.append(self._queue.get_nowait() if restante <= 0 else self._queue.get(timeout=restante))
+            except queue.Empty:
+                break
+        return lote
+
+    def _escribir(self, lote: List[Dict[str, Any]]) -> None:
+        for intento in range(self.retries):
+            try:
+                if self._conn is None:
+                    if self._engine is None:
+                        self._engine = self.engine_factory()
+                    self._conn = self._engine.connect()
+                start = time.perf_counter()
+                self._conn.execute(_INSERT_EVENTOS, lote)
+                self._conn.commit()
+                AUDIT_BATCH.observe(time.perf_counter() - start)
+                AUDIT_EVENTS.inc(amount=len(lote))
+                return
+            except Exception:
+                logger.exception("Error escribiendo %s eventos de auditoría (intento %s)", len(lote), intento + 1)
+                self._cerrar_conexion()
+                self._stop.wait(min(0.5 * 2 ** intento, 5.0))  # al detener, reintenta sin esperar
+        AUDIT_DROPPED.inc(("error",), len(lote))
+
+    def _cerrar_conexion(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            lote = self._siguiente_lote()
+            AUDIT_QUEUE.set(self._queue.qsize())
+            if lote:
+                self._escribir(lote)
+        self._cerrar_conexion()
+
+    # --- ciclo de vida ---------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is None and not self._stop.is_set():
+            self.start()
+
+    def start(self) -> None:
+        """Iniciar el hilo escritor (idempotente; también se inicia al primer evento)."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Dejar de aceptar y vaciar la cola antes de cerrar la conexión."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+def _crear_engine() -> Engine:
+    # Conexión dedicada: no compite con los requests por el pool principal
+    return create_engine(settings.DATABASE_URL, pool_size=1, max_overflow=0, pool_pre_ping=True)
+
+
+@lru_cache(maxsize=1)
+def get_audit_writer() -> AuditWriter:
+    return AuditWriter(
+        _crear_engine,
+        max_queue=settings.AUDIT_QUEUE_SIZE,
+        batch_size=settings.AUDIT_BATCH_SIZE,
+        flush_ms=settings.AUDIT_FLUSH_MS,
+        overflow=settings.AUDIT_OVERFLOW_POLICY,
+        block_timeout_ms=settings.AUDIT_BLOCK_TIMEOUT_MS,
+    )
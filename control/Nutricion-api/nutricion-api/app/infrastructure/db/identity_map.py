@@ -0,0 +1,116 @@
+"""
+Identity map por sesión para los repositorios.
+Memoiza lecturas de procedimientos almacenados durante la vida de la `Session`
+(un request) y las invalida cuando el mismo request escribe en las tablas
+de las que dependen.
+"""
+import copy
+from functools import wraps
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.replicas import marcar_escritura
+from app.infrastructure.db.stats import current_request_stats
+
+_INFO_KEY = "identity_map"
+_MISSING = object()
+
+
+class IdentityMap:
+    """Resultados de lectura indexados por (método, parámetros) con etiquetas de tabla."""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[Any, FrozenSet[str]]] = {}
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        # Copia para que el llamador pueda mutar el resultado sin afectar la caché
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: Hashable, value: Any, tables: Iterable[str]) -> None:
+        self._entries[key] = (copy.deepcopy(value), frozenset(tables))
+
+    def invalidate(self, *tables: str) -> None:
+        """Descartar las lecturas que dependen de alguna de las tablas."""
+        touched = set(tables)
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if not (entry[1] & touched)
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_identity_map(db: Session) -> IdentityMap:
+    """Identity map asociado a la sesión (se crea en el primer uso)."""
+    imap = db.info.get(_INFO_KEY)
+    if imap is None:
+        imap = db.info[_INFO_KEY] = IdentityMap()
+    return imap
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session: Session) -> None:
+    imap = session.info.get(_INFO_KEY)
+    if imap is not None:
+        imap.clear()
+
+
+def memoized_read(*tables: str):
+    """
+    Decorador para métodos de lectura de repositorios (requieren `self.db`).
+
+    Args:
+        tables: Tablas de las que depende el resultado
+    """
+    def decorator(fn):
+        name = fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return fn(self, *args, **kwargs)
+
+            imap = get_identity_map(self.db)
+            cached = imap.get(key)
+            if cached is not _MISSING:
+                stats = current_request_stats()
+                if stats is not None:
+                    stats.cache_hits += 1
+                return cached
+
+            value = fn(self, *args, **kwargs)
+            imap.put(key, value, tables)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*tables: str):
+    """
+    Decorador para métodos de escritura: invalida las lecturas de `tables`
+    antes de ejecutar, de modo que las relecturas dentro del método ya son frescas.
+    También marca la escritura para el ruteo a réplicas (lecturas siguientes al primario).
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            get_identity_map(self.db).invalidate(*tables)
+            marcar_escritura(self.db)
+            return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
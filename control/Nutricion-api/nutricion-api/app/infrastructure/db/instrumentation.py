@@ -0,0 +1,84 @@
+"""
+Instrumentación de la base de datos: tiempo por procedimiento almacenado y
+estado del pool de conexiones.
+"""
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import REGISTRY
+
+_CALL_RE = re.compile(r"^\s*CALL\s+([A-Za-z0-9_]+)", re.IGNORECASE)
+_START_KEY = "_metrics_query_start"
+
+DB_PROCEDURE_LATENCY = REGISTRY.histogram(
+    "db_procedure_duration_seconds",
+    "Duración de llamadas a procedimientos almacenados",
+    ("procedure",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_SIZE = REGISTRY.gauge("db_pool_size", "Tamaño configurado del pool")
+DB_POOL_CHECKED_OUT = REGISTRY.gauge("db_pool_checked_out", "Conexiones en uso")
+DB_POOL_OVERFLOW = REGISTRY.gauge("db_pool_overflow", "Conexiones por encima del tamaño del pool")
+DB_POOL_WAIT = REGISTRY.histogram(
+    "db_pool_wait_seconds",
+    "Tiempo de espera para obtener una conexión del pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+def procedure_name(statement: str) -> str:
+    """Nombre del procedimiento de un `CALL sp_x(...)`; el resto se agrupa como `other`."""
+    match = _CALL_RE.match(statement)
+    return match.group(1) if match else "other"
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada checkout por una conexión."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine, pool_metrics: bool = True) -> None:
+    """Registrar los hooks de tiempo por procedimiento y el colector del pool (solo el del primario)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        DB_PROCEDURE_LATENCY.observe(elapsed, (procedure_name(statement),))
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        conn = context.connection
+        if conn is not None:
+            starts = conn.info.get(_START_KEY)
+            if starts:
+                starts.pop()
+
+    if not pool_metrics:
+        return
+
+    pool = engine.pool
+
+    def _collect_pool():
+        if isinstance(pool, QueuePool):
+            DB_POOL_SIZE.set(pool.size())
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    REGISTRY.add_collector(_collect_pool)
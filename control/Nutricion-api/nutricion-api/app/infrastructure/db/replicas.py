@@ -0,0 +1,294 @@
+"""
+Ruteo de lecturas a réplicas de MySQL.
+
+`RoutingSession` decide el engine de cada sentencia en `get_bind`:
+
+- `CALL` de un procedimiento de REPLICA_READ_PROCEDURES (solo lectura) -> una
+  réplica sana, salvo que la sesión ya haya escrito o que el usuario esté dentro
+  de su ventana de lectura de sus escrituras;
+- SELECT/SHOW y los demás procedimientos de consulta (`sp_*_get`,
+  `sp_*_obtener*`, `sp_*_buscar`, `sp_*_listar`, `sp_*_existe*`: el login, la
+  versión del tutor para el ETag) -> primario, sin fijar la sesión;
+- cualquier otra sentencia -> primario, y desde ahí toda la sesión lee del
+  primario.
+
+Una escritura explícita (`marcar_escritura`, la llaman los métodos
+`@invalidates` de los repositorios) abre además una ventana de
+REPLICA_READ_YOUR_WRITES_SECONDS para el usuario de la sesión: sus requests
+siguientes, en cualquier worker del nodo, leen del primario. Las ventanas se
+guardan en un arreglo mapeado en REFDATA_DIR (una marca de tiempo por hash de
+usuario; una colisión solo manda más lecturas al primario).
+
+`ReplicaSet` mide el retraso de cada réplica en segundo plano (`SHOW REPLICA
+STATUS`) y solo reparte entre las que están por debajo de
+REPLICA_MAX_LAG_SECONDS; con la replicación detenida o sin conexión, la
+réplica queda fuera hasta la siguiente medición. Sin réplicas sanas se lee del
+primario.
+"""
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Lecturas del dashboard; REPLICA_READ_PROCEDURES agrega otras
+PROCEDIMIENTOS_LECTURA = frozenset({
+    "sp_ninos_get",
+    "sp_ninos_obtener_por_tutor",
+    "sp_antropometria_obtener_por_nino",
+    "sp_ninos_obtener_alergias",
+    "sp_tipos_alergias_buscar",
+    "sp_entidades_buscar",
+})
+
+REPLICA = "replica"
+LECTURA = "lectura"
+ESCRITURA = "escritura"
+
+_CALL_RE = re.compile(r"^\s*CALL\s+([A-Za-z0-9_]+)", re.IGNORECASE)
+_LECTURA_RE = re.compile(r"^\s*(SELECT|SHOW|WITH)\b", re.IGNORECASE)
+# Convención de nombres de los procedimientos que solo consultan (ninguno escribe)
+_CONSULTA_RE = re.compile(r"_(get|obtener|buscar|listar|existe)(_|$)")
+
+_INFO_ESCRIBIO = "replicas_escribio"
+_INFO_USUARIO = "replicas_usuario"
+_INFO_REPLICA = "replicas_engine"
+
+DB_READ_ROUTING = REGISTRY.counter(
+    "db_read_routing_total", "Lecturas de solo lectura según destino y motivo", ("destino", "motivo")
+)
+DB_REPLICA_LAG = REGISTRY.gauge("db_replica_lag_seconds", "Retraso medido de cada réplica (-1 sin replicación)",
+                                ("replica",))
+
+
+def procedimientos_lectura() -> frozenset:
+    extra = {p.strip() for p in settings.REPLICA_READ_PROCEDURES.split(",") if p.strip()}
+    return PROCEDIMIENTOS_LECTURA | extra
+
+
+@lru_cache(maxsize=2048)
+def _clasificar_texto(sql: str) -> str:
+    match = _CALL_RE.match(sql)
+    if match:
+        nombre = match.group(1)
+        if nombre in procedimientos_lectura():
+            return REPLICA
+        return LECTURA if _CONSULTA_RE.search(nombre) else ESCRITURA
+    return LECTURA if _LECTURA_RE.match(sql) else ESCRITURA
+
+
+def clasificar(clause) -> str:
+    """REPLICA (puede ir a una réplica), LECTURA (primario) o ESCRITURA (primario y fija la sesión)."""
+    if isinstance(clause, TextClause):
+        return _clasificar_texto(clause.text)
+    return ESCRITURA if getattr(clause, "is_dml", False) else LECTURA
+
+
+# --- ventanas de lectura de las propias escrituras ------------------------------------
+
+
+class VentanasEscritura:
+    """Última escritura (epoch) por hash de usuario, compartida entre los procesos del nodo."""
+
+    def __init__(self, ruta: Optional[Path] = None, slots: int = 1 << 16):
+        self.slots = slots
+        self._marcas = None
+        if ruta is not None:
+            try:
+                ruta.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    if os.fstat(fd).st_size < slots * 8:
+                        os.ftruncate(fd, slots * 8)
+                finally:
+                    os.close(fd)
+                self._marcas = np.memmap(ruta, dtype=np.float64, mode="r+", shape=(slots,))
+            except OSError:
+                logger.warning("No se pudo mapear %s; las ventanas de escritura serán locales", ruta, exc_info=True)
+        if self._marcas is None:
+            self._marcas = np.zeros(slots, dtype=np.float64)
+
+    def registrar(self, usr_id: int) -> None:
+        self._marcas[usr_id % self.slots] = time.time()
+
+    def reciente(self, usr_id: int, ventana_seg: float) -> bool:
+        return time.time() - float(self._marcas[usr_id % self.slots]) < ventana_seg
+
+
+@lru_cache(maxsize=1)
+def get_ventanas_escritura() -> VentanasEscritura:
+    from app.infrastructure.refdata import directorio_base
+
+    return VentanasEscritura(directorio_base() / "ventanas_escritura.bin")
+
+
+def fijar_usuario(db: Session, usr_id: Optional[int]) -> None:
+    """Asociar el usuario autenticado a la sesión (lo llama get_current_user)."""
+    db.info[_INFO_USUARIO] = usr_id
+
+
+def marcar_escritura(db: Session) -> None:
+    """La sesión escribió: lee del primario desde ahora y abre la ventana del usuario."""
+    db.info[_INFO_ESCRIBIO] = True
+    usr_id = db.info.get(_INFO_USUARIO)
+    if usr_id is not None and isinstance(db, RoutingSession) and db.replicas is not None:
+        get_ventanas_escritura().registrar(usr_id)
+
+
+# --- réplicas ---------------------------------------------------------------------------
+
+
+def _nombre(engine: Engine) -> str:
+    return f"{engine.url.host}:{engine.url.port or 3306}"
+
+
+class ReplicaSet:
+    def __init__(self, engines: List[Engine], max_lag: float = 2.0, check_interval: float = 1.0):
+        self.engines = list(engines)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._sanas: List[Engine] = []
+        self._ronda = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def medir(self, engine: Engine) -> Optional[float]:
+        """Retraso en segundos; 0 si la instancia no es réplica; None si no replica o no responde."""
+        try:
+            with engine.connect() as conn:
+                try:
+                    fila = conn.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+                    clave = "Seconds_Behind_Source"
+                except Exception:
+                    # MySQL < 8.0.22 y MariaDB
+                    conn.rollback()
+                    fila = conn.exec_driver_sql("SHOW SLAVE STATUS").mappings().first()
+                    clave = "Seconds_Behind_Master"
+        except Exception as exc:
+            logger.warning("Réplica %s no disponible: %s", _nombre(engine), exc)
+            return None
+        if fila is None:
+            return 0.0
+        retraso = fila.get(clave)
+        return None if retraso is None else float(retraso)
+
+    def actualizar(self) -> List[Engine]:
+        sanas = []
+        for engine in self.engines:
+            retraso = self.medir(engine)
+            DB_REPLICA_LAG.set(-1 if retraso is None else retraso, (_nombre(engine),))
+            if retraso is not None and retraso <= self.max_lag:
+                sanas.append(engine)
+        self._sanas = sanas
+        return sanas
+
+    def elegir(self) -> Optional[Engine]:
+        """Siguiente réplica sana en ronda (None hasta la primera medición o si no hay)."""
+        self._ensure_started()
+        sanas = self._sanas
+        if not sanas:
+            return None
+        return sanas[next(self._ronda) % len(sanas)]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.actualizar()
+            except Exception:
+                logger.exception("Error midiendo el retraso de las réplicas")
+                self._sanas = []
+            self._stop.wait(self.check_interval)
+
+    def _ensure_started(self) -> None:
+        if self._thread is None and not self._stop.is_set():
+            self.start()
+
+    def start(self) -> None:
+        """Iniciar la medición en segundo plano (idempotente; también se inicia en la primera lectura)."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="replica-lag", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self._sanas = []
+
+
+# --- sesión ------------------------------------------------------------------------------
+
+
+class RoutingSession(Session):
+    """Session que envía los procedimientos de solo lectura a una réplica (ver módulo)."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        primario = super().get_bind(mapper, clause=clause, **kw)
+        if self.replicas is None or clause is None or mapper is not None:
+            return primario
+
+        tipo = clasificar(clause)
+        if tipo == ESCRITURA:
+            self.info[_INFO_ESCRIBIO] = True
+            return primario
+        if tipo == LECTURA:
+            return primario
+
+        if self.info.get(_INFO_ESCRIBIO):
+            DB_READ_ROUTING.inc(("primario", "sesion_escribio"))
+            return primario
+        usr_id = self.info.get(_INFO_USUARIO)
+        if usr_id is not None and get_ventanas_escritura().reciente(usr_id, settings.REPLICA_READ_YOUR_WRITES_SECONDS):
+            DB_READ_ROUTING.inc(("primario", "ventana_usuario"))
+            return primario
+
+        # Una réplica por sesión: las lecturas de un request comparten conexión
+        replica = self.info.get(_INFO_REPLICA)
+        if replica is None:
+            replica = self.replicas.elegir()
+            if replica is None:
+                DB_READ_ROUTING.inc(("primario", "sin_replica_sana"))
+                return primario
+            self.info[_INFO_REPLICA] = replica
+        DB_READ_ROUTING.inc(("replica", "lectura"))
+        return replica
+
+    def close(self) -> None:
+        super().close()
+        for clave in (_INFO_ESCRIBIO, _INFO_USUARIO, _INFO_REPLICA):
+            self.info.pop(clave, None)
+
+
+def crear_replicas(urls: str, engine_factory) -> Optional[ReplicaSet]:
+    """ReplicaSet con un engine por URL (separadas por coma); None si no hay ninguna."""
+    engines = [engine_factory(url.strip()) for url in urls.split(",") if url.strip()]
+    if not engines:
+        return None
+    return ReplicaSet(
+        engines,
+        max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval=settings.REPLICA_LAG_CHECK_SECONDS,
+    )
@@ -1,9 +1,26 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.profiling import install_sql_profiling
+from app.infrastructure.db.instrumentation import TimedQueuePool, instrument_engine
+from app.infrastructure.db.replicas import RoutingSession, crear_replicas
+from app.infrastructure.db.stats import install_query_counter
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _crear_engine(url: str, pool_metrics: bool = True):
+    nuevo = create_engine(url, pool_pre_ping=True, poolclass=TimedQueuePool)
+    install_query_counter(nuevo)
+    instrument_engine(nuevo, pool_metrics=pool_metrics)
+    install_sql_profiling(nuevo)
+    return nuevo
+
+
+engine = _crear_engine(settings.DATABASE_URL)
+# Réplicas de lectura (DATABASE_REPLICA_URLS); None = todo va al primario
+REPLICAS = crear_replicas(settings.DATABASE_REPLICA_URLS, lambda url: _crear_engine(url, pool_metrics=False))
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=REPLICAS
+)
 
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,38 @@
+"""
+Contadores de base de datos por request (idas y vueltas y aciertos de caché).
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class RequestStats:
+    round_trips: int = 0
+    cache_hits: int = 0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def begin_request_stats() -> RequestStats:
+    """Iniciar contadores para el request actual (el objeto se comparte con el threadpool)."""
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Contar cada sentencia enviada a la base de datos en el request actual."""
+    @event.listens_for(engine, "after_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.round_trips += 1
@@ -0,0 +1,92 @@
+"""
+Acceso a los artefactos entrenados de `modelo/ml-recomendator`
+(`models/rf.pkl` + `models/preprocess.joblib`).
+"""
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "rf.pkl"
+PREPROCESS_FILE = "preprocess.joblib"
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    model: Any
+    preprocess: Any
+    version: str
+    # Columnas con las que se ajustó el preprocesamiento (orden de entrada)
+    features: Tuple[str, ...]
+
+
+def find_models_dir() -> Optional[Path]:
+    """
+    Carpeta con los artefactos entrenados.
+
+    RISK_MODEL_DIR si está definido; si no, `models/` del proyecto ml-recomendator
+    que resuelve `ml_bridge` (checkout, ML_RECOMENDATOR_DIR o instalación
+    editable). Una instalación normal del paquete no incluye los artefactos:
+    en ese caso hay que definir RISK_MODEL_DIR.
+    """
+    from app.core.config import settings
+    from app.infrastructure.external.ml_bridge import raiz_paquete
+
+    if settings.RISK_MODEL_DIR:
+        return Path(settings.RISK_MODEL_DIR)
+    raiz = raiz_paquete()
+    if raiz is not None and (raiz / "models").is_dir():
+        return raiz / "models"
+    logger.info("Sin artefactos del modelo de riesgo; defina RISK_MODEL_DIR para usarlos")
+    return None
+
+
+def _digest(*paths: Path) -> str:
+    sha = hashlib.sha1()
+    for path in paths:
+        with path.open("rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                sha.update(block)
+    return sha.hexdigest()[:12]
+
+
+def load_rf_bundle(models_dir: Optional[str] = None) -> Optional[ModelBundle]:
+    """
+    Cargar el random forest y su preprocesamiento.
+
+    Args:
+        models_dir: Carpeta con los artefactos; por defecto `find_models_dir()`
+
+    Returns:
+        ModelBundle con versión `rf-<sha1 de los artefactos>`, o None si no hay
+        artefactos o faltan joblib/scikit-learn
+    """
+    directory = Path(models_dir) if models_dir else find_models_dir()
+    if directory is None:
+        return None
+    model_path = directory / MODEL_FILE
+    preprocess_path = directory / PREPROCESS_FILE
+    if not (model_path.exists() and preprocess_path.exists()):
+        return None
+
+    try:
+        import joblib
+    except ImportError:
+        logger.warning("joblib no está instalado; no se puede cargar %s", model_path)
+        return None
+
+    try:
+        model = joblib.load(model_path)
+        preprocess = joblib.load(preprocess_path)
+    except Exception:
+        logger.exception("No se pudieron cargar los artefactos de %s", directory)
+        return None
+
+    features = tuple(getattr(preprocess, "feature_names_in_", ()))
+    if not features:
+        logger.warning("%s no expone feature_names_in_; se ignora el modelo", preprocess_path)
+        return None
+    return ModelBundle(model, preprocess, f"rf-{_digest(model_path, preprocess_path)}", features)
@@ -0,0 +1,136 @@
+"""
+Puente con el paquete `ml-recomendator` (modelo/ml-recomendator).
+
+Se resuelve recién en el primer uso: ni el arranque de la API ni el de los
+workers pagan la importación, y si falta solo fallan los endpoints de ML.
+
+1. Instalado (`pip install -e modelo/ml-recomendator`, paquete
+   `ml_recomendator`): por los entry points `nutricion_api.ml:assist` y
+   `nutricion_api.ml:budget`.
+2. Sin instalar: desde la carpeta del proyecto (ML_RECOMENDATOR_DIR o
+   `modelo/ml-recomendator` buscando hacia arriba en el repositorio), como
+   `src.llm.*`. Sus dependencias (httpx, python-dotenv) están en requirements.txt.
+"""
+import logging
+import sys
+from functools import lru_cache
+from importlib import import_module
+from importlib.metadata import entry_points
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "nutricion_api.ml"
+# Entry point -> módulo dentro de `src/` del proyecto
+_MODULOS = {"assist": "llm.assist", "budget": "llm.budget"}
+
+
+class MLNoDisponible(RuntimeError):
+    """El paquete ml-recomendator no está instalado ni se encontró su carpeta, o no se pudo importar."""
+
+
+def _carpeta_proyecto() -> Optional[Path]:
+    if settings.ML_RECOMENDATOR_DIR:
+        candidatos = [Path(settings.ML_RECOMENDATOR_DIR)]
+    else:
+        candidatos = [p / "modelo" / "ml-recomendator" for p in Path(__file__).resolve().parents]
+    return next((c for c in candidatos if (c / "src" / "llm").is_dir()), None)
+
+
+@lru_cache(maxsize=None)
+def _modulo(nombre: str) -> Optional[ModuleType]:
+    encontrados = entry_points(group=ENTRY_POINT_GROUP, name=nombre)
+    if encontrados:
+        ruta = next(iter(encontrados)).value
+    else:
+        carpeta = _carpeta_proyecto()
+        if carpeta is None:
+            logger.warning("Sin entry point %s:%s ni carpeta modelo/ml-recomendator; instale el paquete o "
+                           "defina ML_RECOMENDATOR_DIR", ENTRY_POINT_GROUP, nombre)
+            return None
+        if str(carpeta) not in sys.path:
+            sys.path.append(str(carpeta))
+        ruta = f"src.{_MODULOS[nombre]}"
+    try:
+        return import_module(ruta)
+    except Exception:
+        logger.exception("No se pudo importar %s (%s)", ruta, nombre)
+        return None
+
+
+def assist() -> ModuleType:
+    """Módulo `llm.assist` de ml-recomendator."""
+    modulo = _modulo("assist")
+    if modulo is None:
+        raise MLNoDisponible("El paquete ml-recomendator no está disponible")
+    return modulo
+
+
+def budget() -> ModuleType:
+    """Módulo `llm.budget` (resúmenes con presupuesto de latencia)."""
+    modulo = _modulo("budget")
+    if modulo is None:
+        raise MLNoDisponible("El paquete ml-recomendator disponible no incluye llm.budget; reinstálelo")
+    return modulo
+
+
+@lru_cache(maxsize=1)
+def resumidor():
+    """
+    BudgetedSummarizer configurado con ML_SUMMARY_*.
+
+    Los resúmenes pendientes se guardan en un directorio compartido por los
+    workers del nodo: el GET o el SSE de seguimiento puede caer en otro worker.
+    """
+    from app.infrastructure.refdata import directorio_base
+
+    modulo = budget()
+    directorio = settings.ML_SUMMARY_DIR or directorio_base() / "ml-resumenes"
+    try:
+        store = modulo.DirectoryStore(directorio, ttl=settings.ML_SUMMARY_TTL_SECONDS)
+    except OSError:
+        logger.warning("No se pudo usar %s; los resúmenes pendientes quedan en memoria del worker", directorio)
+        store = modulo.MemoryStore(ttl=settings.ML_SUMMARY_TTL_SECONDS)
+    return modulo.BudgetedSummarizer(
+        store,
+        budget_ms=settings.ML_SUMMARY_BUDGET_MS,
+        max_budget_ms=settings.ML_SUMMARY_MAX_BUDGET_MS,
+        workers=settings.ML_SUMMARY_WORKERS,
+        max_pending=settings.ML_SUMMARY_MAX_PENDING,
+    )
+
+
+def cerrar_resumidor() -> None:
+    """Soltar el pool de llamadas al LLM si se llegó a crear (apagado de la API)."""
+    if resumidor.cache_info().currsize:
+        resumidor().shutdown()
+
+
+def disponible() -> bool:
+    return _modulo("assist") is not None
+
+
+def raiz_paquete() -> Optional[Path]:
+    """
+    Carpeta del proyecto ml-recomendator en uso si es un checkout (donde está `models/`).
+
+    None si el paquete se instaló en site-packages: ahí no hay proyecto.
+    """
+    modulo = _modulo("assist")
+    if modulo is None or not getattr(modulo, "__file__", None):
+        return None
+    # <raiz>/src/llm/assist.py
+    raiz = Path(modulo.__file__).resolve().parents[2]
+    return raiz if (raiz / "src" / "llm").is_dir() else None
+
+
+def summarize_with_llm(features: Dict[str, Any], scores: Dict[str, float]) -> Optional[str]:
+    return assist().summarize_with_llm(features, scores)
+
+
+def format_recommender_prompt(features: Dict[str, Any], scores: Dict[str, float]) -> str:
+    return assist().format_recommender_prompt(features, scores)
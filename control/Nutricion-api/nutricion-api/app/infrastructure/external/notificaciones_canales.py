@@ -0,0 +1,181 @@
+"""
+Canales de entrega de notificaciones.
+
+Cada canal recibe un `Digest` (todas las notificaciones agrupadas de un usuario
+y tipo) y lanza una excepción si no pudo entregarlo. Se registran con
+`canal("nombre")` y se eligen con NOTIFICATIONS_CHANNELS:
+
+- `webhook`: POST JSON a NOTIFICATIONS_WEBHOOK_URL
+- `smtp`: correo por SMTP (SMTP_HOST, SMTP_PORT, ...)
+- `archivo`: un .json por digest en NOTIFICATIONS_FILE_DIR (pruebas y desarrollo)
+- `log`: solo registra el digest; la notificación queda disponible en la app
+"""
+import logging
+import os
+import smtplib
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, List, Optional, Protocol
+
+from app.core.config import settings
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Digest:
+    usr_id: int
+    correo: str
+    nombre: str
+    tipo: str
+    asunto: str
+    lineas: List[str]
+    not_ids: List[int]
+    payloads: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def cuerpo(self) -> str:
+        saludo = f"Hola {self.nombre}," if self.nombre else "Hola,"
+        return "\n".join([saludo, "", *(f"- {linea}" for linea in self.lineas)])
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "usr_id": self.usr_id,
+            "correo": self.correo,
+            "tipo": self.tipo,
+            "asunto": self.asunto,
+            "cuerpo": self.cuerpo,
+            "cantidad": len(self.not_ids),
+            "not_ids": self.not_ids,
+            "items": self.payloads,
+        }
+
+
+class Canal(Protocol):
+    nombre: str
+
+    def enviar(self, digest: Digest) -> None: ...
+
+
+CANALES: Dict[str, Callable[[], Canal]] = {}
+
+
+def canal(nombre: str):
+    """Decorador que registra una fábrica de canal (sin argumentos; lee la configuración)."""
+
+    def decorator(factory):
+        CANALES[nombre] = factory
+        return factory
+
+    return decorator
+
+
+@canal("log")
+class LogCanal:
+    nombre = "log"
+
+    def enviar(self, digest: Digest) -> None:
+        logger.info("Digest %s para usuario %s (%s notificaciones): %s",
+                    digest.tipo, digest.usr_id, len(digest.not_ids), digest.asunto)
+
+
+@canal("archivo")
+class ArchivoCanal:
+    nombre = "archivo"
+
+    def __init__(self, directorio: Optional[str] = None):
+        self.directorio = directorio or settings.NOTIFICATIONS_FILE_DIR
+        os.makedirs(self.directorio, exist_ok=True)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def enviar(self, digest: Digest) -> None:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        nombre = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{os.getpid()}-{seq}-{digest.usr_id}-{digest.tipo}.json"
+        tmp = os.path.join(self.directorio, nombre + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(dumps(digest.as_dict()))
+        os.replace(tmp, os.path.join(self.directorio, nombre))
+
+
+@canal("smtp")
+class SmtpCanal:
+    nombre = "smtp"
+
+    def __init__(self):
+        if not settings.SMTP_HOST:
+            raise ValueError("El canal smtp requiere SMTP_HOST")
+        self._local = threading.local()
+
+    def _conexion(self) -> smtplib.SMTP:
+        # Una conexión por hilo del pool de envío, reutilizada entre digests
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except smtplib.SMTPException:
+                pass
+        conn = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT)
+        if settings.SMTP_STARTTLS:
+            conn.starttls()
+        if settings.SMTP_USER:
+            conn.login(settings.SMTP_USER, settings.SMTP_PASSWORD or "")
+        self._local.conn = conn
+        return conn
+
+    def enviar(self, digest: Digest) -> None:
+        if not digest.correo:
+            raise ValueError(f"Usuario {digest.usr_id} sin correo")
+        msg = EmailMessage()
+        msg["From"] = settings.SMTP_FROM
+        msg["To"] = digest.correo
+        msg["Subject"] = digest.asunto
+        msg.set_content(digest.cuerpo)
+        try:
+            self._conexion().send_message(msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._local.conn = None
+            raise
+
+
+@canal("webhook")
+class WebhookCanal:
+    nombre = "webhook"
+
+    def __init__(self):
+        if not settings.NOTIFICATIONS_WEBHOOK_URL:
+            raise ValueError("El canal webhook requiere NOTIFICATIONS_WEBHOOK_URL")
+        import requests
+
+        self._session = requests.Session()
+
+    def enviar(self, digest: Digest) -> None:
+        response = self._session.post(
+            settings.NOTIFICATIONS_WEBHOOK_URL,
+            data=dumps(digest.as_dict()),
+            headers={"Content-Type": "application/json"},
+            timeout=settings.NOTIFICATIONS_WEBHOOK_TIMEOUT,
+        )
+        response.raise_for_status()
+
+
+def crear_canales(nombres: Optional[str] = None) -> List[Canal]:
+    """
+    Canales configurados (separados por coma). Sin configuración: `webhook` si
+    hay NOTIFICATIONS_WEBHOOK_URL, si no `log`.
+    """
+    nombres = settings.NOTIFICATIONS_CHANNELS if nombres is None else nombres
+    if not nombres:
+        nombres = "webhook" if settings.NOTIFICATIONS_WEBHOOK_URL else "log"
+    canales = []
+    for nombre in (n.strip() for n in nombres.split(",") if n.strip()):
+        if nombre not in CANALES:
+            raise ValueError(f"Canal de notificaciones desconocido: {nombre}")
+        canales.append(CANALES[nombre]())
+    return canales
@@ -0,0 +1,192 @@
+"""
+Datos de referencia compartidos entre procesos (workers de gunicorn/uvicorn).
+
+Un proceso arma las columnas NumPy de un catálogo y las publica como snapshot
+en REFDATA_DIR: un directorio por versión con un `.npy` por arreglo y
+`meta.json` para lo que no es arreglo (nombres, diccionarios). El puntero
+`<nombre>/ACTUAL` se reemplaza con `os.replace`, así que un lector ve la
+versión anterior completa o la nueva completa.
+
+Los demás procesos adjuntan los `.npy` con `np.load(mmap_mode="r")`: las páginas
+son del page cache (o de /dev/shm) y las comparten todos los workers del nodo,
+sin copias; los arreglos quedan de solo lectura.
+
+Solo un proceso arma cada versión: `obtener` toma un flock por catálogo y
+vuelve a leer el puntero antes de construir. Al publicar se borran los
+snapshots anteriores salvo el último; un proceso que todavía los tenga mapeados
+sigue leyéndolos hasta soltarlos.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin lock, a lo sumo dos procesos arman la misma versión
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PUNTERO = "ACTUAL"
+META = "meta.json"
+
+REFDATA_BUILDS = REGISTRY.counter("refdata_builds_total", "Snapshots de datos de referencia publicados", ("nombre",))
+REFDATA_ATTACHES = REGISTRY.counter("refdata_attaches_total", "Snapshots adjuntados por este proceso", ("nombre",))
+REFDATA_BUILD_SECONDS = REGISTRY.histogram(
+    "refdata_build_seconds", "Duración de armado y publicación de un snapshot", ("nombre",)
+)
+
+Columnas = Tuple[Dict[str, np.ndarray], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    nombre: str
+    version: int
+    arrays: Dict[str, np.ndarray]
+    meta: Dict[str, Any]
+
+
+def directorio_base() -> Path:
+    if settings.REFDATA_DIR:
+        return Path(settings.REFDATA_DIR)
+    # /dev/shm: memoria compartida sin pasar por disco; si no existe, el temporal del sistema
+    raiz = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return Path(raiz) / "appsaludable-refdata"
+
+
+def _leer_puntero(base: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(base / PUNTERO, "rb") as f:
+            return json.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def version_publicada(nombre: str) -> Optional[int]:
+    puntero = _leer_puntero(directorio_base() / nombre)
+    return int(puntero["version"]) if puntero else None
+
+
+def publicar(nombre: str, version: int, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> Snapshot:
+    """Escribir un snapshot y apuntar `ACTUAL` a él."""
+    base = directorio_base() / nombre
+    base.mkdir(parents=True, exist_ok=True)
+    destino = f"v{version}-{os.getpid()}-{time.time_ns()}"
+    tmp = base / (destino + ".tmp")
+    tmp.mkdir()
+    for clave, arreglo in arrays.items():
+        np.save(tmp / f"{clave}.npy", np.asarray(arreglo), allow_pickle=False)
+    with open(tmp / META, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, default=str)
+    os.rename(tmp, base / destino)
+
+    puntero_tmp = base / f"{PUNTERO}.{os.getpid()}.tmp"
+    with open(puntero_tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "dir": destino}, f)
+    os.replace(puntero_tmp, base / PUNTERO)
+    _limpiar(base, destino)
+    return adjuntar(nombre) or Snapshot(nombre, version, arrays, meta)
+
+
+def _limpiar(base: Path, vigente: str) -> None:
+    anteriores = sorted(
+        (p for p in base.iterdir() if p.is_dir() and p.name != vigente),
+        key=lambda p: p.stat().st_mtime,
+    )
+    # Se conserva el anterior para los procesos que lo adjuntaron hace poco
+    for viejo in anteriores[:-1]:
+        shutil.rmtree(viejo, ignore_errors=True)
+
+
+def adjuntar(nombre: str) -> Optional[Snapshot]:
+    """Mapear el snapshot vigente de `nombre` (None si no hay ninguno publicado)."""
+    base = directorio_base() / nombre
+    puntero = _leer_puntero(base)
+    if puntero is None:
+        return None
+    carpeta = base / puntero["dir"]
+    try:
+        with open(carpeta / META, "rb") as f:
+            meta = json.loads(f.read())
+        arrays = {
+            p.stem: np.load(p, mmap_mode="r", allow_pickle=False)
+            for p in carpeta.iterdir() if p.suffix == ".npy"
+        }
+    except FileNotFoundError:
+        # Reemplazado y limpiado entre la lectura del puntero y la de los archivos
+        return None
+    REFDATA_ATTACHES.inc((nombre,))
+    return Snapshot(nombre, int(puntero["version"]), arrays, meta)
+
+
+@contextmanager
+def _lock(nombre: str) -> Iterator[None]:
+    base = directorio_base() / nombre
+    base.mkdir(parents=True, exist_ok=True)
+    with open(base / ".lock", "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def obtener(nombre: str, version: int, construir: Callable[[], Columnas]) -> Snapshot:
+    """
+    Snapshot de `nombre` con versión `version`, armándolo si hace falta.
+
+    Args:
+        nombre: Catálogo (subdirectorio de REFDATA_DIR)
+        version: Versión pedida (versión de la base o marca de tiempo); cualquier otra
+            publicada se reemplaza, también una mayor (base restaurada, reloj corregido)
+        construir: Arma (arreglos, meta) leyendo la base; lo ejecuta un solo proceso
+
+    Returns:
+        Snapshot adjuntado; si no se puede publicar (disco, permisos) se devuelve
+        uno en memoria del proceso
+    """
+    actual = version_publicada(nombre)
+    if actual == version:
+        snapshot = adjuntar(nombre)
+        # El puntero puede haber cambiado entre la lectura de la versión y la de los archivos
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+    try:
+        with _lock(nombre):
+            actual = version_publicada(nombre)
+            if actual == version:
+                snapshot = adjuntar(nombre)
+                if snapshot is not None:
+                    return snapshot
+            start = time.perf_counter()
+            arrays, meta = construir()
+            snapshot = publicar(nombre, version, arrays, meta)
+            REFDATA_BUILDS.inc((nombre,))
+            REFDATA_BUILD_SECONDS.observe(time.perf_counter() - start, (nombre,))
+            logger.info("Snapshot %s v%s publicado en %s", nombre, version, directorio_base() / nombre)
+            return snapshot
+    except OSError:
+        logger.exception("No se pudo publicar el snapshot %s; se usa una copia local", nombre)
+        arrays, meta = construir()
+        return Snapshot(nombre, version, arrays, meta)
+
+
+def marca_tiempo(intervalo_seg: float) -> int:
+    """Versión compartida por todos los procesos dentro de una ventana de `intervalo_seg`."""
+    return int(time.time() // max(intervalo_seg, 1.0))
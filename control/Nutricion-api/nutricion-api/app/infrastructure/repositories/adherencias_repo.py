@@ -0,0 +1,65 @@
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps
+
+# INSERT IGNORE: los eventos ya registrados (mismo adh_evento_id) se descartan al
+# reenviar un lote o reproducir el log; PyMySQL lo envía como INSERT multi-fila
+_INSERT_EVENTOS = text(
+    "INSERT IGNORE INTO adherencias "
+    "(adh_evento_id, nin_id, men_id, mei_id, adh_registrado_en, adh_estado, adh_notas) "
+    "VALUES (:evento_id, :nin_id, :men_id, :mei_id, :registrado_en, :estado, :notas)"
+)
+
+
+class AdherenciasRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insertar_lote(self, eventos: Sequence[Dict[str, Any]], commit: bool = True) -> int:
+        """Insertar eventos en un solo INSERT multi-fila; devuelve las filas nuevas."""
+        if not eventos:
+            return 0
+        result = self.db.execute(_INSERT_EVENTOS, list(eventos))
+        if commit:
+            self.db.commit()
+        return max(result.rowcount, 0)
+
+    def resumen_nino(self, nin_id: int, desde: date) -> Dict[str, int]:
+        """Conteos OK/PARCIAL/NO del niño desde `desde` (adherencias_nino_dia)."""
+        row = self.db.execute(
+            text("CALL sp_adherencia_resumen_nino(:nin_id, :desde)"),
+            {"nin_id": nin_id, "desde": desde},
+        ).fetchone()
+        return {"ok": int(row.ok), "parcial": int(row.parcial), "no": int(row.no_cumple), "dias": int(row.dias)}
+
+    def resumen_menu(self, men_id: int) -> Optional[Dict[str, int]]:
+        """Conteos OK/PARCIAL/NO del menú (adherencias_menu); None si el menú no existe."""
+        row = self.db.execute(
+            text("CALL sp_adherencia_resumen_menu(:men_id)"),
+            {"men_id": men_id},
+        ).fetchone()
+        if not row:
+            return None
+        return {"men_id": row.men_id, "nin_id": row.nin_id,
+                "ok": int(row.ok), "parcial": int(row.parcial), "no": int(row.no_cumple)}
+
+    def propietarios_menus(
+        self, men_ids: Iterable[int], mei_ids: Iterable[int]
+    ) -> Tuple[Dict[int, int], Dict[int, Tuple[int, int]]]:
+        """
+        Dueños de los menús e ítems citados por un lote de eventos.
+
+        Returns:
+            ({men_id: nin_id}, {mei_id: (men_id, nin_id)}); sin los que no existen
+        """
+        rows = self.db.execute(
+            text("CALL sp_adherencia_menus_obtener(:men_ids, :mei_ids)"),
+            {"men_ids": dumps(sorted(men_ids)).decode(), "mei_ids": dumps(sorted(mei_ids)).decode()},
+        ).fetchall()
+        menus = {int(r.id): int(r.nin_id) for r in rows if r.tipo == "MENU"}
+        items = {int(r.id): (int(r.men_id), int(r.nin_id)) for r in rows if r.tipo == "ITEM"}
+        return menus, items
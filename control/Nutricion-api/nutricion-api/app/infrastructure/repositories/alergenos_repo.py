@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class AlergenosRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def obtener_bits(self) -> List[Dict[str, Any]]:
+        """Posición de bit de cada tipo de alergia (sp_alergenos_bits)."""
+        rows = self.db.execute(text("CALL sp_alergenos_bits()")).fetchall()
+        return [
+            {"ta_id": row.ta_id, "ta_codigo": row.ta_codigo, "ta_categoria": row.ta_categoria, "ta_bit": row.ta_bit}
+            for row in rows
+        ]
+
+    def obtener_mascaras(self, desde: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Máscaras de niños, alimentos y recetas modificados desde `desde` (None = todos)."""
+        rows = self.db.execute(
+            text("CALL sp_alergenos_indice(:desde)"),
+            {"desde": desde},
+        ).fetchall()
+        return [
+            {
+                "tipo": row.tipo,
+                "id": row.id,
+                "ent_id": row.ent_id,
+                "mascara": int(row.mascara),
+                "activo": bool(row.activo),
+                "actualizado_en": row.actualizado_en,
+            }
+            for row in rows
+        ]
+
+    def reconstruir(self) -> None:
+        """Recalcular todas las máscaras en la base (sp_alergenos_reconstruir)."""
+        self.db.execute(text("CALL sp_alergenos_reconstruir()"))
+        self.db.commit()
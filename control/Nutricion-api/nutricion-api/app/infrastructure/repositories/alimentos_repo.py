@@ -0,0 +1,55 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+CATALOGO_ALIMENTOS = "ALIMENTOS"
+
+
+class AlimentosRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def obtener_version(self) -> int:
+        """Versión del catálogo de alimentos (incrementada por triggers)."""
+        row = self.db.execute(
+            text("CALL sp_version_catalogo_obtener(:catalogo)"),
+            {"catalogo": CATALOGO_ALIMENTOS},
+        ).fetchone()
+        return int(row.version) if row else 0
+
+    def obtener_alimentos(self) -> List[Dict[str, Any]]:
+        rows = self.db.execute(text("CALL sp_alimentos_catalogo()")).fetchall()
+        return [
+            {"ali_id": row.ali_id, "nombre": row.ali_nombre, "grupo": row.ali_grupo, "unidad": row.ali_unidad}
+            for row in rows
+        ]
+
+    def obtener_nutrientes(self) -> List[Dict[str, Any]]:
+        rows = self.db.execute(text("CALL sp_alimentos_catalogo_nutrientes()")).fetchall()
+        return [
+            {"codigo": row.nutri_codigo, "nombre": row.nutri_nombre, "unidad": row.nutri_unidad}
+            for row in rows
+        ]
+
+    def obtener_matriz_nutrientes(self) -> List[Dict[str, Any]]:
+        """Filas (ali_id, nutri_codigo, cantidad_100) de los alimentos activos."""
+        rows = self.db.execute(text("CALL sp_menu_catalogo_nutrientes()")).fetchall()
+        return [
+            {"ali_id": row.ali_id, "nutri_codigo": row.nutri_codigo, "cantidad_100": float(row.an_cantidad_100)}
+            for row in rows
+        ]
+
+    def obtener_disponibilidad(self) -> List[Dict[str, Any]]:
+        """Disponibilidad nacional y regional de todos los trimestres (precio en S/ por kg o litro)."""
+        rows = self.db.execute(text("CALL sp_alimentos_catalogo_disponibilidad()")).fetchall()
+        return [
+            {
+                "ali_id": row.ali_id,
+                "periodo": row.dis_periodo,
+                "region": row.dis_region,
+                "disponible": bool(row.dis_disponible),
+                "precio": float(row.dis_precio_promedio) if row.dis_precio_promedio is not None else None,
+            }
+            for row in rows
+        ]
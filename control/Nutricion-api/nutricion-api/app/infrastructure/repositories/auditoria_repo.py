@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class AuditoriaRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def listar(
+        self,
+        entidad: str,
+        entidad_id: str,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        cursor_fecha: Optional[datetime] = None,
+        cursor_id: Optional[int] = None,
+        limite: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Eventos de una entidad, del más reciente al más antiguo (idx_eau_entidad)."""
+        rows = self.db.execute(
+            text("CALL sp_auditoria_listar(:entidad, :entidad_id, :desde, :hasta, :cursor_fecha, :cursor_id, :limite)"),
+            {
+                "entidad": entidad,
+                "entidad_id": entidad_id,
+                "desde": desde,
+                "hasta": hasta,
+                "cursor_fecha": cursor_fecha,
+                "cursor_id": cursor_id,
+                "limite": limite,
+            },
+        ).fetchall()
+        return [{
+            "eau_id": row.eau_id,
+            "usr_id": row.usr_id,
+            "entidad": row.eau_entidad,
+            "entidad_id": row.eau_entidad_id,
+            "accion": row.eau_accion,
+            "ip": row.eau_ip,
+            "metadata": orjson.loads(row.eau_metadata) if row.eau_metadata else None,
+            "fecha_hora": row.eau_fecha_hora,
+        } for row in rows]
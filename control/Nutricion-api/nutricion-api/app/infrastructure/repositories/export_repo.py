@@ -0,0 +1,61 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class ExportRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def iter_mediciones(
+        self,
+        usr_id_tutor: Optional[int] = None,
+        ent_id: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorrer sp_export_mediciones con cursor del lado del servidor
+        (stream_results), entregando lotes de `chunk_size` filas.
+        """
+        result = self.db.execute(
+            text("CALL sp_export_mediciones(:usr_id_tutor, :ent_id)"),
+            {"usr_id_tutor": usr_id_tutor, "ent_id": ent_id},
+            execution_options={"stream_results": True, "max_row_buffer": chunk_size},
+        )
+        try:
+            for partition in result.partitions(chunk_size):
+                yield [self._map_row(row) for row in partition]
+        finally:
+            result.close()
+
+    @staticmethod
+    def _map_row(row: Any) -> Dict[str, Any]:
+        return {
+            "nin_id": row.nin_id,
+            "ent_id": row.ent_id,
+            "nin_sexo": row.nin_sexo,
+            "nin_fecha_nac": row.nin_fecha_nac,
+            "ant_id": row.ant_id,
+            "ant_fecha": row.ant_fecha,
+            "ant_peso_kg": float(row.ant_peso_kg),
+            "ant_talla_cm": float(row.ant_talla_cm),
+            "edad_meses": row.edad_meses,
+            "imc": float(row.imc) if row.imc is not None else None,
+            "ant_z_imc": float(row.ant_z_imc) if row.ant_z_imc is not None else None,
+            "ant_z_peso_edad": float(row.ant_z_peso_edad) if row.ant_z_peso_edad is not None else None,
+            "ant_z_talla_edad": float(row.ant_z_talla_edad) if row.ant_z_talla_edad is not None else None,
+            "en_z_score_imc": float(row.en_z_score_imc) if row.en_z_score_imc is not None else None,
+            "en_percentil_imc": float(row.en_percentil_imc) if row.en_percentil_imc is not None else None,
+            "en_clasificacion": row.en_clasificacion,
+            "en_nivel_riesgo": row.en_nivel_riesgo,
+            "alergias": row.alergias,
+        }
+
+    def nutricionista_en_entidad(self, usr_id: int, ent_id: int) -> bool:
+        """Verificar con sp_nutricionista_en_entidad si el usuario es nutricionista de la entidad."""
+        row = self.db.execute(
+            text("CALL sp_nutricionista_en_entidad(:usr_id, :ent_id)"),
+            {"usr_id": usr_id, "ent_id": ent_id},
+        ).fetchone()
+        return bool(row and row.pertenece)
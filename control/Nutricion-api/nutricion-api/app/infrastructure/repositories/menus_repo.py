@@ -0,0 +1,109 @@
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# executemany sobre un INSERT ... VALUES simple: PyMySQL lo envía como INSERT multi-fila
+_INSERT_ITEMS = text(
+    "INSERT INTO menus_items (men_id, mei_dia_idx, mei_comida, rec_id, mei_kcal) "
+    "VALUES (:men_id, :dia_idx, :comida, :rec_id, :kcal)"
+)
+
+
+class MenusRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # --- catálogo ----------------------------------------------------------------
+
+    def obtener_matriz_nutrientes(self) -> List[Dict[str, Any]]:
+        rows = self.db.execute(text("CALL sp_menu_catalogo_nutrientes()")).fetchall()
+        return [
+            {"ali_id": row.ali_id, "nutri_codigo": row.nutri_codigo, "cantidad_100": float(row.an_cantidad_100)}
+            for row in rows
+        ]
+
+    def obtener_ingredientes_recetas(self) -> List[Dict[str, Any]]:
+        rows = self.db.execute(text("CALL sp_menu_catalogo_recetas()")).fetchall()
+        return [
+            {
+                "rec_id": row.rec_id,
+                "rec_nombre": row.rec_nombre,
+                "ali_id": row.ali_id,
+                "cantidad": float(row.ri_cantidad),
+                "unidad": row.ri_unidad,
+                "mascara": int(row.rec_mascara_alergenos),
+            }
+            for row in rows
+        ]
+
+    def obtener_disponibilidad(self, periodo: str) -> List[Dict[str, Any]]:
+        """Disponibilidad y precio promedio (S/ por kg o litro) de un trimestre Q1-Q4."""
+        rows = self.db.execute(
+            text("CALL sp_menu_catalogo_disponibilidad(:periodo)"),
+            {"periodo": periodo},
+        ).fetchall()
+        return [
+            {
+                "ali_id": row.ali_id,
+                "ent_id": row.ent_id,
+                "region": row.dis_region,
+                "disponible": bool(row.dis_disponible),
+                "precio": float(row.dis_precio_promedio) if row.dis_precio_promedio is not None else None,
+            }
+            for row in rows
+        ]
+
+    def obtener_ninos(
+        self, ent_id: Optional[int] = None, nin_id: Optional[int] = None, inicio: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Niños a planificar (todos, los de una entidad o uno solo) con región y máscara de alergias alimentarias.
+
+        Con `inicio`, `men_id_semana` es el menú IA no archivado que ya tienen para esa semana (o None).
+        """
+        rows = self.db.execute(
+            text("CALL sp_menu_ninos(:ent_id, :nin_id, :inicio)"),
+            {"ent_id": ent_id, "nin_id": nin_id, "inicio": inicio},
+        ).fetchall()
+        return [
+            {
+                "nin_id": row.nin_id,
+                "nin_fecha_nac": row.nin_fecha_nac,
+                "nin_sexo": row.nin_sexo,
+                "ent_id": row.ent_id,
+                "region": row.region,
+                "mascara_alergias": int(row.nin_mascara_alergias),
+                "men_id_semana": row.men_id_semana,
+            }
+            for row in rows
+        ]
+
+    # --- menús ---------------------------------------------------------------------
+
+    def crear_menu(
+        self,
+        nin_id: int,
+        inicio: date,
+        fin: date,
+        kcal_total: int,
+        items: Sequence[Dict[str, Any]],
+        generado_por: str = "IA",
+        commit: bool = True,
+    ) -> int:
+        """Crear el menú (BORRADOR) con sp_menus_crear e insertar sus ítems en un solo INSERT."""
+        row = self.db.execute(
+            text("CALL sp_menus_crear(:nin_id, :generado_por, :inicio, :fin, :kcal_total)"),
+            {"nin_id": nin_id, "generado_por": generado_por, "inicio": inicio, "fin": fin, "kcal_total": kcal_total},
+        ).fetchone()
+        men_id = int(row.men_id)
+        if items:
+            self.db.execute(_INSERT_ITEMS, [
+                {"men_id": men_id, "dia_idx": it["dia_idx"], "comida": it["comida"], "rec_id": it["rec_id"],
+                 "kcal": it["kcal"]}
+                for it in items
+            ])
+        if commit:
+            self.db.commit()
+        return men_id
@@ -5,6 +5,8 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.domain.interfaces.ninos_repository import INinosRepository
+from app.infrastructure.db.audit import audited
+from app.infrastructure.db.identity_map import invalidates, memoized_read
 from app.schemas.ninos import NinoCreate, NinoUpdate, AnthropometryCreate
 
 
@@ -17,7 +19,7 @@ class NinosRepository(INinosRepository):
             "nin_id": row.nin_id,
             "ent_id": getattr(row, "ent_id", None),
             "nin_nombres": getattr(row, "nin_nombres", None),
-            "nin_fecha_nac": row.nin_fecha_nac.isoformat() if getattr(row, "nin_fecha_nac", None) else None,
+            "nin_fecha_nac": getattr(row, "nin_fecha_nac", None),
             "nin_sexo": getattr(row, "nin_sexo", None),
             "usr_id_tutor": getattr(row, "usr_id_tutor", None),
             "usr_id_propietario": getattr(row, "usr_id_propietario", None),
@@ -33,8 +35,8 @@ class NinosRepository(INinosRepository):
             "idioma_resp": getattr(row, "idioma_resp", None),
             # Campos requeridos por el schema NinoResponse
             "edad_meses": getattr(row, "edad_meses", 0),
-            "creado_en": row.creado_en.isoformat() if getattr(row, "creado_en", None) else None,
-            "actualizado_en": row.actualizado_en.isoformat() if getattr(row, "actualizado_en", None) else None,
+            "creado_en": getattr(row, "creado_en", None),
+            "actualizado_en": getattr(row, "actualizado_en", None),
             # Campos opcionales de entidad
             "ent_nombre": getattr(row, "ent_nombre", None),
             "ent_codigo": getattr(row, "ent_codigo", None),
@@ -56,9 +58,11 @@ class NinosRepository(INinosRepository):
             "ant_z_peso_edad": float(row.ant_z_peso_edad) if getattr(row, "ant_z_peso_edad", None) is not None else None,
             "ant_z_talla_edad": float(row.ant_z_talla_edad) if getattr(row, "ant_z_talla_edad", None) is not None else None,
             "imc": float(getattr(row, "imc", None)) if getattr(row, "imc", None) is not None else None,
-            "creado_en": row.creado_en.isoformat() if getattr(row, "creado_en", None) else None,
+            "creado_en": getattr(row, "creado_en", None),
         }
 
+    @invalidates("ninos")
+    @audited("ninos", "CREAR", id_de=lambda r: r.get("nin_id"))
     def crear_nino(self, nino_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Crear un nuevo perfil de niño usando procedimientos almacenados."""
         try:
@@ -133,6 +137,7 @@ class NinosRepository(INinosRepository):
             payload["nin_sexo"] = nino_data.nin_sexo.value
         return self.crear_nino(payload)
 
+    @memoized_read("ninos", "usuarios", "entidades")
     def obtener_nino(self, nin_id: int) -> Optional[Dict[str, Any]]:
         """Obtener un niño por su ID usando sp_ninos_get."""
         import logging
@@ -163,6 +168,7 @@ class NinosRepository(INinosRepository):
     def get_nino_by_id(self, nin_id: int) -> Optional[Dict[str, Any]]:
         return self.obtener_nino(nin_id)
 
+    @memoized_read("ninos", "usuarios", "entidades")
     def get_nino_by_owner(self, usr_id_propietario: int) -> Optional[Dict[str, Any]]:
         """Obtener un niño asociado como propietario (autogestión)"""
         result = self.db.execute(
@@ -175,6 +181,7 @@ class NinosRepository(INinosRepository):
 
         return self._map_nino_row(result)
 
+    @memoized_read("ninos", "entidades")
     def get_ninos_by_tutor(self, usr_id_tutor: int) -> List[Dict[str, Any]]:
         """Obtener todos los niños asociados al usuario usando sp_ninos_obtener_por_tutor."""
         # Usar procedimiento almacenado sp_ninos_obtener_por_tutor
@@ -187,7 +194,7 @@ class NinosRepository(INinosRepository):
             "usr_id_tutor": row.usr_id_tutor,
             "ent_id": row.ent_id,
             "nin_nombres": row.nin_nombres,
-            "nin_fecha_nac": row.nin_fecha_nac.isoformat() if row.nin_fecha_nac else None,
+            "nin_fecha_nac": row.nin_fecha_nac,
             "nin_sexo": row.nin_sexo,
             # Campos de la entidad (LEFT JOIN)
             "ent_nombre": row.ent_nombre if hasattr(row, 'ent_nombre') else None,
@@ -198,10 +205,19 @@ class NinosRepository(INinosRepository):
             "ent_distrito": row.ent_distrito if hasattr(row, 'ent_distrito') else None,
             # Campos calculados y temporales
             "edad_meses": row.edad_meses,
-            "creado_en": row.creado_en.isoformat() if row.creado_en else None,
-            "actualizado_en": row.actualizado_en.isoformat() if row.actualizado_en else None,
+            "creado_en": row.creado_en,
+            "actualizado_en": row.actualizado_en,
         } for row in results]
 
+    def get_data_version(self, usr_id: int) -> int:
+        """Versión de los datos de niños del usuario (sp_version_tutor_obtener), mantenida por triggers."""
+        row = self.db.execute(text("CALL sp_version_tutor_obtener(:usr_id)"), {
+            "usr_id": usr_id
+        }).fetchone()
+        return int(row.version) if row else 0
+
+    @invalidates("ninos")
+    @audited("ninos", "ACTUALIZAR", "nin_id")
     def actualizar_nino(self, nin_id: int, nino_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Actualizar datos de un niño usando procedimiento almacenado."""
         try:
@@ -230,6 +246,8 @@ class NinosRepository(INinosRepository):
     def update_nino(self, nin_id: int, nino_data: NinoUpdate) -> Optional[Dict[str, Any]]:
         return self.actualizar_nino(nin_id, nino_data.model_dump(exclude_unset=True))
 
+    @invalidates("ninos")
+    @audited("ninos", "PROMOVER_PROPIETARIO", "nin_id", campos=("usr_id_propietario",))
     def promote_child_to_owner(self, nin_id: int, usr_id_propietario: int) -> Optional[Dict[str, Any]]:
         """Promover un niño existente (donde el usuario es tutor) a propietario.
         Útil para reconciliar el perfil personal (self child).
@@ -249,6 +267,8 @@ class NinosRepository(INinosRepository):
             self.db.rollback()
             raise e
 
+    @invalidates("ninos")
+    @audited("ninos", "ASIGNAR_TUTOR", "nin_id", campos=("usr_id_tutor",))
     def assign_child_to_tutor(self, nin_id: int, usr_id_tutor: int) -> Optional[Dict[str, Any]]:
         """Asociar un niño existente a un tutor/padre usando SP dedicado."""
         try:
@@ -266,6 +286,8 @@ class NinosRepository(INinosRepository):
             self.db.rollback()
             raise e
 
+    @invalidates("antropometrias")
+    @audited("ninos", "AGREGAR_MEDICION", "nin_id")
     def agregar_antropometria(self, nin_id: int, ant_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Agregar datos antropométricos usando procedimiento almacenado."""
         try:
@@ -296,6 +318,7 @@ class NinosRepository(INinosRepository):
     def create_antropometria(self, nin_id: int, antropo_data: AnthropometryCreate) -> Optional[Dict[str, Any]]:
         return self.agregar_antropometria(nin_id, antropo_data.model_dump())
 
+    @memoized_read("antropometrias")
     def get_antropometria_by_nino_fecha(self, nin_id: int, fecha: date) -> Optional[Dict[str, Any]]:
         """Obtener antropometría específica por niño y fecha"""
         result = self.db.execute(
@@ -308,6 +331,7 @@ class NinosRepository(INinosRepository):
 
         return self._map_antropometria_row(result)
 
+    @memoized_read("antropometrias")
     def get_antropometrias_by_nino(self, nin_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Obtener todas las antropometrías de un niño usando procedimiento almacenado"""
         results = self.db.execute(text("CALL sp_antropometria_obtener_por_nino(:nin_id, :limit)"), {
@@ -329,9 +353,10 @@ class NinosRepository(INinosRepository):
                 if (getattr(row, "imc", None) is not None or getattr(row, "imc_calculado", None) is not None)
                 else None
             ),
-            "creado_en": row.creado_en.isoformat() if row.creado_en else None
+            "creado_en": row.creado_en
         } for row in results]
 
+    @memoized_read("antropometrias")
     def get_latest_antropometria(self, nin_id: int) -> Optional[Dict[str, Any]]:
         """Obtener la antropometría más reciente usando procedimiento almacenado"""
         result = self.db.execute(
@@ -344,6 +369,8 @@ class NinosRepository(INinosRepository):
 
         return self._map_antropometria_row(result)
 
+    @invalidates("ninos", "antropometrias", "ninos_alergias")
+    @audited("ninos", "ELIMINAR", "nin_id")
     def delete_nino(self, nin_id: int) -> bool:
         """Eliminar un niño (por ahora hard delete)"""
         try:
@@ -357,6 +384,7 @@ class NinosRepository(INinosRepository):
             self.db.rollback()
             raise e
 
+    @invalidates("antropometrias", "evaluaciones_nutricionales")
     def evaluar_estado_nutricional(self, nin_id: int) -> Dict[str, Any]:
         """Evaluar estado nutricional usando WHO standards con sp_evaluar_estado_nutricional"""
         try:
@@ -376,13 +404,51 @@ class NinosRepository(INinosRepository):
                     "en_clasificacion": result.en_clasificacion,
                     "en_nivel_riesgo": result.en_nivel_riesgo,
                     "oms_usado": bool(result.oms_usado),
-                    "evaluado_en": result.evaluado_en.isoformat() if result.evaluado_en else None
+                    "evaluado_en": result.evaluado_en
                 }
             return None
             
         except Exception as e:
             raise e
 
+    @memoized_read("evaluaciones_nutricionales", "antropometrias")
+    def get_ultima_evaluacion(self, nin_id: int) -> Optional[Dict[str, Any]]:
+        """Evaluación ya persistida de la última antropometría (sp_evaluacion_obtener_ultima)."""
+        result = self.db.execute(text("CALL sp_evaluacion_obtener_ultima(:nin_id)"), {
+            "nin_id": nin_id
+        }).fetchone()
+        if not result:
+            return None
+        return {
+            "en_id": result.en_id,
+            "nin_id": result.nin_id,
+            "ant_id": result.ant_id,
+            "en_edad_meses": result.en_edad_meses,
+            "imc_calculado": float(result.imc_calculado),
+            "en_z_score_imc": float(result.en_z_score_imc),
+            "percentil_calculado": float(result.percentil_calculado) if result.percentil_calculado else None,
+            "en_clasificacion": result.en_clasificacion,
+            "en_nivel_riesgo": result.en_nivel_riesgo,
+            "oms_usado": result.oms_usado,
+            "evaluado_en": result.evaluado_en
+        }
+
+    def obtener_o_evaluar_estado(self, nin_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Leer la evaluación calculada por el worker; si aún no existe (medición
+        recién registrada o datos antiguos) evaluar en línea y encolar el
+        recálculo para que quede persistida.
+        """
+        estado = self.get_ultima_evaluacion(nin_id)
+        if estado:
+            return estado
+        estado = self.evaluar_estado_nutricional(nin_id)
+        from app.workers.registry import enqueue
+        enqueue(self.db, "evaluacion.recalcular", {"nin_id": nin_id}, clave=f"evaluacion:{nin_id}")
+        return estado
+
+    @invalidates("ninos_alergias")
+    @audited("ninos", "AGREGAR_ALERGIA", "nin_id", campos=("ta_codigo", "severidad"))
     def agregar_alergia(self, nin_id: int, ta_codigo: str, severidad: str = "LEVE") -> Dict[str, Any]:
         """Agregar alergia a un niño usando sp_ninos_agregar_alergia"""
         try:
@@ -401,13 +467,29 @@ class NinosRepository(INinosRepository):
                 "ta_nombre": row.ta_nombre,
                 "ta_categoria": row.ta_categoria,
                 "na_severidad": row.na_severidad,
-                "creado_en": row.creado_en.isoformat() if row.creado_en else None
+                "creado_en": row.creado_en
             } for row in result]
             
         except Exception as e:
             self.db.rollback()
             raise e
 
+    @invalidates("ninos_alergias")
+    @audited("ninos", "ELIMINAR_ALERGIA", "nin_id", campos=("na_id",))
+    def eliminar_alergia(self, nin_id: int, na_id: int) -> bool:
+        """Quitar una alergia del niño; False si no le pertenece."""
+        try:
+            affected = self.db.execute(
+                text("DELETE FROM ninos_alergias WHERE na_id = :na_id AND nin_id = :nin_id"),
+                {"na_id": na_id, "nin_id": nin_id},
+            )
+            self.db.commit()
+            return affected.rowcount > 0
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    @memoized_read("ninos_alergias", "tipos_alergias")
     def obtener_alergias(self, nin_id: int) -> List[Dict[str, Any]]:
         """Obtener alergias de un niño usando sp_ninos_obtener_alergias"""
         try:
@@ -422,12 +504,13 @@ class NinosRepository(INinosRepository):
                 "ta_nombre": row.ta_nombre,
                 "ta_categoria": row.ta_categoria,
                 "na_severidad": row.na_severidad,
-                "creado_en": row.creado_en.isoformat() if row.creado_en else None
+                "creado_en": row.creado_en
             } for row in results]
             
         except Exception as e:
             raise e
 
+    @invalidates("tipos_alergias")
     def crear_tipo_alergia(self, ta_codigo: str, ta_nombre: str, ta_categoria: str) -> Dict[str, Any]:
         """Crear nuevo tipo de alergia"""
         try:
@@ -451,13 +534,14 @@ class NinosRepository(INinosRepository):
                 "ta_nombre": result.ta_nombre,
                 "ta_categoria": result.ta_categoria,
                 "ta_activo": bool(result.ta_activo),
-                "creado_en": result.creado_en.isoformat() if result.creado_en else None,
+                "creado_en": result.creado_en,
             }
 
         except Exception as e:
             self.db.rollback()
             raise e
 
+    @memoized_read("tipos_alergias")
     def obtener_tipos_alergias(self, q: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Obtener tipos de alergias usando sp_tipos_alergias_buscar"""
         try:
@@ -473,13 +557,14 @@ class NinosRepository(INinosRepository):
                     "ta_nombre": row.ta_nombre,
                     "ta_categoria": row.ta_categoria,
                     "ta_activo": bool(row.ta_activo),
-                    "creado_en": row.creado_en.isoformat() if row.creado_en else None,
+                    "creado_en": row.creado_en,
                 }
                 for row in results
             ]
         except Exception as e:
             raise e
 
+    @memoized_read("ninos", "antropometrias")
     def get_perfil_completo(self, nin_id: int) -> Dict[str, Any]:
         """Obtener perfil completo con última antropometría usando procedimiento almacenado"""
         result_sets = self.db.execute(
@@ -502,8 +587,8 @@ class NinosRepository(INinosRepository):
                     "nin_sexo": getattr(nino_row, "nin_sexo", None),
                     "nin_alergias": getattr(nino_row, "nin_alergias", None),
                     "edad_meses": getattr(nino_row, "edad_meses", None),
-                    "creado_en": nino_row.creado_en.isoformat() if getattr(nino_row, "creado_en", None) else None,
-                    "actualizado_en": nino_row.actualizado_en.isoformat() if getattr(nino_row, "actualizado_en", None) else None,
+                    "creado_en": getattr(nino_row, "creado_en", None),
+                    "actualizado_en": getattr(nino_row, "actualizado_en", None),
                 },
                 "ultima_antropometria": None,
             }
@@ -535,8 +620,8 @@ class NinosRepository(INinosRepository):
         # sp_ninos_obtener_alergias
         alergias = self.obtener_alergias(nin_id)
         
-        # sp_evaluar_estado_nutricional
-        estado = self.evaluar_estado_nutricional(nin_id)
+        # Evaluación persistida (o sp_evaluar_estado_nutricional si aún no existe)
+        estado = self.obtener_o_evaluar_estado(nin_id)
         ultimo_estado = None
         if estado:
             clasificacion = estado.get("en_clasificacion", "")
@@ -579,11 +664,11 @@ class NinosRepository(INinosRepository):
             # sp_ninos_obtener_alergias
             alergias = self.obtener_alergias(nin_id)
             
-            # sp_evaluar_estado_nutricional
+            # Evaluación persistida (o sp_evaluar_estado_nutricional si aún no existe)
             ultimo_estado = None
             if antropometrias:
                 try:
-                    estado = self.evaluar_estado_nutricional(nin_id)
+                    estado = self.obtener_o_evaluar_estado(nin_id)
                     if estado:
                         clasificacion = estado.get("en_clasificacion", "")
                         imc = estado.get("imc_calculado", 0)
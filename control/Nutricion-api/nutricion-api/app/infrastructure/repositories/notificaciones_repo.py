@@ -0,0 +1,173 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps
+
+# Inserción de un fan-out (muchos destinatarios) en un INSERT multi-fila; IGNORE
+# descarta las que repiten (usr_id, not_clave)
+_INSERT_NOTIFICACIONES = text(
+    "INSERT IGNORE INTO notificaciones (usr_id, not_tipo, not_payload, not_clave, not_disponible_en) "
+    "VALUES (:usr_id, :tipo, :payload, :clave, UTC_TIMESTAMP() + INTERVAL :ventana SECOND)"
+)
+
+
+def _payload(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+class NotificacionesRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def crear(
+        self,
+        usr_id: int,
+        tipo: str,
+        payload: Dict[str, Any],
+        commit: bool = True,
+        clave: Optional[str] = None,
+        ventana_seg: int = 0,
+    ) -> Optional[int]:
+        """
+        Registrar una notificación PENDIENTE con sp_notificaciones_crear.
+
+        `ventana_seg` es la ventana de agrupación: se entrega junto con las demás
+        del mismo usuario y tipo. Devuelve None si `clave` ya existía para el usuario.
+        """
+        row = self.db.execute(
+            text("CALL sp_notificaciones_crear(:usr_id, :tipo, :payload, :clave, :ventana)"),
+            {
+                "usr_id": usr_id,
+                "tipo": tipo,
+                "payload": json.dumps(payload, default=str),
+                "clave": clave,
+                "ventana": ventana_seg,
+            },
+        ).fetchone()
+        if commit:
+            self.db.commit()
+        return int(row.not_id) if row.not_id is not None else None
+
+    def crear_lote(self, notificaciones: Sequence[Dict[str, Any]], ventana_seg: int = 0, commit: bool = True) -> int:
+        """Insertar notificaciones ({usr_id, tipo, payload, clave}) en un INSERT multi-fila; devuelve las nuevas."""
+        if not notificaciones:
+            return 0
+        result = self.db.execute(
+            _INSERT_NOTIFICACIONES,
+            [
+                {
+                    "usr_id": n["usr_id"],
+                    "tipo": n["tipo"],
+                    "payload": dumps(n["payload"]).decode(),
+                    "clave": n.get("clave"),
+                    "ventana": ventana_seg,
+                }
+                for n in notificaciones
+            ],
+        )
+        if commit:
+            self.db.commit()
+        return max(result.rowcount, 0)
+
+    def obtener(self, not_id: int) -> Optional[Dict[str, Any]]:
+        row = self.db.execute(
+            text("CALL sp_notificaciones_obtener(:not_id)"),
+            {"not_id": not_id},
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            "not_id": row.not_id,
+            "usr_id": row.usr_id,
+            "usr_correo": row.usr_correo,
+            "not_tipo": row.not_tipo,
+            "not_payload": _payload(row.not_payload),
+            "not_estado": row.not_estado,
+            "not_enviado_en": row.not_enviado_en,
+            "creado_en": row.creado_en,
+        }
+
+    def marcar(self, not_id: int, estado: str) -> None:
+        """Actualizar estado (ENVIADO/FALLADO) con sp_notificaciones_marcar."""
+        self.db.execute(
+            text("CALL sp_notificaciones_marcar(:not_id, :estado)"),
+            {"not_id": not_id, "estado": estado},
+        ).fetchone()
+        self.db.commit()
+
+    # --- motor de envío --------------------------------------------------------
+
+    def reclamar(self, worker: str, max_grupos: int) -> List[Dict[str, Any]]:
+        """Reservar los grupos (usuario, tipo) vencidos con sp_notificaciones_reclamar y confirmar."""
+        try:
+            rows = self.db.execute(
+                text("CALL sp_notificaciones_reclamar(:worker, :max_grupos)"),
+                {"worker": worker, "max_grupos": max_grupos},
+            ).fetchall()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [
+            {
+                "not_id": row.not_id,
+                "usr_id": row.usr_id,
+                "usr_correo": row.usr_correo,
+                "usr_nombre": row.usr_nombre,
+                "not_tipo": row.not_tipo,
+                "not_payload": _payload(row.not_payload),
+                "not_intentos": row.not_intentos,
+                "creado_en": row.creado_en,
+            }
+            for row in rows
+        ]
+
+    def finalizar(
+        self,
+        worker: str,
+        resultados: Sequence[Dict[str, Any]],
+        max_intentos: int,
+        backoff_base: int,
+        backoff_max: int,
+    ) -> int:
+        """
+        Registrar el resultado de un ciclo ({id, ok, error} por notificación) en un solo UPDATE.
+
+        Solo se actualizan las filas que `worker` aún tiene reservadas.
+        """
+        if not resultados:
+            return 0
+        row = self.db.execute(
+            text("CALL sp_notificaciones_finalizar(:worker, :resultados, :max_intentos, :backoff_base, :backoff_max)"),
+            {
+                "worker": worker,
+                "resultados": dumps(list(resultados)).decode(),
+                "max_intentos": max_intentos,
+                "backoff_base": backoff_base,
+                "backoff_max": backoff_max,
+            },
+        ).fetchone()
+        self.db.commit()
+        return int(row.filas_afectadas)
+
+    def recuperar_expiradas(self, timeout_seg: int) -> int:
+        row = self.db.execute(
+            text("CALL sp_notificaciones_recuperar_expiradas(:timeout)"),
+            {"timeout": timeout_seg},
+        ).fetchone()
+        self.db.commit()
+        return int(row.recuperadas)
+
+    def mediciones_vencidas(self, dias: int) -> List[Dict[str, Any]]:
+        rows = self.db.execute(
+            text("CALL sp_ninos_mediciones_vencidas(:dias)"),
+            {"dias": dias},
+        ).fetchall()
+        return [
+            {"usr_id": row.usr_id, "nin_id": row.nin_id, "nin_nombres": row.nin_nombres,
+             "ultima_fecha": row.ultima_fecha}
+            for row in rows
+        ]
@@ -0,0 +1,135 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps
+
+# Inserción por lotes: executemany sobre un INSERT ... VALUES simple, que PyMySQL
+# reescribe como un INSERT multi-fila (un round-trip por ~1 MB de sentencia).
+_INSERT_PUNTAJES = text(
+    "INSERT INTO puntajes_riesgo (nin_id, pri_fecha_hora, pri_version, pri_riesgo, pri_caracteristicas, rej_id) "
+    "VALUES (:nin_id, :fecha, :version, :riesgo, :caracteristicas, :rej_id)"
+)
+
+
+def _float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+class RiesgoRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insertar_puntaje(self, nin_id: int, version: str, riesgo: float, caracteristicas: Dict[str, Any]) -> int:
+        """Guardar un puntaje en puntajes_riesgo con sp_puntajes_riesgo_insertar."""
+        row = self.db.execute(
+            text("CALL sp_puntajes_riesgo_insertar(:nin_id, :version, :riesgo, :caracteristicas)"),
+            {
+                "nin_id": nin_id,
+                "version": version,
+                "riesgo": round(float(riesgo), 4),
+                "caracteristicas": json.dumps(caracteristicas, default=str),
+            },
+        ).fetchone()
+        self.db.commit()
+        return int(row.pri_id)
+
+    # --- lotes -----------------------------------------------------------------
+
+    def iniciar_ejecucion(self, version: str, incremental: bool) -> Dict[str, Any]:
+        """Registrar una corrida con sp_riesgo_ejecucion_iniciar; incluye la marca de agua `rej_desde`."""
+        row = self.db.execute(
+            text("CALL sp_riesgo_ejecucion_iniciar(:version, :incremental)"),
+            {"version": version, "incremental": int(incremental)},
+        ).fetchone()
+        self.db.commit()
+        return {
+            "rej_id": int(row.rej_id),
+            "rej_version": row.rej_version,
+            "rej_modo": row.rej_modo,
+            "rej_desde": row.rej_desde,
+            "rej_iniciado_en": row.rej_iniciado_en,
+        }
+
+    def finalizar_ejecucion(self, rej_id: int, estado: str, puntuados: int, error: Optional[str] = None) -> None:
+        self.db.execute(
+            text("CALL sp_riesgo_ejecucion_finalizar(:rej_id, :estado, :puntuados, :error)"),
+            {"rej_id": rej_id, "estado": estado, "puntuados": puntuados, "error": error},
+        )
+        self.db.commit()
+
+    def iter_caracteristicas(
+        self,
+        desde: Optional[datetime] = None,
+        chunk_size: int = 5000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorrer sp_riesgo_caracteristicas con cursor del lado del servidor,
+        en lotes de `chunk_size` niños. Requiere una sesión dedicada: la conexión
+        queda ocupada hasta agotar el resultado.
+        """
+        result = self.db.execute(
+            text("CALL sp_riesgo_caracteristicas(:desde)"),
+            {"desde": desde},
+            execution_options={"stream_results": True, "max_row_buffer": chunk_size},
+        )
+        try:
+            for partition in result.partitions(chunk_size):
+                yield [self._map_caracteristicas(row) for row in partition]
+        finally:
+            result.close()
+
+    @staticmethod
+    def _map_caracteristicas(row: Any) -> Dict[str, Any]:
+        return {
+            "nin_id": row.nin_id,
+            "nin_sexo": row.nin_sexo,
+            "nin_fecha_nac": row.nin_fecha_nac,
+            "ant_id": row.ant_id,
+            "ant_fecha": row.ant_fecha,
+            "edad_meses": row.edad_meses,
+            "imc": _float(row.imc),
+            "ant_z_imc": _float(row.ant_z_imc),
+            "ant_z_peso_edad": _float(row.ant_z_peso_edad),
+            "ant_z_talla_edad": _float(row.ant_z_talla_edad),
+            "en_z_score_imc": _float(row.en_z_score_imc),
+            "en_clasificacion": row.en_clasificacion,
+            "en_nivel_riesgo": row.en_nivel_riesgo,
+            "alergias": int(row.alergias),
+            "alergias_severas": int(row.alergias_severas),
+            "sintomas_14d": int(row.sintomas_14d),
+            "diarrea_14d": int(row.diarrea_14d),
+            "adherencia_30d": _float(row.adherencia_30d),
+            "registros_30d": int(row.registros_30d),
+        }
+
+    def insertar_puntajes_lote(
+        self,
+        rej_id: int,
+        version: str,
+        fecha: datetime,
+        caracteristicas: Sequence[Dict[str, Any]],
+        riesgos: Sequence[float],
+    ) -> int:
+        """Guardar un lote de puntajes de una corrida en una sola transacción."""
+        if not caracteristicas:
+            return 0
+        self.db.execute(
+            _INSERT_PUNTAJES,
+            [
+                {
+                    "nin_id": fila["nin_id"],
+                    "fecha": fecha,
+                    "version": version,
+                    "riesgo": round(float(riesgo), 4),
+                    "caracteristicas": dumps(fila).decode(),
+                    "rej_id": rej_id,
+                }
+                for fila, riesgo in zip(caracteristicas, riesgos)
+            ],
+        )
+        self.db.commit()
+        return len(caracteristicas)
@@ -0,0 +1,97 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.audit import audited
+
+
+def _columnas(result, nombres) -> Dict[str, list]:
+    """Resultado completo como columnas (listas), en el orden del SELECT."""
+    rows = result.fetchall()
+    if not rows:
+        return {nombre: [] for nombre in nombres}
+    return dict(zip(nombres, (list(col) for col in zip(*rows))))
+
+
+class SintomasRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _map_sintoma_row(row: Any) -> Dict[str, Any]:
+        return {
+            "sin_id": row.sin_id,
+            "nin_id": row.nin_id,
+            "fecha": row.sin_fecha,
+            "tipo": row.sin_tipo,
+            "categoria": int(row.sin_categoria),
+            "grado": row.sin_grado,
+            "notas": row.sin_notas,
+            "creado_en": row.creado_en,
+        }
+
+    @audited("ninos", "REGISTRAR_SINTOMA", "nin_id", campos=("fecha", "tipo", "grado"))
+    def registrar(
+        self, nin_id: int, fecha: date, tipo: str, grado: Optional[int] = None, notas: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Registrar un síntoma; los triggers actualizan la serie diaria y los episodios."""
+        try:
+            row = self.db.execute(
+                text("CALL sp_sintomas_registrar(:nin_id, :fecha, :tipo, :grado, :notas)"),
+                {"nin_id": nin_id, "fecha": fecha, "tipo": tipo, "grado": grado, "notas": notas},
+            ).fetchone()
+            self.db.commit()
+            return self._map_sintoma_row(row)
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    @audited("ninos", "ELIMINAR_SINTOMA", "nin_id", campos=("sin_id",))
+    def eliminar(self, nin_id: int, sin_id: int) -> bool:
+        try:
+            row = self.db.execute(
+                text("CALL sp_sintomas_eliminar(:nin_id, :sin_id)"),
+                {"nin_id": nin_id, "sin_id": sin_id},
+            ).fetchone()
+            self.db.commit()
+            return bool(row and row.filas_afectadas)
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    def listar(self, nin_id: int, desde: Optional[date] = None) -> List[Dict[str, Any]]:
+        rows = self.db.execute(
+            text("CALL sp_sintomas_listar(:nin_id, :desde)"),
+            {"nin_id": nin_id, "desde": desde},
+        ).fetchall()
+        return [self._map_sintoma_row(row) for row in rows]
+
+    def resumen_nino(self, nin_id: int, desde: date) -> List[Dict[str, Any]]:
+        """Episodios por categoría activos desde `desde` (sintomas_episodios)."""
+        rows = self.db.execute(
+            text("CALL sp_sintomas_resumen_nino(:nin_id, :desde)"),
+            {"nin_id": nin_id, "desde": desde},
+        ).fetchall()
+        return [{
+            "categoria": int(row.categoria),
+            "episodios": int(row.episodios),
+            "dias": int(row.dias),
+            "grado_max": row.grado_max,
+            "ultima_fecha": row.ultima_fecha,
+        } for row in rows]
+
+    # --- series de toda la población (columnas) ---------------------------------
+
+    def serie_sintomas(self, desde: Optional[date] = None) -> Dict[str, list]:
+        result = self.db.execute(text("CALL sp_sintomas_serie(:desde)"), {"desde": desde})
+        return _columnas(result, ("nin_id", "fecha", "categorias", "grado_max", "eventos"))
+
+    def serie_adherencia(self, desde: Optional[date] = None) -> Dict[str, list]:
+        result = self.db.execute(text("CALL sp_adherencia_serie(:desde)"), {"desde": desde})
+        return _columnas(result, ("nin_id", "fecha", "ok", "parcial", "no"))
+
+    def serie_antropometria(self, desde: Optional[date] = None) -> Dict[str, list]:
+        result = self.db.execute(text("CALL sp_antropometria_serie(:desde)"), {"desde": desde})
+        return _columnas(result, ("nin_id", "fecha", "peso_kg", "talla_cm", "z_imc", "z_peso_edad", "z_talla_edad"))
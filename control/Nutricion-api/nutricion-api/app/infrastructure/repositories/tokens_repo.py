@@ -1,6 +1,7 @@
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Any, List, Optional
 
 
 class TokensRepository:
@@ -19,3 +20,16 @@ class TokensRepository:
             {"jti": jti},
         ).fetchone()
         return bool(res and getattr(res, "esta_revocado", 0))
+
+    def revoked_since(self, db: Session, desde: Optional[datetime] = None) -> List[Any]:
+        """Revocaciones vigentes creadas desde `desde` (todas si es None)."""
+        return db.execute(
+            text("CALL sp_tokens_revocados_desde(:desde)"),
+            {"desde": desde},
+        ).fetchall()
+
+    def purge_expired(self, db: Session) -> int:
+        """Eliminar revocaciones cuyo token ya expiró."""
+        res = db.execute(text("CALL sp_tokens_purgar_expirados()")).fetchone()
+        db.commit()
+        return int(getattr(res, "eliminados", 0) or 0) if res else 0
@@ -0,0 +1,77 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class TrabajosRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def encolar(
+        self,
+        tipo: str,
+        payload: Dict[str, Any],
+        clave: Optional[str] = None,
+        max_intentos: int = 5,
+        retraso_seg: int = 0,
+        commit: bool = True,
+    ) -> int:
+        """Encolar un trabajo con sp_trabajos_encolar; `clave` deduplica trabajos pendientes."""
+        row = self.db.execute(
+            text("CALL sp_trabajos_encolar(:tipo, :payload, :clave, :max_intentos, :retraso)"),
+            {
+                "tipo": tipo,
+                "payload": json.dumps(payload, default=str),
+                "clave": clave,
+                "max_intentos": max_intentos,
+                "retraso": retraso_seg,
+            },
+        ).fetchone()
+        if commit:
+            self.db.commit()
+        return int(row.tra_id)
+
+    def reservar(self, worker: str, tipos: Optional[Sequence[str]], limite: int) -> List[Dict[str, Any]]:
+        """Reservar trabajos vencidos (FOR UPDATE SKIP LOCKED) y confirmar la reserva."""
+        try:
+            rows = self.db.execute(
+                text("CALL sp_trabajos_reservar(:worker, :tipos, :limite)"),
+                {"worker": worker, "tipos": ",".join(tipos) if tipos else None, "limite": limite},
+            ).fetchall()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [
+            {
+                "tra_id": row.tra_id,
+                "tra_tipo": row.tra_tipo,
+                "tra_payload": json.loads(row.tra_payload) if isinstance(row.tra_payload, (str, bytes)) else row.tra_payload,
+                "tra_intentos": row.tra_intentos,
+                "tra_max_intentos": row.tra_max_intentos,
+            }
+            for row in rows
+        ]
+
+    def completar(self, tra_id: int) -> None:
+        self.db.execute(text("CALL sp_trabajos_completar(:tra_id)"), {"tra_id": tra_id}).fetchone()
+        self.db.commit()
+
+    def fallar(self, tra_id: int, error: str, reintentar_en_seg: int) -> Optional[str]:
+        """Registrar el error; devuelve el nuevo estado (PENDIENTE o FALLADO)."""
+        row = self.db.execute(
+            text("CALL sp_trabajos_fallar(:tra_id, :error, :retraso)"),
+            {"tra_id": tra_id, "error": error, "retraso": reintentar_en_seg},
+        ).fetchone()
+        self.db.commit()
+        return row.tra_estado if row else None
+
+    def recuperar_expirados(self, timeout_seg: int) -> int:
+        row = self.db.execute(
+            text("CALL sp_trabajos_recuperar_expirados(:timeout)"),
+            {"timeout": timeout_seg},
+        ).fetchone()
+        self.db.commit()
+        return int(row.recuperados) if row else 0
@@ -2,30 +2,24 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 
-from passlib.context import CryptContext
-
 from app.domain.interfaces.usuarios_repository import IUsuariosRepository
+from app.infrastructure.db.identity_map import invalidates, memoized_read
+from app.infrastructure.security.password_service import get_password_service
 from app.schemas.auth import UserResponse
 from app.schemas.usuarios import UserRegister
 
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    default="pbkdf2_sha256",
-    pbkdf2_sha256__default_rounds=100,
-    pbkdf2_sha256__default_salt_size=8,
-    deprecated="auto",
-)
-
 
 class UsuariosRepository(IUsuariosRepository):
     def __init__(self, db: Session):
         self.db = db
 
+    @invalidates("usuarios")
     def insert_user(self, user_data: UserRegister) -> Optional[Any]:
         """Registrar un usuario usando procedimiento almacenado."""
         password_value = user_data.contrasena or ""
-        if not password_value.startswith("pbkdf2_sha256$"):
-            password_value = pwd_context.hash(password_value)
+        password_service = get_password_service()
+        if not password_service.is_hashed(password_value):
+            password_value = password_service.hash_password(password_value)
 
         result = self.db.execute(
             text(
@@ -44,6 +38,16 @@ class UsuariosRepository(IUsuariosRepository):
         self.db.commit()
         return result
 
+    @invalidates("usuarios")
+    def update_password_hash(self, usr_id: int, password_hash: str) -> None:
+        """Reemplazar el hash de contraseña con sp_usuarios_actualizar_contrasena"""
+        self.db.execute(
+            text("CALL sp_usuarios_actualizar_contrasena(:usr_id, :contrasena_hash)"),
+            {"usr_id": usr_id, "contrasena_hash": password_hash},
+        ).fetchone()
+        self.db.commit()
+
+    @invalidates("usuarios")
     def update_user_profile(self, usr_id: int, profile_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Actualizar perfil del usuario con sp_usuarios_perfil_guardar"""
         result = self.db.execute(
@@ -83,6 +87,7 @@ class UsuariosRepository(IUsuariosRepository):
         }
         return mapped
 
+    @memoized_read("usuarios")
     def get_user_by_username(self, username: str) -> Optional[UserResponse]:
         result = self.db.execute(text("CALL sp_login_get_hash(:usuario)"), {"usuario": username}).fetchone()
         if not result:
@@ -99,6 +104,7 @@ class UsuariosRepository(IUsuariosRepository):
             password_hash=result.password_hash
         )
 
+    @memoized_read("usuarios")
     def get_user_by_id(self, usr_id: int) -> Optional[UserResponse]:
         row = self.db.execute(
             text("CALL sp_usuarios_obtener_por_id(:usr_id)"),
@@ -119,6 +125,7 @@ class UsuariosRepository(IUsuariosRepository):
             password_hash=row.password_hash,
         )
 
+    @memoized_read("usuarios")
     def get_user_by_email(self, email: str) -> Optional[UserResponse]:
         row = self.db.execute(
             text("CALL sp_usuarios_obtener_por_email(:correo)"),
@@ -139,6 +146,7 @@ class UsuariosRepository(IUsuariosRepository):
             password_hash=row.password_hash,
         )
 
+    @memoized_read("usuarios")
     def username_exists(self, username: str) -> bool:
         """Verificar si username existe usando sp_usuarios_existe_username"""
         try:
@@ -150,6 +158,7 @@ class UsuariosRepository(IUsuariosRepository):
         except Exception as e:
             raise e
 
+    @invalidates("roles")
     def insert_rol(self, rol_codigo: str, rol_nombre: str) -> Optional[Any]:
         result = self.db.execute(
             text("CALL sp_roles_insertar(:rol_codigo, :rol_nombre)"),
@@ -162,6 +171,7 @@ class UsuariosRepository(IUsuariosRepository):
         self.db.commit()
         return result
 
+    @invalidates("usuarios")
     def change_user_role(self, usr_id: int, rol_codigo: str) -> Optional[Dict[str, Any]]:
         row = self.db.execute(
             text("CALL sp_usuarios_cambiar_rol(:usr_id, :rol_codigo)"),
@@ -181,6 +191,7 @@ class UsuariosRepository(IUsuariosRepository):
             "msg": getattr(row, "msg", None)
         }
 
+    @memoized_read("roles")
     def get_role_code_by_id(self, rol_id: int) -> Optional[str]:
         """Obtener código de rol usando sp_roles_get_codigo_by_id"""
         row = self.db.execute(text("CALL sp_roles_get_codigo_by_id(:rol_id)"), {
@@ -188,6 +199,7 @@ class UsuariosRepository(IUsuariosRepository):
         }).fetchone()
         return row.rol_codigo if row else None
 
+    @memoized_read("usuarios")
     def get_user_profile(self, usr_id: int) -> Optional[Dict[str, Any]]:
         """Obtener perfil completo del usuario con sp_usuarios_perfil_get"""
         row = self.db.execute(text("CALL sp_usuarios_perfil_get(:usr_id)"), {"usr_id": usr_id}).fetchone()
@@ -207,6 +219,7 @@ class UsuariosRepository(IUsuariosRepository):
             "idioma": row.idioma,
         }
 
+    @invalidates("usuarios")
     def ensure_profile_avatar(
         self,
         usr_id: int,
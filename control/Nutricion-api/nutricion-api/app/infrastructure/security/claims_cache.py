@@ -0,0 +1,95 @@
+"""
+Caché LRU de claims JWT ya verificados.
+Evita repetir la verificación criptográfica del mismo token en cada request.
+"""
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedClaimsCache:
+    """
+    LRU acotado de claims verificados, indexado por la firma del token.
+
+    Cada entrada guarda el `signing input` (header.payload) para comparar en
+    tiempo constante y así no aceptar una firma válida pegada a otro payload.
+    Las entradas caducan exactamente en el `exp` del token.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _split(token: str) -> Optional[Tuple[str, bytes]]:
+        signing_input, sep, signature = token.rpartition(".")
+        if not sep or not signature:
+            return None
+        return signature, signing_input.encode("ascii", "ignore")
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Obtener claims en caché si el token sigue vigente."""
+        if self.max_size <= 0:
+            return None
+        parts = self._split(token)
+        if parts is None:
+            return None
+        signature, signing_input = parts
+
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            cached_input, expires_at, claims = entry
+            if time.time() >= expires_at or not hmac.compare_digest(cached_input, signing_input):
+                # Expirado o firma reutilizada con otro payload: forzar verificación completa
+                del self._entries[signature]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(signature)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Guardar claims verificados hasta su `exp`."""
+        if self.max_size <= 0:
+            return
+        exp = claims.get("exp")
+        if exp is None:
+            # Sin expiración no hay cota segura para la entrada
+            return
+        parts = self._split(token)
+        if parts is None:
+            return
+        signature, signing_input = parts
+
+        with self._lock:
+            self._entries[signature] = (signing_input, float(exp), dict(claims))
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        """Eliminar un token de la caché (p.ej. al revocarlo)."""
+        parts = self._split(token)
+        if parts is None:
+            return
+        with self._lock:
+            self._entries.pop(parts[0], None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
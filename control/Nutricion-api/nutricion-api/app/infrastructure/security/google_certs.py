@@ -0,0 +1,117 @@
+"""
+Sesión HTTP compartida y caché de certificados públicos de Google.
+Permite verificar ID tokens localmente sin descargar los certificados en cada login.
+"""
+import base64
+import json
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def build_http_session(pool_size: int = 10) -> requests.Session:
+    """Crear una sesión con pool de conexiones y reintentos en errores transitorios."""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_google_http_session() -> requests.Session:
+    """Sesión HTTP de larga vida para las llamadas a Google."""
+    return build_http_session(settings.GOOGLE_HTTP_POOL_SIZE)
+
+
+def token_key_id(token: str) -> Optional[str]:
+    """Leer el `kid` del header del JWT sin verificarlo."""
+    try:
+        header_b64 = token.split(".", 1)[0]
+        header_b64 += "=" * (-len(header_b64) % 4)
+        return json.loads(base64.urlsafe_b64decode(header_b64)).get("kid")
+    except (ValueError, IndexError):
+        return None
+
+
+class GoogleCertsCache:
+    """
+    Certificados `kid -> PEM` de Google con expiración según `Cache-Control: max-age`.
+
+    Si llega un token con un `kid` desconocido se fuerza una recarga, limitada a
+    una cada `min_refresh_interval` segundos para no amplificar tokens falsos.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        session: Optional[requests.Session] = None,
+        default_max_age: int = 300,
+        min_refresh_interval: float = 30.0,
+    ):
+        self.certs_url = certs_url
+        self.session = session or get_google_http_session()
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def _max_age(self, response: requests.Response) -> int:
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        return int(match.group(1)) if match else self.default_max_age
+
+    def _fetch(self) -> None:
+        response = self.session.get(self.certs_url, timeout=10)
+        response.raise_for_status()
+        self._certs = response.json()
+        now = time.monotonic()
+        self._expires_at = now + self._max_age(response)
+        self._last_fetch = now
+        self.fetches += 1
+
+    def get(self, key_id: Optional[str] = None) -> Dict[str, str]:
+        """Obtener certificados vigentes, recargando si expiraron o falta `key_id`."""
+        now = time.monotonic()
+        if now < self._expires_at and (key_id is None or key_id in self._certs):
+            return self._certs
+
+        with self._lock:
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            unknown_kid = key_id is not None and key_id not in self._certs
+            if expired or (unknown_kid and now - self._last_fetch >= self.min_refresh_interval):
+                try:
+                    self._fetch()
+                except requests.RequestException:
+                    if not self._certs:
+                        raise
+                    # Mantener los certificados anteriores ante una caída puntual
+                    logger.warning("No se pudieron refrescar los certificados de Google", exc_info=True)
+            return self._certs
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+
+
+@lru_cache(maxsize=1)
+def get_google_certs_cache() -> GoogleCertsCache:
+    """Caché de certificados compartida por todas las instancias del cliente."""
+    return GoogleCertsCache(settings.GOOGLE_CERTS_URL)
@@ -2,29 +2,46 @@
 Servicio de infraestructura para Google OAuth.
 Encapsula la lógica de autenticación con Google.
 """
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlencode, urlparse, parse_qsl, urlunparse
 from datetime import datetime, timedelta
 
 import requests
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token as google_id_token
 from fastapi import HTTPException
 from jose import jwt, JWTError
 
 from app.core.config import settings
+from app.infrastructure.security.google_certs import (
+    GoogleCertsCache,
+    get_google_certs_cache,
+    get_google_http_session,
+    token_key_id,
+)
+
+
+def _google_jwt():
+    # google-auth solo se importa al verificar el primer token: el arranque no lo paga
+    from google.auth import jwt as google_jwt
+
+    return google_jwt
 
 
 class GoogleOAuthClient:
     """Cliente para operaciones de Google OAuth"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        certs_cache: Optional[GoogleCertsCache] = None
+    ):
         self.client_id = settings.GOOGLE_CLIENT_ID
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = settings.GOOGLE_REDIRECT_URI
-        self.token_url = "https://oauth2.googleapis.com/token"
-        self.userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
-        # Ya no necesitamos almacenamiento en memoria, usamos JWT
+        self.token_url = settings.GOOGLE_TOKEN_URL
+        self.userinfo_url = settings.GOOGLE_USERINFO_URL
+        # Sesión y certificados compartidos entre instancias (pool de conexiones)
+        self.session = session or get_google_http_session()
+        self.certs_cache = certs_cache or get_google_certs_cache()
     
     def verify_id_token(self, id_token_value: str) -> Dict[str, any]:
         """
@@ -46,11 +63,19 @@ class GoogleOAuthClient:
             )
         
         try:
-            id_info = google_id_token.verify_oauth2_token(
+            # Verificación local de firma, audiencia y expiración con certificados en caché
+            certs = self.certs_cache.get(token_key_id(id_token_value))
+            id_info = _google_jwt().decode(
                 id_token_value,
-                google_requests.Request(),
-                self.client_id,
+                certs=certs,
+                audience=self.client_id,
+                clock_skew_in_seconds=10,
             )
+        except requests.RequestException as exc:
+            raise HTTPException(
+                status_code=503,
+                detail="No se pudieron obtener los certificados de Google"
+            ) from exc
         except ValueError as exc:
             raise HTTPException(status_code=400, detail="Token de Google inválido") from exc
         
@@ -124,7 +149,7 @@ class GoogleOAuthClient:
         }
         
         try:
-            response = requests.post(self.token_url, data=payload, timeout=10)
+            response = self.session.post(self.token_url, data=payload, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as exc:
@@ -149,7 +174,7 @@ class GoogleOAuthClient:
         headers = {"Authorization": f"Bearer {access_token}"}
         
         try:
-            response = requests.get(self.userinfo_url, headers=headers, timeout=10)
+            response = self.session.get(self.userinfo_url, headers=headers, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as exc:
@@ -2,22 +2,90 @@
 Servicio de infraestructura para manejo de JWT (JSON Web Tokens).
 Encapsula la lógica de creación y verificación de tokens.
 """
+import logging
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 from jose import JWTError, jwt
 from fastapi import HTTPException
 
 from app.core.config import settings
+from app.infrastructure.security.claims_cache import VerifiedClaimsCache
+
+logger = logging.getLogger(__name__)
+
+
+class _JoseBackend:
+    """Backend por defecto basado en python-jose."""
+
+    name = "jose"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
+
+class _PyJWTBackend:
+    """
+    Backend opcional basado en PyJWT (más rápido para HS256).
+    La clave se codifica una sola vez y los errores se traducen a JWTError
+    para mantener la misma interfaz que el backend de jose.
+    """
+
+    name = "pyjwt"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        import jwt as pyjwt  # PyJWT
+
+        self._jwt = pyjwt
+        self._key = secret_key.encode("utf-8")
+        self.algorithm = algorithm
+        self._algorithms = [algorithm]
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return self._jwt.encode(claims, self._key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, self._key, algorithms=self._algorithms)
+        except self._jwt.PyJWTError as exc:
+            raise JWTError(str(exc)) from exc
+
+
+def _build_backend(name: str, secret_key: str, algorithm: str):
+    if (name or "").lower() == "pyjwt":
+        try:
+            return _PyJWTBackend(secret_key, algorithm)
+        except ImportError:
+            logger.warning("JWT_BACKEND=pyjwt pero PyJWT no está instalado; se usa python-jose")
+    return _JoseBackend(secret_key, algorithm)
 
 
 class JWTService:
     """Servicio para operaciones con JWT"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        claims_cache: Optional[VerifiedClaimsCache] = None,
+        backend: Optional[str] = None
+    ):
         self.secret_key = settings.SECRET_KEY
-        self.algorithm = "HS256"
+        self.algorithm = settings.ALGORITHM
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        self.backend = _build_backend(backend or settings.JWT_BACKEND, self.secret_key, self.algorithm)
+        self.claims_cache = (
+            claims_cache
+            if claims_cache is not None
+            else VerifiedClaimsCache(settings.JWT_CLAIMS_CACHE_SIZE)
+        )
     
     def create_access_token(
         self, 
@@ -32,7 +100,7 @@ class JWTService:
             expires_delta: Tiempo de expiración personalizado
             
         Returns:
-            Token JWT codificado
+            Token JWT codificado (incluye un `jti` único para revocación)
         """
         to_encode = data.copy()
         
@@ -42,34 +110,57 @@ class JWTService:
             expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
         
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        to_encode.setdefault("jti", uuid.uuid4().hex)
+        encoded_jwt = self.backend.encode(to_encode)
         
         return encoded_jwt
     
-    def verify_token(self, token: str) -> str:
+    def verify_claims(self, token: str) -> Dict[str, Any]:
         """
-        Verificar y decodificar un token JWT.
+        Verificar un token JWT y devolver todos sus claims.
+        Usa la caché de claims verificados antes de la verificación completa.
         
         Args:
             token: Token JWT a verificar
             
         Returns:
-            Username extraído del token (subject)
+            Claims del token
             
         Raises:
             HTTPException: Si el token es inválido o expiró
         """
+        claims = self.claims_cache.get(token)
+        if claims is not None:
+            return claims
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            username: str = payload.get("sub")
-            
-            if username is None:
-                raise HTTPException(status_code=401, detail="Token inválido: no contiene subject")
-            
-            return username
-            
+            claims = self.backend.decode(token)
         except JWTError as e:
             raise HTTPException(status_code=401, detail=f"Token inválido: {str(e)}")
+
+        self.claims_cache.put(token, claims)
+        return claims
+    
+    def verify_token(self, token: str) -> str:
+        """
+        Verificar y decodificar un token JWT.
+        
+        Args:
+            token: Token JWT a verificar
+            
+        Returns:
+            Username extraído del token (subject)
+            
+        Raises:
+            HTTPException: Si el token es inválido o expiró
+        """
+        payload = self.verify_claims(token)
+        username: str = payload.get("sub")
+        
+        if username is None:
+            raise HTTPException(status_code=401, detail="Token inválido: no contiene subject")
+        
+        return username
     
     def decode_token(self, token: str) -> Dict[str, any]:
         """
@@ -82,6 +173,12 @@ class JWTService:
             Payload del token
         """
         try:
-            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            return self.backend.decode(token)
         except JWTError:
             return {}
+
+
+@lru_cache(maxsize=1)
+def get_jwt_service() -> JWTService:
+    """Instancia compartida del servicio JWT (comparte la caché de claims)."""
+    return JWTService()
@@ -1,43 +1,191 @@
 """
 Servicio de infraestructura para manejo de contraseñas.
 Encapsula la lógica de hashing y verificación.
+
+Los parámetros (esquema, rondas, tamaño de sal) se leen de la configuración;
+al cambiarlos, los hashes existentes se siguen verificando y se reemplazan en el
+siguiente login (ver `verify_and_update`). El trabajo de CPU se ejecuta en un
+pool de procesos acotado para no bloquear los hilos que atienden requests.
 """
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
+
+from app.core.config import settings
+
+
+# Esquemas con los que pudieron guardarse hashes anteriores: se siguen verificando
+# (y se rehashean al iniciar sesión) aunque PASSWORD_HASH_SCHEME cambie
+LEGACY_SCHEMES = ("pbkdf2_sha256",)
+
+
+def _acepta_salt_size(scheme: str) -> bool:
+    return "salt_size" in get_crypt_handler(scheme).setting_kwds
+
+
+@lru_cache(maxsize=8)
+def build_context(scheme: str, rounds: int, salt_size: int) -> CryptContext:
+    """
+    Construir el CryptContext para los parámetros dados.
+
+    `scheme` es el esquema por defecto; los de LEGACY_SCHEMES quedan como
+    obsoletos, de modo que sus hashes verifican y se marcan para rehash.
+    `min_rounds` hace que los hashes con menos rondas se marquen para rehash.
+    """
+    legacy = [s for s in LEGACY_SCHEMES if s != scheme]
+    opciones = {
+        f"{scheme}__default_rounds": rounds,
+        f"{scheme}__min_rounds": rounds,
+    }
+    if _acepta_salt_size(scheme):
+        opciones[f"{scheme}__default_salt_size"] = salt_size
+    return CryptContext(schemes=[scheme, *legacy], default=scheme, deprecated=legacy, **opciones)
+
+
+def _salt_corta(context: CryptContext, hashed_password: str, salt_size: int) -> bool:
+    """passlib no compara el tamaño de sal en `needs_update`: un hash con sal menor a la configurada se rehashea."""
+    scheme = context.identify(hashed_password)
+    if scheme != context.default_scheme() or not _acepta_salt_size(scheme):
+        return False
+    salt = getattr(context.handler(scheme).from_string(hashed_password), "salt", None)
+    return salt is not None and len(salt) < salt_size
+
+
+# Funciones de nivel de módulo: deben ser serializables para el pool de procesos
+def _hash(plain_password: str, scheme: str, rounds: int, salt_size: int) -> str:
+    return build_context(scheme, rounds, salt_size).hash(plain_password)
+
+
+def _verify_and_update(
+    plain_password: str, hashed_password: str, scheme: str, rounds: int, salt_size: int
+) -> Tuple[bool, Optional[str]]:
+    context = build_context(scheme, rounds, salt_size)
+    ok, nuevo = context.verify_and_update(plain_password, hashed_password)
+    if ok and nuevo is None and _salt_corta(context, hashed_password, salt_size):
+        nuevo = context.hash(plain_password)
+    return ok, nuevo
 
 
 class PasswordService:
     """Servicio para operaciones con contraseñas"""
-    
-    def __init__(self):
-        self.pwd_context = CryptContext(
-            schemes=["pbkdf2_sha256"],
-            default="pbkdf2_sha256",
-            pbkdf2_sha256__default_rounds=100,
-            pbkdf2_sha256__default_salt_size=8,
-            deprecated="auto"
-        )
-    
+
+    def __init__(
+        self,
+        scheme: Optional[str] = None,
+        rounds: Optional[int] = None,
+        salt_size: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        self.scheme = scheme or settings.PASSWORD_HASH_SCHEME
+        self.rounds = rounds or settings.PASSWORD_HASH_ROUNDS
+        self.salt_size = salt_size or settings.PASSWORD_SALT_SIZE
+        self.workers = settings.PASSWORD_HASH_WORKERS if workers is None else workers
+        self.pwd_context = build_context(self.scheme, self.rounds, self.salt_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Limita el trabajo en cola para que una ráfaga de logins no crezca sin cota
+        self._slots = threading.BoundedSemaphore(max(1, self.workers) * 4)
+
+    @property
+    def _params(self) -> Tuple[str, int, int]:
+        return self.scheme, self.rounds, self.salt_size
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _run(self, fn, *args):
+        executor = self._get_executor()
+        if executor is None:
+            return fn(*args)
+        with self._slots:
+            return executor.submit(fn, *args).result()
+
+    async def _run_async(self, fn, *args):
+        executor = self._get_executor()
+        if executor is None:
+            return fn(*args)
+        await asyncio.to_thread(self._slots.acquire)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            self._slots.release()
+
+    def is_hashed(self, value: str) -> bool:
+        """Indicar si el valor ya es un hash del esquema actual o de uno de LEGACY_SCHEMES."""
+        return bool(value) and self.pwd_context.identify(value) is not None
+
     def hash_password(self, plain_password: str) -> str:
         """
         Hash de una contraseña en texto plano.
-        
+
         Args:
             plain_password: Contraseña en texto plano
-            
+
         Returns:
             Hash de la contraseña
         """
-        return self.pwd_context.hash(plain_password)
-    
+        return self._run(_hash, plain_password, *self._params)
+
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
         Verificar si una contraseña coincide con su hash.
-        
+
         Args:
             plain_password: Contraseña en texto plano
             hashed_password: Hash almacenado
-            
+
         Returns:
             True si coincide, False en caso contrario
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return self.verify_and_update(plain_password, hashed_password)[0]
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verificar la contraseña y, si el hash usa parámetros antiguos, generar uno nuevo.
+
+        Args:
+            plain_password: Contraseña en texto plano
+            hashed_password: Hash almacenado
+
+        Returns:
+            (coincide, nuevo_hash) donde nuevo_hash es None si no requiere rehash
+        """
+        if not self.is_hashed(hashed_password):
+            return False, None
+        return self._run(_verify_and_update, plain_password, hashed_password, *self._params)
+
+    async def hash_password_async(self, plain_password: str) -> str:
+        """Versión asíncrona de hash_password para endpoints `async def`."""
+        return await self._run_async(_hash, plain_password, *self._params)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Versión asíncrona de verify_and_update para endpoints `async def`."""
+        if not self.is_hashed(hashed_password):
+            return False, None
+        return await self._run_async(_verify_and_update, plain_password, hashed_password, *self._params)
+
+    def shutdown(self) -> None:
+        """Liberar el pool de procesos."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+@lru_cache(maxsize=1)
+def get_password_service() -> PasswordService:
+    """Instancia compartida del servicio (un único pool de procesos por worker)."""
+    return PasswordService()
@@ -0,0 +1,135 @@
+"""
+Conjunto en memoria de tokens revocados (logout).
+Mantiene los `jti` revocados y vigentes para que la verificación por request
+no requiera consultar MySQL; se sincroniza por deltas en segundo plano.
+"""
+import calendar
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.repositories.tokens_repo import TokensRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _to_epoch(value: datetime) -> float:
+    """Convertir un DATETIME UTC sin zona a epoch."""
+    return float(calendar.timegm(value.utctimetuple()))
+
+
+class RevocationSet:
+    """
+    Hash set `jti -> exp` con sincronización periódica desde `tokens_revocados`.
+
+    Hasta completar la primera sincronización, las consultas se confirman
+    contra la base de datos para no aceptar tokens ya revocados tras un reinicio.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        repository: Optional[TokensRepository] = None,
+        sync_interval: float = 5.0,
+        purge_interval: float = 300.0,
+        overlap_seconds: float = 5.0,
+    ):
+        self.session_factory = session_factory
+        self.repository = repository or TokensRepository()
+        self.sync_interval = sync_interval
+        self.purge_interval = purge_interval
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_db_purge = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def add(self, jti: str, exp: float) -> None:
+        """Registrar un `jti` revocado hasta su expiración (epoch)."""
+        with self._lock:
+            if exp > self._revoked.get(jti, 0.0):
+                self._revoked[jti] = exp
+
+    def is_revoked(self, jti: str) -> bool:
+        """Indicar si el `jti` está revocado y todavía no ha expirado."""
+        exp = self._revoked.get(jti)
+        if exp is not None:
+            return exp > time.time()
+        if self.ready:
+            return False
+        # Sin sincronización previa el conjunto puede estar incompleto
+        with self.session_factory() as db:
+            return self.repository.is_revoked(db, jti)
+
+    def purge_expired(self) -> int:
+        """Eliminar de memoria los `jti` cuyo token ya expiró."""
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+            for jti in expired:
+                del self._revoked[jti]
+        return len(expired)
+
+    def sync(self, db: Session) -> int:
+        """Cargar revocaciones nuevas desde la última marca de agua."""
+        desde = self._watermark - self.overlap if self._watermark else None
+        rows = self.repository.revoked_since(db, desde)
+        for row in rows:
+            self.add(row.tr_jti, _to_epoch(row.tr_expira_en))
+            if self._watermark is None or row.creado_en > self._watermark:
+                self._watermark = row.creado_en
+        self._ready.set()
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.session_factory() as db:
+                    self.sync(db)
+                    if time.monotonic() - self._last_db_purge >= self.purge_interval:
+                        self.repository.purge_expired(db)
+                        self._last_db_purge = time.monotonic()
+                self.purge_expired()
+            except Exception:
+                logger.exception("Error sincronizando tokens revocados")
+            self._stop.wait(self.sync_interval)
+
+    def start(self) -> None:
+        """Iniciar el hilo de sincronización (idempotente)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+@lru_cache(maxsize=1)
+def get_revocation_set() -> RevocationSet:
+    """Instancia compartida del conjunto de revocaciones."""
+    return RevocationSet(
+        sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+        purge_interval=settings.TOKEN_REVOCATION_PURGE_SECONDS,
+    )
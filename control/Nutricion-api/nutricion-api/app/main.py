@@ -1,10 +1,31 @@
-from fastapi import FastAPI
+import hmac
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .api.v1.api import api_router
+from .application.adherencias_ingesta import get_adherencia_ingestor
+from .application.notificaciones_motor import get_notification_engine
+from .core.audit import AuditMiddleware
+from .core.compression import CompressionMiddleware
 from .core.config import settings
+from .core.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from .core.profiling import ProfilingMiddleware
+from .core.serialization import ORJSONResponse
+from .infrastructure.db.audit import get_audit_writer
+from .infrastructure.db.session import REPLICAS
+from .infrastructure.db.stats import begin_request_stats
+from .infrastructure.external.ml_bridge import cerrar_resumidor
+from .infrastructure.security.password_service import get_password_service
+from .infrastructure.security.revocation import get_revocation_set
+from .workers.worker import get_job_worker
 import os
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    version=settings.VERSION,
+    default_response_class=ORJSONResponse,
+)
 
 frontend_origins_env = os.getenv("FRONTEND_ORIGINS")
 if frontend_origins_env:
@@ -24,12 +45,75 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],
-    expose_headers=["Authorization"],
+    expose_headers=["Authorization", "ETag"],
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
+app.add_middleware(MetricsMiddleware)
+
+if settings.AUDIT_ENABLED:
+    app.add_middleware(AuditMiddleware)
+
+if settings.PROFILING_ENABLED or settings.PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+if settings.DEBUG_HEADERS:
+    @app.middleware("http")
+    async def db_debug_headers(request, call_next):
+        stats = begin_request_stats()
+        response = await call_next(request)
+        response.headers["X-DB-Round-Trips"] = str(stats.round_trips)
+        response.headers["X-DB-Cache-Hits"] = str(stats.cache_hits)
+        return response
+
+
+@app.on_event("startup")
+def start_background_services():
+    get_revocation_set().start()
+    get_adherencia_ingestor().start()
+    if REPLICAS is not None:
+        REPLICAS.start()
+    if settings.JOBS_INPROCESS:
+        get_job_worker().start()
+    if settings.NOTIFICATIONS_INPROCESS:
+        get_notification_engine().start()
+
+
+@app.on_event("shutdown")
+def stop_background_services():
+    get_job_worker().stop()
+    get_notification_engine().stop()
+    get_adherencia_ingestor().stop()
+    get_audit_writer().stop()
+    get_revocation_set().stop()
+    if REPLICAS is not None:
+        REPLICAS.stop()
+    get_password_service().shutdown()
+    cerrar_resumidor()
+
+
 @app.get("/health", tags=["health"])  
 def health():
     return {"status": "ok"}
 
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    # Solo con `Authorization: Bearer <METRICS_TOKEN>`; sin token configurado no se expone
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    esperado = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if not hmac.compare_digest((authorization or "").encode(), esperado):
+        raise HTTPException(
+            status_code=401, detail="Token de métricas inválido", headers={"WWW-Authenticate": "Bearer"}
+        )
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
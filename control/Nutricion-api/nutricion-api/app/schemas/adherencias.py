@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional
+
+
+class EstadoAdherenciaEnum(str, Enum):
+    OK = "OK"
+    PARCIAL = "PARCIAL"
+    NO = "NO"
+
+
+class AdherenciaEvento(BaseModel):
+    nin_id: int
+    estado: EstadoAdherenciaEnum
+    men_id: Optional[int] = None
+    mei_id: Optional[int] = Field(None, description="Ítem del menú (comida) al que corresponde")
+    registrado_en: Optional[datetime] = Field(
+        None, description="Momento de la comida (sin zona: hora local del servidor); por defecto, la recepción",
+    )
+    notas: Optional[str] = Field(None, max_length=1000)
+    evento_id: Optional[str] = Field(
+        None, min_length=8, max_length=64,
+        description="Identificador del cliente (p. ej. UUID) para reenviar sin duplicar",
+    )
+
+
+class AdherenciasAceptadasResponse(BaseModel):
+    aceptados: int
+    evento_ids: List[str]
+
+
+class AdherenciaResumenResponse(BaseModel):
+    ok: int
+    parcial: int
+    no: int
+    total: int
+    tasa: Optional[float] = Field(None, description="(OK + 0.5 x PARCIAL) / total")
+
+
+class AdherenciaNinoResumenResponse(AdherenciaResumenResponse):
+    nin_id: int
+    desde: date
+    dias_con_registro: int
+
+
+class AdherenciaMenuResumenResponse(AdherenciaResumenResponse):
+    men_id: int
+    nin_id: int
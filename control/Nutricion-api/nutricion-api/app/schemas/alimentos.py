@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+class AlimentoBusquedaItem(BaseModel):
+    ali_id: int
+    nombre: str
+    grupo: Optional[str] = None
+    unidad: str
+    disponible: bool
+    precio_kg: Optional[float] = Field(None, description="Precio promedio en S/ por kg o litro")
+    nutrientes: Dict[str, float] = Field(..., description="Cantidad por 100 g/ml por código de nutriente")
+    densidad_precio: Optional[float] = Field(None, description="Cantidad del nutriente de orden por S/ 1")
+
+
+class AlimentosBusquedaResponse(BaseModel):
+    version: int
+    periodo: str
+    region: Optional[str] = None
+    total: int
+    items: List[AlimentoBusquedaItem]
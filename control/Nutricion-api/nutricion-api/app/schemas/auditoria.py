@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class EventoAuditoriaItem(BaseModel):
+    eau_id: int
+    usr_id: Optional[int] = None
+    entidad: str
+    entidad_id: str
+    accion: str
+    ip: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    fecha_hora: datetime = Field(..., description="Momento de captura (hora local del servidor)")
+
+
+class EventosAuditoriaResponse(BaseModel):
+    items: List[EventoAuditoriaItem]
+    siguiente_cursor: Optional[str] = Field(
+        None, description="Pasar como `cursor` para la página siguiente; null al llegar al final"
+    )
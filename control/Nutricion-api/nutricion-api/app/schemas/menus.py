@@ -0,0 +1,57 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import Dict, List, Optional
+
+
+class GenerarMenuRequest(BaseModel):
+    inicio: Optional[date] = Field(None, description="Primer día del menú (por defecto mañana)")
+    presupuesto_dia_pen: Optional[float] = Field(None, gt=0, description="Presupuesto diario por niño en soles")
+    guardar: bool = Field(True, description="Registrar el menú como BORRADOR")
+
+
+class GenerarMenusLoteRequest(BaseModel):
+    ent_id: Optional[int] = Field(None, description="Entidad a planificar; vacío = todos los niños")
+    inicio: Optional[date] = None
+    presupuesto_dia_pen: Optional[float] = Field(None, gt=0)
+
+
+class MenuItemResponse(BaseModel):
+    dia_idx: int
+    fecha: date
+    comida: str
+    rec_id: int
+    rec_nombre: str
+    kcal: int
+    costo_pen: float
+
+
+class MenuGeneradoResponse(BaseModel):
+    men_id: Optional[int] = None
+    nin_id: int
+    inicio: date
+    fin: date
+    presupuesto_dia_pen: float
+    kcal_total: int
+    costo_total_pen: float
+    cobertura: Dict[str, float] = Field(..., description="Promedio diario / objetivo por nutriente")
+    cumple_objetivos: bool
+    dentro_presupuesto: bool
+    advertencias: List[str] = []
+    items: List[MenuItemResponse]
+
+
+class GenerarMenusLoteResponse(BaseModel):
+    tra_id: int
+
+
+class RecetasSegurasResponse(BaseModel):
+    nin_id: int
+    alergias: List[str] = Field(..., description="Códigos de tipos_alergias del niño")
+    rec_ids: List[int]
+
+
+class NinosAlergicosResponse(BaseModel):
+    ent_id: int
+    codigos: List[str]
+    todas: bool
+    nin_ids: List[int]
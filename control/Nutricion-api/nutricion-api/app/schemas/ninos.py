@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, List
 from enum import Enum
 
@@ -31,8 +31,8 @@ class NinoResponse(BaseModel):
     ent_provincia: Optional[str] = None
     ent_distrito: Optional[str] = None
     edad_meses: int
-    creado_en: Optional[str] = None
-    actualizado_en: Optional[str] = None
+    creado_en: Optional[datetime] = None
+    actualizado_en: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -49,7 +49,7 @@ class AlergiaResponse(BaseModel):
     ta_nombre: str
     ta_categoria: str
     na_severidad: str
-    creado_en: str
+    creado_en: datetime
 
     class Config:
         from_attributes = True
@@ -65,7 +65,7 @@ class TipoAlergiaResponse(BaseModel):
     ta_nombre: str
     ta_categoria: str
     ta_activo: bool
-    creado_en: str
+    creado_en: datetime
 
     class Config:
         from_attributes = True
@@ -89,7 +89,7 @@ class AnthropometryResponse(BaseModel):
     ant_z_peso_edad: Optional[float] = None
     ant_z_talla_edad: Optional[float] = None
     imc: Optional[float] = None
-    creado_en: str
+    creado_en: datetime
 
     class Config:
         from_attributes = True
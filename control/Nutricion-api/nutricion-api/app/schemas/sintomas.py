@@ -0,0 +1,52 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SintomaCreate(BaseModel):
+    nin_id: int
+    tipo: str = Field(..., min_length=1, max_length=120, description="Texto libre; se clasifica en una categoría")
+    fecha: Optional[date] = Field(None, description="Por defecto, hoy")
+    grado: Optional[int] = Field(None, ge=1, le=3, description="1 leve, 2 moderado, 3 severo")
+    notas: Optional[str] = Field(None, max_length=1000)
+
+
+class SintomaResponse(BaseModel):
+    sin_id: int
+    nin_id: int
+    fecha: date
+    tipo: str
+    categoria: str
+    grado: Optional[int] = None
+    notas: Optional[str] = None
+    creado_en: Optional[datetime] = None
+
+
+class SintomaCategoriaResumen(BaseModel):
+    categoria: str
+    episodios: int
+    dias: int = Field(..., description="Días con el síntoma en esos episodios")
+    grado_max: Optional[int] = None
+    ultima_fecha: date
+
+
+class SintomasResumenResponse(BaseModel):
+    nin_id: int
+    desde: date
+    categorias: List[SintomaCategoriaResumen]
+
+
+class CorrelacionItem(BaseModel):
+    x: str
+    y: str
+    n: int
+    r: Optional[float] = Field(None, description="Pearson; null con menos de 3 niños o sin varianza")
+
+
+class SintomasCorrelacionResponse(BaseModel):
+    fecha: date
+    ventana_sintomas: int
+    ventana_adherencia: int
+    ninos: int
+    correlaciones: List[CorrelacionItem]
@@ -0,0 +1,46 @@
+"""
+Configuración común de las pruebas.
+
+Las pruebas no necesitan MySQL: las que pasan por la API reemplazan `get_db`
+o los repositorios. Las variables se fijan antes de importar `app` porque
+`Settings` las lee al importarse.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("AUDIT_ENABLED", "false")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("REFDATA_DIR", tempfile.mkdtemp(prefix="refdata-tests-"))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    from app.main import app as fastapi_app
+
+    yield fastapi_app
+    fastapi_app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers():
+    """Encabezado Bearer para `usuario`; el conjunto de revocados se da por sincronizado (sin base)."""
+    from app.infrastructure.security.jwt_service import get_jwt_service
+    from app.infrastructure.security.revocation import get_revocation_set
+
+    get_revocation_set()._ready.set()
+
+    def _headers(usuario: str) -> dict:
+        return {"Authorization": f"Bearer {get_jwt_service().create_access_token({'sub': usuario})}"}
+
+    return _headers
@@ -0,0 +1,150 @@
+"""Ingesta de adherencia: segmentos del log local y recuperación tras una caída."""
+import glob
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.application import adherencias_ingesta
+from app.application.adherencias_ingesta import AdherenciaIngestor
+
+pytestmark = pytest.mark.skipif(adherencias_ingesta.fcntl is None, reason="requiere flock")
+
+
+class SesionFalsa:
+    """Sesión que acumula las filas de cada INSERT en `insertadas`."""
+
+    def __init__(self, insertadas):
+        self.insertadas = insertadas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        self.insertadas.extend(params)
+        return SimpleNamespace(rowcount=len(params))
+
+    def commit(self):
+        pass
+
+
+def _ingestor(log_dir, insertadas):
+    return AdherenciaIngestor(lambda: SesionFalsa(insertadas), log_dir=str(log_dir), fsync=False)
+
+
+def _evento(n):
+    return {"evento_id": f"evento-{n:04d}", "nin_id": 1, "men_id": None, "mei_id": None,
+            "registrado_en": datetime(2025, 3, 1, 12, 0), "estado": "OK", "notas": None}
+
+
+def test_segmento_nuevo_solo_aparece_ya_bloqueado(tmp_path, monkeypatch):
+    flock = adherencias_ingesta.fcntl.flock
+    visibles = []
+
+    def flock_espia(fd, op):
+        visibles.append(glob.glob(str(tmp_path / "adherencias-*.log")))
+        return flock(fd, op)
+
+    monkeypatch.setattr(adherencias_ingesta.fcntl, "flock", flock_espia)
+    _ingestor(tmp_path, []).registrar([_evento(1)])
+
+    assert visibles == [[]]
+    assert len(glob.glob(str(tmp_path / "adherencias-*.log"))) == 1
+    assert not glob.glob(str(tmp_path / "*.tmp"))
+
+
+def test_recuperar_respeta_segmentos_vivos_y_reinserta_huerfanos(tmp_path):
+    vivo = _ingestor(tmp_path, [])
+    vivo.registrar([_evento(1), _evento(2)])
+
+    recuperadas = []
+    otro = _ingestor(tmp_path, recuperadas)
+    assert otro.recuperar() == 0
+    assert len(glob.glob(str(tmp_path / "adherencias-*.log"))) == 1
+
+    # Caída: el proceso muere sin volcar; el bloqueo se libera con el archivo abierto
+    vivo._segmento.file.close()
+    assert otro.recuperar() == 2
+    assert [f["evento_id"] for f in recuperadas] == ["evento-0001", "evento-0002"]
+    assert not os.listdir(tmp_path)
+
+
+# --- endpoint ------------------------------------------------------------------------
+
+USR_ID = 7
+
+FILAS = {
+    "sp_login_get_hash": [SimpleNamespace(
+        usr_id=USR_ID, usr_usuario="tutor_adh", usr_correo="tutor@example.com", usr_nombre="Ana",
+        usr_apellido="Quispe", rol_id=2, usr_activo=1, password_hash="x",
+    )],
+    "sp_ninos_get": [SimpleNamespace(nin_id=1, usr_id_tutor=USR_ID)],
+    # Menú 10 (ítem 100) es del niño 1; menú 20 (ítem 200) es de otro niño
+    "sp_adherencia_menus_obtener": [
+        SimpleNamespace(tipo="MENU", id=10, men_id=10, nin_id=1),
+        SimpleNamespace(tipo="MENU", id=20, men_id=20, nin_id=2),
+        SimpleNamespace(tipo="ITEM", id=100, men_id=10, nin_id=1),
+        SimpleNamespace(tipo="ITEM", id=200, men_id=20, nin_id=2),
+    ],
+}
+
+
+class _Resultado:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def fetchone(self):
+        return self._filas[0] if self._filas else None
+
+    def fetchall(self):
+        return list(self._filas)
+
+
+@pytest.fixture
+def api(app, client, auth_headers, tmp_path, monkeypatch):
+    from sqlalchemy.orm import Session
+
+    from app.api.v1.endpoints import adherencias
+    from app.infrastructure.db.session import get_db
+
+    class SesionFija(Session):
+        def execute(self, statement, params=None, **kw):
+            return _Resultado(FILAS.get(statement.text.split()[1].split("(")[0], []))
+
+    def _get_db():
+        with SesionFija() as db:
+            yield db
+
+    ingestor = _ingestor(tmp_path, [])
+    ingestor.max_buffered = 3
+    app.dependency_overrides[get_db] = _get_db
+    monkeypatch.setattr(adherencias, "get_adherencia_ingestor", lambda: ingestor)
+    headers = auth_headers("tutor_adh")
+
+    def post(*eventos):
+        return client.post("/api/v1/adherencias/", json=list(eventos), headers=headers)
+
+    post.ingestor = ingestor
+    return post
+
+
+def test_menu_e_item_deben_ser_del_nino(api):
+    assert api({"nin_id": 1, "estado": "OK", "men_id": 10, "mei_id": 100}).status_code == 202
+    assert api({"nin_id": 1, "estado": "OK", "men_id": 20}).status_code == 422
+    assert api({"nin_id": 1, "estado": "OK", "mei_id": 200}).status_code == 422
+    assert api({"nin_id": 1, "estado": "OK", "men_id": 10, "mei_id": 200}).status_code == 422
+    assert api({"nin_id": 1, "estado": "OK", "men_id": 99}).status_code == 404
+    assert len(api.ingestor) == 1
+
+
+def test_buffer_lleno_responde_503(api):
+    assert api(*[{"nin_id": 1, "estado": "OK"}] * 3).status_code == 202
+
+    resp = api({"nin_id": 1, "estado": "NO"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"]
+    assert len(api.ingestor) == 3
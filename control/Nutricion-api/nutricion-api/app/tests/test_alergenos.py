@@ -0,0 +1,163 @@
+"""Índice de alérgenos: carga completa, cambios incrementales y consultas por máscara."""
+from datetime import datetime
+
+import pytest
+
+from app.application import alergenos_index
+from app.application.alergenos_index import AllergenIndex
+
+BITS = [
+    {"ta_id": 1, "ta_codigo": "LECHE", "ta_categoria": "ALIMENTARIA", "ta_bit": 0},
+    {"ta_id": 2, "ta_codigo": "HUEVO", "ta_categoria": "ALIMENTARIA", "ta_bit": 1},
+    {"ta_id": 3, "ta_codigo": "MANI", "ta_categoria": "ALIMENTARIA", "ta_bit": 2},
+    {"ta_id": 4, "ta_codigo": "POLEN", "ta_categoria": "AMBIENTAL", "ta_bit": None},
+]
+
+
+def _fila(tipo, id_, mascara, ent_id=None, activo=True, minuto=0):
+    return {
+        "tipo": tipo, "id": id_, "ent_id": ent_id, "mascara": mascara, "activo": activo,
+        "actualizado_en": datetime(2025, 1, 1, 8, minuto),
+    }
+
+
+FILAS = [
+    _fila("NINO", 10, 0b001, ent_id=1),
+    _fila("NINO", 11, 0b011, ent_id=1),
+    _fila("NINO", 12, 0b110, ent_id=2),
+    _fila("ALIMENTO", 100, 0b001),
+    _fila("ALIMENTO", 101, 0),
+    _fila("RECETA", 200, 0b010),
+    _fila("RECETA", 201, 0),
+]
+
+
+@pytest.fixture
+def indice():
+    indice = AllergenIndex()
+    indice.cargar(BITS, FILAS, completo=True)
+    return indice
+
+
+def test_carga_completa(indice):
+    assert indice.mascara(["LECHE", "MANI"]) == 0b101
+    assert indice.codigos(0b011) == ["LECHE", "HUEVO"]
+    assert indice.mascara_nino(11) == 0b011
+    assert indice.mascara_nino(99) is None
+    assert indice._estado.desde == datetime(2025, 1, 1, 8, 0)
+
+
+def test_codigo_sin_bit_no_esta_indexado(indice):
+    with pytest.raises(ValueError):
+        indice.mascara(["POLEN"])
+
+
+def test_filtro_por_varios_alergenos(indice):
+    assert indice.ninos_alergicos(["LECHE", "HUEVO"]).tolist() == [10, 11, 12]
+    assert indice.ninos_alergicos(["LECHE", "HUEVO"], todas=True).tolist() == [11]
+    assert indice.ninos_alergicos(["HUEVO", "MANI"], ent_id=2).tolist() == [12]
+    assert indice.ninos_alergicos(["MANI"], ent_id=1).tolist() == []
+
+
+def test_ingrediente_sin_alergenos_siempre_es_seguro(indice):
+    todos = indice.mascara(["LECHE", "HUEVO", "MANI"])
+    assert indice.alimentos_seguros(todos).tolist() == [101]
+    assert indice.recetas_seguras(todos).tolist() == [201]
+    assert indice.alimentos_seguros(0).tolist() == [100, 101]
+    assert indice.recetas_seguras(indice.mascara_nino(10)).tolist() == [200, 201]
+
+
+def test_incremental_agrega_actualiza_y_quita(indice):
+    indice.cargar(BITS, [
+        _fila("NINO", 13, 0b100, ent_id=1, minuto=5),
+        _fila("NINO", 10, 0, ent_id=1, minuto=5),
+        _fila("NINO", 12, 0b110, ent_id=2, activo=False, minuto=6),
+        _fila("RECETA", 202, 0b001, minuto=6),
+    ])
+
+    assert indice._estado.ninos.ids.tolist() == [10, 11, 13]
+    assert indice.mascara_nino(10) == 0
+    assert indice.mascara_nino(12) is None
+    assert indice.ninos_alergicos(["MANI"]).tolist() == [13]
+    assert indice.recetas_seguras(indice.mascara(["LECHE"])).tolist() == [200, 201]
+    assert indice._estado.desde == datetime(2025, 1, 1, 8, 6)
+
+
+def test_incremental_sin_cambios_conserva_la_marca(indice):
+    indice.cargar(BITS, [])
+    assert indice._estado.desde == datetime(2025, 1, 1, 8, 0)
+    assert indice._estado.ninos.ids.tolist() == [10, 11, 12]
+
+
+class _RepoFalso:
+    """Reemplaza a AlergenosRepository y registra las lecturas de máscaras."""
+
+    bits = BITS
+    filas = FILAS
+    lecturas = []
+
+    def __init__(self, db):
+        pass
+
+    def obtener_bits(self):
+        return self.bits
+
+    def obtener_mascaras(self, desde=None):
+        _RepoFalso.lecturas.append(desde)
+        return [f for f in self.filas if desde is None or f["actualizado_en"] > desde]
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REFDATA_SHARED", False)
+    monkeypatch.setattr(alergenos_index, "AlergenosRepository", _RepoFalso)
+    monkeypatch.setattr(_RepoFalso, "lecturas", [])
+    return _RepoFalso
+
+
+def test_refresco_incremental_lee_desde_la_ultima_marca(repo, monkeypatch):
+    indice = AllergenIndex()
+    indice.refrescar(None, completo=True)
+    monkeypatch.setattr(repo, "filas", FILAS + [_fila("NINO", 14, 0b001, ent_id=2, minuto=9)])
+
+    assert indice.refrescar(None) == 1
+
+    assert repo.lecturas == [None, datetime(2025, 1, 1, 8, 0)]
+    assert indice.ninos_alergicos(["LECHE"], ent_id=2).tolist() == [14]
+
+
+def test_cambio_de_bits_fuerza_recarga_completa(repo, monkeypatch):
+    indice = AllergenIndex()
+    indice.refrescar(None, completo=True)
+
+    # sp_alergenos_reconstruir intercambió LECHE y HUEVO y reescribió todas las máscaras
+    # con la misma marca: una lectura incremental no vería ninguna fila
+    intercambiados = [dict(b, ta_bit={0: 1, 1: 0}.get(b["ta_bit"], b["ta_bit"])) for b in BITS]
+
+    def intercambiar(m):
+        return (m & 0b100) | (m & 0b001) << 1 | (m & 0b010) >> 1
+
+    reescritas = [dict(f, mascara=intercambiar(f["mascara"])) for f in FILAS]
+    monkeypatch.setattr(repo, "bits", intercambiados)
+    monkeypatch.setattr(repo, "filas", reescritas)
+
+    assert indice.refrescar(None) == len(FILAS)
+
+    assert repo.lecturas == [None, None]
+    # Mismas alergias que antes del cambio; con las máscaras viejas LECHE daría [11, 12]
+    assert indice.ninos_alergicos(["LECHE"]).tolist() == [10, 11]
+    assert indice.ninos_alergicos(["HUEVO"]).tolist() == [11, 12]
+    assert indice.alimentos_seguros(indice.mascara(["LECHE"])).tolist() == [101]
+
+
+def test_codigo_nuevo_no_fuerza_recarga(repo, monkeypatch):
+    indice = AllergenIndex()
+    indice.refrescar(None, completo=True)
+    nuevo = {"ta_id": 5, "ta_codigo": "SOYA", "ta_categoria": "ALIMENTARIA", "ta_bit": 3}
+    monkeypatch.setattr(repo, "bits", BITS + [nuevo])
+
+    assert indice.refrescar(None) == 0
+    assert repo.lecturas == [None, datetime(2025, 1, 1, 8, 0)]
+    assert indice.mascara(["SOYA"]) == 0b1000
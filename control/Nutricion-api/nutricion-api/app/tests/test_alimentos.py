@@ -0,0 +1,141 @@
+"""Búsqueda de alimentos por nutrientes: rangos, orden, datos faltantes y disponibilidad."""
+import numpy as np
+import pytest
+
+from app.application.alimentos_catalogo import construir_catalogo_alimentos
+from app.application.menus_service import construir_catalogo
+
+NUTRIENTES = [
+    {"codigo": "HIERRO_MG", "nombre": "Hierro", "unidad": "mg"},
+    {"codigo": "PROTEINA_G", "nombre": "Proteína", "unidad": "g"},
+]
+ALIMENTOS = [
+    {"ali_id": 1, "nombre": "Quinua", "grupo": "Cereales", "unidad": "g"},
+    {"ali_id": 2, "nombre": "Sangrecita", "grupo": "Carnes", "unidad": "g"},
+    {"ali_id": 3, "nombre": "Espinaca", "grupo": "Verduras", "unidad": "g"},
+    {"ali_id": 4, "nombre": "Lentejas", "grupo": "Menestras", "unidad": "g"},
+    {"ali_id": 5, "nombre": "Hígado", "grupo": "carnes", "unidad": "g"},
+    {"ali_id": 6, "nombre": "Chuño", "grupo": "Tubérculos", "unidad": "g"},
+]
+CANTIDADES = {
+    1: {"HIERRO_MG": 4.6, "PROTEINA_G": 14.0},
+    2: {"HIERRO_MG": 29.5, "PROTEINA_G": 20.0},
+    3: {"HIERRO_MG": 2.7},  # sin dato de proteína
+    4: {"HIERRO_MG": 7.5, "PROTEINA_G": 24.0},
+    5: {"HIERRO_MG": 4.6, "PROTEINA_G": 20.0},
+    6: {"HIERRO_MG": 3.3, "PROTEINA_G": 2.0},
+}
+
+
+def _dis(ali_id, disponible, precio, region=None, periodo="Q2"):
+    return {"ali_id": ali_id, "periodo": periodo, "region": region, "disponible": disponible, "precio": precio}
+
+
+# Lentejas (4) no tiene registros: disponible y sin precio
+DISPONIBILIDAD = [
+    _dis(1, 1, 8.0),
+    _dis(2, 1, 12.0),
+    _dis(2, 1, None, region="Sierra"),
+    _dis(3, 1, 4.0),
+    _dis(3, 0, 5.0, region="Sierra"),
+    _dis(5, 0, 10.0),
+    _dis(5, 1, 14.0),
+    _dis(6, 0, 2.0),
+    _dis(6, 1, 2.5, periodo="Q3"),
+]
+
+
+@pytest.fixture
+def catalogo():
+    matriz = [
+        {"ali_id": a, "nutri_codigo": c, "cantidad_100": v} for a, vs in CANTIDADES.items() for c, v in vs.items()
+    ]
+    return construir_catalogo_alimentos(1, ALIMENTOS, NUTRIENTES, matriz, DISPONIBILIDAD)
+
+
+def _ids(resultado):
+    return [fila["ali_id"] for fila in resultado[1]]
+
+
+def test_filtros_por_rango(catalogo):
+    assert _ids(catalogo.buscar("Q2", rangos=[("HIERRO_MG", ">", 4.6)])) == [2, 4]
+    assert _ids(catalogo.buscar("Q2", rangos=[("HIERRO_MG", ">=", 4.6)])) == [1, 2, 4, 5]
+    total, _ = catalogo.buscar("Q2", rangos=[("HIERRO_MG", ">=", 2), ("PROTEINA_G", "<", 21)])
+    assert total == 3
+    assert _ids(catalogo.buscar("Q2", rangos=[("HIERRO_MG", "<=", 3.3)], solo_disponibles=False)) == [3, 6]
+    with pytest.raises(ValueError):
+        catalogo.buscar("Q2", rangos=[("HIERRO_MG", "!=", 1)])
+    with pytest.raises(ValueError):
+        catalogo.buscar("Q2", rangos=[("ZINC_MG", ">", 1)])
+
+
+def test_nutriente_sin_dato_no_cumple_rangos_y_va_al_final(catalogo):
+    assert 3 not in _ids(catalogo.buscar("Q2", rangos=[("PROTEINA_G", "<", 100)]))
+    assert 3 not in _ids(catalogo.buscar("Q2", rangos=[("PROTEINA_G", ">=", 0)]))
+
+    for descendente in (True, False):
+        total, filas = catalogo.buscar("Q2", ordenar_por="PROTEINA_G", descendente=descendente)
+        assert filas[-1]["ali_id"] == 3
+        assert "PROTEINA_G" not in filas[-1]["nutrientes"]
+    assert total == 5
+
+
+def test_orden_y_empates(catalogo):
+    assert _ids(catalogo.buscar("Q2", ordenar_por="HIERRO_MG")) == [2, 4, 1, 5, 3]
+    assert _ids(catalogo.buscar("Q2", ordenar_por="HIERRO_MG", descendente=False)) == [3, 1, 5, 4, 2]
+    # Empate en el corte del top-k (Quinua y Hígado con 4.6): gana el primero del catálogo
+    assert _ids(catalogo.buscar("Q2", ordenar_por="HIERRO_MG", limite=3)) == [2, 4, 1]
+    assert _ids(catalogo.buscar("Q2", ordenar_por="PROTEINA_G", limite=2)) == [4, 2]
+    total, filas = catalogo.buscar("Q2", ordenar_por="HIERRO_MG", limite=1)
+    assert (total, len(filas)) == (5, 1)
+
+
+def test_orden_por_precio_y_tope(catalogo):
+    # Sin precio (Lentejas) al final aunque el orden sea ascendente
+    assert _ids(catalogo.buscar("Q2", ordenar_por="PRECIO")) == [3, 1, 2, 5, 4]
+    assert _ids(catalogo.buscar("Q2", precio_max=10)) == [1, 3]
+
+
+def test_densidad_por_precio(catalogo):
+    total, filas = catalogo.buscar("Q2", ordenar_por="HIERRO_MG", por_precio=True)
+    assert [f["ali_id"] for f in filas] == [2, 3, 1, 5, 4]
+    densidades = [f["densidad_precio"] for f in filas]
+    assert densidades[:4] == pytest.approx([295 / 12, 27 / 4, 46 / 8, 46 / 12])
+    assert densidades[4] is None
+    assert all(f["densidad_precio"] is None for f in catalogo.buscar("Q2", ordenar_por="HIERRO_MG")[1])
+
+
+def test_disponibilidad_por_region_y_duplicados(catalogo):
+    nacional = catalogo.disponibilidad("Q2", None)
+    sierra = catalogo.disponibilidad("Q2", " sierra ")
+    # Hígado: dos registros nacionales, basta uno disponible y el precio es el promedio
+    assert nacional.disponible.tolist() == [True, True, True, True, True, False]
+    assert nacional.precio[4] == 12.0
+    # En la sierra la espinaca no está disponible; la sangrecita usa el precio nacional
+    assert sierra.disponible.tolist() == [True, True, False, True, True, False]
+    assert sierra.precio[1] == 12.0 and sierra.precio[2] == 5.0
+    assert np.isnan(sierra.precio[3])
+    assert _ids(catalogo.buscar("Q3", grupo="TUBÉRCULOS")) == [6]
+    assert _ids(catalogo.buscar("Q2", grupo="Carnes", solo_disponibles=False)) == [2, 5]
+    with pytest.raises(ValueError):
+        catalogo.disponibilidad("Q5", None)
+
+
+def test_menus_usa_la_misma_disponibilidad(catalogo):
+    """El generador de menús resuelve cada alimento con las mismas reglas que la búsqueda."""
+    # Una receta por alimento (100 g): su disponibilidad y costo son los del alimento
+    ingredientes = [
+        {"rec_id": a["ali_id"], "rec_nombre": a["nombre"], "ali_id": a["ali_id"], "cantidad": 100, "unidad": "g"}
+        for a in ALIMENTOS
+    ]
+    menus = construir_catalogo([], ingredientes)
+    filas = [dict(f, ent_id=None) for f in DISPONIBILIDAD if f["periodo"] == "Q2"]
+
+    for region in (None, "Sierra"):
+        ctx = menus._calcular_contexto(filas, None, (region or "").casefold())
+        esperado = catalogo.disponibilidad("Q2", region)
+        assert ctx.disponible.tolist() == esperado.disponible.tolist()
+        con_precio = ~np.isnan(esperado.precio)
+        assert ctx.costo[con_precio] == pytest.approx(esperado.precio[con_precio] / 10)
+        # Sin precio en el contexto: mediana de sus precios del trimestre (o 0 sin ninguno)
+        assert ctx.costo[3] == 0.0
@@ -0,0 +1,97 @@
+"""Login con Google contra el servidor falso de `benchmarks.fake_google`."""
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from benchmarks.fake_google import FakeGoogle, start_server
+
+CLIENT_ID = "fake-client-id"
+CORREO = "usuario@example.com"
+USUARIO = SimpleNamespace(
+    usr_id=5, usr_usuario="usuario_google", usr_correo=CORREO, usr_nombre="Usuario", usr_apellido="Prueba",
+    rol_id=2, usr_activo=1, password_hash="x",
+)
+
+
+class _Resultado:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def fetchone(self):
+        return self._filas[0] if self._filas else None
+
+
+@pytest.fixture
+def google(app, monkeypatch):
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.infrastructure.db.session import get_db
+    from app.infrastructure.security import google_certs
+
+    fake = FakeGoogle(CLIENT_ID)
+    server = start_server(fake)
+    base = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_SECRET", "fake-secret")
+    monkeypatch.setattr(settings, "GOOGLE_REDIRECT_URI", "http://testserver/api/v1/auth/google/callback")
+    monkeypatch.setattr(settings, "GOOGLE_CERTS_URL", f"{base}/oauth2/v1/certs")
+    monkeypatch.setattr(settings, "GOOGLE_TOKEN_URL", f"{base}/token")
+    monkeypatch.setattr(settings, "GOOGLE_USERINFO_URL", f"{base}/oauth2/v2/userinfo")
+    google_certs.get_google_certs_cache.cache_clear()
+
+    class SesionFija(Session):
+        def execute(self, statement, params=None, **kw):
+            sp = statement.text.split()[1].split("(")[0]
+            return _Resultado([USUARIO] if sp == "sp_usuarios_obtener_por_email" else [])
+
+    def _get_db():
+        with SesionFija() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    yield fake
+    server.shutdown()
+    google_certs.get_google_certs_cache.cache_clear()
+
+
+def _usuario_del_token(token):
+    from app.infrastructure.security.jwt_service import get_jwt_service
+
+    return get_jwt_service().verify_claims(token)["sub"]
+
+
+def test_login_con_id_token_descarga_los_certificados_una_vez(client, google):
+    for _ in range(3):
+        resp = client.post("/api/v1/auth/google", json={"id_token": google.issue_id_token(CORREO)})
+        assert resp.status_code == 200, resp.text
+        assert _usuario_del_token(resp.json()["access_token"]) == USUARIO.usr_usuario
+    assert google.requests["certs"] == 1
+
+
+def test_id_token_alterado_o_vencido_se_rechaza(client, google):
+    header, payload, firma = google.issue_id_token(CORREO).split(".")
+    alterado = f"{header}.{payload}.{firma[:-4]}AAAA"
+    assert client.post("/api/v1/auth/google", json={"id_token": alterado}).status_code == 400
+
+    vencido = google.issue_id_token(CORREO, ttl=-3600)
+    assert client.post("/api/v1/auth/google", json={"id_token": vencido}).status_code == 400
+
+
+def test_flujo_de_autorizacion_completo(client, google):
+    inicio = client.get("/api/v1/auth/google/start", params={"redirect_to": "http://front.test/login"},
+                        follow_redirects=False)
+    assert inicio.status_code == 302
+    state = parse_qs(urlparse(inicio.headers["location"]).query)["state"][0]
+
+    resp = client.get("/api/v1/auth/google/callback", params={"code": "codigo", "state": state},
+                      follow_redirects=False)
+
+    assert resp.status_code == 302
+    destino = urlparse(resp.headers["location"])
+    assert destino.netloc == "front.test"
+    params = parse_qs(destino.query)
+    assert "google_error" not in params
+    assert _usuario_del_token(params["google_token"][0]) == USUARIO.usr_usuario
+    assert google.requests["token"] == 1
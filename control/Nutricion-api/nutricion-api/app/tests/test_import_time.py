@@ -0,0 +1,76 @@
+"""
+Presupuesto de tiempo de arranque de la API.
+
+Importa `app.main` en un proceso nuevo con `python -X importtime`. El framework
+(FastAPI, SQLAlchemy, pydantic, numpy, ...) se importa antes y fuera de la
+medición: lo que se mide es el código de la app y lo que arrastra. Falla si
+supera IMPORT_BUDGET_MS (mejor de hasta tres corridas) o si al arrancar se
+importa algún subsistema que debe cargarse en el primer uso.
+
+Para ver los módulos más lentos:
+    python -m pytest app/tests/test_import_time.py -s
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# Medido con el framework ya cargado: ~0.65-0.8 s en un runner de CI; el doble da margen al ruido
+PRESUPUESTO_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+CORRIDAS = 3
+FRAMEWORK = ("fastapi", "fastapi.security", "sqlalchemy.orm", "pydantic", "pydantic_settings", "numpy", "requests",
+             "orjson")
+
+# Subsistemas opcionales que solo se importan en el primer uso
+DIFERIDOS = ("google.auth", "pandas", "sklearn", "joblib", "ml_recomendator", "src.llm", "httpx", "matplotlib")
+
+RAIZ = Path(__file__).resolve().parents[2]
+_LINEA = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def medir(modulo: str = "app.main") -> Tuple[int, List[Tuple[int, int, str]]]:
+    """Acumulado en µs de `modulo` y (propio, acumulado, nombre) de cada import que arrastra."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(FRAMEWORK)}; import {modulo}"],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stderr[-4000:]
+
+    total = 0
+    modulos = []
+    for linea in proc.stderr.splitlines():
+        m = _LINEA.match(linea)
+        if not m:
+            continue
+        propio, acumulado, sangria, nombre = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        # Los imports anidados se listan antes que su padre; los de nivel superior
+        # (sangría de un espacio) son los del framework y, al final, `modulo`
+        if len(sangria) == 1:
+            if nombre == modulo:
+                total = acumulado
+                break
+            modulos = []
+        else:
+            modulos.append((propio, acumulado, nombre))
+    return total, modulos
+
+
+def test_arranque_dentro_del_presupuesto():
+    corridas = []
+    for _ in range(CORRIDAS):
+        corridas.append(medir())
+        if corridas[-1][0] / 1000 <= PRESUPUESTO_MS:
+            break
+    total, modulos = min(corridas, key=lambda c: c[0])
+
+    print(f"\nimport app.main: {total / 1000:.0f} ms (presupuesto {PRESUPUESTO_MS:.0f} ms)")
+    for propio, acumulado, nombre in sorted(modulos, key=lambda m: m[1], reverse=True)[:15]:
+        print(f"{acumulado / 1000:>10.1f}  {propio / 1000:>8.1f}  {nombre}")
+
+    cargados = {nombre for _, _, nombre in modulos}
+    for prefijo in DIFERIDOS:
+        encontrados = sorted(n for n in cargados if n == prefijo or n.startswith(prefijo + "."))
+        assert not encontrados, f"{prefijo} se importa al arrancar ({encontrados[0]}); debe cargarse en el primer uso"
+    assert total / 1000 <= PRESUPUESTO_MS, f"el arranque ({total / 1000:.0f} ms) supera {PRESUPUESTO_MS:.0f} ms"
@@ -0,0 +1,86 @@
+"""Generación de menús por lote: un reintento no duplica los menús ya confirmados."""
+from datetime import date
+
+import pytest
+
+from app.application import menus_service
+from benchmarks.catalogo_sintetico import catalogo_menus
+
+INICIO = date(2025, 3, 3)
+
+
+class BaseFalsa:
+    """Menús confirmados y pendientes de la transacción en curso."""
+
+    def __init__(self):
+        self.confirmados = []
+        self.pendientes = []
+
+    def commit(self):
+        self.confirmados += self.pendientes
+        self.pendientes = []
+
+    def rollback(self):
+        self.pendientes = []
+
+
+class RepoFalso:
+    def __init__(self, db, disponibilidad, falla_en=None):
+        self.db = db
+        self.disponibilidad = disponibilidad
+        self.falla_en = falla_en
+
+    def obtener_ninos(self, ent_id=None, nin_id=None, inicio=None):
+        con_menu = {nin: men for men, (nin, ini) in enumerate(self.db.confirmados, 1) if ini == inicio}
+        return [
+            {"nin_id": n, "nin_fecha_nac": date(2021, 1, 1), "nin_sexo": "F", "ent_id": 1, "region": "Lima",
+             "mascara_alergias": 0, "men_id_semana": con_menu.get(n)}
+            for n in range(1, 8)
+        ]
+
+    def obtener_disponibilidad(self, periodo):
+        return self.disponibilidad
+
+    def crear_menu(self, nin_id, inicio, fin, kcal_total, items, generado_por="IA", commit=True):
+        if nin_id == self.falla_en:
+            raise RuntimeError("conexión perdida")
+        self.db.pendientes.append((nin_id, inicio))
+        return len(self.db.confirmados) + len(self.db.pendientes)
+
+
+@pytest.fixture
+def lote(monkeypatch):
+    matriz, ingredientes, disponibilidad = catalogo_menus(60, 120)
+    catalogo = menus_service.construir_catalogo(matriz, ingredientes)
+    db = BaseFalsa()
+    repo = RepoFalso(db, disponibilidad)
+    monkeypatch.setattr(menus_service, "obtener_catalogo", lambda db: catalogo)
+    monkeypatch.setattr(menus_service, "MenusRepository", lambda db: repo)
+
+    def generar(**kw):
+        return menus_service.generar_menus(db, inicio=INICIO, presupuesto_dia_pen=50, commit_cada=2, **kw)
+
+    return db, repo, generar
+
+
+def test_reintento_omite_ninos_con_menu_de_la_semana(lote):
+    db, repo, generar = lote
+    repo.falla_en = 6
+    with pytest.raises(RuntimeError):
+        generar(omitir_con_menu=True)
+    db.rollback()
+    assert [n for n, _ in db.confirmados] == [1, 2, 3, 4]
+
+    repo.falla_en = None
+    resultado = generar(omitir_con_menu=True)
+
+    assert sorted(n for n, _ in db.confirmados) == list(range(1, 8))
+    assert [p.nin_id for p in resultado.planes] == [5, 6, 7]
+    assert [o["nin_id"] for o in resultado.omitidos] == [1, 2, 3, 4]
+
+
+def test_sin_omitir_se_puede_regenerar_la_semana(lote):
+    db, _, generar = lote
+    generar()
+    generar()
+    assert len(db.confirmados) == 14
@@ -0,0 +1,44 @@
+"""Endpoint /metrics protegido por token y caché de plantillas de ruta."""
+import threading
+
+from app.core.metrics import MetricsMiddleware
+
+
+def test_metrics_requiere_token(client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "secreto")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer otro"}).status_code == 401
+
+    resp = client.get("/metrics", headers={"Authorization": "Bearer secreto"})
+    assert resp.status_code == 200
+    assert "http_requests_total" in resp.text
+
+
+def test_cache_de_rutas_acotada_con_hilos_concurrentes():
+    middleware = MetricsMiddleware(None, resolver=lambda scope: "/items/{id}", cache_size=50)
+
+    def resolver_muchas(hilo):
+        for i in range(2000):
+            assert middleware._route_for({"method": "GET", "path": f"/items/{hilo}-{i}"}) == "/items/{id}"
+
+    hilos = [threading.Thread(target=resolver_muchas, args=(h,)) for h in range(8)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert len(middleware._routes) == 50
+
+
+def test_cache_de_rutas_conserva_las_recientes():
+    middleware = MetricsMiddleware(None, resolver=lambda scope: scope["path"], cache_size=2)
+    a, b, c = ({"method": "GET", "path": p} for p in ("/a", "/b", "/c"))
+    middleware._route_for(a)
+    middleware._route_for(b)
+    middleware._route_for(a)
+    middleware._route_for(c)
+    assert list(middleware._routes) == [("GET", "/a"), ("GET", "/c")]
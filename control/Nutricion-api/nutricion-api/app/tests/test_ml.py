@@ -0,0 +1,52 @@
+"""Puente ML/LLM: ml-recomendator y sus artefactos desde el checkout o el paquete instalado."""
+from types import SimpleNamespace
+
+from app.infrastructure.external import ml_bridge
+
+
+def test_summary_sin_paquete_instalado_usa_la_carpeta_del_repo(client, monkeypatch):
+    monkeypatch.setattr(ml_bridge, "entry_points", lambda **kw: [])
+    ml_bridge._modulo.cache_clear()
+    ml_bridge.resumidor.cache_clear()
+    try:
+        resp = client.post("/api/v1/ml/summary", json={
+            "features": {"edad_meses": 30, "imc": 15.5}, "scores": {"riesgo": 0.2}, "prefer_llm": False,
+        })
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["used_llm"] is False
+        assert "edad_meses" in resp.json()["text"]
+        assert ml_bridge.raiz_paquete().name == "ml-recomendator"
+    finally:
+        ml_bridge.cerrar_resumidor()
+        ml_bridge._modulo.cache_clear()
+        ml_bridge.resumidor.cache_clear()
+
+
+def test_modelos_de_riesgo_sin_checkout_requieren_risk_model_dir(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.infrastructure.external import ia_client
+
+    # Paquete instalado en site-packages: no hay carpeta del proyecto
+    monkeypatch.setattr(ml_bridge, "raiz_paquete", lambda: None)
+    monkeypatch.setattr(settings, "RISK_MODEL_DIR", None)
+    assert ia_client.find_models_dir() is None
+
+    monkeypatch.setattr(settings, "RISK_MODEL_DIR", str(tmp_path))
+    assert ia_client.find_models_dir() == tmp_path
+
+
+def test_raiz_paquete_es_none_para_una_instalacion_en_site_packages(tmp_path, monkeypatch):
+    instalado = tmp_path / "site-packages" / "ml_recomendator" / "llm" / "assist.py"
+    instalado.parent.mkdir(parents=True)
+    instalado.touch()
+    monkeypatch.setattr(ml_bridge, "_modulo", lambda nombre: SimpleNamespace(__file__=str(instalado)))
+    assert ml_bridge.raiz_paquete() is None
+
+
+def test_budget_ms_por_encima_del_tope_se_rechaza(client):
+    from app.core.config import settings
+
+    resp = client.post("/api/v1/ml/summary", json={
+        "features": {}, "scores": {}, "budget_ms": settings.ML_SUMMARY_MAX_BUDGET_MS + 1,
+    })
+    assert resp.status_code == 422
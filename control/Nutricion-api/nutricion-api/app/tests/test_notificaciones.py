@@ -0,0 +1,87 @@
+"""Motor de notificaciones: un ciclo completo por el canal `archivo`."""
+import json
+from types import SimpleNamespace
+
+from app.application.notificaciones_motor import NotificationEngine
+from app.infrastructure.external.notificaciones_canales import ArchivoCanal
+
+WORKER = "worker-pruebas:1"
+
+
+def _reservada(not_id, nin_id):
+    return SimpleNamespace(
+        not_id=not_id, usr_id=7, usr_correo="tutor@example.com", usr_nombre="Ana", not_tipo="MEDICION_VENCIDA",
+        not_payload=json.dumps({"nin_id": nin_id, "nin_nombres": f"Niño {nin_id}", "ultima_fecha": None}),
+        not_intentos=1, creado_en=None,
+    )
+
+
+class _Resultado:
+    def __init__(self, filas):
+        self.filas = filas
+
+    def fetchall(self):
+        return self.filas
+
+    def fetchone(self):
+        return self.filas[0] if self.filas else None
+
+
+class SesionFalsa:
+    """Responde a los SP del motor y guarda los parámetros de cada CALL."""
+
+    def __init__(self):
+        self.llamadas = {}
+
+    def execute(self, statement, params=None):
+        sp = statement.text.split()[1].split("(")[0]
+        self.llamadas[sp] = params
+        if sp == "sp_notificaciones_reclamar":
+            return _Resultado([_reservada(1, 11), _reservada(2, 12)])
+        if sp == "sp_notificaciones_finalizar":
+            return _Resultado([SimpleNamespace(filas_afectadas=len(json.loads(params["resultados"])))])
+        return _Resultado([SimpleNamespace(recuperadas=0)])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_ciclo_entrega_un_digest_por_archivo_y_finaliza_con_el_worker(tmp_path):
+    sesion = SesionFalsa()
+    motor = NotificationEngine(lambda: sesion, [ArchivoCanal(str(tmp_path))], name=WORKER)
+
+    assert motor.poll_once() == 1
+
+    archivos = list(tmp_path.glob("*.json"))
+    assert len(archivos) == 1 and not list(tmp_path.glob("*.tmp"))
+    digest = json.loads(archivos[0].read_bytes())
+    assert digest["usr_id"] == 7
+    assert digest["cantidad"] == 2
+    assert digest["asunto"] == "2 mediciones pendientes"
+    assert "Niño 12: sin mediciones registradas" in digest["cuerpo"]
+
+    finalizar = sesion.llamadas["sp_notificaciones_finalizar"]
+    assert finalizar["worker"] == WORKER == sesion.llamadas["sp_notificaciones_reclamar"]["worker"]
+    assert json.loads(finalizar["resultados"]) == [
+        {"id": 1, "ok": 1, "error": None},
+        {"id": 2, "ok": 1, "error": None},
+    ]
+
+
+def test_fallo_del_canal_se_registra_como_error(tmp_path):
+    sesion = SesionFalsa()
+    canal = ArchivoCanal(str(tmp_path))
+    tmp_path.rmdir()
+    motor = NotificationEngine(lambda: sesion, [canal], name=WORKER)
+
+    motor.poll_once()
+
+    resultados = json.loads(sesion.llamadas["sp_notificaciones_finalizar"]["resultados"])
+    assert [r["ok"] for r in resultados] == [0, 0]
+    assert resultados[0]["error"].startswith("archivo: ")
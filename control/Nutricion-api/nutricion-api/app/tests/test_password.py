@@ -0,0 +1,57 @@
+"""Hashes de contraseña: cambios de esquema y parámetros se migran en el login."""
+from types import SimpleNamespace
+
+from app.infrastructure.security.password_service import PasswordService
+
+
+def _servicio(scheme="pbkdf2_sha256", rounds=1000, salt_size=16):
+    return PasswordService(scheme=scheme, rounds=rounds, salt_size=salt_size, workers=0)
+
+
+def test_cambio_de_esquema_verifica_y_rehashea_los_hashes_anteriores():
+    anterior = _servicio().hash_password("secreta")
+    assert anterior.startswith("$pbkdf2-sha256$")
+
+    nuevo_servicio = _servicio(scheme="pbkdf2_sha512")
+    assert nuevo_servicio.is_hashed(anterior)
+    ok, nuevo = nuevo_servicio.verify_and_update("secreta", anterior)
+    assert ok
+    assert nuevo.startswith("$pbkdf2-sha512$")
+    assert nuevo_servicio.verify_and_update("secreta", nuevo) == (True, None)
+    assert nuevo_servicio.verify_and_update("otra", anterior) == (False, None)
+
+
+def test_mas_rondas_o_sal_mas_grande_fuerzan_rehash():
+    anterior = _servicio().hash_password("secreta")
+
+    ok, nuevo = _servicio(rounds=2000).verify_and_update("secreta", anterior)
+    assert ok and "$2000$" in nuevo
+
+    ok, nuevo = _servicio(salt_size=32).verify_and_update("secreta", anterior)
+    assert ok and nuevo is not None
+    assert _servicio(salt_size=32).verify_and_update("secreta", nuevo) == (True, None)
+
+
+def test_registro_no_rehashea_un_hash_de_un_esquema_anterior(monkeypatch):
+    from app.infrastructure.repositories import usuarios_repo
+    from app.schemas.usuarios import UserRegister
+
+    anterior = _servicio().hash_password("secreta")
+    monkeypatch.setattr(usuarios_repo, "get_password_service", lambda: _servicio(scheme="pbkdf2_sha512"))
+    llamadas = []
+
+    class SesionFalsa:
+        def execute(self, statement, params=None):
+            llamadas.append(params)
+            return SimpleNamespace(fetchone=lambda: None)
+
+        def commit(self):
+            pass
+
+        info = {}
+
+    usuarios_repo.UsuariosRepository(SesionFalsa()).insert_user(UserRegister(
+        nombres="Ana", apellidos="Quispe", usuario="ana", correo="ana@example.com", contrasena=anterior,
+        rol_nombre="TUTOR",
+    ))
+    assert llamadas[0]["contrasena_hash"] == anterior
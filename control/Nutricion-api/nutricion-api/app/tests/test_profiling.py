@@ -0,0 +1,73 @@
+"""Perfilado por request: solo se muestrean las pilas del propio request."""
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfilingMiddleware, _current_profile
+
+TOKEN = "perfil-secreto"
+
+
+def _ocupar(segundos: float) -> None:
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        pass
+
+
+def _perfilado_sync():
+    _ocupar(0.3)
+
+
+def _otro_request():
+    _ocupar(0.3)
+
+
+@pytest.fixture
+def perfilador(tmp_path):
+    api = FastAPI()
+
+    @api.get("/perfilado")
+    def perfilado():
+        # Lo que hace el hook SQL en el primer statement del request
+        _current_profile.get().register_current_thread()
+        _perfilado_sync()
+        return {"ok": True}
+
+    @api.get("/otro")
+    async def otro():
+        _otro_request()
+        return {"ok": True}
+
+    mw = ProfilingMiddleware(api)
+    mw.token = TOKEN.encode()
+    mw.enabled = False
+    mw.output_dir = str(tmp_path)
+    mw.interval = 0.002
+    return mw, tmp_path
+
+
+def test_token_incorrecto_no_perfila(perfilador):
+    mw, salida = perfilador
+    with TestClient(mw) as client:
+        resp = client.get("/otro", headers={"X-Profile": "otro-token"})
+    assert "x-profile-id" not in resp.headers
+    assert not list(salida.iterdir())
+
+
+def test_no_mezcla_otros_requests_del_mismo_hilo(perfilador):
+    mw, salida = perfilador
+    with TestClient(mw) as client:
+        hilo = threading.Thread(target=client.get, args=("/perfilado",), kwargs={"headers": {"X-Profile": TOKEN}})
+        hilo.start()
+        time.sleep(0.05)
+        # Bloquea el event loop, que es el hilo registrado del request perfilado
+        client.get("/otro")
+        hilo.join()
+
+    (folded,) = salida.glob("*.folded")
+    pilas = folded.read_text()
+    assert "_perfilado_sync" in pilas
+    assert "_otro_request" not in pilas
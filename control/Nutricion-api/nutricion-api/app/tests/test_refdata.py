@@ -0,0 +1,34 @@
+"""Snapshots compartidos: se reutilizan solo con la misma versión."""
+import numpy as np
+
+from app.infrastructure import refdata
+
+
+def _construir(valor, armados):
+    def construir():
+        armados.append(valor)
+        return {"valores": np.array([valor])}, {"valor": valor}
+    return construir
+
+
+def test_misma_version_se_adjunta_sin_armar():
+    armados = []
+    primero = refdata.obtener("prueba_misma", 5, _construir(1, armados))
+    segundo = refdata.obtener("prueba_misma", 5, _construir(2, armados))
+
+    assert armados == [1]
+    assert segundo.version == primero.version == 5
+    assert segundo.arrays["valores"].tolist() == [1]
+    assert not segundo.arrays["valores"].flags.writeable
+
+
+def test_otra_version_se_vuelve_a_armar():
+    armados = []
+    refdata.obtener("prueba_otra", 5, _construir(1, armados))
+    refdata.obtener("prueba_otra", 6, _construir(2, armados))
+    # Una versión menor (base restaurada) tampoco reutiliza el snapshot publicado
+    snapshot = refdata.obtener("prueba_otra", 4, _construir(3, armados))
+
+    assert armados == [1, 2, 3]
+    assert snapshot.version == refdata.version_publicada("prueba_otra") == 4
+    assert snapshot.meta == {"valor": 3}
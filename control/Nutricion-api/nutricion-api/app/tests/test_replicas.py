@@ -0,0 +1,123 @@
+"""Ruteo a réplicas a través de un request autenticado real (get_current_user + GET /children)."""
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.infrastructure.db import replicas
+from app.infrastructure.db.replicas import ESCRITURA, LECTURA, REPLICA, ReplicaSet, RoutingSession, clasificar
+from app.infrastructure.db.session import get_db
+
+USR_ID = 41
+
+FILAS = {
+    "sp_login_get_hash": [SimpleNamespace(
+        usr_id=USR_ID, usr_usuario="tutor_replica", usr_correo="tutor@example.com", usr_nombre="Ana",
+        usr_apellido="Quispe", rol_id=2, usr_activo=1, password_hash="x",
+    )],
+    "sp_version_tutor_obtener": [SimpleNamespace(version=7)],
+    "sp_ninos_obtener_por_tutor": [SimpleNamespace(
+        nin_id=5, usr_id_tutor=USR_ID, ent_id=None, nin_nombres="Mateo", nin_fecha_nac=date(2022, 1, 10),
+        nin_sexo="M", edad_meses=30, creado_en=datetime(2024, 1, 1), actualizado_en=datetime(2024, 1, 1),
+    )],
+    "sp_antropometria_obtener_por_nino": [SimpleNamespace(
+        ant_id=9, nin_id=5, ant_fecha=date(2024, 6, 1), ant_peso_kg=13.1, ant_talla_cm=92.0, ant_z_imc=0.2,
+        ant_z_peso_edad=0.1, ant_z_talla_edad=0.0, imc=15.5, creado_en=datetime(2024, 6, 1),
+    )],
+    "sp_ninos_obtener_alergias": [],
+    "sp_evaluacion_obtener_ultima": [SimpleNamespace(
+        en_id=3, nin_id=5, ant_id=9, en_edad_meses=30, imc_calculado=15.5, en_z_score_imc=0.2,
+        percentil_calculado=55.0, en_clasificacion="NORMAL", en_nivel_riesgo="BAJO", oms_usado="OMS 2006",
+        evaluado_en=datetime(2024, 6, 1),
+    )],
+}
+
+
+class _Resultado:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def fetchone(self):
+        return self._filas[0] if self._filas else None
+
+    def fetchall(self):
+        return list(self._filas)
+
+
+class SesionGrabada(RoutingSession):
+    """RoutingSession que responde cada CALL con filas fijas y anota a qué engine lo rutea."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rutas = []
+
+    def execute(self, statement, params=None, **kw):
+        nombre = replicas._CALL_RE.match(statement.text).group(1)
+        destino = self.get_bind(clause=statement)
+        self.rutas.append((nombre, "replica" if destino is not self.bind else "primario"))
+        return _Resultado(FILAS.get(nombre, []))
+
+
+@pytest.fixture
+def replica_set():
+    rs = ReplicaSet([create_engine("sqlite://")])
+    # Sin hilo de medición: la réplica se da por sana
+    rs._stop.set()
+    rs._sanas = list(rs.engines)
+    return rs
+
+
+@pytest.fixture
+def sesion(app, replica_set):
+    db = SesionGrabada(bind=create_engine("sqlite://"), replicas=replica_set)
+
+    def _get_db():
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    return db
+
+
+def test_clasificacion():
+    assert clasificar(text("CALL sp_ninos_get(:nin_id)")) == REPLICA
+    # Consultas del login y del ETag: primario, sin fijar la sesión
+    assert clasificar(text("CALL sp_login_get_hash(:usuario)")) == LECTURA
+    assert clasificar(text("CALL sp_version_tutor_obtener(:usr_id)")) == LECTURA
+    assert clasificar(text("CALL sp_usuarios_obtener_por_id(:usr_id)")) == LECTURA
+    assert clasificar(text("SELECT 1")) == LECTURA
+    assert clasificar(text("CALL sp_antropometria_agregar(:nin_id, :f, :p, :t)")) == ESCRITURA
+    assert clasificar(text("CALL sp_evaluar_estado_nutricional(:nin_id)")) == ESCRITURA
+
+
+def test_dashboard_autenticado_lee_de_la_replica(client, sesion, auth_headers):
+    resp = client.get("/api/v1/children/", headers=auth_headers("tutor_replica"))
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()[0]["nino"]["nin_id"] == 5
+    rutas = dict(sesion.rutas)
+    assert rutas["sp_login_get_hash"] == "primario"
+    assert rutas["sp_version_tutor_obtener"] == "primario"
+    assert rutas["sp_ninos_obtener_por_tutor"] == "replica"
+    assert rutas["sp_antropometria_obtener_por_nino"] == "replica"
+    assert rutas["sp_ninos_obtener_alergias"] == "replica"
+
+
+def test_escritura_fija_la_sesion_y_abre_la_ventana(replica_set):
+    primario = create_engine("sqlite://")
+    db = RoutingSession(bind=primario, replicas=replica_set)
+    replicas.fijar_usuario(db, USR_ID + 1)
+    lectura = text("CALL sp_ninos_get(:nin_id)")
+    assert db.get_bind(clause=lectura) is not primario
+
+    db.get_bind(clause=text("CALL sp_antropometria_agregar(:nin_id, :f, :p, :t)"))
+    assert db.get_bind(clause=lectura) is primario
+
+    replicas.marcar_escritura(db)
+    db.close()
+    otra = RoutingSession(bind=primario, replicas=replica_set)
+    replicas.fijar_usuario(otra, USR_ID + 1)
+    assert otra.get_bind(clause=lectura) is primario
@@ -0,0 +1,70 @@
+"""Puntaje de riesgo por lote con las características alineadas de sintomas_series."""
+from datetime import date, datetime, timedelta
+
+from app.application import riesgo_service
+from app.application.sintomas_series import CATEGORIAS, construir_series
+
+HOY = date(2025, 3, 31)
+
+
+def _series():
+    dias = lambda *n: [HOY - timedelta(days=d) for d in n]  # noqa: E731
+    diarrea = CATEGORIAS["DIARREA"]
+    return construir_series(
+        # Niño 1: dos episodios de diarrea en 14 días (separados por más de 2 días) y uno fuera de la ventana
+        {"nin_id": [1, 1, 1, 1], "fecha": dias(30, 10, 9, 2), "categorias": [diarrea] * 4,
+         "grado_max": [1] * 4, "eventos": [1] * 4},
+        {"nin_id": [], "fecha": [], "ok": [], "parcial": [], "no": []},
+        # Niño 1: 12.0 kg hace 100 días y 12.9 kg hace 10 (9 g/día); niño 2 sin mediciones
+        {"nin_id": [1, 1], "fecha": dias(100, 10), "peso_kg": [12.0, 12.9], "talla_cm": [85, 88],
+         "z_imc": [-1.5, -1.0], "z_peso_edad": [0, 0], "z_talla_edad": [0, 0]},
+    )
+
+
+def test_lote_se_completa_con_las_series():
+    filas = [{"nin_id": 1}, {"nin_id": 2}]
+    riesgo_service.agregar_caracteristicas_series(filas, _series(), HOY)
+
+    assert filas[0]["diarrea_episodios"] == 2
+    assert filas[0]["dias_desde_medicion"] == 10
+    assert round(filas[0]["delta_z_imc"], 3) == 0.5
+    assert round(filas[0]["ganancia_peso_g_dia"], 3) == 10.0
+    assert filas[1] == {"nin_id": 2, "diarrea_episodios": 0, "fiebre_episodios": 0, "delta_z_imc": None,
+                        "ganancia_peso_g_dia": None, "dias_desde_medicion": None}
+
+
+def test_corrida_guarda_las_caracteristicas_de_las_series(monkeypatch):
+    guardadas = []
+
+    class RepoFalso:
+        def __init__(self, db):
+            pass
+
+        def iniciar_ejecucion(self, version, incremental):
+            return {"rej_id": 1, "rej_desde": None, "rej_iniciado_en": datetime(2025, 3, 31), "rej_modo": "COMPLETA"}
+
+        def iter_caracteristicas(self, desde, chunk_size):
+            yield [{"nin_id": 1, "ant_z_imc": -1.0, "en_z_score_imc": None}]
+
+        def insertar_puntajes_lote(self, rej_id, version, fecha, filas, riesgos):
+            guardadas.extend(filas)
+            return len(filas)
+
+        def finalizar_ejecucion(self, *args):
+            pass
+
+    class SesionFalsa:
+        def close(self):
+            pass
+
+    monkeypatch.setattr(riesgo_service, "RiesgoRepository", RepoFalso)
+    monkeypatch.setattr(riesgo_service, "cargar_series", lambda db, hasta: _series())
+    monkeypatch.setattr(riesgo_service, "date", type("FechaFija", (), {"today": staticmethod(lambda: HOY)}))
+
+    resultado = riesgo_service.RiskScoringEngine(
+        SesionFalsa(), SesionFalsa, model=riesgo_service.BazRiskModel()
+    ).run(incremental=False)
+
+    assert resultado.puntuados == 1
+    assert guardadas[0]["diarrea_episodios"] == 2
+    assert guardadas[0]["dias_desde_medicion"] == 10
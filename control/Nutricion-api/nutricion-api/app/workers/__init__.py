@@ -0,0 +1,14 @@
+"""
+Cola de trabajos en segundo plano respaldada por la tabla `trabajos`.
+
+- `registry`: registro de tipos de trabajo (`job_handler`) y `enqueue`.
+- `handlers`: evaluación nutricional, puntaje de riesgo y avisos de mediciones vencidas.
+- `worker`: `JobWorker`, que reserva con FOR UPDATE SKIP LOCKED y ejecuta con
+  reintentos, backoff y límites de concurrencia por tipo.
+
+Se ejecuta dentro de la API (JOBS_INPROCESS) o como proceso aparte:
+    python -m app.workers
+
+La entrega de notificaciones corre aparte (NOTIFICATIONS_INPROCESS o
+`python -m app.workers.notificaciones`).
+"""
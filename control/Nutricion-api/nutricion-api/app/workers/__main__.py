@@ -0,0 +1,41 @@
+"""
+Worker como proceso independiente:
+    python -m app.workers [--tipos evaluacion.recalcular,riesgo.calcular] [--concurrency 8]
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from app.core.config import settings
+from app.infrastructure.db.session import SessionLocal
+from app.workers.registry import HANDLERS
+from app.workers.worker import JobWorker
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Worker de la cola de trabajos")
+    ap.add_argument("--tipos", default=None, help=f"Tipos separados por coma (por defecto todos: {','.join(HANDLERS)})")
+    ap.add_argument("--concurrency", type=int, default=settings.JOBS_CONCURRENCY)
+    ap.add_argument("--poll", type=float, default=settings.JOBS_POLL_SECONDS)
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = JobWorker(
+        SessionLocal,
+        tipos=args.tipos.split(",") if args.tipos else None,
+        concurrency=args.concurrency,
+        poll_interval=args.poll,
+        lock_timeout=settings.JOBS_LOCK_TIMEOUT_SECONDS,
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    worker.start()
+    stop.wait()
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
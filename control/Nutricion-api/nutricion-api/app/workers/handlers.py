@@ -0,0 +1,104 @@
+"""
+Manejadores de trabajos: evaluación nutricional, puntaje de riesgo (individual
+y por lote), generación de menús por lote y avisos de mediciones vencidas. La
+entrega de notificaciones la hace `NotificationEngine` (app.application.notificaciones_motor).
+"""
+import logging
+from datetime import date
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.application import menus_service
+from app.application.notificaciones_motor import (
+    get_notification_engine,
+    notificar,
+    notificar_mediciones_vencidas,
+)
+from app.application.riesgo_service import RIESGO_VERSION_BAZ, RiskScoringEngine, puntaje_riesgo_baz
+from app.infrastructure.repositories.ninos_repo import NinosRepository
+from app.infrastructure.repositories.riesgo_repo import RiesgoRepository
+from app.workers.registry import enqueue, job_handler
+
+logger = logging.getLogger(__name__)
+
+NIVELES_ALERTA = {"ALTO", "CRITICO"}
+
+
+@job_handler("evaluacion.recalcular", max_intentos=5, concurrencia=4)
+def recalcular_evaluacion(db: Session, payload: Dict[str, Any]) -> None:
+    """Evaluar la última antropometría y encolar el puntaje de riesgo y, si corresponde, una alerta."""
+    nin_id = int(payload["nin_id"])
+    repo = NinosRepository(db)
+    estado = repo.evaluar_estado_nutricional(nin_id)
+    if not estado:
+        db.commit()
+        return
+
+    enqueue(db, "riesgo.calcular", {
+        "nin_id": nin_id,
+        "ant_id": estado.get("ant_id"),
+        "en_z_score_imc": estado.get("en_z_score_imc"),
+        "en_edad_meses": estado.get("en_edad_meses"),
+        "en_clasificacion": estado.get("en_clasificacion"),
+    }, clave=f"riesgo:{nin_id}", commit=False)
+
+    if estado.get("en_nivel_riesgo") in NIVELES_ALERTA:
+        nino = repo.get_nino_by_id(nin_id) or {}
+        # Se agrupa con las demás alertas del destinatario en un digest
+        notificar(db, (nino.get("usr_id_tutor"), nino.get("usr_id_propietario")), "ALERTA_NUTRICIONAL", {
+            "nin_id": nin_id,
+            "nin_nombres": nino.get("nin_nombres"),
+            "ant_id": estado.get("ant_id"),
+            "clasificacion": estado.get("en_clasificacion"),
+            "nivel_riesgo": estado.get("en_nivel_riesgo"),
+            "z_score_imc": estado.get("en_z_score_imc"),
+        }, clave=f"alerta:{estado['ant_id']}" if estado.get("ant_id") else None, commit=False)
+
+    # Evaluación y trabajos derivados en la misma transacción
+    db.commit()
+
+
+@job_handler("riesgo.calcular", max_intentos=5, concurrencia=2)
+def calcular_riesgo(db: Session, payload: Dict[str, Any]) -> None:
+    riesgo = puntaje_riesgo_baz(payload.get("en_z_score_imc"))
+    RiesgoRepository(db).insertar_puntaje(int(payload["nin_id"]), RIESGO_VERSION_BAZ, riesgo, payload)
+
+
+@job_handler("riesgo.lote", max_intentos=3, concurrencia=1, backoff_base=60.0)
+def puntuar_lote(db: Session, payload: Dict[str, Any]) -> None:
+    """Puntuar toda la población (o solo los cambios si `incremental`)."""
+    from app.infrastructure.db.session import SessionLocal
+
+    RiskScoringEngine(db, SessionLocal).run(incremental=bool(payload.get("incremental", True)))
+
+
+@job_handler("menus.generar_lote", max_intentos=3, concurrencia=1, backoff_base=60.0)
+def generar_menus_lote(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Los menús se confirman cada 200: un reintento tras una falla a mitad del
+    lote omite a los niños que ya tienen el menú de esa semana.
+    """
+    inicio = payload.get("inicio")
+    menus_service.generar_menus(
+        db,
+        ent_id=payload.get("ent_id"),
+        inicio=date.fromisoformat(inicio) if inicio else None,
+        presupuesto_dia_pen=payload.get("presupuesto_dia_pen"),
+        omitir_con_menu=True,
+    )
+
+
+@job_handler("notificaciones.mediciones_vencidas", max_intentos=3, concurrencia=1, backoff_base=60.0)
+def avisar_mediciones_vencidas(db: Session, payload: Dict[str, Any]) -> None:
+    nuevas = notificar_mediciones_vencidas(db, payload.get("dias"))
+    logger.info("%s avisos de medición vencida registrados", nuevas)
+
+
+@job_handler("notificacion.enviar", max_intentos=1, concurrencia=1)
+def enviar_notificacion(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Compatibilidad con trabajos encolados antes del motor de notificaciones: la
+    fila sigue PENDIENTE y la entrega el motor en su digest; solo lo despierta.
+    """
+    get_notification_engine().notify()
@@ -0,0 +1,63 @@
+"""
+Motor de notificaciones como proceso aparte (con NOTIFICATIONS_INPROCESS=false):
+    python -m app.workers.notificaciones [--canales archivo,smtp] [--hilos 8]
+    python -m app.workers.notificaciones --vencidas [--dias 60]   # avisos de mediciones vencidas
+    python -m app.workers.notificaciones --vencidas --encolar     # delega en la cola
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from app.application.notificaciones_motor import NotificationEngine, notificar_mediciones_vencidas
+from app.core.config import settings
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.external.notificaciones_canales import crear_canales
+from app.workers.registry import enqueue
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Envío de notificaciones agrupadas")
+    ap.add_argument("--canales", default=None, help="Canales separados por coma (por defecto NOTIFICATIONS_CHANNELS)")
+    ap.add_argument("--hilos", type=int, default=settings.NOTIFICATIONS_WORKERS)
+    ap.add_argument("--vencidas", action="store_true", help="Registrar avisos de mediciones vencidas y salir")
+    ap.add_argument("--dias", type=int, default=settings.NOTIFICATIONS_OVERDUE_DAYS)
+    ap.add_argument("--encolar", action="store_true", help="Con --vencidas: encolar el trabajo en lugar de ejecutarlo")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.vencidas:
+        db = SessionLocal()
+        try:
+            if args.encolar:
+                tra_id = enqueue(db, "notificaciones.mediciones_vencidas", {"dias": args.dias},
+                                 clave="notificaciones:mediciones_vencidas")
+                print(f"Trabajo notificaciones.mediciones_vencidas encolado: {tra_id}")
+            else:
+                print(f"Avisos de medición vencida registrados: {notificar_mediciones_vencidas(db, args.dias)}")
+        finally:
+            db.close()
+        return
+
+    engine = NotificationEngine(
+        SessionLocal,
+        crear_canales(args.canales),
+        workers=args.hilos,
+        poll_interval=settings.NOTIFICATIONS_POLL_SECONDS,
+        max_grupos=settings.NOTIFICATIONS_BATCH_GROUPS,
+        max_intentos=settings.NOTIFICATIONS_MAX_ATTEMPTS,
+        backoff_base=settings.NOTIFICATIONS_BACKOFF_SECONDS,
+        backoff_max=settings.NOTIFICATIONS_BACKOFF_MAX_SECONDS,
+        lock_timeout=settings.NOTIFICATIONS_LOCK_TIMEOUT_SECONDS,
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    engine.start()
+    stop.wait()
+    engine.stop()
+
+
+if __name__ == "__main__":
+    main()
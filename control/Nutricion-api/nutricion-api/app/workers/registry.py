@@ -0,0 +1,83 @@
+"""
+Registro de tipos de trabajo y encolado.
+"""
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.infrastructure.repositories.trabajos_repo import TrabajosRepository
+
+Handler = Callable[[Session, Dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    tipo: str
+    handler: Handler
+    max_intentos: int = 5
+    concurrencia: int = 2
+    backoff_base: float = 2.0
+    backoff_max: float = 600.0
+    # Se invoca una vez cuando el trabajo agota sus intentos
+    on_exhausted: Optional[Handler] = None
+
+
+HANDLERS: Dict[str, JobSpec] = {}
+
+
+def job_handler(
+    tipo: str,
+    max_intentos: int = 5,
+    concurrencia: int = 2,
+    backoff_base: float = 2.0,
+    backoff_max: float = 600.0,
+    on_exhausted: Optional[Handler] = None,
+):
+    """Decorador que registra `fn(db, payload)` como manejador del tipo `tipo`."""
+
+    def decorator(fn: Handler) -> Handler:
+        HANDLERS[tipo] = JobSpec(tipo, fn, max_intentos, concurrencia, backoff_base, backoff_max, on_exhausted)
+        return fn
+
+    return decorator
+
+
+def backoff_seconds(spec: JobSpec, intentos: int) -> int:
+    """Backoff exponencial con jitter: base * 2^(n-1), acotado, entre 50% y 100%."""
+    delay = min(spec.backoff_base * (2 ** max(intentos - 1, 0)), spec.backoff_max)
+    return max(1, math.ceil(delay * random.uniform(0.5, 1.0)))
+
+
+def enqueue(
+    db: Session,
+    tipo: str,
+    payload: Dict[str, Any],
+    clave: Optional[str] = None,
+    retraso_seg: int = 0,
+    commit: bool = True,
+) -> int:
+    """
+    Encolar un trabajo del tipo registrado.
+
+    Args:
+        db: Sesión de base de datos
+        tipo: Tipo registrado con `job_handler`
+        payload: Datos serializables a JSON
+        clave: Clave de deduplicación mientras el trabajo siga pendiente
+        retraso_seg: Segundos antes de que el trabajo esté disponible
+        commit: Confirmar la transacción (False para encolar junto a otra escritura)
+
+    Returns:
+        ID del trabajo
+    """
+    from app.workers import handlers  # noqa: F401  registra los tipos
+
+    spec = HANDLERS.get(tipo)
+    if spec is None:
+        raise ValueError(f"Tipo de trabajo no registrado: {tipo}")
+    return TrabajosRepository(db).encolar(
+        tipo, payload, clave=clave, max_intentos=spec.max_intentos, retraso_seg=retraso_seg, commit=commit
+    )
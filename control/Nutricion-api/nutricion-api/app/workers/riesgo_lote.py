@@ -0,0 +1,38 @@
+"""
+Corrida de puntaje de riesgo por lote:
+    python -m app.workers.riesgo_lote [--completo] [--batch-size 5000]
+    python -m app.workers.riesgo_lote --encolar   # delega en la cola (tipo riesgo.lote)
+"""
+import argparse
+import logging
+
+from app.application.riesgo_service import RiskScoringEngine
+from app.core.config import settings
+from app.infrastructure.db.session import SessionLocal
+from app.workers.registry import enqueue
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Puntaje de riesgo de todos los niños")
+    ap.add_argument("--completo", action="store_true", help="Puntuar a todos aunque no tengan cambios")
+    ap.add_argument("--batch-size", type=int, default=settings.RISK_BATCH_SIZE)
+    ap.add_argument("--encolar", action="store_true", help="Encolar un trabajo riesgo.lote en lugar de ejecutarlo aquí")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    db = SessionLocal()
+    try:
+        if args.encolar:
+            tra_id = enqueue(db, "riesgo.lote", {"incremental": not args.completo}, clave="riesgo:lote")
+            print(f"Trabajo riesgo.lote encolado: {tra_id}")
+            return
+        resultado = RiskScoringEngine(db, SessionLocal, batch_size=args.batch_size).run(incremental=not args.completo)
+        print(f"Corrida {resultado.rej_id} ({resultado.version}, {resultado.modo}): "
+              f"{resultado.puntuados} niños en {resultado.segundos:.1f}s "
+              f"({resultado.puntuados / max(resultado.segundos, 1e-9):,.0f}/s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Worker de la cola `trabajos`.
+
+Un hilo de sondeo reserva trabajos (FOR UPDATE SKIP LOCKED, así varios
+workers/procesos comparten la cola sin tomar el mismo trabajo) respetando la
+concurrencia global y la de cada tipo, y los ejecuta en un pool de hilos con
+una sesión propia por trabajo. Los fallos se reprograman con backoff
+exponencial hasta agotar los intentos.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.infrastructure.repositories.trabajos_repo import TrabajosRepository
+from app.workers import handlers  # noqa: F401  registra los tipos
+from app.workers.registry import HANDLERS, JobSpec, backoff_seconds
+
+logger = logging.getLogger(__name__)
+
+JOBS_PROCESSED = REGISTRY.counter(
+    "jobs_processed_total", "Trabajos procesados por tipo y resultado", ("tipo", "resultado")
+)
+JOB_DURATION = REGISTRY.histogram(
+    "job_duration_seconds", "Duración de trabajos en segundo plano", ("tipo",)
+)
+JOBS_IN_FLIGHT = REGISTRY.gauge("jobs_in_flight", "Trabajos en ejecución", ("tipo",))
+
+
+class JobWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        tipos: Optional[Sequence[str]] = None,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        lock_timeout: int = 300,
+        name: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.specs: Dict[str, JobSpec] = {t: HANDLERS[t] for t in (tipos or HANDLERS)}
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+        self._inflight: Dict[str, int] = {t: 0 for t in self.specs}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_recovery = 0.0
+
+    # --- ciclo de vida ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job")
+        self._thread = threading.Thread(target=self._loop, name="job-poller", daemon=True)
+        self._thread.start()
+        logger.info("JobWorker %s iniciado (tipos=%s, concurrencia=%s)", self.name, list(self.specs), self.concurrency)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Dejar de reservar y esperar a los trabajos en curso."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=True)
+        self._thread = None
+        self._executor = None
+
+    def notify(self) -> None:
+        """Despertar el sondeo (p. ej. tras encolar en el mismo proceso)."""
+        self._wake.set()
+
+    # --- sondeo ----------------------------------------------------------------
+
+    def _free_slots(self) -> Dict[str, int]:
+        with self._lock:
+            total_free = self.concurrency - sum(self._inflight.values())
+            if total_free <= 0:
+                return {}
+            return {
+                tipo: min(spec.concurrencia - self._inflight[tipo], total_free)
+                for tipo, spec in self.specs.items()
+                if self._inflight[tipo] < spec.concurrencia
+            }
+
+    def poll_once(self) -> int:
+        """Reservar y despachar lo que quepa en los cupos libres. Devuelve cuántos trabajos tomó."""
+        taken = 0
+        db = self.session_factory()
+        try:
+            repo = TrabajosRepository(db)
+            now = time.monotonic()
+            if now - self._last_recovery > self.lock_timeout / 2:
+                self._last_recovery = now
+                recovered = repo.recuperar_expirados(self.lock_timeout)
+                if recovered:
+                    logger.warning("%s trabajos recuperados tras timeout de reserva", recovered)
+
+            for tipo, free in self._free_slots().items():
+                with self._lock:
+                    free = min(free, self.concurrency - sum(self._inflight.values()))
+                if free <= 0:
+                    break
+                for job in repo.reservar(self.name, [tipo], free):
+                    with self._lock:
+                        self._inflight[tipo] += 1
+                    JOBS_IN_FLIGHT.inc((tipo,))
+                    self._executor.submit(self._run, job)
+                    taken += 1
+        finally:
+            db.close()
+        return taken
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                taken = self.poll_once()
+            except Exception:
+                logger.exception("Error al reservar trabajos")
+                taken = 0
+            if not taken:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    # --- ejecución -------------------------------------------------------------
+
+    def _run(self, job: dict) -> None:
+        tipo = job["tra_tipo"]
+        spec = self.specs[tipo]
+        start = time.perf_counter()
+        db = self.session_factory()
+        try:
+            spec.handler(db, job["tra_payload"])
+            db.commit()
+            TrabajosRepository(db).completar(job["tra_id"])
+            JOBS_PROCESSED.inc((tipo, "ok"))
+        except Exception as exc:
+            db.rollback()
+            self._fail(db, spec, job, exc)
+        finally:
+            db.close()
+            JOB_DURATION.observe(time.perf_counter() - start, (tipo,))
+            JOBS_IN_FLIGHT.dec((tipo,))
+            with self._lock:
+                self._inflight[tipo] -= 1
+            self._wake.set()
+
+    def _fail(self, db: Session, spec: JobSpec, job: dict, exc: Exception) -> None:
+        intentos = job["tra_intentos"]
+        delay = backoff_seconds(spec, intentos)
+        error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        try:
+            estado = TrabajosRepository(db).fallar(job["tra_id"], error, delay)
+        except Exception:
+            logger.exception("No se pudo registrar el fallo del trabajo %s", job["tra_id"])
+            return
+        if estado == "FALLADO":
+            JOBS_PROCESSED.inc((spec.tipo, "fallado"))
+            logger.error("Trabajo %s (%s) agotó %s intentos: %s", job["tra_id"], spec.tipo, intentos, error)
+            if spec.on_exhausted is not None:
+                try:
+                    spec.on_exhausted(db, job["tra_payload"])
+                except Exception:
+                    db.rollback()
+                    logger.exception("on_exhausted falló para el trabajo %s", job["tra_id"])
+        else:
+            JOBS_PROCESSED.inc((spec.tipo, "reintento"))
+            logger.warning("Trabajo %s (%s) falló (intento %s), reintento en %ss: %s",
+                           job["tra_id"], spec.tipo, intentos, delay, error)
+
+
+@lru_cache(maxsize=None)
+def get_job_worker() -> JobWorker:
+    from app.infrastructure.db.session import SessionLocal
+
+    return JobWorker(
+        SessionLocal,
+        concurrency=settings.JOBS_CONCURRENCY,
+        poll_interval=settings.JOBS_POLL_SECONDS,
+        lock_timeout=settings.JOBS_LOCK_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,77 @@
+"""
+Benchmark del índice de alérgenos, sin base de datos.
+
+Carga máscaras sintéticas de niños, alimentos y recetas en `AllergenIndex` y
+mide la carga completa, un refresco incremental y las consultas
+(recetas seguras para un niño, niños de una entidad alérgicos a un código).
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_alergenos --children 200000 --recipes 5000 --queries 2000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.application.alergenos_index import AllergenIndex
+
+CODIGOS = ["LECHE", "HUEVO", "MANI", "TRIGO", "SOYA", "PESCADO", "MARISCOS", "NUECES", "SESAMO", "GLUTEN"]
+
+
+def _filas(tipo: str, n: int, ents: int, p_alergia: float, rng: random.Random, inicio: datetime):
+    filas = []
+    for i in range(1, n + 1):
+        mascara = 0
+        while rng.random() < p_alergia:
+            mascara |= 1 << rng.randrange(len(CODIGOS))
+        filas.append({"tipo": tipo, "id": i, "ent_id": rng.randint(1, ents) if ents else None,
+                      "mascara": mascara, "activo": True, "actualizado_en": inicio + timedelta(seconds=i)})
+    return filas
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--children", type=int, default=200_000)
+    ap.add_argument("--foods", type=int, default=2000)
+    ap.add_argument("--recipes", type=int, default=5000)
+    ap.add_argument("--entities", type=int, default=200)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    inicio = datetime(2025, 1, 1)
+    bits = [{"ta_codigo": c, "ta_bit": b} for b, c in enumerate(CODIGOS)]
+    filas = (_filas("NINO", args.children, args.entities, 0.15, rng, inicio)
+             + _filas("ALIMENTO", args.foods, 0, 0.1, rng, inicio)
+             + _filas("RECETA", args.recipes, 0, 0.3, rng, inicio))
+
+    indice = AllergenIndex()
+    start = time.perf_counter()
+    indice.cargar(bits, filas, completo=True)
+    print(f"carga completa: {len(filas):,} filas en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    cambios = [dict(f, mascara=1 << rng.randrange(len(CODIGOS)), activo=rng.random() > 0.1)
+               for f in rng.sample(filas[:args.children], 1000)]
+    start = time.perf_counter()
+    indice.cargar(bits, cambios)
+    print(f"incremental:    {len(cambios):,} filas en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    nin_ids = [rng.randint(1, args.children) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for nin_id in nin_ids:
+        indice.recetas_seguras(indice.mascara_nino(nin_id) or 0)
+    t = time.perf_counter() - start
+    print(f"recetas seguras: {t / args.queries * 1e6:.1f} µs/consulta sobre {args.recipes:,} recetas")
+
+    consultas = [([rng.choice(CODIGOS)], rng.randint(1, args.entities)) for _ in range(args.queries)]
+    start = time.perf_counter()
+    total = 0
+    for codigos, ent_id in consultas:
+        total += len(indice.ninos_alergicos(codigos, ent_id=ent_id))
+    t = time.perf_counter() - start
+    print(f"niños alérgicos: {t / args.queries * 1e6:.1f} µs/consulta sobre {args.children:,} niños "
+          f"({total / args.queries:.1f} por entidad)")
+
+
+if __name__ == "__main__":
+    main()
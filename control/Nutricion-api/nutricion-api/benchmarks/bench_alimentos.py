@@ -0,0 +1,79 @@
+"""
+Benchmark de la búsqueda de alimentos por nutrientes, sin base de datos.
+
+Arma un catálogo sintético (alimentos x nutrientes, disponibilidad nacional y
+regional por trimestre) y mide la construcción de las columnas y la latencia
+de `CatalogoAlimentos.buscar` para consultas típicas.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_alimentos --foods 50000 --queries 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.application.alimentos_catalogo import PERIODOS, construir_catalogo_alimentos
+
+NUTRIENTES = ["ENERGIA_KCAL", "PROTEINA_G", "GRASA_G", "CARBOHIDRATOS_G", "HIERRO_MG", "CALCIO_MG", "ZINC_MG",
+              "VITAMINA_A_UG", "FIBRA_G", "SODIO_MG", "VITAMINA_C_MG", "FOLATO_UG"]
+REGIONES = ["Costa", "Sierra", "Selva"] + [f"Región {i}" for i in range(22)]
+GRUPOS = ["Cereales", "Tubérculos", "Menestras", "Carnes", "Lácteos", "Verduras", "Frutas", "Grasas"]
+
+
+def _filas(n_foods: int, seed: int = 0):
+    rng = random.Random(seed)
+    alimentos, matriz, disponibilidad = [], [], []
+    for a in range(1, n_foods + 1):
+        alimentos.append({"ali_id": a, "nombre": f"Alimento {a}", "grupo": rng.choice(GRUPOS), "unidad": "g"})
+        for codigo in NUTRIENTES:
+            if rng.random() < 0.85:
+                matriz.append({"ali_id": a, "nutri_codigo": codigo, "cantidad_100": rng.expovariate(1 / 20)})
+        for periodo in PERIODOS:
+            disponibilidad.append({"ali_id": a, "periodo": periodo, "region": None,
+                                   "disponible": rng.random() > 0.1, "precio": rng.uniform(1, 40)})
+            if rng.random() < 0.3:
+                disponibilidad.append({"ali_id": a, "periodo": periodo, "region": rng.choice(REGIONES),
+                                       "disponible": rng.random() > 0.3,
+                                       "precio": rng.uniform(1, 40) if rng.random() > 0.2 else None})
+    nutrientes = [{"codigo": c, "nombre": c, "unidad": c.rsplit("_", 1)[-1].lower()} for c in NUTRIENTES]
+    return alimentos, nutrientes, matriz, disponibilidad
+
+
+def _medir(nombre, consulta, n):
+    tiempos = []
+    for _ in range(n):
+        start = time.perf_counter()
+        total, _ = consulta()
+        tiempos.append((time.perf_counter() - start) * 1e6)
+    tiempos.sort()
+    print(f"{nombre:<34} p50 {statistics.median(tiempos):7.1f} µs  p99 {tiempos[int(n * 0.99) - 1]:7.1f} µs  "
+          f"({total} coinciden)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--foods", type=int, default=50_000)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    filas = _filas(args.foods)
+    start = time.perf_counter()
+    catalogo = construir_catalogo_alimentos(1, *filas)
+    print(f"catálogo: {args.foods:,} alimentos x {len(NUTRIENTES)} nutrientes "
+          f"en {(time.perf_counter() - start) * 1000:.0f} ms")
+    for periodo in PERIODOS:
+        for region in REGIONES:
+            catalogo.disponibilidad(periodo, region)  # contextos ya cacheados, como en régimen
+
+    _medir("hierro > 5, Q2 sierra, < S/ 3", lambda: catalogo.buscar(
+        "Q2", "Sierra", [("HIERRO_MG", ">", 5)], precio_max=3, limite=20), args.queries)
+    _medir("hierro/S/ top 20, Q2 sierra", lambda: catalogo.buscar(
+        "Q2", "Sierra", [("HIERRO_MG", ">", 5)], ordenar_por="HIERRO_MG", por_precio=True, limite=20), args.queries)
+    _medir("3 rangos + grupo, orden por precio", lambda: catalogo.buscar(
+        "Q3", "Selva", [("PROTEINA_G", ">=", 10), ("GRASA_G", "<", 15), ("ENERGIA_KCAL", "<=", 60)],
+        grupo="Menestras", ordenar_por="PRECIO", limite=50), args.queries)
+
+
+if __name__ == "__main__":
+    main()
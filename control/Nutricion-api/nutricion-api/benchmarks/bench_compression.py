@@ -0,0 +1,90 @@
+"""
+Benchmark de compresión sobre un payload sintético de GET /children:
+bytes transferidos y costo por request con identity, gzip y brotli.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_compression --children 5 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.compression import CompressionMiddleware, brotli
+
+RECOMENDACIONES = [
+    "Incluir alimentos ricos en hierro como sangrecita, hígado y menestras al menos 3 veces por semana.",
+    "Acompañar las comidas con frutas cítricas para mejorar la absorción de hierro.",
+    "Mantener la lactancia materna y ofrecer 5 comidas al día en porciones adecuadas a su edad.",
+]
+
+
+def _children_payload(n_children: int) -> bytes:
+    children = []
+    for i in range(n_children):
+        children.append({
+            "nino": {
+                "nin_id": i + 1, "nin_nombres": f"Niño {i}", "nin_fecha_nac": "2021-03-15",
+                "nin_sexo": "F" if i % 2 else "M", "edad_meses": 40 + i, "usr_id_tutor": 7,
+                "ent_nombre": "I.E. 1234", "creado_en": "2024-01-10T10:00:00",
+            },
+            "antropometrias": [
+                {"ant_id": i * 10 + k, "nin_id": i + 1, "ant_fecha": f"2024-{k + 1:02d}-01",
+                 "ant_peso_kg": 14.2 + k * 0.1, "ant_talla_cm": 96.0 + k * 0.4, "ant_z_imc": -0.8}
+                for k in range(10)
+            ],
+            "alergias": [{"na_id": i, "ta_codigo": "LACTOSA", "ta_nombre": "Lactosa", "na_severidad": "LEVE"}],
+            "ultimo_estado_nutricional": {
+                "imc": 15.1, "z_score_imc": -0.8, "clasificacion_oms": "NORMAL",
+                "recomendaciones": RECOMENDACIONES,
+            },
+        })
+    return json.dumps(children).encode("utf-8")
+
+
+def _app_for(body: bytes):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def _drive(app, accept_encoding: bytes, n: int):
+    size = [0]
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            size[0] = len(message.get("body", b""))
+
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/children/", "headers": [(b"accept-encoding", accept_encoding)]}
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(scope, None, send)
+    return time.perf_counter() - start, size[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de compresión de respuestas")
+    ap.add_argument("--children", type=int, default=5)
+    ap.add_argument("--requests", type=int, default=2000)
+    args = ap.parse_args()
+
+    body = _children_payload(args.children)
+    app = CompressionMiddleware(_app_for(body))
+    cases = [("identity", b"identity"), ("gzip", b"gzip")]
+    if brotli is not None:
+        cases.append(("br", b"br, gzip"))
+    else:
+        print("brotli no instalado: solo gzip")
+
+    for name, header in cases:
+        elapsed, size = asyncio.run(_drive(app, header, args.requests))
+        print(f"{name:>8}: {size:8d} bytes ({size / len(body):6.1%})  {elapsed / args.requests * 1e6:8.1f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark de verificación de ID tokens de Google contra el servidor falso local.
+
+Compara el comportamiento anterior (sesión y descarga de certificados por
+login) con la sesión compartida + caché de certificados, y comprueba que un
+token con firma alterada se rechaza.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_google_login --logins 200 --delay-ms 20
+"""
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.fake_google import FakeGoogle, start_server
+
+CLIENT_ID = "fake-client-id"
+
+
+def _latencies(fn, n: int):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples):
+    p95 = statistics.quantiles(samples, n=20)[18] if len(samples) > 1 else samples[0]
+    print(f"{label:>22}: p50={statistics.median(samples):8.3f} ms  p95={p95:8.3f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de login con Google (servidor falso)")
+    ap.add_argument("--logins", type=int, default=200)
+    ap.add_argument("--delay-ms", type=float, default=20.0, help="Latencia simulada de Google")
+    args = ap.parse_args()
+
+    fake = FakeGoogle(CLIENT_ID, max_age=3600, delay_ms=args.delay_ms)
+    server = start_server(fake)
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ["GOOGLE_CLIENT_ID"] = CLIENT_ID
+    os.environ["GOOGLE_CERTS_URL"] = f"{base}/oauth2/v1/certs"
+    os.environ["GOOGLE_TOKEN_URL"] = f"{base}/token"
+
+    from fastapi import HTTPException
+    from app.infrastructure.security.google_certs import GoogleCertsCache, build_http_session
+    from app.infrastructure.security.google_oauth_client import GoogleOAuthClient
+
+    token = fake.issue_id_token("usuario@example.com")
+    certs_url = os.environ["GOOGLE_CERTS_URL"]
+
+    def cold_login():
+        # Equivalente al comportamiento anterior: sesión nueva y certificados sin caché
+        session = build_http_session()
+        client = GoogleOAuthClient(session=session, certs_cache=GoogleCertsCache(certs_url, session=session))
+        client.verify_id_token(token)
+        session.close()
+
+    warm_client = GoogleOAuthClient()
+    warm_client.verify_id_token(token)
+    fetches_before = fake.requests["certs"]
+
+    _report("sin caché", _latencies(cold_login, args.logins))
+    cold_fetches = fake.requests["certs"] - fetches_before
+    _report("caché caliente", _latencies(lambda: warm_client.verify_id_token(token), args.logins))
+    warm_fetches = fake.requests["certs"] - fetches_before - cold_fetches
+    print(f"descargas de certificados: sin caché={cold_fetches} caché caliente={warm_fetches}")
+
+    header, payload, signature = token.split(".")
+    tampered = f"{header}.{payload}.{signature[:-4]}AAAA"
+    try:
+        warm_client.verify_id_token(tampered)
+        print("ERROR: token alterado aceptado")
+    except HTTPException:
+        print("token alterado rechazado")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
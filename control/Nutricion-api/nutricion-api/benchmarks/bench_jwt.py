@@ -0,0 +1,50 @@
+"""
+Benchmark de verificación JWT: verificaciones por segundo con y sin caché
+de claims, para cada backend disponible.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_jwt --tokens 20 --iterations 20000
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from app.infrastructure.security.claims_cache import VerifiedClaimsCache  # noqa: E402
+from app.infrastructure.security.jwt_service import JWTService  # noqa: E402
+
+
+def _run(service: JWTService, tokens, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        service.verify_token(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de verificación JWT")
+    ap.add_argument("--tokens", type=int, default=20, help="Tokens distintos (usuarios concurrentes)")
+    ap.add_argument("--iterations", type=int, default=20000)
+    args = ap.parse_args()
+
+    for backend in ("jose", "pyjwt"):
+        issuer = JWTService(claims_cache=VerifiedClaimsCache(0), backend=backend)
+        if issuer.backend.name != backend:
+            print(f"{backend:>6}: no disponible, se omite")
+            continue
+        tokens = [issuer.create_access_token({"sub": f"user{i}"}) for i in range(args.tokens)]
+
+        uncached = _run(issuer, tokens, args.iterations)
+        cached_service = JWTService(claims_cache=VerifiedClaimsCache(4096), backend=backend)
+        cached = _run(cached_service, tokens, args.iterations)
+        print(
+            f"{backend:>6}: sin caché {uncached:>10,.0f} verif/s | "
+            f"con caché {cached:>10,.0f} verif/s | x{cached / uncached:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark del generador de menús, sin base de datos.
+
+Arma un catálogo sintético (alimentos x nutrientes, recetas de 2-4
+ingredientes con máscara de alérgenos y disponibilidad por región) y mide:
+- construcción de las matrices del catálogo,
+- `resolver_semana` por niño (sin compartir planes),
+- planificación por lote agrupando niños con las mismas entradas.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_menus --foods 500 --recipes 800 --children 5000
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.application.menus_service import construir_catalogo, resolver_semana
+from app.domain.policies import nutricion_rules as reglas
+from benchmarks.catalogo_sintetico import REGIONES, catalogo_menus
+
+
+class _Disponibilidad:
+    """Fuente de disponibilidad en memoria con la interfaz de MenusRepository."""
+
+    def __init__(self, filas: List[Dict[str, Any]]):
+        self.filas = filas
+
+    def obtener_disponibilidad(self, periodo: str) -> List[Dict[str, Any]]:
+        return self.filas
+
+
+def _ninos(n: int, seed: int = 1) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "edad_meses": rng.randint(6, 150),
+            "ent_id": rng.randint(1, 20),
+            "region": rng.choice(REGIONES),
+            "mascara_alergias": sum(1 << b for b in rng.sample(range(8), rng.choice([0, 0, 0, 1, 2]))),
+        }
+        for _ in range(n)
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--foods", type=int, default=500)
+    ap.add_argument("--recipes", type=int, default=800)
+    ap.add_argument("--children", type=int, default=5000)
+    ap.add_argument("--budget", type=float, default=8.0)
+    args = ap.parse_args()
+
+    matriz, ingredientes, disponibilidad = catalogo_menus(args.foods, args.recipes)
+    start = time.perf_counter()
+    catalogo = construir_catalogo(matriz, ingredientes)
+    print(f"catálogo: {len(catalogo.ali_ids)} alimentos, {len(catalogo.rec_ids)} recetas "
+          f"en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    fuente = _Disponibilidad(disponibilidad)
+    periodo = "Q2"
+    e = catalogo.idx_energia
+    con_energia = catalogo.nutrientes_receta[:, e] > 0
+
+    def resolver(nino):
+        banda = reglas.banda_edad(nino["edad_meses"])
+        ctx = catalogo.contexto(fuente, periodo, nino["ent_id"], nino["region"])
+        objetivos = reglas.OBJETIVOS_POR_EDAD[banda][2]
+        objetivo = np.array([objetivos[c] for c in catalogo.nutrientes], dtype=float)
+        candidatas = con_energia & ctx.disponible & ~catalogo.conflicto_alergenos(nino["mascara_alergias"])
+        return resolver_semana(catalogo.nutrientes_receta, objetivo, e, candidatas, ctx.costo, args.budget)
+
+    ninos = _ninos(args.children)
+    start = time.perf_counter()
+    for nino in ninos:
+        resolver(nino)
+    individual = time.perf_counter() - start
+    print(f"por niño:  {args.children} planes en {individual:.2f}s ({args.children / individual:,.0f}/s)")
+
+    start = time.perf_counter()
+    grupos = {}
+    for nino in ninos:
+        key = (reglas.banda_edad(nino["edad_meses"]), nino["ent_id"], nino["region"], nino["mascara_alergias"])
+        if key not in grupos:
+            grupos[key] = resolver(nino)
+    agrupado = time.perf_counter() - start
+    print(f"agrupado:  {args.children} planes ({len(grupos)} grupos) en {agrupado:.2f}s "
+          f"({args.children / agrupado:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
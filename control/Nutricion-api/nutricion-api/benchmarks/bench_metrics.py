@@ -0,0 +1,73 @@
+"""
+Benchmark del costo de la instrumentación: llama una app ASGI mínima con y sin
+MetricsMiddleware y mide primitivas (observe/inc) y el render de /metrics.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_metrics --requests 50000
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.metrics import Histogram, MetricsMiddleware, Registry
+
+ROUTES = ["/api/v1/children/", "/api/v1/children/{nin_id}", "/api/v1/auth/login", "/health"]
+
+
+async def _dummy_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _noop_send(_message):
+    return None
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _drive(app, n: int) -> float:
+    scopes = [
+        {"type": "http", "method": "GET", "path": f"/api/v1/children/{i % 500}"}
+        for i in range(n)
+    ]
+    start = time.perf_counter()
+    for scope in scopes:
+        await app(scope, _receive, _noop_send)
+    return time.perf_counter() - start
+
+
+def _resolver(scope) -> str:
+    return ROUTES[1] if scope["path"].startswith("/api/v1/children/") else ROUTES[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de métricas")
+    ap.add_argument("--requests", type=int, default=50000)
+    args = ap.parse_args()
+
+    base = asyncio.run(_drive(_dummy_app, args.requests))
+    instrumented = asyncio.run(_drive(MetricsMiddleware(_dummy_app, resolver=_resolver), args.requests))
+    overhead_us = (instrumented - base) / args.requests * 1e6
+    print(f"app sin métricas : {base / args.requests * 1e6:8.2f} µs/request")
+    print(f"app con métricas : {instrumented / args.requests * 1e6:8.2f} µs/request")
+    print(f"sobrecosto       : {overhead_us:8.2f} µs/request")
+
+    hist = Histogram("bench_seconds", "bench", ("procedure",))
+    start = time.perf_counter()
+    for i in range(args.requests):
+        hist.observe(0.003, ("sp_ninos_get",))
+    print(f"Histogram.observe: {(time.perf_counter() - start) / args.requests * 1e9:8.0f} ns")
+
+    registry = Registry()
+    big = registry.histogram("bench_render_seconds", "bench", ("procedure",))
+    for i in range(200):
+        big.observe(0.01, (f"sp_{i}",))
+    start = time.perf_counter()
+    body = registry.render()
+    print(f"render 200 series: {(time.perf_counter() - start) * 1000:8.2f} ms ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark del motor de notificaciones, sin base de datos.
+
+Genera filas como las devuelve `sp_notificaciones_reclamar` (alertas de muchos
+niños para pocos tutores), mide el armado de digests con `agrupar` y la entrega
+por el canal `archivo` más un canal con latencia simulada (round trip de SMTP o
+webhook), una notificación por envío frente a un digest por usuario y tipo, con
+1 hilo y con el pool del motor.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_notificaciones --notifications 100000 --users 2500 --latency-ms 2 --threads 8
+"""
+import argparse
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.application.notificaciones_motor import NotificationEngine, agrupar
+from app.infrastructure.external.notificaciones_canales import ArchivoCanal
+
+CLASIFICACIONES = ["DESNUTRICION_AGUDA", "DESNUTRICION_SEVERA", "OBESIDAD"]
+
+
+class LatenciaCanal:
+    nombre = "latencia"
+
+    def __init__(self, segundos: float):
+        self.segundos = segundos
+
+    def enviar(self, digest) -> None:
+        time.sleep(self.segundos)
+
+
+def _filas(n: int, usuarios: int, rng: random.Random):
+    filas = []
+    for i in range(1, n + 1):
+        usr_id = rng.randint(1, usuarios)
+        tipo = "ALERTA_NUTRICIONAL" if rng.random() < 0.7 else "MEDICION_VENCIDA"
+        nin_id = rng.randint(1, n)
+        payload = ({"nin_id": nin_id, "nin_nombres": f"Niño {nin_id}", "clasificacion": rng.choice(CLASIFICACIONES),
+                    "nivel_riesgo": "ALTO", "z_score_imc": round(rng.uniform(-4, -2), 2)}
+                   if tipo == "ALERTA_NUTRICIONAL" else
+                   {"nin_id": nin_id, "nin_nombres": f"Niño {nin_id}", "ultima_fecha": "2025-01-15"})
+        filas.append({"not_id": i, "usr_id": usr_id, "usr_correo": f"u{usr_id}@example.pe",
+                      "usr_nombre": f"Usuario {usr_id}", "not_tipo": tipo, "not_payload": payload,
+                      "not_intentos": 0, "creado_en": None})
+    # Mismo orden que el SP: usuario, tipo, creación
+    filas.sort(key=lambda f: (f["usr_id"], f["not_tipo"], f["not_id"]))
+    return filas
+
+
+def _entregar(engine: NotificationEngine, digests, hilos: int) -> float:
+    start = time.perf_counter()
+    if hilos == 1:
+        resultados = [engine._entregar(d) for d in digests]
+    else:
+        with ThreadPoolExecutor(max_workers=hilos) as executor:
+            resultados = list(executor.map(engine._entregar, digests))
+    assert all(ok for ok, _ in resultados)
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--notifications", type=int, default=100_000)
+    ap.add_argument("--users", type=int, default=2500)
+    ap.add_argument("--latency-ms", type=float, default=2.0)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--sample", type=int, default=2000, help="Envíos individuales medidos (se extrapola al total)")
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    filas = _filas(args.notifications, args.users, rng)
+
+    start = time.perf_counter()
+    digests = agrupar(filas)
+    t = time.perf_counter() - start
+    print(f"agrupar: {len(filas):,} notificaciones -> {len(digests):,} digests "
+          f"({len(filas) / len(digests):.1f}x menos envíos) en {t * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        engine = NotificationEngine(None, [ArchivoCanal(directorio), LatenciaCanal(args.latency_ms / 1000.0)])
+
+        # Sin agrupar: un envío por notificación (muestra y extrapolación)
+        individuales = [agrupar([f])[0] for f in rng.sample(filas, min(args.sample, len(filas)))]
+        for hilos in (1, args.threads):
+            t = _entregar(engine, individuales, hilos) / len(individuales) * len(filas)
+            print(f"sin agrupar, {hilos:>2} hilo(s): ~{t:.1f} s para {len(filas):,} envíos (estimado)")
+
+        for hilos in (1, args.threads):
+            t = _entregar(engine, digests, hilos)
+            print(f"digests,     {hilos:>2} hilo(s): {t:.1f} s para {len(digests):,} envíos "
+                  f"({len(filas) / t:,.0f} notificaciones/s)")
+
+
+if __name__ == "__main__":
+    main()
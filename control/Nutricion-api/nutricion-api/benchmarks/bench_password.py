@@ -0,0 +1,77 @@
+"""
+Benchmark de login: verificaciones de contraseña por segundo para varias
+rondas de hashing, en el mismo proceso y con el pool de procesos.
+
+Simula una ráfaga de logins con N hilos (como el threadpool de FastAPI) y mide
+además la latencia de una tarea ligera concurrente, para ver cuánto la
+afecta el hashing.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_password --rounds 100 29000 100000 --logins 200
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from app.infrastructure.security.password_service import PasswordService  # noqa: E402
+
+
+def _run(service: PasswordService, stored_hash: str, logins: int, threads: int):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        futures = [
+            pool.submit(service.verify_and_update, "contrasena-segura", stored_hash)
+            for _ in range(logins)
+        ]
+        for f in futures:
+            assert f.result()[0]
+        elapsed = time.perf_counter() - start
+    return logins / elapsed
+
+
+def _probe_latency(service: PasswordService, stored_hash: str, logins: int, threads: int) -> float:
+    """p95 de la tarea ligera mientras se procesan los logins."""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(service.verify_and_update, "contrasena-segura", stored_hash)
+            for _ in range(logins)
+        ]
+        samples = []
+        while not all(f.done() for f in futures):
+            start = time.perf_counter()
+            sum(range(1000))
+            samples.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=20)[18]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de hashing de contraseñas")
+    ap.add_argument("--rounds", type=int, nargs="+", default=[100, 29000, 100000])
+    ap.add_argument("--logins", type=int, default=200)
+    ap.add_argument("--threads", type=int, default=40, help="Hilos concurrentes (threadpool)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Procesos del pool")
+    args = ap.parse_args()
+
+    print(f"{'rondas':>8} {'modo':>8} {'logins/s':>10} {'p95 tarea ligera (ms)':>22}")
+    for rounds in args.rounds:
+        for workers, label in ((0, "inline"), (args.workers, f"pool{args.workers}")):
+            service = PasswordService(rounds=rounds, workers=workers)
+            stored_hash = service.hash_password("contrasena-segura")
+            try:
+                throughput = _run(service, stored_hash, args.logins, args.threads)
+                p95 = _probe_latency(service, stored_hash, args.logins, args.threads)
+            finally:
+                service.shutdown()
+            print(f"{rounds:>8} {label:>8} {throughput:>10.1f} {p95:>22.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark de los datos de referencia compartidos, sin base de datos.
+
+Arma un catálogo de menús sintético (la matriz recetas x alimentos es la más
+grande de la API) y lanza N procesos como workers, en dos modos:
+- `privado`: cada proceso arma su copia a partir de las filas (lo que antes
+  hacía cada worker al leer la base),
+- `compartido`: el padre publica el snapshot una vez y cada proceso lo adjunta
+  con `refdata.adjuntar` (mmap, sin copias).
+
+Con todos los procesos vivos a la vez, cada uno informa el tiempo desde su
+creación hasta tener el catálogo listo (y cuánto de eso fue el catálogo; lo
+demás es intérprete e imports), su RSS y su PSS (memoria proporcional:
+las páginas compartidas se dividen entre los procesos que las mapean, ver
+/proc/<pid>/smaps_rollup).
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_refdata --foods 2000 --recipes 5000 --workers 8
+"""
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import statistics
+import tempfile
+import time
+
+
+def _memoria_kb():
+    valores = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for linea in f:
+                partes = linea.split()
+                if partes[0] in ("Rss:", "Pss:"):
+                    valores[partes[0][:-1]] = int(partes[1])
+    except FileNotFoundError:
+        import resource
+
+        valores["Rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return valores.get("Rss", 0), valores.get("Pss", valores.get("Rss", 0))
+
+
+def _worker(modo, ruta_filas, t0, barrera, salida):
+    from app.application.menus_service import construir_catalogo, desde_snapshot
+    from app.infrastructure import refdata
+
+    inicio = time.perf_counter()
+    if modo == "privado":
+        with open(ruta_filas, "rb") as f:
+            matriz, ingredientes = pickle.load(f)
+        catalogo = construir_catalogo(matriz, ingredientes)
+    else:
+        catalogo = desde_snapshot(refdata.adjuntar("menus"))
+    # Recorrer las matrices como lo haría el generador (fallos de página incluidos)
+    float(catalogo.gramos.sum()) + float(catalogo.nutrientes_receta.sum())
+    carga = time.perf_counter() - inicio
+    listo = time.time() - t0
+    barrera.wait()
+    rss, pss = _memoria_kb()
+    salida.put((listo, carga, rss, pss))
+    barrera.wait()
+
+
+def _correr(modo, n, ruta_filas):
+    ctx = mp.get_context("spawn")
+    barrera, salida = ctx.Barrier(n), ctx.Queue()
+    procesos = [ctx.Process(target=_worker, args=(modo, ruta_filas, time.time(), barrera, salida)) for _ in range(n)]
+    for p in procesos:
+        p.start()
+    resultados = [salida.get() for _ in range(n)]
+    for p in procesos:
+        p.join()
+    listos = [r[0] for r in resultados]
+    carga = statistics.mean(r[1] for r in resultados)
+    rss = sum(r[2] for r in resultados) / 1024
+    pss = sum(r[3] for r in resultados) / 1024
+    print(f"{modo:>10}: listo en {statistics.mean(listos) * 1000:6.0f} ms (media; máx {max(listos) * 1000:.0f}; "
+          f"catálogo {carga * 1000:.0f} ms), "
+          f"RSS {rss / n:6.1f} MiB/worker, PSS total {pss:7.1f} MiB ({pss / n:.1f} MiB/worker)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--foods", type=int, default=2000)
+    ap.add_argument("--recipes", type=int, default=5000)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # Los hijos (spawn) leen la configuración del entorno
+        os.environ["REFDATA_DIR"] = os.path.join(directorio, "refdata")
+        from app.application.menus_service import a_columnas, construir_catalogo
+        from app.core.config import settings
+        from app.infrastructure import refdata
+        from benchmarks.catalogo_sintetico import catalogo_menus
+
+        settings.REFDATA_DIR = os.environ["REFDATA_DIR"]
+        matriz, ingredientes, _ = catalogo_menus(args.foods, args.recipes)
+        ruta_filas = os.path.join(directorio, "filas.pkl")
+        with open(ruta_filas, "wb") as f:
+            pickle.dump((matriz, ingredientes), f)
+
+        start = time.perf_counter()
+        catalogo = construir_catalogo(matriz, ingredientes)
+        armado = time.perf_counter() - start
+        start = time.perf_counter()
+        refdata.publicar("menus", 1, *a_columnas(catalogo))
+        publicado = time.perf_counter() - start
+        print(f"catálogo {args.recipes:,} recetas x {args.foods:,} alimentos "
+              f"({catalogo.gramos.nbytes / 2 ** 20:.0f} MiB de matriz): armado {armado * 1000:.0f} ms, "
+              f"publicación {publicado * 1000:.0f} ms")
+
+        for modo in ("privado", "compartido"):
+            _correr(modo, args.workers, ruta_filas)
+
+
+if __name__ == "__main__":
+    main()
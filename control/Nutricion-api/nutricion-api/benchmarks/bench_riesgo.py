@@ -0,0 +1,108 @@
+"""
+Benchmark del puntaje de riesgo por lote, sin base de datos.
+
+Genera N niños sintéticos con la forma de sp_riesgo_caracteristicas y mide,
+por lote de `--batch-size`:
+- `score`: puntaje BAZ y, si hay pandas + scikit-learn, el random forest
+  (artefactos de ml-recomendator o uno pequeño entrenado con datos sintéticos).
+- `params`: armado de los parámetros del INSERT multi-fila (JSON con orjson).
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_riesgo --children 100000 --batch-size 5000
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from app.application.riesgo_service import RF_COLUMNAS, BazRiskModel, RandomForestRiskModel, rf_frame
+from app.core.serialization import dumps
+from app.infrastructure.external.ia_client import ModelBundle, load_rf_bundle
+
+NUMERIC = ["age_months", "BMI", "muac_cm", "head_circumference_cm", "dietary_diversity_score",
+           "altitude_m", "budget_per_day_pen"]
+CATEGORICAL = ["sex", "region", "edema_pitting", "anemia_hemoglobin_g_dl", "diarrhea_last_2w"]
+
+
+def _population(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    hoy = date(2025, 6, 1)
+    filas = []
+    for i in range(n):
+        edad = rng.randint(6, 60)
+        z = rng.gauss(-0.3, 1.2)
+        filas.append({
+            "nin_id": i + 1, "nin_sexo": rng.choice("MF"), "nin_fecha_nac": hoy - timedelta(days=30 * edad),
+            "ant_id": i * 3 + 1, "ant_fecha": hoy, "edad_meses": edad, "imc": round(16 + z, 2),
+            "ant_z_imc": round(z, 3), "ant_z_peso_edad": None, "ant_z_talla_edad": None,
+            "en_z_score_imc": round(z, 2), "en_clasificacion": "NORMAL", "en_nivel_riesgo": "BAJO",
+            "alergias": rng.randint(0, 2), "alergias_severas": 0, "sintomas_14d": rng.randint(0, 3),
+            "diarrea_14d": int(rng.random() < 0.1), "adherencia_30d": round(rng.random(), 2), "registros_30d": 20,
+        })
+    return filas
+
+
+def _rf_model():
+    bundle = load_rf_bundle()
+    if bundle is None:
+        try:
+            from sklearn.compose import ColumnTransformer
+            from sklearn.ensemble import RandomForestClassifier
+            from sklearn.impute import SimpleImputer
+            from sklearn.pipeline import make_pipeline
+            from sklearn.preprocessing import OneHotEncoder
+        except ImportError:
+            return None
+        entrenamiento = _population(5000, seed=1)
+        X = rf_frame(entrenamiento, NUMERIC + CATEGORICAL)
+        pre = ColumnTransformer([
+            ("num", SimpleImputer(strategy="median"), NUMERIC),
+            ("cat", make_pipeline(SimpleImputer(strategy="most_frequent"), OneHotEncoder(handle_unknown="ignore")),
+             CATEGORICAL),
+        ])
+        y = [0 if abs(f["en_z_score_imc"]) < 2 else (1 if abs(f["en_z_score_imc"]) < 3 else 2) for f in entrenamiento]
+        rf = RandomForestClassifier(n_estimators=100, min_samples_leaf=2, random_state=42, n_jobs=-1)
+        rf.fit(pre.fit_transform(X), y)
+        bundle = ModelBundle(rf, pre, "rf-synthetic", tuple(NUMERIC + CATEGORICAL))
+    return RandomForestRiskModel(bundle)
+
+
+def _bench(nombre: str, model, filas: List[Dict[str, Any]], batch_size: int) -> None:
+    fecha = datetime(2025, 6, 1, 3, 0)
+    t_score = t_params = 0.0
+    for i in range(0, len(filas), batch_size):
+        lote = filas[i:i + batch_size]
+        start = time.perf_counter()
+        riesgos = model.score(lote)
+        t_score += time.perf_counter() - start
+        start = time.perf_counter()
+        [
+            {"nin_id": f["nin_id"], "fecha": fecha, "version": model.version, "riesgo": round(float(r), 4),
+             "caracteristicas": dumps(f).decode(), "rej_id": 1}
+            for f, r in zip(lote, riesgos)
+        ]
+        t_params += time.perf_counter() - start
+    total = t_score + t_params
+    print(f"{nombre:<14} score {t_score:7.2f}s  params {t_params:6.2f}s  "
+          f"total {total:7.2f}s  {len(filas) / total:>10,.0f} niños/s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--children", type=int, default=100_000)
+    ap.add_argument("--batch-size", type=int, default=5000)
+    args = ap.parse_args()
+
+    filas = _population(args.children)
+    print(f"{args.children} niños, lotes de {args.batch_size}; columnas RF derivadas: {sorted(RF_COLUMNAS)}")
+    _bench("baz", BazRiskModel(), filas, args.batch_size)
+    rf = _rf_model()
+    if rf is None:
+        print("rf             omitido (faltan pandas/scikit-learn)")
+    else:
+        _bench(rf.version, rf, filas, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
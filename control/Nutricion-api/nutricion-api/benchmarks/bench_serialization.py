@@ -0,0 +1,109 @@
+"""
+Benchmark de serialización del listado de niños (GET /children).
+
+Compara, para N niños con 10 antropometrías cada uno:
+- FastAPI clásico: dicts con fechas en `isoformat()` -> validación del
+  response_model -> dump en modo JSON -> `json.dumps` (JSONResponse).
+- Validación + orjson (ORJSONResponse por defecto).
+- `trusted_response`: dicts con tipos nativos -> proyección -> orjson.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_serialization --children 100 --rounds 50
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import dumps, model_projector
+from app.schemas.ninos import NinoWithAnthropometry
+
+RECOMENDACIONES = [
+    "Incluir alimentos ricos en hierro como sangrecita, hígado y menestras al menos 3 veces por semana.",
+    "Acompañar las comidas con frutas cítricas para mejorar la absorción de hierro.",
+]
+
+
+def _listing(n_children: int, as_strings: bool) -> list:
+    fmt = (lambda v: v.isoformat()) if as_strings else (lambda v: v)
+    base = datetime(2024, 1, 10, 10, 0, 0)
+    children = []
+    for i in range(n_children):
+        children.append({
+            "nino": {
+                "nin_id": i + 1, "usr_id_tutor": 7, "ent_id": 3, "nin_nombres": f"Niño {i}",
+                "nin_fecha_nac": fmt(date(2021, 3, 15) + timedelta(days=i)), "nin_sexo": "F" if i % 2 else "M",
+                "ent_nombre": "I.E. 1234", "ent_codigo": "IE1234", "ent_direccion": "Av. Principal 123",
+                "ent_departamento": "Junín", "ent_provincia": "Huancayo", "ent_distrito": "El Tambo",
+                "edad_meses": 40 + i, "creado_en": fmt(base), "actualizado_en": fmt(base),
+            },
+            "antropometrias": [
+                {
+                    "ant_id": i * 10 + k, "nin_id": i + 1, "ant_fecha": fmt(date(2024, k + 1, 1)),
+                    "ant_peso_kg": 14.2 + k * 0.1, "ant_talla_cm": 96.0 + k * 0.4, "ant_z_imc": -0.8,
+                    "ant_z_peso_edad": None, "ant_z_talla_edad": None, "imc": 15.4,
+                    "creado_en": fmt(base + timedelta(days=30 * k)),
+                }
+                for k in range(10)
+            ],
+            "alergias": [{
+                "na_id": i, "nin_id": i + 1, "ta_codigo": "LACTOSA", "ta_nombre": "Lactosa",
+                "ta_categoria": "ALIMENTARIA", "na_severidad": "LEVE", "creado_en": fmt(base),
+            }],
+            "ultimo_estado_nutricional": {
+                "imc": 15.4, "z_score_imc": -0.8, "classification": "NORMAL", "percentile": 38.0,
+                "recommendations": RECOMENDACIONES, "risk_level": "BAJO",
+            },
+        })
+    return children
+
+
+def _time(fn, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de serialización de respuestas")
+    ap.add_argument("--children", type=int, default=100)
+    ap.add_argument("--rounds", type=int, default=50)
+    args = ap.parse_args()
+
+    adapter = TypeAdapter(List[NinoWithAnthropometry])
+    legacy = _listing(args.children, as_strings=True)
+    native = _listing(args.children, as_strings=False)
+    project = model_projector(NinoWithAnthropometry)
+
+    def fastapi_json():
+        content = adapter.dump_python(adapter.validate_python(legacy), mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+    def validated_orjson():
+        return dumps(adapter.dump_python(adapter.validate_python(native), mode="json"))
+
+    def trusted_orjson():
+        return dumps([project(item) for item in native])
+
+    # Mismo JSON en los tres caminos
+    assert json.loads(fastapi_json()) == json.loads(trusted_orjson()) == json.loads(validated_orjson())
+
+    results = [
+        ("validación + json.dumps", _time(fastapi_json, args.rounds)),
+        ("validación + orjson", _time(validated_orjson, args.rounds)),
+        ("trusted_response", _time(trusted_orjson, args.rounds)),
+    ]
+    size = len(trusted_orjson())
+    print(f"{args.children} niños, {size / 1024:.1f} KiB")
+    base = results[0][1]
+    for name, elapsed in results:
+        print(f"{name:>26}: {elapsed * 1000:8.2f} ms  ({base / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
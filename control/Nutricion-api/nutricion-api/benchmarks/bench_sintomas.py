@@ -0,0 +1,107 @@
+"""
+Benchmark de las características de síntomas/adherencia/crecimiento, sin base de datos.
+
+Arma series sintéticas de toda la población (síntomas por día, adherencia por
+día y mediciones) y compara `caracteristicas_poblacion` (una pasada con
+`searchsorted`) con el cálculo de los episodios de diarrea niño por niño en
+Python puro; el resultado de ambos se compara para verificar la pasada.
+
+Uso (desde nutricion-api/):
+    python -m benchmarks.bench_sintomas --children 100000 --days 400
+"""
+import argparse
+import random
+from collections import defaultdict
+import time
+from datetime import date, timedelta
+
+from app.application.sintomas_series import (
+    CATEGORIAS, SEPARACION_EPISODIO_DIAS, caracteristicas_poblacion, construir_series,
+)
+
+HOY = date(2025, 6, 30)
+
+
+def _series(n_children: int, days: int, seed: int = 0):
+    rng = random.Random(seed)
+    sint = {k: [] for k in ("nin_id", "fecha", "categorias", "grado_max", "eventos")}
+    adh = {k: [] for k in ("nin_id", "fecha", "ok", "parcial", "no")}
+    ant = {k: [] for k in ("nin_id", "fecha", "peso_kg", "talla_cm", "z_imc", "z_peso_edad", "z_talla_edad")}
+    bits = list(CATEGORIAS.values())
+    for nin in range(1, n_children + 1):
+        for d in sorted(rng.sample(range(days), rng.randint(0, 12))):
+            sint["nin_id"].append(nin)
+            sint["fecha"].append(HOY - timedelta(days=days - d))
+            sint["categorias"].append(rng.choice(bits) | (rng.random() < 0.2) * rng.choice(bits))
+            sint["grado_max"].append(rng.randint(1, 3))
+            sint["eventos"].append(rng.randint(1, 2))
+        for d in range(days - 60, days, rng.randint(1, 4)):
+            adh["nin_id"].append(nin)
+            adh["fecha"].append(HOY - timedelta(days=days - d))
+            adh["ok"].append(rng.randint(0, 3))
+            adh["parcial"].append(rng.randint(0, 1))
+            adh["no"].append(rng.randint(0, 1))
+        peso = rng.uniform(8, 20)
+        for d in range(rng.randint(0, 60), days, 90):
+            peso += rng.uniform(0, 0.8)
+            ant["nin_id"].append(nin)
+            ant["fecha"].append(HOY - timedelta(days=days - d))
+            ant["peso_kg"].append(peso)
+            ant["talla_cm"].append(80.0)
+            ant["z_imc"].append(rng.gauss(0, 1))
+            ant["z_peso_edad"].append(0.0)
+            ant["z_talla_edad"].append(0.0)
+    return sint, adh, ant
+
+
+def _por_nino(dias, hoy, ventana=14):
+    """Episodios de diarrea en la ventana a partir de los días (ordenados) de un niño, en Python."""
+    inicio = hoy - timedelta(days=ventana - 1)
+    episodios, previo, contado = 0, None, False
+    for f in dias:
+        if f > hoy:
+            break
+        if previo is None or (f - previo).days > SEPARACION_EPISODIO_DIAS:
+            contado = False
+        if f >= inicio and not contado:
+            episodios, contado = episodios + 1, True
+        previo = f
+    return episodios
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--children", type=int, default=100_000)
+    ap.add_argument("--days", type=int, default=400)
+    args = ap.parse_args()
+
+    sint, adh, ant = _series(args.children, args.days)
+    print(f"filas: {len(sint['nin_id']):,} síntomas/día, {len(adh['nin_id']):,} adherencia/día, "
+          f"{len(ant['nin_id']):,} mediciones")
+
+    start = time.perf_counter()
+    series = construir_series(sint, adh, ant)
+    construir = time.perf_counter() - start
+    nin_ids = series.nin_ids()
+    start = time.perf_counter()
+    caracteristicas = caracteristicas_poblacion(series, nin_ids, HOY)
+    pasada = time.perf_counter() - start
+    print(f"construcción de series: {construir * 1000:.0f} ms")
+    print(f"una pasada ({len(nin_ids):,} niños, 14 columnas): {pasada * 1000:.0f} ms "
+          f"({len(nin_ids) / pasada:,.0f} niños/s)")
+
+    # Filas ya agrupadas por niño (como las devolvería una consulta por índice)
+    diarrea = defaultdict(list)
+    for nin, f, c in zip(sint["nin_id"], sint["fecha"], sint["categorias"]):
+        if c & CATEGORIAS["DIARREA"]:
+            diarrea[nin].append(f)
+    start = time.perf_counter()
+    esperados = [_por_nino(diarrea.get(nin, []), HOY) for nin in nin_ids.tolist()]
+    por_nino = time.perf_counter() - start
+    assert esperados == caracteristicas["diarrea_episodios"].tolist()
+    print(f"por niño en Python (solo episodios de diarrea, sin contar la consulta): {por_nino * 1000:.0f} ms; "
+          f"con una consulta por niño se suma un round-trip x {len(nin_ids):,}")
+
+
+if __name__ == "__main__":
+    main()
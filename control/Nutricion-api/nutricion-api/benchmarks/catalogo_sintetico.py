@@ -0,0 +1,44 @@
+"""
+Catálogo sintético de alimentos y recetas para el generador de menús, sin base
+de datos. Lo usan `bench_menus`, `bench_refdata` y las pruebas de
+`app/tests/test_menus.py`; con la misma semilla las filas son las mismas.
+"""
+import random
+
+from app.domain.policies import nutricion_rules as reglas
+
+REGIONES = ["Junín", "Lima", "Cusco", "Puno", "Loreto"]
+
+
+def catalogo_menus(n_foods: int, n_recipes: int, seed: int = 0):
+    """
+    Filas sintéticas con el formato de MenusRepository.
+
+    Returns:
+        (matriz, ingredientes, disponibilidad): nutrientes de NUTRIENTES_MENU por
+        alimento, recetas de 2-4 ingredientes con la máscara de alérgenos de sus
+        alimentos y disponibilidad nacional (y a veces regional) sin entidad
+    """
+    rng = random.Random(seed)
+    matriz, ingredientes, disponibilidad = [], [], []
+    mascara_alimento = {}
+    for a in range(1, n_foods + 1):
+        kcal = rng.uniform(20, 400)
+        valores = [kcal, kcal * 0.05, kcal * 0.03, kcal * 0.15, rng.uniform(0, 5),
+                   rng.uniform(0, 250), rng.uniform(0, 3), rng.uniform(0, 300)]
+        matriz += [{"ali_id": a, "nutri_codigo": c, "cantidad_100": v} for c, v in zip(reglas.NUTRIENTES_MENU, valores)]
+        disponibilidad.append({"ali_id": a, "ent_id": None, "region": None,
+                               "disponible": rng.random() > 0.05, "precio": rng.uniform(2, 30)})
+        if rng.random() < 0.2:
+            disponibilidad.append({"ali_id": a, "ent_id": None, "region": rng.choice(REGIONES),
+                                   "disponible": rng.random() > 0.5, "precio": rng.uniform(2, 30)})
+        mascara_alimento[a] = 1 << rng.randrange(8) if rng.random() < 0.1 else 0
+    for r in range(1, n_recipes + 1):
+        usados = rng.sample(range(1, n_foods + 1), rng.randint(2, 4))
+        mascara = 0
+        for a in usados:
+            mascara |= mascara_alimento[a]
+        for a in usados:
+            ingredientes.append({"rec_id": r, "rec_nombre": f"Receta {r}", "ali_id": a,
+                                 "cantidad": rng.uniform(15, 80), "unidad": "g", "mascara": mascara})
+    return matriz, ingredientes, disponibilidad
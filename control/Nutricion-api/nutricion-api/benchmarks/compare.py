@@ -0,0 +1,70 @@
+"""
+Comparar dos resultados de loadtest.py y marcar regresiones.
+
+Se considera regresión si el p95 (o p99) empeora más del umbral o si el
+throughput cae más del umbral. Sale con código 1 si hay alguna.
+
+Uso:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/nuevo.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def _pct_change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0
+    return (new - old) / old * 100.0
+
+
+def compare(base: dict, head: dict, threshold: float):
+    rows = []
+    regressions = []
+    for name, old in base["scenarios"].items():
+        new = head["scenarios"].get(name)
+        if new is None:
+            continue
+        deltas = {
+            "throughput_rps": _pct_change(old["throughput_rps"], new["throughput_rps"]),
+            "p50_ms": _pct_change(old["p50_ms"], new["p50_ms"]),
+            "p95_ms": _pct_change(old["p95_ms"], new["p95_ms"]),
+            "p99_ms": _pct_change(old["p99_ms"], new["p99_ms"]),
+        }
+        flagged = (
+            deltas["throughput_rps"] < -threshold
+            or deltas["p95_ms"] > threshold
+            or deltas["p99_ms"] > threshold
+        )
+        rows.append((name, old, new, deltas, flagged))
+        if flagged:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Comparar resultados de carga")
+    ap.add_argument("base")
+    ap.add_argument("head")
+    ap.add_argument("--threshold", type=float, default=10.0, help="Porcentaje tolerado")
+    args = ap.parse_args()
+
+    with open(args.base, encoding="utf-8") as fh:
+        base = json.load(fh)
+    with open(args.head, encoding="utf-8") as fh:
+        head = json.load(fh)
+
+    print(f"base={base['meta'].get('commit')}  head={head['meta'].get('commit')}  umbral={args.threshold}%")
+    rows, regressions = compare(base, head, args.threshold)
+    for name, old, new, deltas, flagged in rows:
+        mark = "REGRESIÓN" if flagged else "ok"
+        print(
+            f"{name:>16}: rps {old['throughput_rps']:8.1f} -> {new['throughput_rps']:8.1f} "
+            f"({deltas['throughput_rps']:+6.1f}%)  p95 {old['p95_ms']:8.2f} -> {new['p95_ms']:8.2f} "
+            f"({deltas['p95_ms']:+6.1f}%)  p99 ({deltas['p99_ms']:+6.1f}%)  {mark}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Servidor local que imita los endpoints de Google usados en el login:
+certificados públicos, intercambio de código y userinfo.
+
+Firma los ID tokens con una clave RSA generada al arrancar, de modo que el
+cliente puede verificarlos localmente igual que con Google. Lo usan
+`bench_google_login` y las pruebas de `app/tests/test_auth.py`.
+
+Uso directo:
+    python -m benchmarks.fake_google --port 8765 --max-age 3600
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+
+class FakeGoogle:
+    """Estado del servidor falso: clave de firma y contadores de peticiones."""
+
+    def __init__(self, client_id: str, max_age: int = 3600, delay_ms: float = 0.0):
+        self.client_id = client_id
+        self.max_age = max_age
+        self.delay = delay_ms / 1000.0
+        self.key_id = "fake-kid-1"
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self.public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        self.signer = crypt.RSASigner.from_string(private_pem, key_id=self.key_id)
+        self.requests: Dict[str, int] = {"certs": 0, "token": 0, "userinfo": 0}
+
+    def issue_id_token(self, email: str, ttl: int = 3600) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": self.client_id,
+            "sub": f"sub-{email}",
+            "email": email,
+            "email_verified": True,
+            "name": email.split("@", 1)[0],
+            "given_name": email.split("@", 1)[0],
+            "family_name": "Prueba",
+            "iat": now,
+            "exp": now + ttl,
+        }
+        return google_jwt.encode(self.signer, payload).decode()
+
+
+def _handler(state: FakeGoogle):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *_args):
+            pass
+
+        def _json(self, body: dict, headers: Optional[Dict[str, str]] = None):
+            if state.delay:
+                time.sleep(state.delay)
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.startswith("/oauth2/v1/certs"):
+                state.requests["certs"] += 1
+                self._json(
+                    {state.key_id: state.public_pem},
+                    {"Cache-Control": f"public, max-age={state.max_age}, must-revalidate"},
+                )
+            elif self.path.startswith("/oauth2/v2/userinfo"):
+                state.requests["userinfo"] += 1
+                self._json({"email": "usuario@example.com", "verified_email": True})
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            if self.path.startswith("/token"):
+                state.requests["token"] += 1
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                self._json({
+                    "access_token": "fake-access-token",
+                    "id_token": state.issue_id_token("usuario@example.com"),
+                    "token_type": "Bearer",
+                    "expires_in": 3599,
+                })
+            else:
+                self.send_error(404)
+
+    return Handler
+
+
+def start_server(state: FakeGoogle, port: int = 0) -> ThreadingHTTPServer:
+    """Arrancar el servidor en un hilo; devuelve el servidor (usar `.server_port`)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Servidor falso de Google OAuth")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--client-id", default="fake-client-id")
+    ap.add_argument("--max-age", type=int, default=3600)
+    ap.add_argument("--delay-ms", type=float, default=0.0)
+    args = ap.parse_args()
+
+    state = FakeGoogle(args.client_id, args.max_age, args.delay_ms)
+    server = start_server(state, args.port)
+    print(f"Fake Google en http://127.0.0.1:{server.server_port}")
+    print(f"ID token de ejemplo: {state.issue_id_token('usuario@example.com')}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
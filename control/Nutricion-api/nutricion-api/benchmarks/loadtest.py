@@ -0,0 +1,199 @@
+"""
+Prueba de carga con escenarios fijos contra una API en ejecución.
+
+Cada escenario corre por separado con N hilos durante `--duration` segundos
+(tras un calentamiento) y se reporta throughput y p50/p95/p99 en un JSON para
+comparar entre commits con compare.py.
+
+Escenarios:
+    login           POST /auth/login
+    dashboard       GET  /children/
+    profile         GET  /children/{nin_id}
+    measurement_add POST /children/{nin_id}/anthropometry
+    catalog_search  GET  /alergias/tipos?q=...
+
+Uso (desde nutricion-api/, con la API levantada sobre la base sembrada):
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --concurrency 16 --duration 30
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from benchmarks.seed_db import BENCH_PASSWORD, TUTOR_PREFIX
+
+SCENARIOS = ("login", "dashboard", "profile", "measurement_add", "catalog_search")
+CATALOG_QUERIES = ("le", "hue", "ma", "tri", "pes", "soy", "fr", "")
+
+
+class VirtualUser:
+    """Un hilo de carga con su propia sesión HTTP y su tutor sintético."""
+
+    def __init__(self, base_url: str, index: int, tutors: int, rng: random.Random):
+        self.api = base_url.rstrip("/") + "/api/v1"
+        self.username = f"{TUTOR_PREFIX}{index % tutors}"
+        self.session = requests.Session()
+        self.rng = rng
+        self.token: Optional[str] = None
+        self.children: List[int] = []
+
+    def login(self) -> requests.Response:
+        response = self.session.post(
+            f"{self.api}/auth/login",
+            json={"usuario": self.username, "contrasena": BENCH_PASSWORD},
+            timeout=30,
+        )
+        if response.ok:
+            self.token = response.json()["access_token"]
+            self.session.headers["Authorization"] = f"Bearer {self.token}"
+        return response
+
+    def prepare(self) -> None:
+        """Login y descubrimiento de niños fuera de la medición."""
+        self.login().raise_for_status()
+        response = self.dashboard()
+        response.raise_for_status()
+        self.children = [item["nino"]["nin_id"] for item in response.json()]
+
+    def dashboard(self) -> requests.Response:
+        return self.session.get(f"{self.api}/children/", timeout=30)
+
+    def profile(self) -> requests.Response:
+        return self.session.get(f"{self.api}/children/{self.rng.choice(self.children)}", timeout=30)
+
+    def measurement_add(self) -> requests.Response:
+        # Misma fecha (hoy): el SP hace upsert, así la tabla no crece sin límite
+        payload = {
+            "ant_fecha": date.today().isoformat(),
+            "ant_peso_kg": round(self.rng.uniform(10, 40), 2),
+            "ant_talla_cm": round(self.rng.uniform(80, 150), 2),
+        }
+        return self.session.post(
+            f"{self.api}/children/{self.rng.choice(self.children)}/anthropometry", json=payload, timeout=30
+        )
+
+    def catalog_search(self) -> requests.Response:
+        return self.session.get(
+            f"{self.api}/alergias/tipos", params={"q": self.rng.choice(CATALOG_QUERIES), "limit": 20}, timeout=30
+        )
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def run_scenario(users: List[VirtualUser], name: str, duration: float, warmup: float) -> Dict[str, float]:
+    latencies: List[List[float]] = [[] for _ in users]
+    errors = [0] * len(users)
+    measure_from = time.perf_counter() + warmup
+    stop_at = measure_from + duration
+
+    def worker(idx: int, user: VirtualUser):
+        action: Callable[[], requests.Response] = getattr(user, name)
+        while True:
+            start = time.perf_counter()
+            if start >= stop_at:
+                return
+            try:
+                ok = action().ok
+            except requests.RequestException:
+                ok = False
+            end = time.perf_counter()
+            if start >= measure_from:
+                latencies[idx].append((end - start) * 1000)
+                if not ok:
+                    errors[idx] += 1
+
+    threads = [threading.Thread(target=worker, args=(i, u), daemon=True) for i, u in enumerate(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    samples = sorted(x for per_user in latencies for x in per_user)
+    total = len(samples)
+    return {
+        "requests": total,
+        "errors": sum(errors),
+        "throughput_rps": round(total / duration, 2),
+        "mean_ms": round(statistics.fmean(samples), 3) if samples else 0.0,
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p95_ms": round(_percentile(samples, 95), 3),
+        "p99_ms": round(_percentile(samples, 99), 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Prueba de carga de la API de nutrición")
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=30.0, help="Segundos medidos por escenario")
+    ap.add_argument("--warmup", type=float, default=5.0)
+    ap.add_argument("--tutors", type=int, default=200, help="Tutores sembrados por seed_db")
+    ap.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--output", default=None, help="JSON de salida (por defecto benchmarks/results/)")
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    users = [
+        VirtualUser(args.base_url, i, args.tutors, random.Random(rng.random()))
+        for i in range(args.concurrency)
+    ]
+    for user in users:
+        user.prepare()
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "tutors": args.tutors,
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        result = run_scenario(users, name, args.duration, args.warmup)
+        report["scenarios"][name] = result
+        print(
+            f"{name:>16}: {result['throughput_rps']:8.1f} req/s  p50={result['p50_ms']:8.2f}  "
+            f"p95={result['p95_ms']:8.2f}  p99={result['p99_ms']:8.2f} ms  errores={result['errors']}"
+        )
+
+    output = args.output
+    if output is None:
+        results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+        os.makedirs(results_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(results_dir, f"{stamp}-{commit or 'nocommit'}.json")
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Resultados en {output}")
+
+
+if __name__ == "__main__":
+    main()
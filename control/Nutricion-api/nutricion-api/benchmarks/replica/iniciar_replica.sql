@@ -0,0 +1,11 @@
+-- Se ejecuta al inicializar el contenedor mysql-replica: replica desde mysql-primario por GTID
+CHANGE REPLICATION SOURCE TO
+    SOURCE_HOST = 'mysql-primario',
+    SOURCE_PORT = 3306,
+    SOURCE_USER = 'root',
+    SOURCE_PASSWORD = 'bench',
+    SOURCE_AUTO_POSITION = 1,
+    GET_SOURCE_PUBLIC_KEY = 1;
+START REPLICA;
+-- Después del setup del entrypoint (super_read_only impediría crear el usuario root)
+SET PERSIST super_read_only = ON;
@@ -0,0 +1,36 @@
+"""
+gunicorn con workers de uvicorn:
+    gunicorn app.main:app -c gunicorn.conf.py
+
+El maestro publica los datos de referencia (REFDATA_SHARED) antes de crear los
+workers: cada worker hereda los arreglos ya mapeados y no vuelve a leer los
+catálogos de la base ni a armar sus matrices. Las versiones nuevas las publica
+el primer worker que las detecta y las demás las adjuntan.
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+
+def on_starting(server):
+    from app.core.config import settings
+
+    if not settings.REFDATA_SHARED:
+        return
+    from app.application.datos_referencia import precargar
+    from app.infrastructure.db.session import SessionLocal, engine
+
+    db = SessionLocal()
+    try:
+        for nombre, segundos in precargar(db).items():
+            server.log.info("Datos de referencia %s listos en %.0f ms", nombre, segundos * 1000)
+    finally:
+        db.close()
+        # Los workers no deben heredar conexiones abiertas del maestro
+        engine.dispose()
@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import math
 import pandas as pd
 
@@ -24,6 +25,10 @@ try:
     from src.llm.client import get_llm_client
 except Exception:
     get_llm_client = None  # type: ignore
+try:
+    from src.llm.budget import from_env as summarizer_from_env
+except Exception:
+    summarizer_from_env = None  # type: ignore
 
 
 app = FastAPI(title="ml-recomendator", version="0.1.0")
@@ -201,15 +206,43 @@ class SummaryRequest(BaseModel):
     features: Dict[str, Any]
     scores: Dict[str, float]
     prefer_llm: bool = True
+    budget_ms: Optional[int] = Field(default=None, ge=0, description="Max wait for the LLM; default LLM_BUDGET_MS")
 
 
 class SummaryResponse(BaseModel):
     text: str
     used_llm: bool
+    summary_id: Optional[str] = None
+    status: str = "done"
+
+
+_summarizer = None
+
+
+def get_summarizer():
+    """Budgeted summarizer (LLM_BUDGET_MS, LLM_SUMMARY_*), created on first use."""
+    global _summarizer
+    if _summarizer is None and summarizer_from_env is not None:
+        _summarizer = summarizer_from_env()
+    return _summarizer
+
+
+@app.on_event("shutdown")
+def _shutdown_summarizer():
+    if _summarizer is not None:
+        _summarizer.shutdown()
 
 
 @app.post("/ml/summary", response_model=SummaryResponse)
 def summarize(req: SummaryRequest) -> SummaryResponse:
+    summarizer = get_summarizer()
+    if summarizer is not None:
+        # Waits at most budget_ms; a slower LLM finishes in the background (GET /ml/summary/{summary_id})
+        record = summarizer.summarize(req.features, req.scores, req.prefer_llm, req.budget_ms)
+        return SummaryResponse(
+            text=record["text"], used_llm=record["used_llm"],
+            summary_id=record["summary_id"], status=record["status"],
+        )
     used_llm = False
     text: Optional[str] = None
     if req.prefer_llm and summarize_with_llm is not None:
@@ -228,6 +261,31 @@ def summarize(req: SummaryRequest) -> SummaryResponse:
     return SummaryResponse(text=text, used_llm=used_llm)
 
 
+@app.get("/ml/summary/{summary_id}", response_model=SummaryResponse)
+def get_summary(summary_id: str) -> SummaryResponse:
+    summarizer = get_summarizer()
+    record = summarizer.get(summary_id) if summarizer is not None else None
+    if record is None:
+        raise HTTPException(status_code=404, detail="Summary not found or expired")
+    return SummaryResponse(
+        text=record["text"], used_llm=record["used_llm"], summary_id=summary_id, status=record["status"],
+    )
+
+
+@app.get("/ml/summary/{summary_id}/stream")
+def stream_summary(summary_id: str) -> StreamingResponse:
+    """SSE: `summary` with the current text, `summary` again when the LLM finishes, then `end`."""
+    summarizer = get_summarizer()
+    if summarizer is None or summarizer.get(summary_id) is None:
+        raise HTTPException(status_code=404, detail="Summary not found or expired")
+    timeout = float(os.getenv("LLM_TIMEOUT", "30")) + 5
+    return StreamingResponse(
+        summarizer.events(summary_id, timeout=timeout),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # --- Simple chat passthrough endpoint ---
 
 class ChatRequest(BaseModel):
@@ -0,0 +1,61 @@
+"""Compare two benchmark runs and flag regressions.
+
+By default compares the two most recent files in benchmarks/history/.
+A case regresses when its best per-call time grows more than `--threshold`
+percent. Exits with status 1 if any case regressed.
+
+Usage:
+    python -m benchmarks.compare                      # last two runs
+    python -m benchmarks.compare base.json head.json --threshold 15
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+
+HISTORY_DIR = Path(__file__).resolve().parent / "history"
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def compare(base: dict, head: dict, threshold: float):
+    rows = []
+    for name, old in base["results"].items():
+        new = head["results"].get(name)
+        if not new or "min_s" not in old or "min_s" not in new:
+            continue
+        change = (new["min_s"] - old["min_s"]) / old["min_s"] * 100.0 if old["min_s"] else 0.0
+        rows.append((name, old["min_s"], new["min_s"], change, change > threshold))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare benchmark history files")
+    ap.add_argument("base", nargs="?", type=Path)
+    ap.add_argument("head", nargs="?", type=Path)
+    ap.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+    args = ap.parse_args()
+
+    if args.base is None or args.head is None:
+        runs = sorted(HISTORY_DIR.glob("*.json"))
+        if len(runs) < 2:
+            print("Need at least two runs in benchmarks/history/")
+            return 2
+        args.base, args.head = runs[-2], runs[-1]
+
+    base, head = _load(args.base), _load(args.head)
+    print(f"base={base['meta'].get('commit')} ({args.base.name})  head={head['meta'].get('commit')} ({args.head.name})")
+    regressed = []
+    for name, old, new, change, flagged in compare(base, head, args.threshold):
+        mark = "REGRESSION" if flagged else ("faster" if change < -args.threshold else "ok")
+        print(f"{name:>28}: {old * 1e6:12.2f} µs -> {new * 1e6:12.2f} µs  ({change:+7.1f}%)  {mark}")
+        if flagged:
+            regressed.append(name)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Synthetic survey generator with the same columns as data/raw/surveys."""
+from __future__ import annotations
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REGIONS = ["costa", "sierra", "selva"]
+ALLERGIES = ["", "", "", "mariscos", "lactosa", "gluten", "mani", "huevo"]
+
+
+def generate_surveys(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Return `n_rows` synthetic children with plausible anthropometry."""
+    rng = np.random.default_rng(seed)
+    age = rng.integers(0, 228, size=n_rows)
+    sex = rng.choice(np.array(["M", "F"]), size=n_rows)
+    height = np.clip(50 + np.minimum(age, 12) * 2.1 + np.maximum(age - 12, 0) * 0.55 + rng.normal(0, 4, n_rows), 45, 190)
+    bmi = np.clip(rng.normal(np.where(age < 60, 16.3, 18.0), 1.8), 10, 35)
+    weight = bmi * (height / 100) ** 2
+    df = pd.DataFrame(
+        {
+            "child_id": [f"S{i}" for i in range(n_rows)],
+            "sex": sex,
+            "age_months": age,
+            "weight_kg": weight.round(1),
+            "height_cm": height.round(1),
+            "muac_cm": np.where(rng.random(n_rows) < 0.2, np.nan, rng.normal(15, 1.5, n_rows).round(1)),
+            "head_circumference_cm": np.where(age < 36, rng.normal(45, 2, n_rows).round(1), np.nan),
+            "edema_pitting": (rng.random(n_rows) < 0.02).astype(int),
+            "anemia_hemoglobin_g_dl": np.where(rng.random(n_rows) < 0.5, np.nan, rng.normal(11.5, 1.2, n_rows).round(1)),
+            "diarrhea_last_2w": (rng.random(n_rows) < 0.1).astype(int),
+            "dietary_diversity_score": rng.integers(1, 9, size=n_rows),
+            "allergies": rng.choice(np.array(ALLERGIES), size=n_rows),
+            "region": rng.choice(np.array(REGIONS), size=n_rows),
+            "altitude_m": rng.integers(0, 4500, size=n_rows),
+            "budget_per_day_pen": rng.normal(12, 4, n_rows).clip(2, 40).round(1),
+            "measurement_date": "2025-07-01",
+        }
+    )
+    df["bmi"] = (df["weight_kg"] / (df["height_cm"] / 100) ** 2).round(2)
+    df["label_baz_category"] = ""
+    return df
+
+
+def ensure_survey_dir(cache_dir: Path, n_rows: int, seed: int = 42, chunk_rows: int = 1_000_000) -> Path:
+    """Materialize a survey folder with `n_rows` rows (cached between runs)."""
+    out = cache_dir / f"surveys_{n_rows}"
+    marker = out / ".complete"
+    if marker.exists():
+        return out
+    out.mkdir(parents=True, exist_ok=True)
+    written = 0
+    part = 0
+    while written < n_rows:
+        rows = min(chunk_rows, n_rows - written)
+        generate_surveys(rows, seed=seed + part).to_csv(out / f"part_{part:04d}.csv", index=False)
+        written += rows
+        part += 1
+    marker.touch()
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate synthetic surveys")
+    ap.add_argument("--rows", type=int, required=True)
+    ap.add_argument("--out", type=Path, default=Path("benchmarks/.cache"))
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+    print(ensure_survey_dir(args.out, args.rows, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Micro-benchmarks for the recommender hot paths.
+
+Each case is timed with a small timeit-style harness: the loop count is
+auto-calibrated so one repeat lasts at least `--min-time` seconds, and the
+per-call statistics over `--repeat` repeats are stored as a JSON file under
+benchmarks/history/ (one file per run) for compare.py.
+
+Usage (from modelo/ml-recomendator/):
+    python -m benchmarks.run
+    python -m benchmarks.run --label-sizes 10000 100000 1000000 --only label_run
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+WHO_DIR = ROOT / "data" / "raw" / "who"
+HISTORY_DIR = Path(__file__).resolve().parent / "history"
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    # Items processed per call (rows, predictions...) to report throughput
+    items: int = 1
+    params: Dict[str, Any] = field(default_factory=dict)
+    # Heavy cases run a single loop per repeat
+    single_shot: bool = False
+
+
+def _calibrate(fn: Callable[[], Any], min_time: float) -> int:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time or loops >= 1 << 20:
+            return loops
+        loops *= 2
+
+
+def measure(case: Case, repeat: int, min_time: float) -> Dict[str, Any]:
+    fn = case.setup()
+    loops = 1 if case.single_shot else _calibrate(fn, min_time)
+    per_call: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops)
+    best = min(per_call)
+    return {
+        "params": case.params,
+        "loops": loops,
+        "repeat": repeat,
+        "min_s": best,
+        "median_s": statistics.median(per_call),
+        "mean_s": statistics.fmean(per_call),
+        "stdev_s": statistics.pstdev(per_call),
+        "items_per_s": case.items / best if best > 0 else None,
+    }
+
+
+# --- cases -----------------------------------------------------------------
+
+def _lms_cases() -> List[Case]:
+    from src.pipeline import label_dataset as ld
+
+    who = ld._load_lms(WHO_DIR)
+    rng = random.Random(0)
+    queries = [(rng.choice("MF"), rng.randint(0, 228)) for _ in range(256)]
+    it = iter(range(1 << 62))
+
+    def nearest():
+        sex, month = queries[next(it) & 255]
+        return ld._nearest_lms(who, sex, month)
+
+    return [
+        Case("load_lms", lambda: (lambda: ld._load_lms(WHO_DIR))),
+        Case("nearest_lms", lambda: nearest),
+        Case("baz_from_bmi", lambda: (lambda: ld._baz_from_bmi(16.4, -0.6187, 16.0189, 0.07785))),
+    ]
+
+
+def _label_cases(sizes: List[int]) -> List[Case]:
+    from src.pipeline import label_dataset as ld
+    from benchmarks.datagen import ensure_survey_dir
+
+    cases = []
+    for n in sizes:
+        def setup(n=n):
+            survey_dir = ensure_survey_dir(CACHE_DIR, n)
+            out = Path(tempfile.mkdtemp()) / "labeled.csv"
+            return lambda: ld.run(survey_dir, WHO_DIR, out)
+
+        cases.append(Case(f"label_run[{n}]", setup, items=n, params={"rows": n}, single_shot=True))
+    return cases
+
+
+def _build_bundle():
+    """Use the trained bundle if present; otherwise fit a small RF on synthetic data."""
+    import yaml
+    from src.inference.infer import ModelBundle, load_bundle
+    from benchmarks.datagen import generate_surveys
+
+    model_path = ROOT / "models" / "rf.pkl"
+    pre_path = ROOT / "models" / "preprocess.joblib"
+    cfg = yaml.safe_load((ROOT / "configs" / "rf.yaml").read_text())
+    numeric = cfg["features"]["numeric"]
+    categorical = cfg["features"]["categorical"]
+
+    df = generate_surveys(5000, seed=1).rename(columns={"bmi": "BMI"})
+    features = df[numeric + categorical]
+    if model_path.exists() and pre_path.exists():
+        return load_bundle(model_path, pre_path), features
+
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    pre = ColumnTransformer(
+        [
+            ("num", SimpleImputer(strategy="median"), numeric),
+            ("cat", make_pipeline(
+                SimpleImputer(strategy="most_frequent"),
+                OneHotEncoder(handle_unknown="ignore"),
+            ), categorical),
+        ]
+    )
+    labels = (features["BMI"] > 19).astype(int) + (features["BMI"] > 23).astype(int)
+    X = pre.fit_transform(features)
+    model = RandomForestClassifier(n_estimators=100, min_samples_leaf=2, random_state=cfg.get("seed", 42), n_jobs=1)
+    model.fit(X, labels)
+    return ModelBundle(model=model, preprocess=pre), features
+
+
+def _predict_cases(batch_sizes: List[int]) -> List[Case]:
+    from src.inference.infer import predict_proba
+
+    state: Dict[str, Any] = {}
+
+    def ensure():
+        if not state:
+            state["bundle"], state["features"] = _build_bundle()
+        return state["bundle"], state["features"]
+
+    cases = []
+    for size in batch_sizes:
+        def setup(size=size):
+            bundle, features = ensure()
+            batch = features.sample(n=size, replace=True, random_state=0).reset_index(drop=True)
+            return lambda: predict_proba(bundle, batch)
+
+        cases.append(Case(f"predict_proba[{size}]", setup, items=size, params={"batch": size}))
+    return cases
+
+
+def _prompt_cases() -> List[Case]:
+    from src.llm.assist import format_recommender_prompt
+
+    features = {
+        "age_months": 30, "sex": "F", "BMI": 15.2, "muac_cm": 13.9, "region": "sierra",
+        "altitude_m": 3300, "dietary_diversity_score": 4, "budget_per_day_pen": 9.5,
+    }
+    scores = {"normal": 0.71, "moderado": 0.21, "severo": 0.08}
+    return [Case("format_recommender_prompt", lambda: (lambda: format_recommender_prompt(features, scores)))]
+
+
+def _summary_cases(llm_ms: float, budgets: List[float]) -> List[Case]:
+    """One /ml/summary call against a simulated provider taking `llm_ms`, waiting at most each budget."""
+    from src.llm.budget import BudgetedSummarizer, MemoryStore
+
+    features = {"age_months": 30, "sex": "F", "BMI": 15.2}
+    scores = {"normal": 0.71, "moderado": 0.21, "severo": 0.08}
+
+    def provider(f, s):
+        time.sleep(llm_ms / 1000.0)
+        return "llm"
+
+    cases = []
+    for budget in budgets:
+        def setup(budget=budget):
+            summarizer = BudgetedSummarizer(MemoryStore(), budget_ms=budget, workers=16, summarize=provider)
+            return lambda: summarizer.summarize(features, scores)
+
+        cases.append(Case(f"summary[llm={llm_ms:g}ms,budget={budget:g}ms]", setup,
+                          params={"llm_ms": llm_ms, "budget_ms": budget}, single_shot=True))
+    return cases
+
+
+GROUPS: Dict[str, Callable[[argparse.Namespace], List[Case]]] = {
+    "lms": lambda a: _lms_cases(),
+    "label_run": lambda a: _label_cases(a.label_sizes),
+    "predict_proba": lambda a: _predict_cases(a.batch_sizes),
+    "prompt": lambda a: _prompt_cases(),
+    "summary_budget": lambda a: _summary_cases(a.llm_ms, a.summary_budgets),
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Micro-benchmarks for ml-recomendator")
+    ap.add_argument("--only", nargs="+", choices=sorted(GROUPS), default=sorted(GROUPS))
+    ap.add_argument("--label-sizes", type=int, nargs="+", default=[10_000])
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 1024, 16384])
+    ap.add_argument("--llm-ms", type=float, default=1500.0, help="Simulated LLM latency for summary_budget")
+    ap.add_argument("--summary-budgets", type=float, nargs="+", default=[100_000, 800, 50])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat for calibration")
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args()
+
+    results: Dict[str, Any] = {}
+    for group in args.only:
+        try:
+            cases = GROUPS[group](args)
+        except ImportError as exc:
+            print(f"[skip] {group}: {exc}")
+            results[group] = {"skipped": str(exc)}
+            continue
+        for case in cases:
+            repeat = min(args.repeat, 3) if case.single_shot else args.repeat
+            res = measure(case, repeat, args.min_time)
+            results[case.name] = res
+            rate = f"{res['items_per_s']:,.0f} items/s" if res["items_per_s"] else ""
+            print(f"{case.name:>28}: min={res['min_s'] * 1e6:12.2f} µs  median={res['median_s'] * 1e6:12.2f} µs  {rate}")
+
+    commit = _git_commit()
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    payload = {
+        "meta": {
+            "commit": commit,
+            "timestamp": stamp,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "node": platform.node(),
+        },
+        "results": results,
+    }
+    out = args.out or HISTORY_DIR / f"{stamp}-{commit or 'nocommit'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, indent=2))
+    print(f"Saved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Latency-budgeted LLM summaries.
+
+`BudgetedSummarizer.summarize` starts `summarize_with_llm` on a thread pool and
+waits at most `budget_ms` for it. If the LLM answers in time the request gets
+that text. Otherwise it gets the offline `format_recommender_prompt` text at
+once with a `summary_id` and status "pending"; the LLM call keeps running and
+its result replaces the stored record ("done", or "failed" if the LLM gave
+nothing). `get` / `events` deliver the improved text later (polling or SSE).
+Only summaries that miss the budget are written to the store.
+
+Records live in a `MemoryStore` (one process) or a `DirectoryStore` (one JSON
+file per summary, shared by every worker process on the node).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .assist import format_recommender_prompt, summarize_with_llm
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+Record = Dict[str, Any]
+
+
+class MemoryStore:
+    """Summary records in a dict, evicted `ttl` seconds after their last write."""
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._records: Dict[str, Record] = {}
+        self._lock = threading.Lock()
+
+    def put(self, summary_id: str, record: Record) -> None:
+        now = time.time()
+        with self._lock:
+            self._records[summary_id] = {**record, "updated_at": now}
+            expired = [k for k, r in self._records.items() if now - r["updated_at"] > self.ttl]
+            for k in expired:
+                del self._records[k]
+
+    def get(self, summary_id: str) -> Optional[Record]:
+        with self._lock:
+            record = self._records.get(summary_id)
+        if record is None or time.time() - record["updated_at"] > self.ttl:
+            return None
+        return record
+
+
+class DirectoryStore:
+    """Summary records as `<dir>/<id>.json`, written atomically; visible to all processes on the node."""
+
+    def __init__(self, directory: os.PathLike, ttl: float = 600.0, sweep_every: int = 256):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.sweep_every = sweep_every
+        self._writes = 0
+
+    def _path(self, summary_id: str) -> Path:
+        # Ids are uuid4 hex; anything else would escape the directory
+        if not summary_id.isalnum():
+            raise KeyError(summary_id)
+        return self.directory / f"{summary_id}.json"
+
+    def put(self, summary_id: str, record: Record) -> None:
+        path = self._path(summary_id)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**record, "updated_at": time.time()}, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+        self._writes += 1
+        if self._writes % self.sweep_every == 0:
+            self.sweep()
+
+    def get(self, summary_id: str) -> Optional[Record]:
+        try:
+            with open(self._path(summary_id), "rb") as f:
+                record = json.loads(f.read())
+        except (KeyError, FileNotFoundError, ValueError):
+            return None
+        return None if time.time() - record["updated_at"] > self.ttl else record
+
+    def sweep(self) -> None:
+        limit = time.time() - self.ttl
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < limit:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class _Job:
+    """Hand-off between `summarize` and the background call for one summary."""
+
+    __slots__ = ("lock", "published", "finished", "text")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.published = False  # a pending record was stored and returned to the caller
+        self.finished = False
+        self.text: Optional[str] = None
+
+
+class BudgetedSummarizer:
+    def __init__(
+        self,
+        store,
+        budget_ms: float = 800.0,
+        workers: int = 4,
+        max_budget_ms: float = 5000.0,
+        max_pending: int = 64,
+        summarize: Callable[[Dict[str, Any], Dict[str, float]], Optional[str]] = summarize_with_llm,
+        offline: Callable[[Dict[str, Any], Dict[str, float]], str] = format_recommender_prompt,
+    ):
+        self.store = store
+        self.budget_ms = budget_ms
+        # Cap for per-request budgets: a long wait would hold the caller's thread for the whole LLM timeout
+        self.max_budget_ms = max_budget_ms
+        self.max_pending = max_pending
+        self._summarize = summarize
+        self._offline = offline
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="llm-summary")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _run(self, job: _Job, summary_id: str, features: Dict[str, Any], scores: Dict[str, float],
+             offline: str) -> Optional[str]:
+        try:
+            text = self._summarize(features, scores)
+        except Exception:
+            text = None
+        finally:
+            with self._lock:
+                self._pending -= 1
+        with job.lock:
+            job.finished = True
+            job.text = text
+            # Answered within the budget: `summarize` returns the text and nothing is stored
+            if not job.published:
+                return text
+            if text:
+                self.store.put(summary_id, {"summary_id": summary_id, "status": DONE, "text": text,
+                                            "used_llm": True})
+            else:
+                self.store.put(summary_id, {"summary_id": summary_id, "status": FAILED, "text": offline,
+                                            "used_llm": False})
+        return text
+
+    def summarize(
+        self,
+        features: Dict[str, Any],
+        scores: Dict[str, float],
+        prefer_llm: bool = True,
+        budget_ms: Optional[float] = None,
+    ) -> Record:
+        """Best summary available within the budget.
+
+        `budget_ms` (default `self.budget_ms`) is capped at `max_budget_ms`.
+        Returns a record with `text`, `used_llm`, `status` and `summary_id`
+        (None when nothing is left running in the background).
+        """
+        offline = self._offline(features, scores)
+        if not prefer_llm:
+            return {"summary_id": None, "status": DONE, "text": offline, "used_llm": False}
+        with self._lock:
+            # Provider already saturated: do not queue more background calls
+            if self._pending >= self.max_pending:
+                return {"summary_id": None, "status": DONE, "text": offline, "used_llm": False}
+            self._pending += 1
+
+        summary_id = uuid.uuid4().hex
+        job = _Job()
+        future = self._executor.submit(self._run, job, summary_id, features, scores, offline)
+        budget = self.budget_ms if budget_ms is None else budget_ms
+        budget = min(max(budget, 0.0), self.max_budget_ms)
+        try:
+            text = future.result(timeout=budget / 1000.0)
+        except FutureTimeout:
+            # Under the job lock so the final record is always written after "pending"
+            with job.lock:
+                if not job.finished:
+                    job.published = True
+                    record = {"summary_id": summary_id, "status": PENDING, "text": offline, "used_llm": False}
+                    self.store.put(summary_id, record)
+                    return record
+                text = job.text
+        if text:
+            return {"summary_id": None, "status": DONE, "text": text, "used_llm": True}
+        return {"summary_id": None, "status": DONE, "text": offline, "used_llm": False}
+
+    def get(self, summary_id: str) -> Optional[Record]:
+        return self.store.get(summary_id)
+
+    async def events(self, summary_id: str, timeout: float = 60.0, poll: float = 0.25,
+                     keepalive: float = 15.0) -> AsyncIterator[bytes]:
+        """Server-sent events: the current record, then the final one once the LLM finishes (or `timeout`)."""
+        record = self.store.get(summary_id)
+        if record is None:
+            yield _sse("error", {"summary_id": summary_id, "detail": "not found"})
+            return
+        yield _sse("summary", record)
+        start = last = time.monotonic()
+        while record["status"] == PENDING and time.monotonic() - start < timeout:
+            await asyncio.sleep(poll)
+            record = self.store.get(summary_id) or record
+            if record["status"] != PENDING:
+                yield _sse("summary", record)
+            elif time.monotonic() - last >= keepalive:
+                last = time.monotonic()
+                yield b": keepalive\n\n"
+        yield _sse("end", {"summary_id": summary_id, "status": record["status"]})
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _sse(event: str, data: Record) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
+
+
+def from_env() -> BudgetedSummarizer:
+    """Summarizer configured from LLM_BUDGET_MS, LLM_MAX_BUDGET_MS, LLM_SUMMARY_WORKERS, LLM_SUMMARY_TTL and
+    LLM_SUMMARY_DIR."""
+    ttl = float(os.getenv("LLM_SUMMARY_TTL", "600"))
+    directory = os.getenv("LLM_SUMMARY_DIR")
+    store = DirectoryStore(directory, ttl=ttl) if directory else MemoryStore(ttl=ttl)
+    return BudgetedSummarizer(
+        store,
+        budget_ms=float(os.getenv("LLM_BUDGET_MS", "800")),
+        workers=int(os.getenv("LLM_SUMMARY_WORKERS", "4")),
+        max_budget_ms=float(os.getenv("LLM_MAX_BUDGET_MS", "5000")),
+        max_pending=int(os.getenv("LLM_SUMMARY_MAX_PENDING", "64")),
+    )
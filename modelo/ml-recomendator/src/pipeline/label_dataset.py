@@ -102,13 +102,21 @@ def classify_from_baz(z: float) -> int:
     return 0
 
 
+_READERS = {
+    ".csv": pd.read_csv,
+    ".ndjson": lambda p: pd.read_json(p, lines=True, dtype={"sex": str}),
+    ".jsonl": lambda p: pd.read_json(p, lines=True, dtype={"sex": str}),
+    ".parquet": pd.read_parquet,  # requires pyarrow
+}
+
+
 def run(input_dir: Path, who_dir: Path, out_csv: Path) -> None:
     who = _load_lms(who_dir)
-    # Merge all CSVs in input_dir
-    files = sorted(list(input_dir.glob("*.csv")))
+    # Merge all survey files in input_dir (CSV, or NDJSON/Parquet from the API export)
+    files = sorted(p for p in input_dir.iterdir() if p.suffix.lower() in _READERS)
     if not files:
-        raise FileNotFoundError(f"No CSV files in {input_dir}")
-    frames = [pd.read_csv(p) for p in files]
+        raise FileNotFoundError(f"No CSV/NDJSON/Parquet files in {input_dir}")
+    frames = [_READERS[p.suffix.lower()](p) for p in files]
     df = pd.concat(frames, ignore_index=True)
     df = _ensure_children_cols(df)
     # Compute BAZ per row
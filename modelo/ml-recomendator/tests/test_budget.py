@@ -0,0 +1,114 @@
+"""BudgetedSummarizer with a fake LLM: inline answers, background completion over SSE, failures and the cap."""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.llm.budget import DONE, FAILED, PENDING, BudgetedSummarizer, MemoryStore
+
+FEATURES = {"edad_meses": 30}
+SCORES = {"riesgo": 0.2}
+
+
+class SpyStore(MemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def put(self, summary_id, record):
+        self.writes.append(record["status"])
+        super().put(summary_id, record)
+
+
+def offline(features, scores):
+    return "offline"
+
+
+@pytest.fixture
+def make():
+    created = []
+
+    def _make(llm, **kw):
+        summarizer = BudgetedSummarizer(SpyStore(), summarize=llm, offline=offline, **kw)
+        created.append(summarizer)
+        return summarizer
+
+    yield _make
+    for summarizer in created:
+        summarizer.shutdown()
+
+
+def _events(summarizer, summary_id):
+    async def collect():
+        return [chunk async for chunk in summarizer.events(summary_id, timeout=5, poll=0.01)]
+
+    parsed = []
+    for chunk in asyncio.run(collect()):
+        event, data = chunk.decode().strip().split("\n")
+        parsed.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return parsed
+
+
+def test_answer_within_budget_is_returned_inline_and_not_stored(make):
+    summarizer = make(lambda f, s: "llm text", budget_ms=2000)
+
+    record = summarizer.summarize(FEATURES, SCORES)
+
+    assert record == {"summary_id": None, "status": DONE, "text": "llm text", "used_llm": True}
+    assert summarizer.store.writes == []
+
+
+def test_over_budget_returns_offline_and_delivers_the_llm_text_over_sse(make):
+    release = threading.Event()
+    summarizer = make(lambda f, s: release.wait(5) and "late llm text", budget_ms=20)
+
+    record = summarizer.summarize(FEATURES, SCORES)
+    assert record["status"] == PENDING and record["text"] == "offline" and not record["used_llm"]
+    assert summarizer.get(record["summary_id"])["status"] == PENDING
+
+    threading.Timer(0.05, release.set).start()
+    events = _events(summarizer, record["summary_id"])
+
+    assert [e for e, _ in events] == ["summary", "summary", "end"]
+    assert events[0][1]["status"] == PENDING
+    assert events[1][1]["status"] == DONE and events[1][1]["text"] == "late llm text"
+    assert events[2][1] == {"summary_id": record["summary_id"], "status": DONE}
+    assert summarizer.store.writes == [PENDING, DONE]
+
+
+def test_llm_error_falls_back_to_offline(make):
+    def broken(features, scores):
+        raise RuntimeError("provider down")
+
+    summarizer = make(broken, budget_ms=2000)
+    assert summarizer.summarize(FEATURES, SCORES) == {
+        "summary_id": None, "status": DONE, "text": "offline", "used_llm": False,
+    }
+    assert summarizer.store.writes == []
+
+
+def test_llm_error_after_the_budget_is_stored_as_failed(make):
+    def slow_broken(features, scores):
+        time.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    summarizer = make(slow_broken, budget_ms=1)
+    record = summarizer.summarize(FEATURES, SCORES)
+    events = _events(summarizer, record["summary_id"])
+
+    assert events[-2][1]["status"] == FAILED and events[-2][1]["text"] == "offline"
+    assert summarizer.store.writes == [PENDING, FAILED]
+
+
+def test_requested_budget_is_capped(make):
+    release = threading.Event()
+    summarizer = make(lambda f, s: release.wait(5) and "late", budget_ms=10, max_budget_ms=50)
+
+    start = time.monotonic()
+    record = summarizer.summarize(FEATURES, SCORES, budget_ms=10 ** 9)
+    release.set()
+
+    assert record["status"] == PENDING
+    assert time.monotonic() - start < 2